@@ -19,18 +19,138 @@ DATABASE_URL = os.getenv(
 
 # AI Configuration
 AI_API_KEY = os.getenv("AI_API_KEY", "")
-AI_API_URL = "https://api.x.ai/v1/chat/completions"
-AI_MODEL = "grok-4-latest"
+AI_API_URL = os.getenv("AI_API_URL", "https://api.x.ai/v1/chat/completions")
+AI_MODEL = os.getenv("AI_MODEL", "grok-4-1-fast-reasoning")
+
+# AI Providers
+# Daftar provider berurutan (JSON), provider pertama = primary. Kosong = 1
+# provider dari AI_API_URL / AI_MODEL / AI_API_KEY. Contoh:
+# [{"name": "xai", "url": "https://api.x.ai/v1/chat/completions", "model": "grok-4-1-fast-reasoning", "api_key_env": "AI_API_KEY"},
+#  {"name": "backup", "url": "https://backup.example/v1/chat/completions", "model": "...", "api_key_env": "AI_BACKUP_API_KEY"}]
+AI_PROVIDERS = os.getenv("AI_PROVIDERS", "")
+# Hedged request: jika provider belum menjawab setelah persentil latency-nya
+# (AI_HEDGE_PERCENTILE), provider berikutnya ikut dipanggil; jawaban pertama dipakai
+AI_HEDGE_ENABLED = os.getenv("AI_HEDGE_ENABLED", "true").lower() == "true"
+AI_HEDGE_PERCENTILE = float(os.getenv("AI_HEDGE_PERCENTILE", "95"))
+AI_HEDGE_DELAY_SECONDS = float(os.getenv("AI_HEDGE_DELAY_SECONDS", "5"))  # Sebelum cukup data latency
+AI_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("AI_HEDGE_MIN_DELAY_SECONDS", "0.5"))
+AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+AI_HEDGE_SAMPLE_SIZE = int(os.getenv("AI_HEDGE_SAMPLE_SIZE", "200"))  # Latency terakhir per provider
 
 # AI Settings
 AI_TEMPERATURE = 0.7  # Kreativitas AI (0.0 = strict, 1.0 = creative)
 AI_MAX_TOKENS = 500  # Maksimal panjang response
 
+# AI Client (connection pool async, lihat services/ai_client.py)
+AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", "20"))
+AI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+AI_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("AI_KEEPALIVE_EXPIRY_SECONDS", "30"))
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))  # Request AI bersamaan, sisanya antri
+AI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("AI_CONNECT_TIMEOUT_SECONDS", "5"))
+AI_REQUEST_DEADLINE_SECONDS = float(os.getenv("AI_REQUEST_DEADLINE_SECONDS", "20"))  # Termasuk waktu antri
+
+# AI Circuit Breaker (lihat services/circuit_breaker.py)
+# Jika dalam jendela AI_BREAKER_WINDOW_SECONDS error rate / proporsi panggilan
+# lambat melewati batas, panggilan AI diputus selama AI_BREAKER_OPEN_SECONDS
+# dan user mendapat ringkasan rule-based
+AI_BREAKER_WINDOW_SECONDS = float(os.getenv("AI_BREAKER_WINDOW_SECONDS", "60"))
+AI_BREAKER_MIN_CALLS = int(os.getenv("AI_BREAKER_MIN_CALLS", "10"))  # Minimal panggilan sebelum bisa open
+AI_BREAKER_ERROR_RATE = float(os.getenv("AI_BREAKER_ERROR_RATE", "0.5"))
+AI_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("AI_BREAKER_SLOW_CALL_SECONDS", "10"))
+AI_BREAKER_SLOW_RATE = float(os.getenv("AI_BREAKER_SLOW_RATE", "0.5"))
+AI_BREAKER_OPEN_SECONDS = float(os.getenv("AI_BREAKER_OPEN_SECONDS", "30"))
+# Deadline adaptif = p95 latency x multiplier, minimal AI_DEADLINE_MIN_SECONDS,
+# maksimal AI_REQUEST_DEADLINE_SECONDS
+AI_DEADLINE_MIN_SECONDS = float(os.getenv("AI_DEADLINE_MIN_SECONDS", "3"))
+AI_DEADLINE_LATENCY_MULTIPLIER = float(os.getenv("AI_DEADLINE_LATENCY_MULTIPLIER", "2"))
+
+# AI Response Cache (persisten, lihat services/ai_response_cache.py)
+# Jawaban AI disimpan di file SQLite, key = hash(model, versi prompt, data device)
+AI_RESPONSE_CACHE_PATH = os.getenv("AI_RESPONSE_CACHE_PATH", "data/ai_cache.sqlite3")
+AI_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("AI_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+AI_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("AI_RESPONSE_CACHE_MAX_ENTRIES", "20000"))
+AI_RESPONSE_CACHE_MAX_MB = float(os.getenv("AI_RESPONSE_CACHE_MAX_MB", "64"))
+
+# AI Precompute (job background, lihat services/ai_precompute.py)
+# Pasangan perbandingan & parameter rekomendasi yang paling sering diminta
+# dihitung analisis AI-nya di luar jam sibuk, supaya pengunjung pertama tidak
+# menunggu AI. AI_PRECOMPUTE_WINDOW = jam server "mulai-selesai" (boleh lewat
+# tengah malam, misal "22-6"); kosong = kapan saja.
+# Job hanya berjalan di 1 proses (worker gunicorn pertama yang mengambil
+# AI_PRECOMPUTE_LOCK_PATH), supaya budget RPM tidak dikali jumlah worker.
+# Hitungan popularitas setiap worker dijumlahkan ke file AI_RESPONSE_CACHE_PATH
+# setiap AI_PRECOMPUTE_FLUSH_SECONDS, jadi job melihat traffic semua worker
+AI_PRECOMPUTE_ENABLED = os.getenv("AI_PRECOMPUTE_ENABLED", "false").lower() == "true"
+AI_PRECOMPUTE_LOCK_PATH = os.getenv("AI_PRECOMPUTE_LOCK_PATH", "data/ai_precompute.lock")
+AI_PRECOMPUTE_FLUSH_SECONDS = float(os.getenv("AI_PRECOMPUTE_FLUSH_SECONDS", "60"))
+AI_PRECOMPUTE_WINDOW = os.getenv("AI_PRECOMPUTE_WINDOW", "1-6")
+AI_PRECOMPUTE_RPM = float(os.getenv("AI_PRECOMPUTE_RPM", "10"))  # Budget request AI per menit
+AI_PRECOMPUTE_INTERVAL_SECONDS = int(os.getenv("AI_PRECOMPUTE_INTERVAL_SECONDS", "300"))
+AI_PRECOMPUTE_BATCH_SIZE = int(os.getenv("AI_PRECOMPUTE_BATCH_SIZE", "50"))  # Key teratas per putaran
+AI_PRECOMPUTE_MIN_REQUESTS = int(os.getenv("AI_PRECOMPUTE_MIN_REQUESTS", "3"))
+AI_PRECOMPUTE_BACKOFF_SECONDS = float(os.getenv("AI_PRECOMPUTE_BACKOFF_SECONDS", "30"))  # Setelah 429, dobel tiap 429
+AI_PRECOMPUTE_BACKOFF_MAX_SECONDS = float(os.getenv("AI_PRECOMPUTE_BACKOFF_MAX_SECONDS", "900"))
+AI_PRECOMPUTE_TRACK_MAX_KEYS = int(os.getenv("AI_PRECOMPUTE_TRACK_MAX_KEYS", "5000"))
+
+# In-memory Index Settings
+# Index in-memory (autocomplete, dll) di-update otomatis saat data berubah.
+# Rebuild penuh berkala sebagai jaring pengaman untuk multi-worker (detik)
+SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+
+# Comparison Cache Settings
+# Hasil perbandingan (rule-based + analisis AI) per pasangan device disimpan
+# di memory (LRU). Dibatasi jumlah entry dan total ukuran (MB)
+COMPARISON_CACHE_MAX_ENTRIES = int(os.getenv("COMPARISON_CACHE_MAX_ENTRIES", "2000"))
+COMPARISON_CACHE_MAX_MB = float(os.getenv("COMPARISON_CACHE_MAX_MB", "32"))
+
+# Recommendation Cache Settings
+# Kandidat /recommendation/ disimpan per bucket budget (max_price dibulatkan ke
+# atas ke kelipatan RECOMMENDATION_PRICE_BUCKET), kategori dan tahun minimal
+RECOMMENDATION_PRICE_BUCKET = int(os.getenv("RECOMMENDATION_PRICE_BUCKET", "500000"))
+RECOMMENDATION_CACHE_TTL_SECONDS = int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "300"))
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", "256"))
+
+# Pareto Frontier Cache
+# Frontier per (kategori, use case, tahun minimal) disimpan di memory (LRU).
+# Frontier default per kategori (tanpa use case & tahun) tidak pernah dibuang
+PARETO_FRONTIER_CACHE_MAX_ENTRIES = int(os.getenv("PARETO_FRONTIER_CACHE_MAX_ENTRIES", "256"))
+
+# Database Migration
+# Jalankan migration yang belum dijalankan (app/migrations) saat aplikasi start.
+# Set "false" jika migration dijalankan terpisah: python scripts/migrate.py
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+
 # Use Case Options
-USE_CASES = [
-    "gaming",
-    "fotografi",
-    "kerja",
-    "kuliah",
-    "multimedia"
-]
+# Bobot skor rekomendasi per use case (lihat services/recommendation_service.py).
+# Nilai setiap spesifikasi dinormalisasi 0..1 di antara kandidat, lalu skor =
+# jumlah (nilai x bobot). Tidak ada kolom skor GPU/benchmark, jadi performa
+# diwakili RAM dan tahun rilis (generasi chipset).
+DEFAULT_SCORE_WEIGHTS = {
+    "release_year": 0.6,
+    "price": 0.4,
+}
+
+USE_CASE_WEIGHTS = {
+    "gaming": {
+        "ram_gb": 0.3, "release_year": 0.25, "battery_mah": 0.15,
+        "screen_inch": 0.1, "storage_gb": 0.1, "price": 0.1,
+    },
+    "fotografi": {
+        "main_camera_mp": 0.45, "release_year": 0.2, "storage_gb": 0.15,
+        "battery_mah": 0.1, "price": 0.1,
+    },
+    "kerja": {
+        "ram_gb": 0.25, "battery_mah": 0.25, "storage_gb": 0.15,
+        "release_year": 0.15, "screen_inch": 0.1, "price": 0.1,
+    },
+    "kuliah": {
+        "price": 0.4, "battery_mah": 0.25, "ram_gb": 0.15,
+        "storage_gb": 0.1, "release_year": 0.1,
+    },
+    "multimedia": {
+        "screen_inch": 0.3, "battery_mah": 0.2, "storage_gb": 0.2,
+        "main_camera_mp": 0.1, "release_year": 0.1, "price": 0.1,
+    },
+}
+
+USE_CASES = list(USE_CASE_WEIGHTS)
@@ -6,9 +6,13 @@ Berisi fungsi-fungsi untuk Create, Read, Update, Delete database.
 # Import hanya modules yang essential dan sudah working
 from . import category
 from . import device
+from . import search
+from . import pagination
 
 # Export semua agar bisa di-import
 __all__ = [
     "category",
-    "device"
+    "device",
+    "search",
+    "pagination"
 ]
@@ -1,6 +1,27 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List
+import threading
+import time
+from sqlalchemy.orm import Session, Query, joinedload, load_only
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from .. import models, schemas
+from ..core.config import SEARCH_INDEX_REFRESH_SECONDS
+from ..services import catalog_events
+from ..utils import spec_parser, query_parser
+from . import search as search_crud
+from . import pagination
+
+# Maksimal ID per request batch (GET /devices/batch)
+MAX_BATCH_SIZE = 50
+
+# Filter yang punya index komposit (kolom, price_idr) / index price_idr.
+# Halaman keyset dengan filter ini diurutkan harga: urut id + filter membuat
+# SQLite scan seluruh tabel urut rowid sampai LIMIT terpenuhi
+_PRICE_ORDERED_FILTERS = ("category_id", "brand", "release_year", "max_price", "min_price")
+
+# Cache list brand (get_unique_brands), dipakai di setiap search & filter brand.
+# Dibuang setiap ada perubahan katalog (catalog_events), dan dibaca ulang jika
+# umurnya melewati SEARCH_INDEX_REFRESH_SECONDS (perubahan dari worker lain)
+_brand_cache: Dict[str, Any] = {"brands": None, "loaded_at": 0.0, "generation": 0}
+_brand_cache_lock = threading.Lock()
 
 # ==================== READ OPERATIONS ====================
 
@@ -18,38 +39,184 @@ def get_device(db: Session, device_id: int) -> Optional[models.Phone]:
     return db.query(models.Phone).filter(models.Phone.id == device_id).first()
 
 
+def get_devices_by_ids(
+    db: Session,
+    device_ids: Iterable[int],
+    fields: Optional[List[str]] = None
+) -> List[models.Phone]:
+    """
+    Mengambil beberapa device sekaligus dengan 1 query IN (...).
+    
+    Category ikut di-load dalam query yang sama (JOIN), jadi tidak ada
+    query tambahan per device saat category diakses.
+    
+    Args:
+        db: Database session
+        device_ids: List ID device (duplikat diabaikan)
+        fields: Hanya SELECT field ini (lihat utils/fields.py), None = semua
+    
+    Returns:
+        List of Device objects sesuai urutan device_ids.
+        ID yang tidak ditemukan dilewati.
+    """
+    ids = list(dict.fromkeys(device_ids))
+    if not ids:
+        return []
+    
+    query = db.query(models.Phone).filter(models.Phone.id.in_(ids))
+    if fields is None:
+        query = query.options(joinedload(models.Phone.category))
+    devices = _apply_fields(query, fields).all()
+    by_id = {device.id: device for device in devices}
+    return [by_id[device_id] for device_id in ids if device_id in by_id]
+
+
+def get_device_versions(db: Session, device_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Mengambil version beberapa device (hanya kolom id + version).
+
+    Dipakai untuk key cache: jauh lebih ringan dari me-load device lengkap.
+
+    Returns:
+        Dict device_id -> version. ID yang tidak ditemukan tidak ada di dict.
+    """
+    ids = list(dict.fromkeys(device_ids))
+    if not ids:
+        return {}
+    rows = db.query(models.Phone.id, models.Phone.version).filter(models.Phone.id.in_(ids)).all()
+    return {device_id: version for device_id, version in rows}
+
+
 def get_devices(
     db: Session, 
     skip: int = 0, 
     limit: int = 100, 
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> List[models.Phone]:
     """
     Mengambil list devices dengan pagination dan search.
     
+    Catatan: skip (OFFSET) makin lambat di halaman dalam. Untuk list yang
+    bisa di-page, pakai get_devices_page() (keyset/cursor pagination).
+    
     Args:
         db: Database session
         skip: Berapa data yang di-skip (untuk pagination)
         limit: Maksimal berapa data yang diambil
-        search: Keyword untuk search berdasarkan nama device ATAU brand
+        search: Keyword search, boleh berisi spesifikasi
+                (misal "samsung 8gb 256gb di bawah 5 juta")
+        fields: Hanya SELECT field ini (lihat utils/fields.py), None = semua
     
     Returns:
-        List of Device objects
+        List of Device objects (jika search: diurutkan berdasarkan relevansi)
     """
-    query = db.query(models.Phone)
+    if search:
+        # Brand/RAM/storage/harga/tahun di dalam kalimat search diubah jadi
+        # filter kolom ter-index (lihat utils/query_parser.py)
+        filters = query_parser.parse_search_query(search, get_unique_brands(db))
+        if query_parser.has_structured_filters(filters):
+            return get_devices_filtered(db, skip=skip, limit=limit, fields=fields, **filters)
+        
+        # Hanya kata biasa -> full-text index (MySQL FULLTEXT / SQLite FTS5)
+        # Lihat crud/search.py. ILIKE '%q%' tidak bisa pakai index (full table scan)
+        search_query = search_crud.build_search_query(db, search)
+        if search_query is None:
+            return []
+        return _apply_fields(search_query, fields).offset(skip).limit(limit).all()
+    
+    return _apply_fields(db.query(models.Phone), fields).offset(skip).limit(limit).all()
+
+
+def get_devices_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    search: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Tuple[List[models.Phone], Optional[str]]:
+    """
+    Sama seperti get_devices(), tapi dengan keyset (cursor) pagination.
     
-    # Jika ada keyword search, filter berdasarkan nama ATAU brand
-    # Menggunakan ilike() untuk case-insensitive search
-    # Contoh: "samsung", "Samsung", "SAMSUNG" semua akan match
+    Args:
+        db: Database session
+        cursor: Cursor `next` dari halaman sebelumnya (None = halaman pertama)
+        limit: Jumlah device per halaman
+        search: Keyword search (boleh berisi spesifikasi)
+        fields: Hanya SELECT field ini (lihat utils/fields.py), None = semua
+    
+    Returns:
+        Tuple (devices, next_cursor). next_cursor None jika halaman terakhir.
+    
+    Raises:
+        pagination.InvalidCursor: Jika cursor tidak valid
+    """
+    filters = {}
     if search:
-        search_pattern = f"%{search}%"
-        search_filter = (
-            models.Phone.name.ilike(search_pattern) | 
-            models.Phone.brand.ilike(search_pattern)
-        )
-        query = query.filter(search_filter)
+        # Kalimat yang isinya hanya stopword (misal "hp") tetap dicari apa adanya
+        filters = query_parser.parse_search_query(search, get_unique_brands(db)) or {"search": search}
+    return get_devices_filtered_page(db, cursor=cursor, limit=limit, fields=fields, **filters)
+
+
+def _build_filtered_query(
+    db: Session,
+    category_id: Optional[int] = None,
+    brand: Optional[str] = None,
+    ram: Optional[str] = None,
+    storage: Optional[str] = None,
+    max_price: Optional[float] = None,
+    min_price: Optional[float] = None,
+    release_year: Optional[int] = None,
+    search: Optional[str] = None
+) -> Tuple[Query, Any, bool]:
+    """
+    Bangun query filter (belum diurutkan / dieksekusi).
+    
+    Returns:
+        Tuple (query, sort_key, descending). sort_key adalah skor relevansi
+        full-text jika ada search, None jika urut id saja.
+    """
+    query, sort_key, descending = None, None, False
+    if search:
+        ranked = search_crud.build_ranked_search_query(db, search)
+        if ranked is not None:
+            query, sort_key, descending = ranked
+    if query is None:
+        query = db.query(models.Phone)
     
-    return query.offset(skip).limit(limit).all()
+    # Filter by category
+    if category_id:
+        query = query.filter(models.Phone.category_id == category_id)
+    
+    # Filter by brand (case-insensitive). Dicocokkan dulu ke penulisan brand
+    # yang ada di database lalu pakai IN, karena ILIKE (= lower(brand) LIKE ...)
+    # tidak bisa memakai index brand / ix_phones_brand_price
+    if brand:
+        variants = [name for name in get_unique_brands(db) if name.lower() == brand.strip().lower()]
+        query = query.filter(models.Phone.brand.in_(variants or [brand]))
+    
+    # Filter by RAM: "8GB" di-parse jadi 8, lalu cocokkan kolom ram_gb (ter-index)
+    # Exact match, jadi "8GB" tidak lagi ikut match "18GB"
+    ram_gb = spec_parser.parse_ram_gb(ram)
+    if ram_gb is not None:
+        query = query.filter(models.Phone.ram_gb == ram_gb)
+    
+    # Filter by storage: "256GB" -> 256, "1TB" -> 1024
+    storage_gb = spec_parser.parse_storage_gb(storage)
+    if storage_gb is not None:
+        query = query.filter(models.Phone.storage_gb == storage_gb)
+    
+    # Filter by max price (kolom price_idr integer ter-index)
+    if max_price:
+        query = query.filter(models.Phone.price_idr <= max_price)
+    
+    if min_price:
+        query = query.filter(models.Phone.price_idr >= min_price)
+    
+    if release_year:
+        query = query.filter(models.Phone.release_year == release_year)
+    
+    return query, sort_key, descending
 
 
 def get_devices_filtered(
@@ -59,8 +226,12 @@ def get_devices_filtered(
     ram: Optional[str] = None,
     storage: Optional[str] = None,
     max_price: Optional[float] = None,
+    min_price: Optional[float] = None,
+    release_year: Optional[int] = None,
+    search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[List[str]] = None
 ) -> List[models.Phone]:
     """
     Mengambil list devices dengan multiple filters.
@@ -72,53 +243,113 @@ def get_devices_filtered(
         ram: Filter by RAM (e.g., "8GB")
         storage: Filter by storage (e.g., "256GB")
         max_price: Filter by maximum price
+        min_price: Filter by minimum price
+        release_year: Filter by tahun rilis
+        search: Keyword full-text (nama/brand), hasil diurutkan relevansi
         skip: Pagination offset
         limit: Maximum results
+        fields: Hanya SELECT field ini (lihat utils/fields.py), None = semua
     
     Returns:
         List of filtered Device objects
     """
-    query = db.query(models.Phone)
-    
-    # Filter by category
-    if category_id:
-        query = query.filter(models.Phone.category_id == category_id)
-    
-    # Filter by brand (case-insensitive)
-    if brand:
-        query = query.filter(models.Phone.brand.ilike(brand))
-    
-    # Filter by RAM (case-insensitive, partial match)
-    if ram:
-        query = query.filter(models.Phone.ram.ilike(f"%{ram}%"))
+    query, sort_key, descending = _build_filtered_query(
+        db, category_id=category_id, brand=brand, ram=ram, storage=storage,
+        max_price=max_price, min_price=min_price, release_year=release_year,
+        search=search
+    )
+    if sort_key is not None:
+        query = query.order_by(sort_key.desc() if descending else sort_key, models.Phone.id)
+    
+    return _apply_fields(query, fields).offset(skip).limit(limit).all()
+
+
+def get_devices_filtered_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    fields: Optional[List[str]] = None,
+    **filters
+) -> Tuple[List[models.Phone], Optional[str]]:
+    """
+    Sama seperti get_devices_filtered(), tapi dengan keyset (cursor) pagination.
+    Setiap halaman dibaca langsung dari index, tanpa OFFSET dan tanpa COUNT.
+    Urutan: relevansi jika ada search; harga termurah dulu jika ada filter
+    kategori/brand/tahun/harga; selain itu urut id.
     
-    # Filter by storage (case-insensitive, partial match)
-    if storage:
-        query = query.filter(models.Phone.storage.ilike(f"%{storage}%"))
+    Args:
+        db: Database session
+        cursor: Cursor `next` dari halaman sebelumnya (None = halaman pertama)
+        limit: Jumlah device per halaman
+        fields: Hanya SELECT field ini (lihat utils/fields.py), None = semua
+        **filters: Filter yang sama dengan get_devices_filtered()
     
-    # Filter by max price
-    if max_price:
-        query = query.filter(models.Phone.price <= max_price)
+    Returns:
+        Tuple (devices, next_cursor). next_cursor None jika halaman terakhir.
     
-    return query.offset(skip).limit(limit).all()
+    Raises:
+        pagination.InvalidCursor: Jika cursor tidak valid
+    """
+    query, sort_key, descending = _build_filtered_query(db, **filters)
+    if sort_key is None and any(filters.get(name) for name in _PRICE_ORDERED_FILTERS):
+        sort_key = models.Phone.price_idr
+    query = _apply_fields(query, fields)
+    return pagination.paginate(
+        query, cursor=cursor, limit=limit, sort_column=sort_key, descending=descending
+    )
+
+
+def _apply_fields(query: Query, fields: Optional[List[str]]) -> Query:
+    """
+    Batasi kolom yang di-SELECT sesuai sparse fieldset (`?fields=`).
+    Category hanya di-JOIN jika diminta.
+    """
+    if not fields:
+        return query
+    columns = [getattr(models.Phone, name) for name in fields if name != "category"]
+    query = query.options(load_only(*columns))
+    if "category" in fields:
+        query = query.options(joinedload(models.Phone.category))
+    return query
 
 
 def get_unique_brands(db: Session) -> List[str]:
     """
     Mengambil list brand yang unik dari database.
     
+    Hasil di-cache di memory sampai katalog berubah, jadi search dan filter
+    brand tidak menjalankan query DISTINCT brand di setiap request.
+    
     Args:
         db: Database session
     
     Returns:
         List of unique brand names, sorted alphabetically
     """
-    brands = db.query(models.Phone.brand).distinct().filter(models.Phone.brand.isnot(None)).all()
+    with _brand_cache_lock:
+        brands = _brand_cache["brands"]
+        if brands is not None and time.monotonic() - _brand_cache["loaded_at"] <= SEARCH_INDEX_REFRESH_SECONDS:
+            return brands
+        generation = _brand_cache["generation"]
+    
+    rows = db.query(models.Phone.brand).distinct().filter(models.Phone.brand.isnot(None)).all()
     # Extract brand names from tuples and sort
-    brand_list = sorted([brand[0] for brand in brands if brand[0]])
+    brand_list = sorted([brand[0] for brand in rows if brand[0]])
+    with _brand_cache_lock:
+        # Katalog berubah selama query berjalan: hasil ini mungkin sudah basi
+        if _brand_cache["generation"] == generation:
+            _brand_cache.update(brands=brand_list, loaded_at=time.monotonic())
     return brand_list
 
 
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Buang cache list brand setiap ada perubahan katalog."""
+    with _brand_cache_lock:
+        _brand_cache["brands"] = None
+        _brand_cache["generation"] += 1
+
+
 # ==================== CREATE OPERATIONS ====================
 
 def create_device(db: Session, device: schemas.PhoneCreate) -> models.Phone:
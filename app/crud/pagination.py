@@ -0,0 +1,198 @@
+"""
+Keyset (cursor) pagination untuk list device.
+
+OFFSET pagination (`offset(skip).limit(limit)`) membuat database tetap
+membaca & membuang `skip` baris pertama, jadi halaman ke-500 jauh lebih
+lambat dari halaman 1. Keyset pagination mengingat posisi baris terakhir
+(sort_key, id) lalu melanjutkan dengan:
+
+    WHERE sort_key > :last_key OR (sort_key = :last_key AND id > :last_id)
+    ORDER BY sort_key, id
+    LIMIT :limit
+
+sehingga setiap halaman langsung dibaca dari index -> waktu konstan.
+
+Posisi dikirim ke client sebagai cursor opaque (base64 JSON), misal
+`?cursor=eyJrIjogNTk5OTAwMCwgImlkIjogM30`. Client tidak perlu (dan tidak
+boleh) membaca isinya, cukup kirim balik cursor `next` untuk halaman
+berikutnya. Cursor juga menyimpan nama & arah sort: cursor dari urutan lain
+(misal ?sort=price lalu ganti ke ?sort=name) ditolak dengan InvalidCursor,
+bukan diam-diam melompati / mengulang device.
+
+Kolom sort yang boleh NULL (misal price_idr) diproses 2 tahap: baris dengan
+nilai terisi dulu, baru baris NULL (diurutkan id). Dengan begitu filter tetap
+memakai index dan urutan NULL sama di MySQL maupun SQLite.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from .. import models
+
+# Batas limit per halaman (mencegah limit=100000)
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Cursor rusak / bukan hasil encode_cursor()."""
+
+
+# ==================== CURSOR ====================
+
+def sort_signature(sort_column: Any = None, descending: bool = False) -> str:
+    """Nama + arah sort yang disimpan di cursor, misal "price_idr:desc" atau "bm25:asc"."""
+    if sort_column is None:
+        name = "id"
+    else:
+        name = getattr(sort_column, "key", None) or getattr(sort_column, "name", None) or type(sort_column).__name__
+    return f"{name}:{'desc' if descending else 'asc'}"
+
+
+def encode_cursor(position: dict, sort: Optional[str] = None) -> str:
+    """
+    Encode posisi halaman jadi string opaque (base64url tanpa padding).
+
+    Args:
+        position: Posisi baris terakhir ({"k", "id"} atau {"id", "null"})
+        sort: Signature sort (sort_signature), dicek lagi saat decode
+    """
+    if sort is not None:
+        position = dict(position, s=sort)
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str] = None, key_columns: Optional[int] = None) -> dict:
+    """
+    Decode cursor dari client.
+
+    Args:
+        cursor: Cursor dari encode_cursor()
+        sort: Signature sort request ini; None = tidak dicek
+        key_columns: Jumlah kolom sort selain id (0 atau 1); None = tidak dicek
+
+    Returns:
+        Posisi halaman (tanpa signature sort)
+
+    Raises:
+        InvalidCursor: Jika cursor tidak valid, nilai "k" tidak sesuai
+            jumlah kolom sort, atau cursor dibuat untuk sort lain
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Cursor tidak valid: {e}") from e
+    if not isinstance(position, dict) or not isinstance(position.get("id"), int):
+        raise InvalidCursor("Cursor tidak valid")
+    cursor_sort = position.pop("s", None)
+    if sort is not None and cursor_sort != sort:
+        raise InvalidCursor(f"Cursor dibuat untuk urutan {cursor_sort}, bukan {sort}")
+    if key_columns is not None:
+        _check_key(position, key_columns)
+    return position
+
+
+def _check_key(position: dict, key_columns: int) -> None:
+    """Posisi harus punya 1 nilai sort ("k") per kolom sort, kecuali di tahap NULL."""
+    null_phase = position.get("null", False)
+    if not isinstance(null_phase, bool):
+        raise InvalidCursor("Cursor tidak valid")
+    if key_columns and not null_phase:
+        key = position.get("k")
+        if not isinstance(key, (int, float, str)) or isinstance(key, bool):
+            raise InvalidCursor("Cursor tidak valid: butuh 1 nilai sort (k)")
+    elif "k" in position:
+        raise InvalidCursor("Cursor tidak valid: urutan ini tanpa nilai sort (k)")
+
+
+# ==================== PAGINATION ====================
+
+def paginate(
+    query: Query,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    sort_column: Any = None,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Ambil 1 halaman hasil query dengan keyset pagination.
+
+    Args:
+        query: Query phones (urutan yang sudah ada akan diganti)
+        cursor: Cursor `next` dari halaman sebelumnya (None = halaman pertama)
+        limit: Jumlah item per halaman (maksimal MAX_PAGE_SIZE)
+        sort_column: Kolom/ekspresi sort utama (None = urut id saja)
+        descending: True untuk urutan besar -> kecil
+
+    Returns:
+        Tuple (items, next_cursor). next_cursor None jika sudah halaman terakhir.
+
+    Raises:
+        InvalidCursor: Jika cursor tidak valid
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sort = sort_signature(sort_column, descending)
+    position = decode_cursor(cursor, sort, key_columns=0 if sort_column is None else 1) if cursor else None
+    id_column = models.Phone.id
+    query = query.order_by(None)
+
+    # Tanpa kolom sort: cukup keyset di id
+    if sort_column is None:
+        if position:
+            query = query.filter(id_column < position["id"] if descending else id_column > position["id"])
+        order = id_column.desc() if descending else id_column.asc()
+        items = query.order_by(order).limit(limit + 1).all()
+        return _page(items, limit, sort, lambda item: {"id": item.id})
+
+    nullable = getattr(getattr(sort_column, "expression", sort_column), "nullable", False)
+    in_null_phase = bool(position and position.get("null"))
+
+    # Tahap 1: baris dengan sort_key terisi
+    rows = []
+    if not in_null_phase:
+        keyed = query.add_columns(sort_column)
+        if nullable:
+            keyed = keyed.filter(sort_column.isnot(None))
+        if position:
+            after_key, after_id = position.get("k"), position["id"]
+            if descending:
+                keyed = keyed.filter(or_(
+                    sort_column < after_key,
+                    and_(sort_column == after_key, id_column < after_id)
+                ))
+            else:
+                keyed = keyed.filter(or_(
+                    sort_column > after_key,
+                    and_(sort_column == after_key, id_column > after_id)
+                ))
+        order = [sort_column.desc(), id_column.desc()] if descending else [sort_column.asc(), id_column.asc()]
+        rows = [(item, key, False) for item, key in keyed.order_by(*order).limit(limit + 1).all()]
+
+    # Tahap 2: baris dengan sort_key NULL (selalu di akhir, urut id)
+    if nullable and len(rows) <= limit:
+        null_query = query.filter(sort_column.is_(None))
+        if in_null_phase:
+            null_query = null_query.filter(id_column > position["id"])
+        remaining = limit + 1 - len(rows)
+        rows += [
+            (item, None, True)
+            for item in null_query.order_by(id_column.asc()).limit(remaining).all()
+        ]
+
+    page, next_cursor = _page(rows, limit, sort, lambda row: (
+        {"id": row[0].id, "null": True} if row[2] else {"k": row[1], "id": row[0].id}
+    ))
+    return [row[0] for row in page], next_cursor
+
+
+def _page(rows: List[Any], limit: int, sort: str, position_of) -> Tuple[List[Any], Optional[str]]:
+    """Potong hasil limit+1 jadi 1 halaman + cursor halaman berikutnya."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(position_of(page[-1]), sort)
@@ -0,0 +1,253 @@
+"""
+Full-text search untuk tabel phones.
+
+Search lama memakai `name ILIKE '%q%' OR brand ILIKE '%q%'`. Wildcard di
+depan membuat index di phones.name/phones.brand tidak bisa dipakai, jadi
+setiap search = full table scan. Modul ini memakai full-text index:
+
+- MySQL  : FULLTEXT INDEX (name, brand) + MATCH ... AGAINST (BOOLEAN MODE)
+- SQLite : virtual table FTS5 `phones_fts` + trigger sinkronisasi + bm25()
+- Lainnya: fallback ke ILIKE (perilaku lama)
+
+Hasil diurutkan berdasarkan relevansi (skor tertinggi dulu).
+"""
+
+import logging
+import re
+from typing import List
+
+from sqlalchemy import inspect, literal_column, func, or_, text
+from sqlalchemy.sql import table, column
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+# Nama index/tabel full-text
+MYSQL_FULLTEXT_INDEX = "ft_phones_name_brand"
+SQLITE_FTS_TABLE = "phones_fts"
+
+# InnoDB default innodb_ft_min_token_size = 3; token lebih pendek tidak ter-index
+MYSQL_MIN_TOKEN_SIZE = 3
+
+# Bobot bm25 per kolom FTS5 (name lebih penting dari brand)
+SQLITE_BM25_WEIGHTS = (2.0, 1.0)
+
+# Representasi ringan virtual table FTS5 untuk JOIN (bukan ORM model)
+_fts_table = table(SQLITE_FTS_TABLE, column("rowid"))
+
+# Dialect yang full-text index-nya sudah siap (diisi oleh ensure_fulltext_index)
+_fulltext_dialects = set()
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# ==================== SETUP INDEX ====================
+
+def ensure_fulltext_index(engine: Engine) -> bool:
+    """
+    Buat full-text index jika belum ada. Aman dipanggil berkali-kali.
+
+    Dipanggil sekali saat aplikasi start (main.py), setelah create_all().
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        True jika full-text search aktif, False jika fallback ke ILIKE
+    """
+    dialect = engine.dialect.name
+    try:
+        if dialect == "mysql":
+            _ensure_mysql_fulltext(engine)
+        elif dialect == "sqlite":
+            _ensure_sqlite_fts(engine)
+        else:
+            logger.info(f"Full-text search tidak didukung untuk {dialect}, pakai ILIKE")
+            return False
+    except Exception as e:
+        logger.warning(f"Gagal membuat full-text index ({dialect}), pakai ILIKE: {e}")
+        return False
+
+    _fulltext_dialects.add(dialect)
+    return True
+
+
+def _ensure_mysql_fulltext(engine: Engine) -> None:
+    """Tambahkan FULLTEXT INDEX (name, brand) di tabel phones."""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SHOW INDEX FROM phones WHERE Key_name = :name"),
+            {"name": MYSQL_FULLTEXT_INDEX}
+        ).first()
+        if not exists:
+            conn.execute(text(
+                f"ALTER TABLE phones ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (name, brand)"
+            ))
+            logger.info("FULLTEXT index phones(name, brand) dibuat")
+
+
+def _ensure_sqlite_fts(engine: Engine) -> None:
+    """
+    Buat virtual table FTS5 (external content = phones) + trigger
+    supaya index selalu sinkron saat phone di-insert/update/delete.
+    """
+    if inspect(engine).has_table(SQLITE_FTS_TABLE):
+        return
+
+    statements = [
+        f"""CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5(
+            name, brand,
+            content='phones', content_rowid='id',
+            tokenize='unicode61', prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON phones BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, brand)
+            VALUES (new.id, new.name, new.brand);
+        END""",
+        f"""CREATE TRIGGER {SQLITE_FTS_TABLE}_ad AFTER DELETE ON phones BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, name, brand)
+            VALUES ('delete', old.id, old.name, old.brand);
+        END""",
+        f"""CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE OF name, brand ON phones BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, name, brand)
+            VALUES ('delete', old.id, old.name, old.brand);
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, brand)
+            VALUES (new.id, new.name, new.brand);
+        END""",
+        # Isi index dari data yang sudah ada
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+    ]
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    logger.info("FTS5 table phones_fts dibuat")
+
+
+# ==================== SEARCH ====================
+
+def tokenize(query: str) -> List[str]:
+    """
+    Pecah query jadi token alfanumerik lowercase.
+    Karakter operator (", *, +, -) dibuang supaya aman dipakai di MATCH.
+    """
+    return _TOKEN_PATTERN.findall(query.lower()) if query else []
+
+
+def search_devices(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 100
+) -> List[models.Phone]:
+    """
+    Cari phone berdasarkan nama/brand, diurutkan berdasarkan relevansi.
+
+    Semua token harus muncul (AND), dan setiap token dicocokkan sebagai
+    prefix, jadi "sams gal" tetap menemukan "Samsung Galaxy S24".
+
+    Args:
+        db: Database session
+        query: Keyword dari user
+        skip: Pagination offset
+        limit: Maksimal hasil
+
+    Returns:
+        List of Phone objects, paling relevan dulu
+    """
+    search_query = build_search_query(db, query)
+    if search_query is None:
+        return []
+
+    return search_query.offset(skip).limit(limit).all()
+
+
+def build_search_query(db: Session, query: str):
+    """
+    Query full-text (belum dieksekusi) yang masih bisa ditambah filter lain,
+    misal filter brand/RAM/harga dari crud.device.get_devices_filtered().
+
+    Returns:
+        SQLAlchemy Query terurut relevansi, atau None jika query tidak punya token
+    """
+    ranked = build_ranked_search_query(db, query)
+    if ranked is None:
+        return None
+
+    search_query, rank, descending = ranked
+    if rank is None:
+        return search_query.order_by(models.Phone.id)
+    return search_query.order_by(rank.desc() if descending else rank, models.Phone.id)
+
+
+def build_ranked_search_query(db: Session, query: str):
+    """
+    Seperti build_search_query(), tapi urutan diserahkan ke pemanggil.
+    Dipakai keyset pagination (crud/pagination.py) yang butuh ekspresi skor
+    relevansi sebagai sort key.
+
+    Returns:
+        Tuple (query, rank, descending) atau None jika query tidak punya token.
+        rank None berarti tidak ada skor relevansi (urut id saja).
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+
+    dialect = db.get_bind().dialect.name
+    if dialect in _fulltext_dialects:
+        if dialect == "mysql":
+            return _mysql_search_query(db, tokens)
+        return _sqlite_search_query(db, tokens)
+    return _ilike_search_query(db, query), None, False
+
+
+def _mysql_search_query(db: Session, tokens: List[str]):
+    """MATCH(name, brand) AGAINST ('+tok1* +tok2*' IN BOOLEAN MODE), skor besar dulu."""
+    indexed = [t for t in tokens if len(t) >= MYSQL_MIN_TOKEN_SIZE]
+    short = [t for t in tokens if len(t) < MYSQL_MIN_TOKEN_SIZE]
+
+    query = db.query(models.Phone)
+
+    # Token pendek (misal "s2", "a5") tidak ada di FULLTEXT index,
+    # jadi dicocokkan dengan ILIKE setelah full-text mempersempit hasil
+    for token in short:
+        pattern = f"%{token}%"
+        query = query.filter(
+            or_(models.Phone.name.ilike(pattern), models.Phone.brand.ilike(pattern))
+        )
+
+    if not indexed:
+        return query, None, False
+
+    score = mysql_match(
+        models.Phone.name, models.Phone.brand,
+        against=" ".join(f"+{t}*" for t in indexed)
+    ).in_boolean_mode()
+
+    return query.filter(score), score, True
+
+
+def _sqlite_search_query(db: Session, tokens: List[str]):
+    """phones_fts MATCH '"tok1"* "tok2"*', skor bm25 (makin kecil makin relevan)."""
+    fts = literal_column(SQLITE_FTS_TABLE)
+    rank = func.bm25(fts, *SQLITE_BM25_WEIGHTS)
+    match_expr = " ".join(f'"{t}"*' for t in tokens)
+
+    query = (
+        db.query(models.Phone)
+        .join(_fts_table, _fts_table.c.rowid == models.Phone.id)
+        .filter(fts.op("MATCH")(match_expr))
+    )
+    return query, rank, False
+
+
+def _ilike_search_query(db: Session, query: str):
+    """Fallback lama: name ILIKE '%q%' OR brand ILIKE '%q%'."""
+    pattern = f"%{query}%"
+    return db.query(models.Phone).filter(
+        models.Phone.name.ilike(pattern) | models.Phone.brand.ilike(pattern)
+    )
@@ -4,6 +4,13 @@ from starlette.middleware.sessions import SessionMiddleware
 from .routers import devices, compare, categories, recommendation, frontend, admin
 from .database import engine
 from .models import Base  # Import Base dari models package baru
+from .crud import search as search_crud
+from .database import SessionLocal
+from .services import prefix_index, fuzzy_index, facet_index, similar_index, pareto_index
+from .services import ai_precompute
+from .services.ai_client import ai_client
+from .core.config import AUTO_MIGRATE
+from . import migrations
 import os
 from dotenv import load_dotenv
 
@@ -13,6 +20,13 @@ load_dotenv()
 # Membuat tabel database otomatis
 Base.metadata.create_all(bind=engine)
 
+# Kolom/index baru untuk tabel yang sudah ada (create_all tidak menambahkannya)
+if AUTO_MIGRATE:
+    migrations.upgrade(engine)
+
+# Membuat full-text index untuk search (MySQL FULLTEXT / SQLite FTS5)
+search_crud.ensure_fulltext_index(engine)
+
 app = FastAPI(
     title="COMPARELY",
     description="Aplikasi Perbandingan Perangkat",
@@ -54,8 +68,33 @@ async def startup_event():
     else:
         print("⚠️  WARNING: DATABASE_URL tidak ditemukan di .env")
     
+    # Bangun index in-memory (autocomplete + fuzzy + facet filter + device mirip + best value)
+    db = SessionLocal()
+    try:
+        prefix_index.ensure_built(db)
+        fuzzy_index.ensure_built(db)
+        facet_index.ensure_built(db)
+        similar_index.ensure_built(db)
+        pareto_index.ensure_built(db)
+        print(f"✅ Index search siap ({len(prefix_index.device_prefix_index.docs)} devices)")
+    except Exception as e:
+        print(f"⚠️  WARNING: Gagal membangun index search: {e}")
+    finally:
+        db.close()
+    
+    # Job background: analisis AI untuk pasangan / rekomendasi populer
+    ai_precompute.start()
+    
     print("="*60 + "\n")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Hentikan job precompute dan tutup connection pool AI saat aplikasi berhenti."""
+    await ai_precompute.stop()
+    await ai_client.aclose()
+
+
 # Favicon route
 from fastapi.responses import FileResponse
 
@@ -0,0 +1,142 @@
+"""
+Migrations - Versioned schema migration untuk database COMPARELY
+
+Base.metadata.create_all() hanya membuat tabel yang BELUM ada. Kolom atau
+index baru di tabel yang sudah ada (misal kolom ram_gb, composite index)
+tidak pernah ikut dibuat. Modul ini menjalankan file migration berurutan
+dan mencatat versi yang sudah dijalankan di tabel `schema_migrations`.
+
+Struktur:
+    app/migrations/
+    ├── __init__.py                      # Runner (file ini)
+    ├── ops.py                           # Helper DDL idempotent
+    ├── m0001_numeric_spec_columns.py
+    └── m0002_composite_indexes.py
+
+Setiap file migration berisi:
+    VERSION = 2                      # Nomor urut, unik
+    DESCRIPTION = "..."              # Keterangan singkat
+    def upgrade(conn): ...           # DDL, dijalankan dalam 1 transaksi
+
+Migration harus idempotent (cek dulu sebelum ALTER/CREATE), karena database
+baru sudah mendapat kolom/index lewat create_all() dan MySQL meng-commit DDL
+secara otomatis.
+
+Cara Pakai:
+    python scripts/migrate.py            # jalankan migration yang belum
+    python scripts/migrate.py --status   # lihat versi yang sudah/belum
+
+Author: Kelompok COMPARELY
+"""
+
+import importlib
+import logging
+import pkgutil
+import re
+from datetime import datetime
+from types import ModuleType
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+_MODULE_PATTERN = re.compile(r"^m\d{4}_\w+$")
+
+# Tabel pencatat versi (sengaja tidak memakai Base, supaya tidak ikut model)
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# ==================== DISCOVERY ====================
+
+def discover() -> List[ModuleType]:
+    """Semua modul migration di package ini, urut berdasarkan VERSION."""
+    modules = [
+        importlib.import_module(f"{__name__}.{info.name}")
+        for info in pkgutil.iter_modules(__path__)
+        if _MODULE_PATTERN.match(info.name)
+    ]
+    modules.sort(key=lambda module: module.VERSION)
+
+    versions = [module.VERSION for module in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"VERSION migration duplikat: {versions}")
+    return modules
+
+
+# ==================== STATUS ====================
+
+def applied_versions(engine: Engine) -> Dict[int, datetime]:
+    """Versi yang sudah dijalankan -> waktu dijalankan."""
+    _metadata.create_all(engine, tables=[schema_migrations])
+    with engine.connect() as conn:
+        rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+        return {version: applied_at for version, applied_at in rows}
+
+
+def status(engine: Engine) -> List[Dict]:
+    """
+    Status semua migration.
+
+    Returns:
+        List of dict {"version", "description", "applied_at"} (applied_at None = belum)
+    """
+    applied = applied_versions(engine)
+    return [
+        {
+            "version": module.VERSION,
+            "description": module.DESCRIPTION,
+            "applied_at": applied.get(module.VERSION),
+        }
+        for module in discover()
+    ]
+
+
+# ==================== UPGRADE ====================
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    Jalankan semua migration yang belum dijalankan (sampai versi target).
+
+    Args:
+        engine: SQLAlchemy engine
+        target: Versi terakhir yang dijalankan (None = semua)
+
+    Returns:
+        List versi yang baru saja dijalankan
+    """
+    applied = applied_versions(engine)
+    done = []
+
+    for module in discover():
+        if module.VERSION in applied:
+            continue
+        if target is not None and module.VERSION > target:
+            break
+
+        try:
+            with engine.begin() as conn:
+                module.upgrade(conn)
+                conn.execute(schema_migrations.insert().values(
+                    version=module.VERSION,
+                    description=module.DESCRIPTION,
+                    applied_at=datetime.utcnow(),
+                ))
+        except IntegrityError:
+            # Worker lain menjalankan migration yang sama lebih dulu
+            logger.info(f"Migration {module.VERSION} sudah dijalankan proses lain")
+            continue
+
+        logger.info(f"Migration {module.VERSION:04d} ({module.DESCRIPTION}) selesai")
+        done.append(module.VERSION)
+
+    return done
@@ -0,0 +1,72 @@
+"""
+Kolom spesifikasi numerik di tabel phones (hasil utils/spec_parser.py).
+Sebelumnya ditambahkan oleh scripts/backfill_specs.py.
+
+Kolom baru langsung diisi dari kolom teksnya (ram, storage, camera, battery,
+screen, price), supaya filter, sort dan perbandingan tidak melihat NULL di
+database lama sampai backfill dijalankan manual.
+"""
+
+from sqlalchemy import BigInteger, Column, Float, Integer, MetaData, Table, bindparam, select
+
+from ..utils.spec_parser import NORMALIZED_FIELDS, normalize_specs
+from .ops import add_column, create_index
+
+VERSION = 1
+DESCRIPTION = "Kolom numerik ram_gb, storage_gb, main_camera_mp, battery_mah, screen_inch, price_idr"
+
+# (kolom, ter-index?)
+COLUMNS = [
+    (Column("ram_gb", Integer), True),
+    (Column("storage_gb", Integer), True),
+    (Column("main_camera_mp", Integer), True),
+    (Column("battery_mah", Integer), True),
+    (Column("screen_inch", Float), False),
+    (Column("price_idr", BigInteger), True),
+]
+
+BATCH_SIZE = 500
+
+
+def upgrade(conn):
+    for column, indexed in COLUMNS:
+        add_column(conn, "phones", column)
+        if indexed:
+            create_index(conn, f"ix_phones_{column.name}", "phones", [column.name])
+    backfill(conn)
+
+
+def backfill(conn) -> int:
+    """
+    Isi kolom numerik semua phone secara batch (keyset per id).
+
+    Returns:
+        Jumlah phone yang diproses
+    """
+    phones = Table("phones", MetaData(), autoload_with=conn)
+    # Database yang sangat lama bisa belum punya sebagian kolom teks
+    sources = [source for source, _ in NORMALIZED_FIELDS.values() if source in phones.c]
+    statement = (
+        phones.update()
+        .where(phones.c.id == bindparam("phone_id"))
+        .values({name: bindparam(f"new_{name}") for name in NORMALIZED_FIELDS})
+    )
+
+    processed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(phones.c.id, *(phones.c[source] for source in sources))
+            .where(phones.c.id > last_id)
+            .order_by(phones.c.id)
+            .limit(BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            return processed
+
+        conn.execute(statement, [
+            {"phone_id": row["id"], **{f"new_{name}": value for name, value in normalize_specs(row).items()}}
+            for row in rows
+        ])
+        processed += len(rows)
+        last_id = rows[-1]["id"]
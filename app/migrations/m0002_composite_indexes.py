@@ -0,0 +1,31 @@
+"""
+Composite index untuk kombinasi filter + sort yang paling sering dipakai.
+
+- category_id + release_year DESC + price_idr : rekomendasi per kategori
+  (ORDER BY release_year DESC, price ASC) dan filter kategori + harga
+- release_year DESC + price_idr              : rekomendasi tanpa kategori,
+  filter tahun dari query parser
+- category_id + price_idr                    : /devices?category=..&max_price=..
+- brand + price_idr                          : "samsung di bawah 5 juta"
+- ram_gb + storage_gb                        : "8/256", filter RAM + storage
+
+Cek pemakaian index: python scripts/check_indexes.py
+"""
+
+from .ops import create_index
+
+VERSION = 2
+DESCRIPTION = "Composite index untuk filter kategori/brand/harga/tahun/RAM"
+
+INDEXES = [
+    ("ix_phones_category_year_price", ["category_id", ("release_year", "desc"), "price_idr"]),
+    ("ix_phones_year_price", [("release_year", "desc"), "price_idr"]),
+    ("ix_phones_category_price", ["category_id", "price_idr"]),
+    ("ix_phones_brand_price", ["brand", "price_idr"]),
+    ("ix_phones_ram_storage", ["ram_gb", "storage_gb"]),
+]
+
+
+def upgrade(conn):
+    for name, columns in INDEXES:
+        create_index(conn, name, "phones", columns)
@@ -0,0 +1,15 @@
+"""
+Kolom version di tabel phones: naik 1 setiap kali phone di-update.
+Dipakai sebagai bagian key cache perbandingan (services/comparison_cache.py).
+"""
+
+from sqlalchemy import Column, Integer
+
+from .ops import add_column
+
+VERSION = 3
+DESCRIPTION = "Kolom version (penanda perubahan) di tabel phones"
+
+
+def upgrade(conn):
+    add_column(conn, "phones", Column("version", Integer, nullable=False, server_default="1"))
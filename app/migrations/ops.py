@@ -0,0 +1,59 @@
+"""
+Helper DDL idempotent untuk file migration.
+Semua fungsi aman dipanggil berkali-kali (cek dulu sebelum ALTER/CREATE).
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect, text
+from sqlalchemy.engine import Connection
+
+
+def add_column(conn: Connection, table_name: str, column: Column) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN jika kolom belum ada.
+
+    Returns:
+        True jika kolom baru ditambahkan
+    """
+    existing = {col["name"] for col in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return False
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column.type.compile(dialect=conn.dialect)}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    conn.execute(text(ddl))
+    return True
+
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table_name: str,
+    columns: Sequence[Union[str, tuple]]
+) -> bool:
+    """
+    CREATE INDEX jika index dengan nama tersebut belum ada.
+
+    Args:
+        columns: Nama kolom, atau (nama, "desc") untuk urutan menurun
+
+    Returns:
+        True jika index baru dibuat
+    """
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    if name in existing:
+        return False
+
+    table = Table(table_name, MetaData(), autoload_with=conn)
+    expressions = []
+    for column in columns:
+        if isinstance(column, tuple):
+            column_name, direction = column
+            expressions.append(table.c[column_name].desc() if direction == "desc" else table.c[column_name])
+        else:
+            expressions.append(table.c[column])
+    Index(name, *expressions).create(conn)
+    return True
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DECIMAL
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, Float, String, ForeignKey, Text, DECIMAL, Index, event
+from sqlalchemy.orm import object_session, relationship
 from ..database import Base
+from ..utils.spec_parser import apply_normalized_specs
 
 class Phone(Base):
     """
@@ -35,6 +36,45 @@ class Phone(Base):
     description = Column(Text)              # Deskripsi lengkap
     source_data = Column(String(500))       # URL sumber data (GSMArena, dll)
     
+    # Spesifikasi Numerik (hasil parsing dari kolom teks di atas)
+    # Diisi otomatis oleh utils/spec_parser.py, dipakai untuk filter/sort/compare
+    ram_gb = Column(Integer, index=True)            # misal: 8
+    storage_gb = Column(Integer, index=True)        # misal: 256 (1TB = 1024)
+    main_camera_mp = Column(Integer, index=True)    # misal: 50
+    battery_mah = Column(Integer, index=True)       # misal: 5000
+    screen_inch = Column(Float)                     # misal: 6.2
+    price_idr = Column(BigInteger, index=True)      # misal: 12999000
+
+    # Naik 1 setiap kali phone di-update (key cache perbandingan)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     # Relationships
     # Relasi ke Category (many-to-one: banyak phone, 1 category)
     category = relationship("Category", back_populates="phones")
+
+
+# Composite index untuk kombinasi filter + sort yang sering dipakai.
+# Database lama mendapatkannya lewat app/migrations/m0002_composite_indexes.py
+# (nama harus sama).
+Index("ix_phones_category_year_price", Phone.category_id, Phone.release_year.desc(), Phone.price_idr)
+Index("ix_phones_year_price", Phone.release_year.desc(), Phone.price_idr)
+Index("ix_phones_category_price", Phone.category_id, Phone.price_idr)
+Index("ix_phones_brand_price", Phone.brand, Phone.price_idr)
+Index("ix_phones_ram_storage", Phone.ram_gb, Phone.storage_gb)
+
+
+# Event listener: hitung ulang kolom numerik setiap kali phone disimpan.
+# Berlaku untuk semua jalur tulis (API, admin form, import CSV/JSON, bulk edit).
+@event.listens_for(Phone, "before_insert")
+@event.listens_for(Phone, "before_update")
+def _normalize_phone_specs(mapper, connection, target):
+    apply_normalized_specs(target)
+
+
+# Event listener: naikkan version setiap kali ada kolom yang benar-benar berubah.
+# Bulk query (query.update()) tidak lewat sini, jadi harus ikut menaikkan version.
+@event.listens_for(Phone, "before_update")
+def _bump_phone_version(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and session.is_modified(target, include_collections=False):
+        target.version = (target.version or 0) + 1
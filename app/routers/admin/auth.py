@@ -11,6 +11,7 @@ from app.core.deps import get_db
 from app.models import User
 import bcrypt
 from datetime import datetime
+from typing import Optional
 
 # Setup templates
 templates = Jinja2Templates(directory="app/templates")
@@ -65,6 +66,24 @@ def get_current_user(request: Request, db: Session) -> User:
     return mock_user
 
 
+def get_session_user(request: Request, db: Session) -> Optional[User]:
+    """
+    Get the logged-in, active user from session.
+    Unlike get_current_user there is no mock user: returns None if not logged in.
+    Use this to guard actions that must not be reachable anonymously.
+    """
+    user_id = request.session.get("user_id") if hasattr(request, "session") else None
+    if not user_id:
+        return None
+    user = db.query(User).filter(User.id == user_id).first()
+    return user if user and user.is_active else None
+
+
+def login_redirect() -> RedirectResponse:
+    """Redirect to the login page (for handlers guarded by get_session_user)"""
+    return RedirectResponse(url="/admin/login?error=Please log in first", status_code=303)
+
+
 @router.get("/login", response_class=HTMLResponse)
 async def admin_login_page(request: Request):
     """Display login page"""
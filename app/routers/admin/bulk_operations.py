@@ -11,6 +11,7 @@ from app.core.deps import get_db
 from app.models import Phone, Category
 from .auth import get_current_user
 from app.core.rbac_context import add_rbac_to_context
+from app.services import catalog_events
 
 import logging
 
@@ -56,11 +57,14 @@ async def bulk_update_category(
         updated_count = db.query(Phone).filter(
             Phone.id.in_(ids)
         ).update(
-            {"category_id": new_category_id},
+            {"category_id": new_category_id, "version": Phone.version + 1},
             synchronize_session=False
         )
         db.commit()
         
+        # Bulk update tidak lewat ORM events, jadi kabari index in-memory manual
+        catalog_events.publish_changed(db, ids)
+        
         logger.info(f"Bulk updated category for {updated_count} devices")
         
         return RedirectResponse(
@@ -12,8 +12,10 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, or_
 from app.core.deps import get_db
 from app.models import Phone, Category
+from app.crud import pagination
 from .auth import get_current_user
 from app.core.rbac_context import add_rbac_to_context
+from app.services import catalog_events
 import csv
 import io
 import logging
@@ -29,7 +31,7 @@ router = APIRouter(tags=["admin-devices"])
 @router.get("/devices", response_class=HTMLResponse)
 async def admin_devices(
     request: Request,
-    page: int = 1,
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     category_id: Optional[str] = None,
     brand: Optional[str] = None,
@@ -73,19 +75,30 @@ async def admin_devices(
         )
     
     # Sorting
-    valid_sorts = ["id", "name", "brand", "price", "release_year"]
-    if sort in valid_sorts:
-        order_column = getattr(Phone, sort)
-        if order == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    # Harga di-sort lewat kolom numerik price_idr (ter-index)
+    valid_sorts = {
+        "id": None,  # Keyset cukup di id
+        "name": Phone.name,
+        "brand": Phone.brand,
+        "price": Phone.price_idr,
+        "release_year": Phone.release_year,
+    }
+    if sort not in valid_sorts:
+        sort = "id"
     
-    # Pagination
-    total_items = query.count()
-    total_pages = (total_items + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
-    offset = (page - 1) * ITEMS_PER_PAGE
-    devices = query.offset(offset).limit(ITEMS_PER_PAGE).all()
+    # Keyset (cursor) pagination: tidak ada OFFSET dan tidak ada COUNT(*)
+    # per page view, jadi halaman dalam tetap secepat halaman pertama
+    try:
+        devices, next_cursor = pagination.paginate(
+            query, cursor=cursor, limit=ITEMS_PER_PAGE,
+            sort_column=valid_sorts[sort], descending=(order == "desc")
+        )
+    except pagination.InvalidCursor:
+        cursor = None
+        devices, next_cursor = pagination.paginate(
+            query, limit=ITEMS_PER_PAGE,
+            sort_column=valid_sorts[sort], descending=(order == "desc")
+        )
     
     # Get categories for filter
     categories = db.query(Category).all()
@@ -111,9 +124,8 @@ async def admin_devices(
             "categories": categories,
             "brands": brands,
             "years": years,
-            "page": page,
-            "total_pages": total_pages,
-            "total_items": total_items,
+            "next_url": str(request.url.include_query_params(cursor=next_cursor)) if next_cursor else None,
+            "first_url": str(request.url.remove_query_params("cursor")) if cursor else None,
             "search": search,
             "category_id": category_id,
             "brand": brand,
@@ -339,6 +351,9 @@ async def admin_devices_bulk_delete(
         ).delete(synchronize_session=False)
         db.commit()
         
+        # Bulk delete tidak lewat ORM events, jadi kabari index in-memory manual
+        catalog_events.publish_deleted(ids)
+        
         logger.info(f"Bulk deleted {deleted_count} devices")
         return RedirectResponse(
             url=f"/admin/devices?message=Deleted {deleted_count} devices successfully",
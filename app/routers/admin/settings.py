@@ -10,8 +10,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.core.deps import get_db
 from app.models import Phone, Category, AppSettings
-from .auth import get_current_user
+from .auth import get_current_user, get_session_user, login_redirect
 from app.core.rbac_context import add_rbac_to_context
+from app.services import catalog_events, ai as ai_service
+from app.services.ai_providers import provider_pool
 
 import logging
 import os
@@ -92,11 +94,44 @@ async def admin_settings(request: Request, db: Session = Depends(get_db)):
             "ai_api_key_masked": "••••••••••••" if ai_api_key else "",
             "items_per_page": items_per_page,
             "date_format": date_format,
-            "last_backup": last_backup
+            "last_backup": last_backup,
+            "ai_providers": provider_pool.stats()["providers"]
         }
     )
 
 
+@router.post("/settings/test-ai")
+async def test_ai_settings(request: Request, db: Session = Depends(get_db)):
+    """Test koneksi ke AI API (tidak melewati circuit breaker). Hanya untuk user yang login."""
+    if get_session_user(request, db) is None:
+        return login_redirect()
+    if await ai_service.test_ai_connection():
+        return RedirectResponse(
+            url="/admin/settings?message=AI connection OK",
+            status_code=303
+        )
+    return RedirectResponse(
+        url="/admin/settings?error=AI connection failed, check API key and network",
+        status_code=303
+    )
+
+
+@router.post("/settings/reset-ai-circuit")
+async def reset_ai_circuit(request: Request, db: Session = Depends(get_db)):
+    """
+    Tutup circuit breaker semua provider AI secara manual (misal setelah
+    provider pulih). Hanya untuk user yang login.
+    """
+    if get_session_user(request, db) is None:
+        return login_redirect()
+    provider_pool.reset_breakers()
+    logger.info("AI circuit breakers reset")
+    return RedirectResponse(
+        url="/admin/settings?message=AI circuit breaker reset",
+        status_code=303
+    )
+
+
 @router.post("/settings/update-api")
 async def update_api_settings(
     request: Request,
@@ -229,8 +264,10 @@ async def reset_database(request: Request, db: Session = Depends(get_db)):
     """Reset database (delete all devices)"""
     try:
         # Delete all devices
+        deleted_ids = [row[0] for row in db.query(Phone.id).all()]
         deleted_count = db.query(Phone).delete()
         db.commit()
+        catalog_events.publish_deleted(deleted_ids)
         
         logger.warning(f"Database reset: {deleted_count} devices deleted")
         
@@ -1,7 +1,16 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from ..core.deps import get_db  # Import get_db dari core.deps (centralized)
-from ..services import comparison_service, ai as ai_service
+from ..database import SessionLocal
+from ..services import comparison_service, comparison_cache, ai_precompute, ai as ai_service
+from ..services.ai_client import ai_client
+from ..services.ai_response_cache import ai_response_cache
+from ..services.ai_providers import provider_pool
 from .. import schemas
 
 router = APIRouter(
@@ -30,11 +39,37 @@ def compare_devices(id1: int, id2: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/multi")
+def compare_multiple_devices(
+    ids: str = Query(..., description="ID device dipisah koma (2-10 device), misal 1,2,3"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint untuk membandingkan 2 sampai 10 device sekaligus.
+    
+    Query Parameters:
+        ids: ID device dipisah koma, misal /compare/multi?ids=1,2,3
+    
+    Returns:
+        Dictionary berisi devices, specs (values, ranks, deltas, winners
+        per spesifikasi) dan wins (jumlah spesifikasi yang dimenangkan)
+    """
+    try:
+        device_ids = comparison_service.parse_device_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        return comparison_service.compare_many_devices(db, device_ids)
+    except ValueError as e:
+        # Jika ada device yang tidak ditemukan
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/ai")
-def compare_devices_with_ai(
+async def compare_devices_with_ai(
     id1: int = Query(..., description="ID device pertama"),
-    id2: int = Query(..., description="ID device kedua"),
-    db: Session = Depends(get_db)
+    id2: int = Query(..., description="ID device kedua")
 ):
     """
     Endpoint untuk membandingkan 2 device dengan analisis AI dari Grok AI.
@@ -56,14 +91,16 @@ def compare_devices_with_ai(
         - ai_analysis: Analisis lengkap dari Grok AI
     """
     try:
-        # 1. Dapatkan perbandingan dasar (rule-based)
-        result = comparison_service.compare_two_devices(db, id1, id2)
+        # 1. Dapatkan perbandingan dasar (rule-based) + analisis AI dari cache
+        result, cache_key, ai_analysis, pair = await run_in_threadpool(_load_for_ai, id1, id2)
+        ai_precompute.popularity.record(ai_precompute.comparison_key(id1, id2))
         
-        # 2. Dapatkan analisis AI dari Grok AI
-        ai_analysis = ai_service.get_comparison_analysis(
-            result["device_1"],
-            result["device_2"]
-        )
+        # 2. Cache miss: minta analisis AI (di-cache per pasangan + version).
+        #    Panggilan AI di-await, jadi request lain tetap dilayani
+        if ai_analysis is None:
+            ai_analysis = await ai_service.get_comparison_analysis(*pair)
+            if ai_service.is_structured_analysis(ai_analysis):  # pesan error tidak di-cache
+                comparison_cache.comparison_cache.put(cache_key, ai_analysis)
         
         # 3. Tambahkan AI analysis ke result
         result["ai_analysis"] = ai_analysis
@@ -76,3 +113,129 @@ def compare_devices_with_ai(
     except Exception as e:
         # Error lainnya
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@router.get("/ai/stream")
+async def stream_compare_devices_with_ai(
+    id1: int = Query(..., description="ID device pertama"),
+    id2: int = Query(..., description="ID device kedua")
+):
+    """
+    Versi streaming /compare/ai (Server-Sent Events).
+    
+    Event yang dikirim berurutan:
+    - highlights: Hasil perbandingan rule-based (langsung, sebelum AI)
+    - section: 1 bagian analisis AI yang sudah selesai
+      ({"key", "title", "text"}), dikirim begitu tiba
+    - done: {"ai_analysis": analisis lengkap}, sama dengan /compare/ai
+    
+    Query Parameters:
+        id1: ID device pertama
+        id2: ID device kedua
+    """
+    try:
+        result, cache_key, cached, pair = await run_in_threadpool(_load_for_ai, id1, id2)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    ai_precompute.popularity.record(ai_precompute.comparison_key(id1, id2))
+    result = jsonable_encoder(result)
+    
+    async def events():
+        yield _sse("highlights", result)
+        if cached is not None:
+            yield _sse("done", {"ai_analysis": cached})
+            return
+        async for event, data in ai_service.stream_comparison_analysis(*pair):
+            if event == "done":
+                if ai_service.is_structured_analysis(data):
+                    comparison_cache.comparison_cache.put(cache_key, data)
+                data = {"ai_analysis": data}
+            yield _sse(event, data)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/cache/stats")
+def comparison_cache_stats():
+    """
+    Statistik cache perbandingan (hit/miss, jumlah entry, ukuran).
+    
+    Returns:
+        Dictionary berisi entries, bytes, hits, misses, hit_rate,
+        evictions, invalidations
+    """
+    return comparison_cache.comparison_cache.stats()
+
+
+@router.get("/ai/cache/stats")
+def ai_response_cache_stats():
+    """
+    Statistik cache persisten jawaban AI (SQLite).
+    
+    Returns:
+        Dictionary berisi entries, bytes, hits, misses, hit_rate,
+        evictions, invalidations
+    """
+    return ai_response_cache.stats()
+
+
+@router.get("/ai/stats")
+def ai_call_stats():
+    """
+    Statistik panggilan AI: connection pool, single flight, job precompute
+    dan provider (hedged request, circuit breaker per provider).
+    
+    Returns:
+        Dictionary berisi client (in_flight, waiting, requests, ...),
+        single_flight (calls, executions, collapsed, collapse_rate, in_flight)
+        precompute (runs, requests, stored, rate_limited, ...) dan
+        providers (requests, hedged, failovers, providers: latency,
+        hedge_delay_seconds dan circuit_breaker per provider)
+    """
+    return {
+        "client": ai_client.stats(),
+        "single_flight": ai_service.ai_single_flight.stats(),
+        "precompute": ai_precompute.scheduler.stats(),
+        "providers": provider_pool.stats(),
+    }
+
+
+# ==================== HELPERS ====================
+
+def _sse(event: str, data) -> str:
+    """Format 1 event Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _load_for_ai(id1: int, id2: int):
+    """
+    Ambil semua data database untuk /compare/ai dengan session singkat.
+    
+    Sinkron, jadi dipanggil lewat run_in_threadpool supaya query tidak
+    memblokir event loop. Session ditutup sebelum menunggu AI: koneksi yang
+    dipegang selama request AI bersamaan akan menghabiskan pool koneksi.
+    Prompt selalu memakai urutan id kecil dulu, supaya hasilnya sama
+    untuk ?id1=1&id2=2 dan ?id1=2&id2=1.
+    
+    Returns:
+        Tuple (hasil compare rule-based, key cache AI, analisis dari cache
+        atau None, pasangan device untuk prompt atau None)
+    
+    Raises:
+        ValueError: Jika salah satu atau kedua device tidak ditemukan
+    """
+    db = SessionLocal()
+    try:
+        result = comparison_service.compare_two_devices(db, id1, id2)
+        cache_key = comparison_cache.pair_key(db, "ai", id1, id2)
+        cached = comparison_cache.comparison_cache.get(cache_key)
+        pair = None
+        if cached is None:
+            pair = comparison_service.load_pair(db, min(id1, id2), max(id1, id2))
+    finally:
+        db.close()  # Kolom yang sudah dimuat tetap bisa dibaca
+    return result, cache_key, cached, pair
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..core.deps import get_db  # Import get_db dari core.deps (centralized)
-from ..crud import device as device_crud
+from ..crud import device as device_crud, pagination
+from ..services import prefix_index, fuzzy_index, facet_index, similar_index
+from ..utils import fields as field_utils
 from .. import schemas
 
 # Membuat router (kelompok URL) untuk devices
@@ -20,8 +23,44 @@ def create_device(phone: schemas.PhoneCreate, db: Session = Depends(get_db)):
 
 # API: Ambil Semua Phone (bisa cari nama)
 @router.get("/", response_model=List[schemas.Phone])
-def read_devices(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    phones = device_crud.get_devices(db, skip=skip, limit=limit, search=search)
+def read_devices(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    search: str = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Field dipisah koma, misal id,name,brand,price"),
+    db: Session = Depends(get_db)
+):
+    """
+    List phone dengan cursor pagination.
+    
+    - Halaman pertama: GET /devices/?limit=20
+    - Halaman berikutnya: kirim nilai header `X-Next-Cursor` sebagai `?cursor=...`
+    - Header `X-Next-Cursor` tidak ada jika sudah halaman terakhir
+    - `fields=id,name,brand,price,image_url`: hanya field ini yang di-SELECT
+      dan dikirim (response jauh lebih kecil untuk list)
+    
+    `skip` (offset) masih didukung untuk client lama, tapi lambat di halaman dalam.
+    """
+    selected = _parse_fields(fields)
+    
+    next_cursor = None
+    if skip:
+        phones = device_crud.get_devices(db, skip=skip, limit=limit, search=search, fields=selected)
+    else:
+        try:
+            phones, next_cursor = device_crud.get_devices_page(
+                db, cursor=cursor, limit=limit, search=search, fields=selected
+            )
+        except pagination.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if selected:
+        return _lean_response(phones, selected, headers)
+    
+    response.headers.update(headers)
     return phones
 
 # API: Autocomplete Search (untuk suggestions)
@@ -41,16 +80,131 @@ def autocomplete_devices(query: str, db: Session = Depends(get_db)):
     - Query: "iphone" → Return: iPhone 14, iPhone 13, dll
     """
     
-    # Cari phone yang namanya mengandung query (case insensitive)
-    # Limit 5 hasil agar tidak terlalu banyak
-    phones = device_crud.get_devices(db, search=query, limit=5)
+    # Cari di prefix index in-memory (services/prefix_index.py), tanpa query database
+    # Index hanya dibangun dari DB saat pertama dipakai / sudah kadaluarsa
+    # Return hanya data yang diperlukan (id, name, brand) biar response ringan
+    suggestions = prefix_index.ensure_built(db).search(query, limit=5)
+    
+    # Tidak ada yang cocok (kemungkinan typo) -> fallback ke fuzzy index
+    if not suggestions:
+        suggestions = [
+            {"id": match["id"], "name": match["name"], "brand": match["brand"]}
+            for match in fuzzy_index.ensure_built(db).search(query, limit=5)
+        ]
+    
+    return suggestions
+
+
+# API: Jumlah Device per Nilai Filter (faceted search)
+@router.get("/facets")
+def device_facets(
+    brand: Optional[List[str]] = Query(None),
+    category_id: Optional[List[int]] = Query(None),
+    ram_gb: Optional[List[int]] = Query(None),
+    storage_gb: Optional[List[int]] = Query(None),
+    release_year: Optional[List[int]] = Query(None),
+    price_bucket: Optional[List[str]] = Query(None),
+    max_price: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint untuk jumlah device per nilai filter.
+    
+    Cara kerja:
+    - Semua facet (brand, category_id, ram_gb, storage_gb, release_year,
+      price_bucket) dihitung sekaligus dari bitmap in-memory, tanpa query SQL
+    - Nilai dalam 1 facet digabung OR, antar facet digabung AND
+    - Jumlah per facet memakai filter facet lain saja, jadi pilihan lain
+      tetap terlihat jumlahnya
     
-    # Return hanya data yang diperlukan (id dan name)
-    # Biar response lebih ringan
-    return [
-        {"id": phone.id, "name": phone.name, "brand": phone.brand}
-        for phone in phones
-    ]
+    Contoh:
+    - /devices/facets?brand=Samsung&ram_gb=8
+    - /devices/facets?brand=Samsung&brand=Xiaomi&price_bucket=2000000-4000000
+    """
+    filters = {
+        "brand": brand,
+        "category_id": category_id,
+        "ram_gb": ram_gb,
+        "storage_gb": storage_gb,
+        "release_year": release_year,
+        "price_bucket": price_bucket,
+    }
+    return facet_index.ensure_built(db).counts(filters, max_price=max_price)
+
+
+# API: Ambil Beberapa Phone Sekaligus
+@router.get("/batch", response_model=List[schemas.Phone])
+def read_devices_batch(
+    ids: str = Query(..., description="ID device dipisah koma, misal 1,2,3"),
+    fields: Optional[str] = Query(None, description="Field dipisah koma, misal id,name,price"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint untuk mengambil beberapa device dalam 1 request.
+    
+    Cara kerja:
+    - Semua device diambil dengan 1 query IN (...) + category (JOIN)
+    - Urutan hasil mengikuti urutan ids, ID yang tidak ada dilewati
+    - Maksimal MAX_BATCH_SIZE ID per request
+    - `fields=` sama seperti GET /devices/
+    
+    Contoh:
+    - /devices/batch?ids=1,2,3
+    - /devices/batch?ids=1,2,3&fields=name,price
+    """
+    selected = _parse_fields(fields)
+
+    try:
+        device_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids harus berupa angka dipisah koma")
+    
+    if not device_ids:
+        raise HTTPException(status_code=400, detail="ids tidak boleh kosong")
+    if len(device_ids) > device_crud.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maksimal {device_crud.MAX_BATCH_SIZE} ID per request"
+        )
+    
+    phones = device_crud.get_devices_by_ids(db, device_ids, fields=selected)
+    if selected:
+        return _lean_response(phones, selected)
+    return phones
+
+
+# API: Device yang Mirip
+@router.get("/{device_id}/similar", response_model=List[schemas.Phone])
+def read_similar_devices(
+    device_id: int,
+    k: int = Query(10, ge=1, le=similar_index.MAX_SIMILAR),
+    fields: Optional[str] = Query(None, description="Field dipisah koma, misal id,name,price"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint untuk k device dengan spesifikasi paling mirip.
+    
+    Cara kerja:
+    - Tetangga terdekat dicari di similar_index (KD-tree di memory),
+      tanpa query database
+    - Detail device diambil dengan 1 query IN (...) seperti /devices/batch
+    - Urutan hasil: paling mirip dulu
+    - `fields=` sama seperti GET /devices/
+    
+    Contoh:
+    - /devices/12/similar
+    - /devices/12/similar?k=5&fields=name,price
+    """
+    selected = _parse_fields(fields)
+
+    neighbours = similar_index.ensure_built(db).similar(device_id, k)
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail="Phone not found")
+
+    phones = device_crud.get_devices_by_ids(db, [other_id for other_id, _ in neighbours], fields=selected)
+    if selected:
+        return _lean_response(phones, selected)
+    return phones
 
 
 # API: Ambil Detail Phone per ID
@@ -60,3 +214,24 @@ def read_device(device_id: int, db: Session = Depends(get_db)):
     if db_phone is None:
         raise HTTPException(status_code=404, detail="Phone not found")
     return db_phone
+
+
+# ==================== SPARSE FIELDSET HELPERS ====================
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validasi parameter `fields`, field tidak dikenal -> 400."""
+    try:
+        return field_utils.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _lean_response(phones, fields: List[str], headers: Optional[dict] = None) -> JSONResponse:
+    """
+    Response list tanpa Pydantic: dict dibuat langsung dari kolom yang di-load.
+    (response_model tidak dijalankan karena yang di-return Response langsung)
+    """
+    return JSONResponse(
+        content=[field_utils.phone_to_dict(phone, fields) for phone in phones],
+        headers=headers
+    )
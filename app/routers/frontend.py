@@ -4,13 +4,23 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from typing import Optional
 from ..core.deps import get_db
-from ..crud import device as device_crud
+from ..crud import device as device_crud, category as category_crud, pagination
+from ..services import fuzzy_index, facet_index, similar_index, comparison_service, comparison_cache, comparison_summary, highlight_rules
+from ..utils.fields import PHONE_FIELDS, phone_to_dict
+from ..utils import spec_parser
 
 # Setup Jinja2 Templates
 templates = Jinja2Templates(directory="app/templates")
 
 router = APIRouter(tags=["frontend"])
 
+# Jumlah device per halaman (keyset pagination, lihat crud/pagination.py)
+DEVICES_PER_PAGE = 48
+SEARCH_RESULTS_PER_PAGE = 50
+
+# Jumlah device mirip di halaman detail (lihat services/similar_index.py)
+SIMILAR_DEVICES_ON_PAGE = 6
+
 
 @router.get("/", response_class=HTMLResponse)
 async def homepage(request: Request, db: Session = Depends(get_db)):
@@ -110,12 +120,17 @@ async def device_detail_page(
     if not device:
         return RedirectResponse(url="/devices")
     
+    # Device dengan spesifikasi paling mirip (dari index di memory)
+    neighbours = similar_index.ensure_built(db).similar(device.id, SIMILAR_DEVICES_ON_PAGE) or []
+    similar_devices = device_crud.get_devices_by_ids(db, [other_id for other_id, _ in neighbours])
+    
     # Render template device_detail.html dengan data device
     return templates.TemplateResponse(
         "device_detail.html",
         {
             "request": request,
-            "device": device
+            "device": device,
+            "similar_devices": similar_devices
         }
     )
 
@@ -128,6 +143,7 @@ async def devices_page(
     ram: Optional[str] = None,
     storage: Optional[str] = None,
     max_price: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -137,6 +153,7 @@ async def devices_page(
     - Tampilkan semua device dalam bentuk grid atau list
     - User bisa filter berdasarkan kategori, brand, RAM, storage, dan harga
     - User bisa pilih 2 device untuk dibandingkan
+    - Halaman berikutnya lewat cursor (link "Halaman Berikutnya")
     
     Filters:
     - category: 1 (Smartphone) atau 2 (Laptop)
@@ -146,9 +163,6 @@ async def devices_page(
     - max_price: Harga maksimal (contoh: 5000000)
     """
     
-    # Get unique brands for filter dropdown
-    brands = device_crud.get_unique_brands(db)
-    
     # Convert parameters
     category_id = int(category) if category else None
     max_price_float = None
@@ -158,15 +172,36 @@ async def devices_page(
         except ValueError:
             pass
     
-    # Get filtered devices using new function
-    devices = device_crud.get_devices_filtered(
-        db=db,
+    # Pilihan dropdown + jumlah device per pilihan dari facet index in-memory
+    # (services/facet_index.py), dihitung dengan filter yang sedang aktif
+    ram_gb = spec_parser.parse_ram_gb(ram)
+    storage_gb = spec_parser.parse_storage_gb(storage)
+    facets = facet_index.ensure_built(db).counts(
+        {
+            "brand": [brand] if brand else None,
+            "category_id": [category_id] if category_id else None,
+            "ram_gb": [ram_gb] if ram_gb is not None else None,
+            "storage_gb": [storage_gb] if storage_gb is not None else None,
+        },
+        max_price=max_price_float
+    )["facets"]
+    category_names = {c.id: c.name for c in category_crud.get_categories(db)}
+    for option in facets["category_id"]:
+        option["label"] = category_names.get(option["value"], option["label"])
+    
+    # Get filtered devices (keyset pagination, tanpa OFFSET)
+    filters = dict(
         category_id=category_id,
         brand=brand if brand else None,
         ram=ram if ram else None,
         storage=storage if storage else None,
         max_price=max_price_float,
-        limit=100
+    )
+    devices, next_cursor = _load_page(
+        lambda page_cursor: device_crud.get_devices_filtered_page(
+            db, cursor=page_cursor, limit=DEVICES_PER_PAGE, **filters
+        ),
+        cursor
     )
     
     # Render template devices.html dengan data
@@ -175,12 +210,14 @@ async def devices_page(
         {
             "request": request,
             "devices": devices,
-            "brands": brands,  # Pass brands list for dropdown
+            "facets": facets,  # Pilihan dropdown + jumlah device
             "category": category,
             "brand": brand,
             "ram": ram,
             "storage": storage,
-            "max_price": max_price
+            "max_price": max_price,
+            "next_url": _next_page_url(request, next_cursor),
+            "first_url": _first_page_url(request, cursor)
         }
     )
 
@@ -189,6 +226,7 @@ async def devices_page(
 async def search_devices(
     request: Request,
     query: str,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -200,8 +238,21 @@ async def search_devices(
     - Tampilkan hasil di halaman search_results.html
     """
     
-    # Cari devices berdasarkan query (nama atau brand)
-    devices = device_crud.get_devices(db, search=query, limit=50)
+    # Cari devices berdasarkan query (nama atau brand), per halaman via cursor
+    devices, next_cursor = _load_page(
+        lambda page_cursor: device_crud.get_devices_page(
+            db, cursor=page_cursor, limit=SEARCH_RESULTS_PER_PAGE, search=query
+        ),
+        cursor
+    )
+    
+    # Kalau kosong (kemungkinan typo, misal "samsng a55"), fallback ke fuzzy search
+    fuzzy = False
+    if not devices and not cursor:
+        matches = fuzzy_index.ensure_built(db).search(query, limit=SEARCH_RESULTS_PER_PAGE)
+        if matches:
+            devices = device_crud.get_devices_by_ids(db, [match["id"] for match in matches])
+            fuzzy = True
     
     # Render template search_results.html dengan hasil pencarian
     return templates.TemplateResponse(
@@ -210,7 +261,10 @@ async def search_devices(
             "request": request,
             "query": query,
             "devices": devices,
-            "total_results": len(devices)
+            "total_results": len(devices),
+            "fuzzy": fuzzy,
+            "next_url": _next_page_url(request, next_cursor),
+            "first_url": _first_page_url(request, cursor)
         }
     )
 
@@ -229,148 +283,72 @@ async def compare_page(
     - User klik tombol "Select" di 2 device
     - URL jadi: /compare-page?id1=1&id2=2
     - Kita ambil data kedua device dari database
-    - Tampilkan di halaman compare.html
+    - Tampilkan di halaman compare.html bersama ringkasan offline
+      (services/comparison_summary.py); analisis AI baru diminta saat user
+      menekan tombol "Analisis dengan AI"
     """
     
-    # Ambil data device pertama dari database
-    device1 = device_crud.get_device(db, id1)
-    # Ambil data device kedua dari database
-    device2 = device_crud.get_device(db, id2)
+    def compute():
+        # Ambil data kedua device dari database (1 query untuk keduanya)
+        device1, device2 = comparison_service.load_pair(db, id1, id2)
+        return {
+            "devices": {
+                device.id: phone_to_dict(device, PHONE_FIELDS)
+                for device in (device1, device2)
+            },
+            "highlights": _compare_page_highlights(device1, device2),
+            # Ringkasan offline (tanpa AI); analisis AI hanya atas permintaan user
+            "summary": comparison_summary.summary_items(device1, device2)
+        }
     
-    # Kalau salah satu device tidak ada, redirect ke homepage
-    if not device1 or not device2:
+    # Hasil di-cache per pasangan device + version (services/comparison_cache.py)
+    try:
+        cached = comparison_cache.get_pair(db, "page", id1, id2, compute)
+    except ValueError:
+        # Kalau salah satu device tidak ada, redirect ke homepage
         return RedirectResponse(url="/")
     
-    # Buat highlights (perbandingan sederhana)
-    # Ini logika sederhana untuk mahasiswa, bukan pakai AI dulu
-    highlights = []
-    
-    # Bandingkan harga
-    if device1.price and device2.price:
-        price_diff = abs(device1.price - device2.price)
-        if device1.price < device2.price:
-            highlights.append({
-                "category": "<i class='fa-solid fa-tag'></i> Harga",
-                "winner": f"{device1.name} lebih murah Rp {price_diff:,.0f}"
-            })
-        elif device2.price < device1.price:
-            highlights.append({
-                "category": "<i class='fa-solid fa-tag'></i> Harga",
-                "winner": f"{device2.name} lebih murah Rp {price_diff:,.0f}"
-            })
-    
-    # Bandingkan tahun rilis
-    if device1.release_year and device2.release_year:
-        if device1.release_year > device2.release_year:
-            highlights.append({
-                "category": "<i class='fa-solid fa-calendar'></i> Tahun Rilis",
-                "winner": f"{device1.name} lebih baru ({device1.release_year})"
-            })
-        elif device2.release_year > device1.release_year:
-            highlights.append({
-                "category": "<i class='fa-solid fa-calendar'></i> Tahun Rilis",
-                "winner": f"{device2.name} lebih baru ({device2.release_year})"
-            })
-    
-    # Bandingkan RAM (extract angka dari string seperti "8GB")
-    if device1.ram and device2.ram:
-        try:
-            ram1 = int(''.join(filter(str.isdigit, device1.ram)))
-            ram2 = int(''.join(filter(str.isdigit, device2.ram)))
-            if ram1 > ram2:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-memory'></i> RAM",
-                    "winner": f"{device1.name} lebih besar ({device1.ram} vs {device2.ram})"
-                })
-            elif ram2 > ram1:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-memory'></i> RAM",
-                    "winner": f"{device2.name} lebih besar ({device2.ram} vs {device1.ram})"
-                })
-        except:
-            pass  # Skip jika format RAM tidak standar
-    
-    # Bandingkan Storage (extract angka dari string seperti "256GB")
-    if device1.storage and device2.storage:
-        try:
-            storage1 = int(''.join(filter(str.isdigit, device1.storage)))
-            storage2 = int(''.join(filter(str.isdigit, device2.storage)))
-            if storage1 > storage2:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-hard-drive'></i> Storage",
-                    "winner": f"{device1.name} lebih besar ({device1.storage} vs {device2.storage})"
-                })
-            elif storage2 > storage1:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-hard-drive'></i> Storage",
-                    "winner": f"{device2.name} lebih besar ({device2.storage} vs {device1.storage})"
-                })
-        except:
-            pass
-    
-    # Bandingkan Kamera (extract angka MP dari string seperti "48MP + 12MP")
-    if device1.camera and device2.camera:
-        try:
-            # Ambil angka pertama (main camera)
-            cam1 = int(''.join(filter(str.isdigit, device1.camera.split('+')[0])))
-            cam2 = int(''.join(filter(str.isdigit, device2.camera.split('+')[0])))
-            if cam1 > cam2:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-camera'></i> Kamera",
-                    "winner": f"{device1.name} lebih tinggi ({cam1}MP vs {cam2}MP)"
-                })
-            elif cam2 > cam1:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-camera'></i> Kamera",
-                    "winner": f"{device2.name} lebih tinggi ({cam2}MP vs {cam1}MP)"
-                })
-        except:
-            pass
-    
-    # Bandingkan Baterai (extract angka mAh dari string seperti "5000 mAh")
-    if device1.battery and device2.battery:
-        try:
-            bat1 = int(''.join(filter(str.isdigit, device1.battery)))
-            bat2 = int(''.join(filter(str.isdigit, device2.battery)))
-            if bat1 > bat2:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-battery-three-quarters'></i> Baterai",
-                    "winner": f"{device1.name} lebih besar ({bat1} mAh vs {bat2} mAh)"
-                })
-            elif bat2 > bat1:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-battery-three-quarters'></i> Baterai",
-                    "winner": f"{device2.name} lebih besar ({bat2} mAh vs {bat1} mAh)"
-                })
-        except:
-            pass
-    
-    # Bandingkan Screen (extract angka inch dari string seperti "6.7\"")
-    if device1.screen and device2.screen:
-        try:
-            screen1 = float(''.join(c for c in device1.screen.split('"')[0] if c.isdigit() or c == '.'))
-            screen2 = float(''.join(c for c in device2.screen.split('"')[0] if c.isdigit() or c == '.'))
-            if screen1 > screen2:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-display'></i> Layar",
-                    "winner": f"{device1.name} lebih besar ({screen1}\" vs {screen2}\")"
-                })
-            elif screen2 > screen1:
-                highlights.append({
-                    "category": "<i class='fa-solid fa-display'></i> Layar",
-                    "winner": f"{device2.name} lebih besar ({screen2}\" vs {screen1}\")"
-                })
-        except:
-            pass
-    
     # Render template compare.html dengan data yang sudah disiapkan
     return templates.TemplateResponse(
         "compare.html",
         {
             "request": request,
-            "device1": device1,
-            "device2": device2,
-            "highlights": highlights
+            "device1": cached["devices"][id1],
+            "device2": cached["devices"][id2],
+            "highlights": cached["highlights"],
+            "summary": cached["summary"]
+        }
+    )
+
+@router.get("/compare-multi", response_class=HTMLResponse)
+async def compare_multi_page(
+    request: Request,
+    ids: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Halaman perbandingan 2-10 device dalam 1 tabel.
+    
+    Cara kerja:
+    - User memilih lebih dari 2 device di halaman devices
+    - URL jadi: /compare-multi?ids=1,2,3
+    - Pemenang, ranking dan selisih per spesifikasi dihitung sekaligus
+      (comparison_service.compare_many_devices)
+    """
+    try:
+        device_ids = comparison_service.parse_device_ids(ids)
+        comparison = comparison_service.compare_many_devices(db, device_ids)
+    except ValueError:
+        # ids tidak valid / ada device yang tidak ditemukan
+        return RedirectResponse(url="/devices")
+    
+    return templates.TemplateResponse(
+        "compare_multi.html",
+        {
+            "request": request,
+            "devices": comparison["devices"],
+            "specs": comparison["specs"],
+            "wins": comparison["wins"]
         }
     )
 
@@ -454,3 +432,34 @@ async def contact_page(request: Request):
         {"request": request}
     )
 
+
+# ==================== PAGINATION HELPERS ====================
+
+def _load_page(fetch_page, cursor: Optional[str]):
+    """Ambil 1 halaman; cursor rusak/kadaluarsa -> kembali ke halaman pertama."""
+    try:
+        return fetch_page(cursor)
+    except pagination.InvalidCursor:
+        return fetch_page(None)
+
+
+def _next_page_url(request: Request, next_cursor: Optional[str]) -> Optional[str]:
+    """URL halaman berikutnya (filter tetap sama, cursor diganti)."""
+    if not next_cursor:
+        return None
+    return str(request.url.include_query_params(cursor=next_cursor))
+
+
+def _first_page_url(request: Request, cursor: Optional[str]) -> Optional[str]:
+    """URL kembali ke halaman pertama (hanya jika sedang tidak di halaman pertama)."""
+    if not cursor:
+        return None
+    return str(request.url.remove_query_params("cursor"))
+
+
+def _compare_page_highlights(device1, device2) -> list:
+    """Highlights untuk halaman compare (kategori + pemenang per spesifikasi)."""
+    return [
+        {"category": highlight.category, "winner": highlight.text}
+        for highlight in highlight_rules.evaluate(device1, device2)
+    ]
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from ..core.deps import get_db
-from ..services import recommendation_service, ai as ai_service
+from ..database import SessionLocal
+from ..services import recommendation_service, recommendation_cache, pareto_index, ai_precompute, ai as ai_service
 from ..schemas.device import Device
 from ..core.config import USE_CASES
 
@@ -16,6 +18,8 @@ def get_device_recommendations(
     max_price: Optional[float] = Query(None, description="Harga maksimal (Rp)"),
     category_id: Optional[int] = Query(None, description="ID Kategori (1=Smartphone, 2=Laptop)"),
     min_release_year: Optional[int] = Query(None, description="Tahun rilis minimal (misal: 2020)"),
+    use_case: Optional[str] = Query(None, description=f"Use case: {', '.join(USE_CASES)}"),
+    mode: str = Query("score", pattern="^(score|pareto)$", description="score = skor tertinggi, pareto = best value"),
     limit: int = Query(5, description="Jumlah rekomendasi maksimal", ge=1, le=20),
     db: Session = Depends(get_db)
 ):
@@ -27,36 +31,32 @@ def get_device_recommendations(
     - Dengan `max_price`: Filter device dengan harga <= max_price
     - Dengan `category_id`: Filter berdasarkan kategori (1=Smartphone, 2=Laptop)
     - Dengan `min_release_year`: Filter device yang rilis >= tahun tertentu
+    - Dengan `use_case`: Ranking memakai bobot use case (USE_CASE_WEIGHTS)
+    - Dengan `mode=pareto`: Hanya device "best value" - tidak ada device lain
+      yang lebih murah DAN spesifikasinya lebih tinggi (services/pareto_index.py)
     
     **Contoh:**
     - `/recommendation/?max_price=5000000` → Device dengan harga max 5 juta
     - `/recommendation/?category_id=1&max_price=10000000` → Smartphone max 10 juta
     - `/recommendation/?min_release_year=2022&limit=10` → 10 device terbaru (2022+)
+    - `/recommendation/?max_price=5000000&use_case=fotografi` → Kamera terbaik max 5 juta
+    - `/recommendation/?mode=pareto&category_id=1&max_price=8000000` → Best value max 8 juta
     
     **Hasil:**
-    Device akan di-sort berdasarkan:
-    1. Tahun rilis (terbaru dulu)
-    2. Harga (termurah dulu)
+    Device di-sort berdasarkan skor (tertinggi dulu). Tanpa `use_case`,
+    skor = tahun rilis (60%) + harga murah (40%).
+    Mode pareto: spesifikasi terbaik dalam budget dulu, lalu alternatif lebih murah.
     """
-    recommendations = recommendation_service.get_recommendations(
-        db=db,
-        max_price=max_price,
-        category_id=category_id,
-        min_release_year=min_release_year,
-        limit=limit
-    )
-    
-    return recommendations
+    return _recommend(db, max_price, category_id, min_release_year, limit, use_case, mode)
 
 
 @router.get("/ai")
-def get_ai_recommendations(
+async def get_ai_recommendations(
     max_price: Optional[float] = Query(None, description="Harga maksimal (Rp)"),
     category_id: Optional[int] = Query(None, description="ID Kategori (1=Smartphone, 2=Laptop)"),
     min_release_year: Optional[int] = Query(None, description="Tahun rilis minimal"),
     use_case: Optional[str] = Query(None, description=f"Use case: {', '.join(USE_CASES)}"),
-    limit: int = Query(5, description="Jumlah rekomendasi maksimal", ge=1, le=10),
-    db: Session = Depends(get_db)
+    limit: int = Query(5, description="Jumlah rekomendasi maksimal", ge=1, le=10)
 ):
     """
     Endpoint untuk mendapatkan rekomendasi device dengan analisis AI dari Grok AI.
@@ -82,13 +82,11 @@ def get_ai_recommendations(
         - devices: List device yang direkomendasikan
         - ai_recommendation: Analisis & ranking dari Grok AI
     """
-    # 1. Filter device berdasarkan kriteria (rule-based)
-    devices = recommendation_service.get_recommendations(
-        db=db,
-        max_price=max_price,
-        category_id=category_id,
-        min_release_year=min_release_year,
-        limit=limit
+    # 1. Filter + ranking device sesuai bobot use case (rule-based).
+    #    Query sinkron dijalankan di threadpool dengan session singkat, jadi
+    #    event loop tidak terblokir dan koneksi tidak dipegang selama menunggu AI
+    devices = await run_in_threadpool(
+        _recommend_in_session, max_price, category_id, min_release_year, limit, use_case
     )
     
     # 2. Jika tidak ada device yang match, return empty
@@ -98,11 +96,57 @@ def get_ai_recommendations(
             "ai_recommendation": "Maaf, tidak ada device yang sesuai dengan kriteria Anda."
         }
     
-    # 3. Dapatkan rekomendasi AI dari Grok AI
-    result = ai_service.get_ai_recommendation(
+    ai_precompute.popularity.record(
+        ai_precompute.recommendation_key(max_price, category_id, min_release_year, limit, use_case)
+    )
+    
+    # 3. Dapatkan rekomendasi AI dari Grok AI (async, tidak memblokir request lain)
+    result = await ai_service.get_ai_recommendation(
         devices=devices,
         use_case=use_case,
         max_price=max_price
     )
     
     return result
+
+
+@router.get("/cache/stats")
+def recommendation_cache_stats():
+    """
+    Statistik cache kandidat rekomendasi (hit/miss, jumlah entry).
+    
+    Returns:
+        Dictionary berisi entries, ttl_seconds, price_bucket, hits, misses,
+        hit_rate, evictions, invalidations
+    """
+    return recommendation_cache.recommendation_cache.stats()
+
+
+# ==================== HELPERS ====================
+
+def _recommend(db, max_price, category_id, min_release_year, limit, use_case, mode="score"):
+    """Panggil recommendation_service / pareto_index, use case tidak dikenal -> 400."""
+    recommend = (
+        pareto_index.get_pareto_recommendations if mode == "pareto"
+        else recommendation_service.get_recommendations
+    )
+    try:
+        return recommend(
+            db=db,
+            max_price=max_price,
+            category_id=category_id,
+            min_release_year=min_release_year,
+            limit=limit,
+            use_case=use_case
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _recommend_in_session(max_price, category_id, min_release_year, limit, use_case):
+    """_recommend dengan session singkat (untuk dipanggil lewat run_in_threadpool)."""
+    db = SessionLocal()
+    try:
+        return _recommend(db, max_price, category_id, min_release_year, limit, use_case)
+    finally:
+        db.close()  # Kolom yang sudah dimuat tetap bisa dibaca
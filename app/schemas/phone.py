@@ -56,6 +56,14 @@ class Phone(PhoneBase):
     """
     id: int
     
+    # Spesifikasi numerik (diisi otomatis dari kolom teks)
+    ram_gb: Optional[int] = None
+    storage_gb: Optional[int] = None
+    main_camera_mp: Optional[int] = None
+    battery_mah: Optional[int] = None
+    screen_inch: Optional[float] = None
+    price_idr: Optional[int] = None
+    
     # Nested objects (opsional, bisa null)
     category: Optional[Category] = None
     
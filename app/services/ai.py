@@ -1,39 +1,54 @@
 """
 Service untuk integrasi dengan AI.
 Menyediakan analisis perbandingan dan rekomendasi device menggunakan AI.
+
+Semua panggilan AI async lewat ai_client (connection pool bersama, batas
+concurrency dan deadline), jadi request AI yang lambat tidak memblokir
+request lain. Panggilan dikirim lewat provider_pool (daftar provider
+berurutan dengan hedged request, lihat ai_providers.py); setiap provider
+dijaga circuit breaker: saat semua provider lambat / error, user langsung
+mendapat ringkasan rule-based.
 """
 
-import requests
+import hashlib
+import httpx
 import json
-import os
-from typing import Dict, List, Optional
+import re
+import sqlite3
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 from .. import models
+from .ai_client import AIDeadlineExceeded
+from .ai_response_cache import ai_response_cache, fingerprint
+from .ai_providers import provider_pool
+from .circuit_breaker import CircuitOpenError
+from . import comparison_summary
+from .single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv()
 
-# AI Configuration - Load dari environment variable
-AI_API_KEY = os.getenv("AI_API_KEY", "")
-AI_API_URL = "https://api.x.ai/v1/chat/completions"
-AI_MODEL = "grok-4-1-fast-reasoning"  # Model AI yang digunakan
+# Versi template prompt perbandingan. Naikkan jika isi prompt diubah, supaya
+# jawaban lama di ai_response_cache tidak dipakai lagi
+COMPARISON_PROMPT_VERSION = 1
 
+# Field device yang dipakai di prompt perbandingan (ikut di-hash untuk key cache)
+COMPARISON_PROMPT_FIELDS = ("name", "brand", "price", "release_year", "cpu", "ram", "camera", "battery")
 
+# Bagian analisis perbandingan: (key JSON dari AI, judul yang ditampilkan).
+# Sama dengan bagian ringkasan offline (comparison_summary)
+COMPARISON_SECTIONS = comparison_summary.SECTIONS
 
-def call_ai_api(messages: List[Dict], temperature: float = 0.7) -> str:
-    """
-    Helper function untuk call AI API.
-    
-    Args:
-        messages: List of message dicts dengan role & content
-        temperature: Kreativitas AI (0.0 = strict, 1.0 = creative)
-    
-    Returns:
-        Response text dari AI
-    """
-    # Validasi API key
-    if not AI_API_KEY or AI_API_KEY == "":
-        return """⚠️ **AI tidak tersedia**
+# Pasangan "key": "isi" yang sudah lengkap di JSON yang sedang di-stream
+_SECTION_PATTERN = re.compile(
+    r'"(' + "|".join(key for key, _ in COMPARISON_SECTIONS) + r')"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+# Penggabung panggilan AI identik yang berjalan bersamaan
+ai_single_flight = SingleFlight()
+
+AI_UNAVAILABLE_MESSAGE = """⚠️ **AI tidak tersedia**
 
 Untuk menggunakan fitur AI, silakan:
 1. Dapatkan API key
@@ -44,84 +59,146 @@ Untuk menggunakan fitur AI, silakan:
 3. Restart aplikasi
 
 Sementara itu, Anda masih bisa melihat perbandingan manual di atas."""
+
+
+def ai_error_message(error: Exception) -> str:
+    """
+    Pesan yang ramah untuk user dari error panggilan AI.
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {AI_API_KEY}"
-    }
-    
-    payload = {
-        "messages": messages,
-        "model": AI_MODEL,
-        "stream": False,
-        "temperature": temperature
-    }
+    Args:
+        error: Exception dari ai_client atau parsing response
     
-    try:
-        response = requests.post(AI_API_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data['choices'][0]['message']['content']
-        
-    except requests.exceptions.Timeout:
+    Returns:
+        Pesan markdown untuk ditampilkan
+    """
+    if isinstance(error, AIDeadlineExceeded):
         return """⏱️ **Request timeout**
 
 Koneksi ke AI terlalu lama. Silakan:
 - Cek koneksi internet Anda
 - Coba lagi dalam beberapa saat"""
-        
-    except requests.exceptions.HTTPError as e:
-        if response.status_code == 401:
+    
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        if status_code == 401:
             return """🔑 **API Key tidak valid**
 
 Silakan cek:
 1. API key di file `.env` sudah benar
 2. API key masih aktif
 3. Format: `AI_API_KEY=...`"""
-        elif response.status_code == 429:
+        elif status_code == 429:
             return """⚠️ **Quota API habis**
 
 Anda sudah mencapai limit penggunaan API.
 Silakan tunggu beberapa saat."""
         else:
-            return f"""❌ **Error HTTP {response.status_code}**
+            return f"""❌ **Error HTTP {status_code}**
 
 Terjadi kesalahan saat menghubungi AI.
-Detail: {str(e)}"""
-            
-    except requests.exceptions.ConnectionError:
+Detail: {str(error)}"""
+    
+    if isinstance(error, httpx.ConnectError):
         return """🌐 **Tidak ada koneksi internet**
 
 Silakan cek koneksi internet Anda dan coba lagi."""
-        
-    except requests.exceptions.RequestException as e:
+    
+    if isinstance(error, httpx.RequestError):
         return f"""❌ **Error koneksi**
 
 Gagal menghubungi AI.
-Detail: {str(e)}"""
-        
-    except (KeyError, IndexError) as e:
-        return f"""❌ **Error parsing response**
+Detail: {str(error)}"""
+    
+    return f"""❌ **Error parsing response**
 
 Format response dari AI tidak sesuai.
-Detail: {str(e)}"""
+Detail: {str(error)}"""
 
 
-def get_comparison_analysis(device1: models.Phone, device2: models.Phone) -> str:
+async def call_ai_api(messages: List[Dict], temperature: float = 0.7, deadline: Optional[float] = None) -> str:
     """
-    Mendapatkan analisis perbandingan 2 device dari AI.
+    Helper function untuk call AI API (async, lewat connection pool).
     
     Args:
-        device1: Device pertama
-        device2: Device kedua
+        messages: List of message dicts dengan role & content
+        temperature: Kreativitas AI (0.0 = strict, 1.0 = creative)
+        deadline: Deadline detik (default AI_REQUEST_DEADLINE_SECONDS)
     
     Returns:
-        String berisi analisis AI dalam bahasa Indonesia
+        Response text dari AI (atau pesan error yang ramah)
+    
+    Raises:
+        CircuitOpenError: Jika circuit breaker sedang open
     """
-    try:
-        # Buat prompt dengan format JSON strict
-        user_prompt = f"""Bandingkan 2 smartphone berikut. Output HARUS dalam format JSON yang valid.
+    # Validasi API key
+    if not provider_pool.configured():
+        return AI_UNAVAILABLE_MESSAGE
+    
+    async def send() -> str:
+        try:
+            return await request_ai_api(messages, temperature, deadline)
+        except (AIDeadlineExceeded, httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            return ai_error_message(e)
+    
+    # Prompt identik yang sedang berjalan tidak dikirim ulang: semua request
+    # menunggu 1 panggilan yang sama (single flight)
+    payload = {"messages": messages, "temperature": temperature}
+    return await ai_single_flight.do(_payload_key(payload), send)
+
+
+async def request_ai_api(
+    messages: List[Dict],
+    temperature: float = 0.7,
+    deadline: Optional[float] = None,
+    hedge: bool = True
+) -> str:
+    """
+    Seperti call_ai_api, tapi error diteruskan sebagai exception (misal untuk
+    job background yang perlu tahu status 429).
+    
+    Hedged request lewat provider_pool: hasil dicatat di breaker provider
+    masing-masing. Tanpa deadline, dipakai deadline adaptif per provider.
+    hedge=False: tepat 1 request ke 1 provider (tanpa hedge dan failover),
+    supaya job dengan budget request per menit tidak terhitung ganda.
+    
+    Raises:
+        CircuitOpenError: Jika circuit semua provider sedang open
+        AIDeadlineExceeded, httpx.HTTPError: Jika semua provider gagal
+        KeyError, IndexError, ValueError: Jika format response tidak sesuai
+    """
+    if not hedge:
+        return await provider_pool.call_once(messages, temperature, deadline)
+    return await provider_pool.chat(messages, temperature, deadline)
+
+
+def _payload_key(payload: Dict) -> str:
+    """Key single flight: hash dari messages + temperature."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def stream_ai_api(
+    messages: List[Dict],
+    temperature: float = 0.7,
+    deadline: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Seperti call_ai_api, tapi yield potongan teks (token) begitu tiba.
+    Stream tidak di-hedge; provider berikutnya hanya dicoba jika provider
+    gagal sebelum token pertama.
+    
+    Raises:
+        CircuitOpenError: Jika circuit semua provider sedang open
+        AIDeadlineExceeded, httpx.HTTPError: Jika panggilan gagal
+            (ubah jadi pesan dengan ai_error_message)
+    """
+    async for delta in provider_pool.stream(messages, temperature, deadline):
+        yield delta
+
+
+def _comparison_messages(device1: models.Phone, device2: models.Phone) -> List[Dict]:
+    """Prompt perbandingan (format JSON strict, lihat COMPARISON_SECTIONS)."""
+    user_prompt = f"""Bandingkan 2 smartphone berikut. Output HARUS dalam format JSON yang valid.
 
 Device 1: {device1.name} ({device1.brand}) - Rp {device1.price:,.0f} - {device1.release_year}
 CPU: {device1.cpu}, RAM: {device1.ram}, Kamera: {device1.camera}, Baterai: {device1.battery}
@@ -141,79 +218,243 @@ Kamu wajib memberikan output dalam format JSON berikut:
 
 Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indonesia."""
 
-        messages = [
-            {
-                "role": "system",
-                "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid."
-            },
-            {
-                "role": "user",
-                "content": user_prompt
-            }
-        ]
-        
-        # Call AI API
-        response_text = call_ai_api(messages, temperature=0.7)
-        
-        # Parse JSON response
-        try:
-            # Clean response (hapus markdown jika ada)
-            clean_text = response_text.strip()
-            if clean_text.startswith("```json"):
-                clean_text = clean_text.replace("```json", "").replace("```", "").strip()
-            
-            # Parse JSON
-            analysis = json.loads(clean_text)
-            
-            # Format ke text yang readable
-            formatted = f"""
-**Performa:** {analysis.get('performa', 'N/A')}
-
-**Kamera:** {analysis.get('kamera', 'N/A')}
-
-**Baterai:** {analysis.get('baterai', 'N/A')}
+    return [
+        {
+            "role": "system",
+            "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid."
+        },
+        {
+            "role": "user",
+            "content": user_prompt
+        }
+    ]
 
-**Value for Money:** {analysis.get('value_for_money', 'N/A')}
 
-**Rekomendasi:** {analysis.get('rekomendasi', 'N/A')}
-"""
-            return formatted.strip()
-            
-        except json.JSONDecodeError:
-            # Kalau gagal parse JSON, return as is
-            return response_text
-        
-    except Exception as e:
-        return f"Maaf, analisis AI sedang tidak tersedia. Error: {str(e)}"
+def _format_comparison(response_text: str) -> str:
+    """
+    Ubah jawaban JSON AI jadi text yang readable.
+    Kalau gagal parse JSON, jawaban dikembalikan apa adanya.
+    """
+    # Clean response (hapus markdown jika ada)
+    clean_text = response_text.strip()
+    if clean_text.startswith("```json"):
+        clean_text = clean_text.replace("```json", "").replace("```", "").strip()
+    
+    try:
+        analysis = json.loads(clean_text)
+    except json.JSONDecodeError:
+        return response_text
+    
+    return comparison_summary.format_sections(analysis)
 
 
-def get_ai_recommendation(
-    devices: List[models.Phone],
-    use_case: Optional[str] = None,
-    max_price: Optional[float] = None
-) -> Dict[str, any]:
+async def get_comparison_analysis(device1: models.Phone, device2: models.Phone) -> str:
     """
-    Mendapatkan rekomendasi device dari Grok AI berdasarkan use case.
+    Mendapatkan analisis perbandingan 2 device dari AI.
     
     Args:
-        devices: List device yang sudah di-filter
-        use_case: Use case user (gaming, fotografi, kerja, dll)
-        max_price: Budget maksimal user
+        device1: Device pertama
+        device2: Device kedua
     
     Returns:
-        Dictionary berisi ranking devices + penjelasan AI
+        String berisi analisis AI dalam bahasa Indonesia, atau ringkasan
+        offline (rule_based_comparison) jika AI tidak tersedia / gagal
     """
+    # Jawaban untuk prompt yang sama persis diambil dari cache persisten
+    cache_key = comparison_cache_key(device1, device2)
+    cached = await run_in_threadpool(_cache_get, cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Buat daftar device untuk prompt
-        device_list = ""
-        for i, device in enumerate(devices[:3], 1):
-            device_list += f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})\n"
-        
-        # Buat prompt
-        use_case_text = f"untuk {use_case}" if use_case else ""
-        budget_text = f"budget max Rp {max_price:,.0f}" if max_price else ""
-        
-        user_prompt = f"""Rekomendasi smartphone {use_case_text} {budget_text}:
+        response_text = await call_ai_api(_comparison_messages(device1, device2), temperature=0.7)
+        formatted = _format_comparison(response_text)
+    except CircuitOpenError:
+        # AI sedang lambat / error: jangan menunggu, pakai ringkasan rule-based
+        return rule_based_comparison(device1, device2)
+    except Exception as e:
+        print(f"Error analisis AI: {str(e)}")
+        return rule_based_comparison(device1, device2)
+    
+    # Tanpa API key / provider error, call_ai_api mengembalikan pesan (bukan
+    # JSON analisis): tampilkan ringkasan offline
+    if not is_structured_analysis(formatted):
+        return rule_based_comparison(device1, device2)
+    await run_in_threadpool(_cache_put, cache_key, "compare", formatted, [device1.id, device2.id])
+    return formatted
+
+
+async def stream_comparison_analysis(
+    device1: models.Phone,
+    device2: models.Phone
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Versi streaming get_comparison_analysis.
+    
+    Jawaban AI di-stream token per token; setiap bagian (performa, kamera,
+    baterai, ...) dikirim begitu string JSON-nya lengkap. Stream untuk
+    pasangan yang sama yang sedang berjalan diikuti bersama (single flight),
+    jadi N tab yang membuka pasangan yang sama hanya memanggil AI 1 kali.
+    
+    Args:
+        device1: Device pertama
+        device2: Device kedua
+    
+    Yields:
+        ("section", {"key", "title", "text"}) untuk setiap bagian yang selesai,
+        lalu ("done", analisis lengkap) - sama dengan hasil get_comparison_analysis
+    """
+    cache_key = comparison_cache_key(device1, device2)
+    cached = await run_in_threadpool(_cache_get, cache_key)
+    if cached is not None:
+        yield "done", cached
+        return
+    
+    if not provider_pool.configured():
+        yield "done", rule_based_comparison(device1, device2)
+        return
+    
+    stream = ai_single_flight.stream(
+        cache_key, lambda: _stream_comparison(device1, device2, cache_key)
+    )
+    async for event in stream:
+        yield event
+
+
+async def _stream_comparison(
+    device1: models.Phone,
+    device2: models.Phone,
+    cache_key: str
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Stream leader stream_comparison_analysis (1 panggilan AI per pasangan)."""
+    titles = dict(COMPARISON_SECTIONS)
+    buffer = ""
+    sent = set()
+    try:
+        async for delta in stream_ai_api(_comparison_messages(device1, device2), temperature=0.7):
+            buffer += delta
+            for match in _SECTION_PATTERN.finditer(buffer):
+                key = match.group(1)
+                if key in sent:
+                    continue
+                sent.add(key)
+                yield "section", {
+                    "key": key,
+                    "title": titles[key],
+                    "text": json.loads(f'"{match.group(2)}"'),
+                }
+    except CircuitOpenError:
+        yield "done", rule_based_comparison(device1, device2)
+        return
+    except (AIDeadlineExceeded, httpx.HTTPError, ValueError) as e:
+        print(f"Error analisis AI: {ai_error_message(e)}")
+        yield "done", rule_based_comparison(device1, device2)
+        return
+    
+    formatted = _format_comparison(buffer)
+    if not is_structured_analysis(formatted):
+        yield "done", rule_based_comparison(device1, device2)
+        return
+    await run_in_threadpool(_cache_put, cache_key, "compare", formatted, [device1.id, device2.id])
+    yield "done", formatted
+
+
+def comparison_cache_key(device1: models.Phone, device2: models.Phone) -> str:
+    """Key ai_response_cache untuk prompt perbandingan device1 vs device2."""
+    devices = [
+        {field: getattr(device, field) for field in COMPARISON_PROMPT_FIELDS}
+        for device in (device1, device2)
+    ]
+    return fingerprint(provider_pool.primary.model, COMPARISON_PROMPT_VERSION, "compare", devices)
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """
+    Baca ai_response_cache; error file cache tidak boleh menggagalkan request.
+    Query SQLite sinkron: dari fungsi async panggil lewat run_in_threadpool.
+    """
+    try:
+        return ai_response_cache.get(key)
+    except sqlite3.Error as e:
+        print(f"AI response cache tidak bisa dibaca: {e}")
+        return None
+
+
+def _cache_put(key: str, kind: str, response: str, device_ids: List[int]) -> None:
+    """Simpan ke ai_response_cache (error hanya dicatat, panggil lewat run_in_threadpool)."""
+    try:
+        ai_response_cache.put(key, kind, response, device_ids)
+    except sqlite3.Error as e:
+        print(f"AI response cache tidak bisa ditulis: {e}")
+
+
+# ==================== RULE-BASED FALLBACK ====================
+# Dipakai saat AI tidak tersedia (tanpa API key, circuit breaker open, atau
+# provider error): user langsung mendapat ringkasan dari data spesifikasi
+# tanpa menunggu AI.
+
+FALLBACK_NOTE = "_Analisis AI sedang tidak tersedia, berikut ringkasan otomatis dari spesifikasi._"
+
+
+def rule_based_comparison(device1: models.Phone, device2: models.Phone) -> str:
+    """
+    Ringkasan perbandingan offline (comparison_summary) dengan bagian yang
+    sama seperti analisis AI. Diawali judul "Ringkasan Otomatis", jadi
+    is_structured_analysis False dan hasilnya tidak ikut di-cache sebagai
+    jawaban AI.
+    """
+    sections = comparison_summary.format_sections(comparison_summary.summarize(device1, device2))
+    return f"""**Ringkasan Otomatis:**
+
+{sections}
+
+{FALLBACK_NOTE}"""
+
+
+def rule_based_recommendation(devices: List[models.Phone]) -> str:
+    """Ringkasan rekomendasi dari urutan ranking rule-based."""
+    lines = "\n".join(
+        f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})"
+        for i, device in enumerate(devices[:3], 1)
+    )
+    return f"""**Top 3 Rekomendasi (otomatis):**
+
+{lines}
+
+{FALLBACK_NOTE}"""
+
+
+def is_structured_analysis(text: str) -> bool:
+    """
+    True jika text adalah hasil analisis yang berhasil di-parse (bukan pesan
+    error / fallback). Dipakai untuk memutuskan hasil AI boleh di-cache.
+    """
+    return text.startswith("**Performa:**")
+
+
+# Versi template prompt rekomendasi (lihat COMPARISON_PROMPT_VERSION)
+RECOMMENDATION_PROMPT_VERSION = 1
+
+# Field device yang dipakai di prompt rekomendasi
+RECOMMENDATION_PROMPT_FIELDS = ("name", "price", "release_year")
+
+
+def _recommendation_messages(
+    devices: List[models.Phone],
+    use_case: Optional[str],
+    max_price: Optional[float]
+) -> List[Dict]:
+    """Prompt rekomendasi untuk maksimal 3 device teratas."""
+    # Buat daftar device untuk prompt
+    device_list = ""
+    for i, device in enumerate(devices[:3], 1):
+        device_list += f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})\n"
+    
+    # Buat prompt
+    use_case_text = f"untuk {use_case}" if use_case else ""
+    budget_text = f"budget max Rp {max_price:,.0f}" if max_price else ""
+    
+    user_prompt = f"""Rekomendasi smartphone {use_case_text} {budget_text}:
 
 {device_list}
 
@@ -228,30 +469,31 @@ Kamu wajib memberikan output dalam format JSON berikut:
 
 Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indonesia."""
 
-        messages = [
-            {
-                "role": "system",
-                "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid."
-            },
-            {
-                "role": "user",
-                "content": user_prompt
-            }
-        ]
-        
-        # Call AI API
-        response_text = call_ai_api(messages, temperature=0.7)
-        
-        # Parse JSON response
-        try:
-            clean_text = response_text.strip()
-            if clean_text.startswith("```json"):
-                clean_text = clean_text.replace("```json", "").replace("```", "").strip()
-            
-            recommendation = json.loads(clean_text)
-            
-            # Format ke text
-            formatted = f"""
+    return [
+        {
+            "role": "system",
+            "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid."
+        },
+        {
+            "role": "user",
+            "content": user_prompt
+        }
+    ]
+
+
+def _format_recommendation(response_text: str) -> str:
+    """Ubah jawaban JSON AI jadi text, atau apa adanya jika gagal parse."""
+    clean_text = response_text.strip()
+    if clean_text.startswith("```json"):
+        clean_text = clean_text.replace("```json", "").replace("```", "").strip()
+    
+    try:
+        recommendation = json.loads(clean_text)
+    except json.JSONDecodeError:
+        return response_text
+    
+    # Format ke text
+    formatted = f"""
 **Top 3 Rekomendasi:**
 
 1. {recommendation.get('top_1', 'N/A')}
@@ -260,18 +502,68 @@ Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indo
 
 **Kesimpulan:** {recommendation.get('summary', 'N/A')}
 """
-            
-            return {
-                "devices": devices[:3],
-                "ai_recommendation": formatted.strip()
-            }
-            
-        except json.JSONDecodeError:
-            return {
-                "devices": devices[:3],
-                "ai_recommendation": response_text
-            }
+    return formatted.strip()
+
+
+def recommendation_cache_key(
+    devices: List[models.Phone],
+    use_case: Optional[str],
+    max_price: Optional[float]
+) -> str:
+    """Key ai_response_cache untuk prompt rekomendasi."""
+    fields = [
+        {field: getattr(device, field) for field in RECOMMENDATION_PROMPT_FIELDS}
+        for device in devices[:3]
+    ]
+    fields.append({"use_case": use_case, "max_price": max_price})
+    return fingerprint(provider_pool.primary.model, RECOMMENDATION_PROMPT_VERSION, "recommend", fields)
+
+
+def is_structured_recommendation(text: str) -> bool:
+    """True jika text adalah rekomendasi yang berhasil di-parse (boleh di-cache)."""
+    return text.startswith("**Top 3 Rekomendasi:**")
+
+
+async def get_ai_recommendation(
+    devices: List[models.Phone],
+    use_case: Optional[str] = None,
+    max_price: Optional[float] = None
+) -> Dict[str, any]:
+    """
+    Mendapatkan rekomendasi device dari Grok AI berdasarkan use case.
+    
+    Args:
+        devices: List device yang sudah di-filter
+        use_case: Use case user (gaming, fotografi, kerja, dll)
+        max_price: Budget maksimal user
+    
+    Returns:
+        Dictionary berisi ranking devices + penjelasan AI
+    """
+    # Jawaban untuk prompt yang sama persis diambil dari cache persisten
+    cache_key = recommendation_cache_key(devices, use_case, max_price)
+    cached = await run_in_threadpool(_cache_get, cache_key)
+    if cached is not None:
+        return {"devices": devices[:3], "ai_recommendation": cached}
+    
+    try:
+        response_text = await call_ai_api(_recommendation_messages(devices, use_case, max_price), temperature=0.7)
+        formatted = _format_recommendation(response_text)
+        if is_structured_recommendation(formatted):
+            await run_in_threadpool(
+                _cache_put, cache_key, "recommend", formatted, [device.id for device in devices[:3]]
+            )
         
+        return {
+            "devices": devices[:3],
+            "ai_recommendation": formatted
+        }
+        
+    except CircuitOpenError:
+        return {
+            "devices": devices[:3],
+            "ai_recommendation": rule_based_recommendation(devices)
+        }
     except Exception as e:
         return {
             "devices": devices[:3],
@@ -279,19 +571,88 @@ Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indo
         }
 
 
-def test_ai_connection() -> bool:
+# ==================== PRECOMPUTE ====================
+# Dipakai job background (services/ai_precompute.py): error diteruskan sebagai
+# exception supaya job bisa mundur saat kena 429.
+
+def is_comparison_cached(device1: models.Phone, device2: models.Phone) -> bool:
+    """True jika analisis perbandingan sudah ada di ai_response_cache."""
+    return ai_response_cache.contains(comparison_cache_key(device1, device2))
+
+
+def is_recommendation_cached(
+    devices: List[models.Phone],
+    use_case: Optional[str] = None,
+    max_price: Optional[float] = None
+) -> bool:
+    """True jika rekomendasi AI sudah ada di ai_response_cache."""
+    return ai_response_cache.contains(recommendation_cache_key(devices, use_case, max_price))
+
+
+async def precompute_comparison(device1: models.Phone, device2: models.Phone) -> bool:
+    """
+    Hitung analisis perbandingan lalu simpan ke cache (1 request AI, tanpa hedge).
+    
+    Returns:
+        True jika jawaban AI valid dan disimpan
+    
+    Raises:
+        AIDeadlineExceeded, httpx.HTTPError: Jika panggilan AI gagal
+    """
+    cache_key = comparison_cache_key(device1, device2)
+    formatted = _format_comparison(
+        await request_ai_api(_comparison_messages(device1, device2), hedge=False)
+    )
+    if not is_structured_analysis(formatted):
+        return False
+    await run_in_threadpool(_cache_put, cache_key, "compare", formatted, [device1.id, device2.id])
+    return True
+
+
+async def precompute_recommendation(
+    devices: List[models.Phone],
+    use_case: Optional[str] = None,
+    max_price: Optional[float] = None
+) -> bool:
+    """
+    Hitung rekomendasi AI lalu simpan ke cache (1 request AI, tanpa hedge).
+    
+    Returns:
+        True jika jawaban AI valid dan disimpan
+    
+    Raises:
+        AIDeadlineExceeded, httpx.HTTPError: Jika panggilan AI gagal
+    """
+    cache_key = recommendation_cache_key(devices, use_case, max_price)
+    formatted = _format_recommendation(
+        await request_ai_api(_recommendation_messages(devices, use_case, max_price), hedge=False)
+    )
+    if not is_structured_recommendation(formatted):
+        return False
+    await run_in_threadpool(
+        _cache_put, cache_key, "recommend", formatted, [device.id for device in devices[:3]]
+    )
+    return True
+
+
+async def test_ai_connection() -> bool:
     """
     Test koneksi ke AI API.
     
+    Memanggil primary langsung, tidak melewati circuit breaker, jadi tetap
+    bisa dipakai admin untuk mengecek provider saat circuit sedang open.
+    
     Returns:
         True jika berhasil, False jika gagal
     """
+    if not provider_pool.primary.api_key:
+        return False
     try:
         messages = [
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": "Say 'Hello World' and nothing else."}
         ]
-        response = call_ai_api(messages, temperature=0)
+        response = await provider_pool.primary.chat(messages, temperature=0, deadline=None)
         return "hello" in response.lower()
     except Exception as e:
         print(f"Error testing AI connection: {str(e)}")
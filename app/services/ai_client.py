@@ -0,0 +1,242 @@
+"""
+AI Client - HTTP client async dengan connection pool untuk AI API
+
+Dulu setiap panggilan AI memakai requests.post(..., timeout=30): koneksi TLS
+baru per request dan thread worker terblokir sampai 30 detik. Modul ini
+menyediakan 1 httpx.AsyncClient bersama:
+
+- Connection pool + HTTP keep-alive: koneksi ke AI API dipakai ulang
+  (AI_MAX_CONNECTIONS, AI_MAX_KEEPALIVE_CONNECTIONS, AI_KEEPALIVE_EXPIRY)
+- Batas concurrency: maksimal AI_MAX_CONCURRENCY request AI berjalan
+  bersamaan, sisanya antri (semaphore) tanpa memblokir request lain
+- Deadline per request: waktu antri + koneksi + respons dibatasi
+  AI_REQUEST_DEADLINE_SECONDS, lalu AIDeadlineExceeded
+- Streaming (stream_json): response SSE dari AI API dibaca per baris dan
+  setiap chunk JSON diteruskan begitu tiba, dengan batas yang sama
+
+Client dibuat lazy di event loop yang sedang berjalan dan ditutup saat
+aplikasi shutdown (main.py).
+
+Author: Kelompok COMPARELY
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from ..core.config import (
+    AI_CONNECT_TIMEOUT_SECONDS,
+    AI_KEEPALIVE_EXPIRY_SECONDS,
+    AI_MAX_CONCURRENCY,
+    AI_MAX_CONNECTIONS,
+    AI_MAX_KEEPALIVE_CONNECTIONS,
+    AI_REQUEST_DEADLINE_SECONDS,
+)
+
+
+class AIDeadlineExceeded(Exception):
+    """Request AI (termasuk waktu antri) melewati deadline."""
+
+
+class AIClient:
+    """
+    Pool koneksi async + batas concurrency untuk AI API.
+
+    Attributes:
+        max_concurrency: Maksimal request AI yang berjalan bersamaan
+        deadline: Deadline default per request (detik)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = AI_MAX_CONNECTIONS,
+        max_keepalive_connections: int = AI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = AI_KEEPALIVE_EXPIRY_SECONDS,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+        connect_timeout: float = AI_CONNECT_TIMEOUT_SECONDS,
+        deadline: float = AI_REQUEST_DEADLINE_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_concurrency = max_concurrency
+        self.connect_timeout = connect_timeout
+        self.deadline = deadline
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.deadline_exceeded = 0
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """Client + semaphore untuk event loop yang sedang berjalan."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Pool terikat ke event loop; loop baru (misal test) -> pool baru
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=httpx.Timeout(self.deadline, connect=self.connect_timeout),
+                transport=self._transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        POST JSON lalu kembalikan body JSON, dalam batas concurrency & deadline.
+
+        Args:
+            url: URL endpoint
+            payload: Body JSON
+            headers: Header tambahan (misal Authorization)
+            deadline: Deadline detik (default self.deadline), termasuk waktu antri
+
+        Returns:
+            Body response (dict)
+
+        Raises:
+            AIDeadlineExceeded: Jika melewati deadline
+            httpx.HTTPStatusError: Jika status 4xx/5xx
+            httpx.RequestError: Jika koneksi gagal
+        """
+        client = self._ensure_client()
+        deadline = self.deadline if deadline is None else deadline
+        started = time.monotonic()
+        self.requests += 1
+
+        async def send() -> Dict[str, Any]:
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            try:
+                # Sisa deadline setelah antri jadi timeout HTTP
+                remaining = max(0.001, deadline - (time.monotonic() - started))
+                response = await client.post(
+                    url, json=payload, headers=headers,
+                    timeout=httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining)),
+                )
+                response.raise_for_status()
+                return response.json()
+            finally:
+                self.in_flight -= 1
+                self._semaphore.release()
+
+        try:
+            return await asyncio.wait_for(send(), timeout=deadline)
+        except (asyncio.TimeoutError, httpx.TimeoutException) as e:
+            self.deadline_exceeded += 1
+            raise AIDeadlineExceeded(f"AI tidak merespons dalam {deadline:g} detik") from e
+
+    async def stream_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        POST JSON dengan response SSE, yield setiap chunk "data: {...}".
+
+        Slot concurrency dipegang sampai stream selesai (atau generator
+        ditutup, misal client disconnect). Deadline berlaku untuk seluruh stream.
+
+        Args:
+            url: URL endpoint
+            payload: Body JSON (biasanya berisi "stream": True)
+            headers: Header tambahan (misal Authorization)
+            deadline: Deadline detik (default self.deadline), termasuk waktu antri
+
+        Yields:
+            Chunk JSON (dict), berhenti di "data: [DONE]"
+
+        Raises:
+            AIDeadlineExceeded: Jika melewati deadline
+            httpx.HTTPStatusError: Jika status 4xx/5xx
+            httpx.RequestError: Jika koneksi gagal
+        """
+        client = self._ensure_client()
+        deadline = self.deadline if deadline is None else deadline
+        started = time.monotonic()
+        self.requests += 1
+
+        def remaining() -> float:
+            return deadline - (time.monotonic() - started)
+
+        def exceeded(cause: Optional[BaseException] = None) -> AIDeadlineExceeded:
+            self.deadline_exceeded += 1
+            error = AIDeadlineExceeded(f"AI tidak merespons dalam {deadline:g} detik")
+            error.__cause__ = cause
+            return error
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.001, remaining()))
+        except asyncio.TimeoutError as e:
+            raise exceeded(e)
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            timeout = max(0.001, remaining())
+            async with client.stream(
+                "POST", url, json=payload, headers=headers,
+                timeout=httpx.Timeout(timeout, connect=min(self.connect_timeout, timeout)),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if remaining() <= 0:
+                        raise exceeded()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    yield json.loads(data)
+        except httpx.TimeoutException as e:
+            raise exceeded(e)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def aclose(self) -> None:
+        """Tutup semua koneksi di pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik client untuk monitoring."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_connections": self.limits.max_connections,
+            "deadline_seconds": self.deadline,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+
+# Singleton client untuk seluruh aplikasi
+ai_client = AIClient()
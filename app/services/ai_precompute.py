@@ -0,0 +1,573 @@
+"""
+AI Precompute - Job background untuk menyiapkan analisis AI yang populer
+
+Analisis AI baru dibuat saat diminta, jadi pengunjung pertama sebuah
+pasangan menunggu seluruh latency model. Modul ini:
+
+1. Mencatat permintaan /compare/ai (pasangan device) dan /recommendation/ai
+   (parameter rekomendasi) di PopularityTracker
+2. Di luar jam sibuk (AI_PRECOMPUTE_WINDOW), setiap
+   AI_PRECOMPUTE_INTERVAL_SECONDS mengambil key paling populer dan menghitung
+   analisis AI yang belum ada di ai_response_cache
+3. Dibatasi AI_PRECOMPUTE_RPM request per menit (jarak antar request rata);
+   jika AI API membalas 429, job berhenti sementara dengan backoff
+   eksponensial (atau sesuai header Retry-After)
+
+Hasilnya disimpan di ai_response_cache, jadi /compare/ai dan
+/recommendation/ai langsung menjawab dari storage.
+
+Job tidak aktif secara default (AI_PRECOMPUTE_ENABLED). Jika aktif, hanya
+1 proses yang menjalankannya: worker yang mendapat file lock
+AI_PRECOMPUTE_LOCK_PATH. Tanpa lock, setiap worker gunicorn menjalankan job
+sendiri dan budget AI_PRECOMPUTE_RPM terpakai berkali lipat.
+
+Karena setiap worker hanya menerima sebagian traffic, hitungan popularitas
+dibagi lewat tabel ai_popularity di file SQLite ai_response_cache: setiap
+worker menjumlahkan hitungannya ke tabel setiap AI_PRECOMPUTE_FLUSH_SECONDS,
+dan job membaca total semua worker sebelum memilih key.
+
+Request job memakai circuit breaker terpisah per provider
+(ProviderPool.call_once), jadi 429 dari job tidak membuka circuit untuk
+request /compare/ai dan /recommendation/ai.
+
+Author: Kelompok COMPARELY
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import IO, Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa file lock, job berjalan di setiap proses
+    fcntl = None
+
+from ..core.config import (
+    AI_PRECOMPUTE_BACKOFF_MAX_SECONDS,
+    AI_PRECOMPUTE_BACKOFF_SECONDS,
+    AI_PRECOMPUTE_BATCH_SIZE,
+    AI_PRECOMPUTE_ENABLED,
+    AI_PRECOMPUTE_FLUSH_SECONDS,
+    AI_PRECOMPUTE_INTERVAL_SECONDS,
+    AI_PRECOMPUTE_LOCK_PATH,
+    AI_PRECOMPUTE_MIN_REQUESTS,
+    AI_PRECOMPUTE_RPM,
+    AI_PRECOMPUTE_TRACK_MAX_KEYS,
+    AI_PRECOMPUTE_WINDOW,
+    AI_RESPONSE_CACHE_PATH,
+)
+from ..database import SessionLocal
+from . import ai as ai_service
+from . import comparison_service, recommendation_service
+from .ai_client import AIDeadlineExceeded
+from .ai_providers import provider_pool
+from .circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Hitungan popularitas dikali faktor ini setiap putaran, supaya key yang
+# dulu ramai lama-lama digantikan yang sedang ramai
+POPULARITY_DECAY = 0.9
+
+# Key dengan hitungan di bawah ini dibuang saat decay
+POPULARITY_MIN_COUNT = 0.5
+
+_POPULARITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_popularity (
+    key TEXT PRIMARY KEY,
+    count REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ai_popularity_count ON ai_popularity (count);
+"""
+
+
+def comparison_key(id1: int, id2: int) -> Tuple:
+    """Key popularitas untuk pasangan perbandingan (urutan id tidak penting)."""
+    return ("compare", min(id1, id2), max(id1, id2))
+
+
+def recommendation_key(
+    max_price: Optional[float],
+    category_id: Optional[int],
+    min_release_year: Optional[int],
+    limit: int,
+    use_case: Optional[str]
+) -> Tuple:
+    """Key popularitas untuk parameter /recommendation/ai."""
+    return ("recommend", max_price, category_id, min_release_year, limit, use_case)
+
+
+def parse_window(window: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse jendela jam "mulai-selesai" (misal "1-6" atau "22-6").
+
+    Returns:
+        Tuple (jam mulai, jam selesai), None = kapan saja
+
+    Raises:
+        ValueError: Jika format tidak valid
+    """
+    window = window.strip()
+    if not window:
+        return None
+    start, end = (int(part) for part in window.split("-"))
+    if not (0 <= start <= 23 and 0 <= end <= 24):
+        raise ValueError(f"Jendela jam tidak valid: {window}")
+    return start, end
+
+
+def in_window(hour: int, window: Optional[Tuple[int, int]]) -> bool:
+    """True jika jam ada di dalam jendela (selesai tidak termasuk)."""
+    if window is None:
+        return True
+    start, end = window
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end  # Melewati tengah malam
+
+
+def retry_delay(error: httpx.HTTPStatusError, backoff: float) -> float:
+    """Lama menunggu setelah 429: header Retry-After (detik) jika ada, atau backoff."""
+    retry_after = error.response.headers.get("Retry-After", "")
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        return backoff
+
+
+def _encode_key(key: Hashable) -> str:
+    """Key popularitas (tuple / string) -> teks untuk tabel ai_popularity."""
+    return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+
+def _decode_key(raw: str) -> Hashable:
+    value = json.loads(raw)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _top_items(counts: Dict[Hashable, float], n: int) -> Dict[Hashable, float]:
+    return dict(heapq.nlargest(n, counts.items(), key=lambda item: item[1]))
+
+
+class PopularityTracker:
+    """
+    Hitungan permintaan per key dengan decay.
+
+    Dengan path, hitungan dibagi antar proses lewat tabel ai_popularity:
+    record() hanya menambah hitungan di memory, flush() menjumlahkan
+    hitungan baru ke tabel, dan load() mengganti hitungan di memory dengan
+    total semua proses. Tanpa path, hitungan hanya di memory proses ini.
+
+    Attributes:
+        max_keys: Maksimal key yang disimpan (yang paling jarang dibuang)
+        path: File SQLite bersama (None = hanya memory)
+    """
+
+    def __init__(self, max_keys: int, path: Optional[str] = None):
+        self.max_keys = max_keys
+        self.path = path
+        self.counts: Dict[Hashable, float] = {}
+        self._pending: Dict[Hashable, float] = {}  # Belum di-flush ke tabel
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+    def record(self, key: Hashable) -> None:
+        """Catat 1 permintaan."""
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0.0) + 1.0
+            if len(self.counts) > 2 * self.max_keys:
+                self.counts = _top_items(self.counts, self.max_keys)
+            if self.path is not None:
+                self._pending[key] = self._pending.get(key, 0.0) + 1.0
+                if len(self._pending) > 2 * self.max_keys:
+                    self._pending = _top_items(self._pending, self.max_keys)
+
+    def top(self, n: int, min_count: float = 0.0) -> List[Hashable]:
+        """Key paling populer (hitungan >= min_count), terbanyak dulu."""
+        with self._lock:
+            items = [item for item in self.counts.items() if item[1] >= min_count]
+        return [key for key, _ in heapq.nlargest(n, items, key=lambda item: item[1])]
+
+    def decay(self, factor: float = POPULARITY_DECAY) -> None:
+        """Kalikan semua hitungan dengan factor, buang yang sudah kecil."""
+        with self._lock:
+            self.counts = {
+                key: count * factor
+                for key, count in self.counts.items()
+                if count * factor >= POPULARITY_MIN_COUNT
+            }
+        if self.path is None:
+            return
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("UPDATE ai_popularity SET count = count * ?", (factor,))
+                conn.execute("DELETE FROM ai_popularity WHERE count < ?", (POPULARITY_MIN_COUNT,))
+                # Hanya max_keys key teratas yang disimpan
+                conn.execute(
+                    "DELETE FROM ai_popularity WHERE count < "
+                    "(SELECT count FROM ai_popularity ORDER BY count DESC LIMIT 1 OFFSET ?)",
+                    (self.max_keys,)
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    def forget(self, key: Hashable) -> None:
+        """Buang key (misal device sudah dihapus)."""
+        with self._lock:
+            self.counts.pop(key, None)
+            self._pending.pop(key, None)
+        if self.path is not None:
+            with self._db_lock:
+                self._connect().execute("DELETE FROM ai_popularity WHERE key = ?", (_encode_key(key),))
+
+    # ==================== SHARED COUNTS ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_POPULARITY_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def flush(self) -> int:
+        """
+        Jumlahkan hitungan baru proses ini ke tabel bersama (sinkron, panggil
+        lewat run_in_threadpool).
+
+        Returns:
+            Jumlah key yang di-flush
+        """
+        if self.path is None:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with self._db_lock:
+                self._connect().executemany(
+                    "INSERT INTO ai_popularity (key, count) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET count = count + excluded.count",
+                    [(_encode_key(key), count) for key, count in pending.items()]
+                )
+        except sqlite3.Error:
+            with self._lock:  # Coba lagi di flush berikutnya
+                for key, count in pending.items():
+                    self._pending[key] = self._pending.get(key, 0.0) + count
+            raise
+        return len(pending)
+
+    def load(self) -> None:
+        """Flush, lalu ganti hitungan di memory dengan total semua proses."""
+        if self.path is None:
+            return
+        self.flush()
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT key, count FROM ai_popularity ORDER BY count DESC LIMIT ?", (self.max_keys,)
+            ).fetchall()
+        counts = {_decode_key(key): count for key, count in rows}
+        with self._lock:
+            self.counts = counts
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PrecomputeScheduler:
+    """
+    Job asyncio yang menghitung analisis AI populer di luar jam sibuk.
+
+    Attributes:
+        tracker: PopularityTracker sumber key
+        rpm: Budget request AI per menit
+        window: Jendela jam (parse_window), None = kapan saja
+    """
+
+    def __init__(
+        self,
+        tracker: PopularityTracker,
+        rpm: float = AI_PRECOMPUTE_RPM,
+        window: str = AI_PRECOMPUTE_WINDOW,
+        interval: float = AI_PRECOMPUTE_INTERVAL_SECONDS,
+        batch_size: int = AI_PRECOMPUTE_BATCH_SIZE,
+        min_requests: int = AI_PRECOMPUTE_MIN_REQUESTS,
+        backoff_base: float = AI_PRECOMPUTE_BACKOFF_SECONDS,
+        backoff_max: float = AI_PRECOMPUTE_BACKOFF_MAX_SECONDS
+    ):
+        self.tracker = tracker
+        self.rpm = rpm
+        self.window = parse_window(window)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.min_requests = min_requests
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.backoff = backoff_base
+        self.paused_until = 0.0
+        self._next_request_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.requests = 0
+        self.stored = 0
+        self.skipped_cached = 0
+        self.failures = 0
+        self.rate_limited = 0
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> None:
+        """Jalankan job di event loop yang sedang berjalan (startup aplikasi)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Hentikan job (shutdown aplikasi)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        """Loop utama: 1 putaran setiap interval, hanya di dalam jendela jam."""
+        while True:
+            try:
+                if in_window(datetime.now().hour, self.window):
+                    await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"AI precompute gagal: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ==================== PRECOMPUTE ====================
+
+    async def run_once(self) -> int:
+        """
+        1 putaran: hitung analisis untuk key populer yang belum di-cache.
+
+        Returns:
+            Jumlah analisis yang disimpan
+        """
+        self.runs += 1
+        stored = 0
+        await run_in_threadpool(self.tracker.load)  # Hitungan semua worker
+        for key in self.tracker.top(self.batch_size, self.min_requests):
+            if time.monotonic() < self.paused_until:
+                break  # Masih backoff setelah 429, lanjut putaran berikutnya
+            try:
+                if await self._precompute(key):
+                    stored += 1
+                    self.backoff = self.backoff_base
+            except CircuitOpenError:
+                break  # AI sedang bermasalah, coba lagi putaran berikutnya
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 429:
+                    self.failures += 1
+                    continue
+                self.rate_limited += 1
+                self.paused_until = time.monotonic() + retry_delay(e, self.backoff)
+                self.backoff = min(self.backoff * 2, self.backoff_max)
+                break
+            except (AIDeadlineExceeded, httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+                self.failures += 1
+                logger.warning(f"AI precompute {key} gagal: {e}")
+        await run_in_threadpool(self.tracker.decay)
+        self.stored += stored
+        return stored
+
+    async def _precompute(self, key: Tuple) -> bool:
+        """
+        Hitung 1 key. Data dari database diambil di threadpool (koneksi
+        dilepas sebelum menunggu AI), lalu 1 request AI tanpa hedge.
+
+        Returns:
+            True jika analisis baru disimpan
+        """
+        loaded = await run_in_threadpool(self._load, key)
+        if loaded is None:
+            return False
+        precompute, args = loaded
+        await self._wait_for_budget()
+        self.requests += 1
+        return await precompute(*args)
+
+    def _load(self, key: Tuple) -> Optional[Tuple[Callable[..., Awaitable[bool]], Tuple]]:
+        """
+        Ambil data 1 key dari database dan cek ai_response_cache (sinkron,
+        dipanggil lewat run_in_threadpool).
+
+        Returns:
+            Tuple (fungsi precompute, argumen), atau None jika device sudah
+            dihapus, tidak ada hasil, atau analisis sudah ada di cache
+        """
+        db = SessionLocal()
+        try:
+            if key[0] == "compare":
+                try:
+                    pair = comparison_service.load_pair(db, key[1], key[2])
+                except ValueError:
+                    self.tracker.forget(key)  # Device sudah dihapus
+                    return None
+                is_cached = ai_service.is_comparison_cached
+                precompute = ai_service.precompute_comparison
+                args = pair
+            else:
+                _, max_price, category_id, min_release_year, limit, use_case = key
+                devices = recommendation_service.get_recommendations(
+                    db=db,
+                    max_price=max_price,
+                    category_id=category_id,
+                    min_release_year=min_release_year,
+                    limit=limit,
+                    use_case=use_case
+                )
+                if not devices:
+                    return None
+                is_cached = ai_service.is_recommendation_cached
+                precompute = ai_service.precompute_recommendation
+                args = (devices, use_case, max_price)
+        finally:
+            db.close()
+
+        if is_cached(*args):
+            self.skipped_cached += 1
+            return None
+        return precompute, args
+
+    async def _wait_for_budget(self) -> None:
+        """Jaga jarak antar request AI: maksimal rpm request per menit."""
+        now = time.monotonic()
+        wait = self._next_request_at - now
+        self._next_request_at = max(now, self._next_request_at) + 60.0 / self.rpm
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik job untuk monitoring."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "window": f"{self.window[0]}-{self.window[1]}" if self.window else None,
+            "rpm": self.rpm,
+            "tracked_keys": len(self.tracker.counts),
+            "runs": self.runs,
+            "requests": self.requests,
+            "stored": self.stored,
+            "skipped_cached": self.skipped_cached,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+        }
+
+
+# Singleton untuk seluruh aplikasi (hitungan dibagi lewat file ai_response_cache)
+popularity = PopularityTracker(max_keys=AI_PRECOMPUTE_TRACK_MAX_KEYS, path=AI_RESPONSE_CACHE_PATH)
+scheduler = PrecomputeScheduler(popularity)
+
+
+_lock_file: Optional[IO] = None
+_flush_task: Optional[asyncio.Task] = None
+
+
+def acquire_lock(path: str = AI_PRECOMPUTE_LOCK_PATH) -> bool:
+    """
+    Ambil file lock job (non-blocking). Lock dilepas otomatis saat proses
+    berhenti, jadi worker pengganti bisa mengambilnya lagi.
+
+    Returns:
+        True jika proses ini yang menjalankan job
+    """
+    global _lock_file
+    if _lock_file is not None or fcntl is None:
+        return True
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lock_file = open(path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def release_lock() -> None:
+    """Lepas file lock job."""
+    global _lock_file
+    if _lock_file is not None:
+        _lock_file.close()  # Menutup file melepas flock
+        _lock_file = None
+
+
+async def _flush_loop(interval: float) -> None:
+    """Flush hitungan popularitas proses ini ke tabel bersama secara berkala."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(popularity.flush)
+        except sqlite3.Error as e:
+            logger.warning(f"Flush popularitas AI precompute gagal: {e}")
+
+
+def start() -> None:
+    """
+    Jika diaktifkan dan AI API key tersedia: setiap worker mulai flush
+    hitungan popularitas, dan worker yang mendapat lock menjalankan job.
+    """
+    global _flush_task
+    if not (AI_PRECOMPUTE_ENABLED and provider_pool.configured()):
+        return
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.get_running_loop().create_task(_flush_loop(AI_PRECOMPUTE_FLUSH_SECONDS))
+    if not acquire_lock():
+        logger.info("AI precompute berjalan di proses lain")
+        return
+    scheduler.start()
+
+
+async def stop() -> None:
+    """Hentikan job, flush hitungan terakhir dan lepas lock (shutdown aplikasi)."""
+    global _flush_task
+    await scheduler.stop()
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+        try:
+            await run_in_threadpool(popularity.flush)
+        except sqlite3.Error as e:
+            logger.warning(f"Flush popularitas AI precompute gagal: {e}")
+    release_lock()
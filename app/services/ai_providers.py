@@ -0,0 +1,483 @@
+"""
+AI Providers - Daftar provider AI berurutan dengan hedged request
+
+Sebelumnya AI_API_URL dan AI_MODEL menunjuk 1 provider saja, jadi tail
+latency /compare/ai sama dengan p99 provider itu. Modul ini:
+
+- AIProvider: 1 endpoint chat completion (format OpenAI-compatible) dengan
+  circuit breaker dan catatan latency sendiri
+- ProviderPool: provider berurutan (AI_PROVIDERS, pertama = primary).
+  ProviderPool.chat menjalankan hedged request:
+  1. Panggil primary
+  2. Jika belum menjawab setelah persentil latency primary
+     (AI_HEDGE_PERCENTILE dari AI_HEDGE_SAMPLE_SIZE panggilan sukses terakhir),
+     panggil provider berikutnya juga
+  3. Jawaban sukses pertama dipakai, panggilan lain dibatalkan
+  Provider yang gagal langsung digantikan provider berikutnya (failover);
+  provider yang circuit-nya open dilewati.
+
+Jadi hanya ~(100 - AI_HEDGE_PERCENTILE)% request yang memanggil 2 provider,
+tapi request yang tersangkut di ekor latency primary tidak menunggu sampai
+deadline.
+
+Author: Kelompok COMPARELY
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from ..core.config import (
+    AI_API_KEY,
+    AI_API_URL,
+    AI_HEDGE_DELAY_SECONDS,
+    AI_HEDGE_ENABLED,
+    AI_HEDGE_MIN_DELAY_SECONDS,
+    AI_HEDGE_MIN_SAMPLES,
+    AI_HEDGE_PERCENTILE,
+    AI_HEDGE_SAMPLE_SIZE,
+    AI_MODEL,
+    AI_PROVIDERS,
+)
+from .ai_client import AIClient, AIDeadlineExceeded, ai_client
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# Error panggilan yang membuat provider dianggap gagal (dan memicu failover)
+PROVIDER_ERRORS = (AIDeadlineExceeded, httpx.HTTPError, KeyError, IndexError, ValueError)
+
+
+class AIProvider:
+    """
+    1 provider chat completion.
+
+    Attributes:
+        name: Nama untuk log / monitoring
+        url: Endpoint chat completion
+        model: Nama model
+        api_key: API key (kosong = provider tidak dipakai)
+        breaker: Circuit breaker khusus provider ini (request user)
+        background_breaker: Circuit breaker terpisah untuk job background
+            (call_background), supaya 429 dari job tidak membuka circuit
+            untuk request user
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        model: str,
+        api_key: str,
+        breaker: Optional[CircuitBreaker] = None,
+        client: Optional[AIClient] = None,
+        sample_size: int = AI_HEDGE_SAMPLE_SIZE
+    ):
+        self.name = name
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+        self.breaker = breaker or CircuitBreaker()
+        self.background_breaker = CircuitBreaker()
+        self.client = client or ai_client
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.wins = 0
+
+    def request(self, messages: List[Dict], temperature: float, stream: bool) -> Tuple[Dict, Dict]:
+        """Header dan payload request chat completion."""
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        payload = {
+            "messages": messages,
+            "model": self.model,
+            "stream": stream,
+            "temperature": temperature
+        }
+        return headers, payload
+
+    # ==================== CALLS ====================
+
+    async def chat(self, messages: List[Dict], temperature: float, deadline: Optional[float]) -> str:
+        """
+        1 panggilan chat completion, tanpa circuit breaker.
+
+        Raises:
+            AIDeadlineExceeded, httpx.HTTPError: Jika panggilan gagal
+            KeyError, IndexError, ValueError: Jika format response tidak sesuai
+        """
+        headers, payload = self.request(messages, temperature, stream=False)
+        data = await self.client.post_json(self.url, payload, headers=headers, deadline=deadline)
+        return data['choices'][0]['message']['content']
+
+    async def call(self, messages: List[Dict], temperature: float, deadline: Optional[float]) -> str:
+        """
+        Seperti chat, tapi hasilnya dicatat di breaker dan latency provider.
+        Tanpa deadline, dipakai deadline adaptif dari breaker.
+
+        Panggilan yang dibatalkan (kalah hedge) dicatat dengan waktu sampai
+        dibatalkan (batas bawah latency-nya): tanpa ini provider yang makin
+        lambat tidak pernah menyumbang sampel, hedge delay tertahan di latency
+        lama dan breaker-nya tidak pernah open. Jika sudah melewati batas
+        panggilan lambat breaker, dicatat sebagai gagal.
+        """
+        if deadline is None:
+            deadline = self.breaker.deadline()
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            content = await self.chat(messages, temperature, deadline)
+        except PROVIDER_ERRORS:
+            self.breaker.record_failure(time.monotonic() - started)
+            raise
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - started
+            self.record_latency(elapsed)
+            if elapsed >= self.breaker.slow_call_seconds:
+                self.breaker.record_failure(elapsed)
+            else:
+                self.breaker.record_success(elapsed)
+            raise
+        latency = time.monotonic() - started
+        self.breaker.record_success(latency)
+        self.record_latency(latency)
+        return content
+
+    async def call_background(self, messages: List[Dict], temperature: float, deadline: Optional[float]) -> str:
+        """
+        Seperti call, tapi hasilnya hanya dicatat di background_breaker.
+        Latency tidak dicatat (tidak mempengaruhi hedge delay request user).
+        """
+        if deadline is None:
+            deadline = self.background_breaker.deadline()
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            content = await self.chat(messages, temperature, deadline)
+        except PROVIDER_ERRORS:
+            self.background_breaker.record_failure(time.monotonic() - started)
+            raise
+        self.background_breaker.record_success(time.monotonic() - started)
+        return content
+
+    async def stream(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        deadline: Optional[float]
+    ) -> AsyncIterator[str]:
+        """
+        Stream chat completion: yield potongan teks (token) begitu tiba.
+        Hasil dicatat di breaker seperti call.
+        """
+        if deadline is None:
+            deadline = self.breaker.deadline()
+        headers, payload = self.request(messages, temperature, stream=True)
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            async for chunk in self.client.stream_json(self.url, payload, headers=headers, deadline=deadline):
+                choices = chunk.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+        except (AIDeadlineExceeded, httpx.HTTPError, ValueError):
+            self.breaker.record_failure(time.monotonic() - started)
+            raise
+        self.breaker.record_success(time.monotonic() - started)
+
+    # ==================== LATENCY ====================
+
+    def record_latency(self, latency: float) -> None:
+        """Catat latency panggilan sukses (detik)."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def latency_percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        """Persentil latency sukses terakhir, None jika sampel < min_samples."""
+        with self._lock:
+            latencies = list(self._latencies)
+        if len(latencies) < max(min_samples, 1):
+            return None
+        return float(np.percentile(latencies, q))
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik provider untuk monitoring."""
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "name": self.name,
+            "model": self.model,
+            "configured": bool(self.api_key),
+            "requests": self.requests,
+            "wins": self.wins,
+            "latency_samples": len(self._latencies),
+            "latency_p50_seconds": round(p50, 3) if p50 is not None else None,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+            "circuit_breaker": self.breaker.stats(),
+            "background_circuit_breaker": self.background_breaker.stats(),
+        }
+
+
+class ProviderPool:
+    """
+    Provider berurutan dengan hedged request dan failover.
+
+    Attributes:
+        providers: Provider berurutan, pertama = primary
+        hedge_enabled: False = provider berikutnya hanya dipanggil saat gagal
+        hedge_percentile: Persentil latency sebelum hedge
+    """
+
+    def __init__(
+        self,
+        providers: List[AIProvider],
+        hedge_enabled: bool = AI_HEDGE_ENABLED,
+        hedge_percentile: float = AI_HEDGE_PERCENTILE,
+        default_delay: float = AI_HEDGE_DELAY_SECONDS,
+        min_delay: float = AI_HEDGE_MIN_DELAY_SECONDS,
+        min_samples: int = AI_HEDGE_MIN_SAMPLES
+    ):
+        if not providers:
+            raise ValueError("Minimal 1 provider AI")
+        self.providers = providers
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.failovers = 0
+
+    @property
+    def primary(self) -> AIProvider:
+        """Provider pertama (modelnya dipakai untuk key cache)."""
+        return self.providers[0]
+
+    def configured(self) -> bool:
+        """True jika minimal 1 provider punya API key."""
+        return any(provider.api_key for provider in self.providers)
+
+    def hedge_delay(self, provider: AIProvider) -> float:
+        """Lama menunggu provider sebelum provider berikutnya ikut dipanggil (detik)."""
+        percentile = provider.latency_percentile(self.hedge_percentile, self.min_samples)
+        if percentile is None:
+            return self.default_delay
+        return max(self.min_delay, percentile)
+
+    def _candidates(self) -> Iterator[AIProvider]:
+        """
+        Provider yang boleh dipanggil, berurutan. allow_request baru dicek saat
+        provider benar-benar akan dipanggil (percobaan half_open hanya 1).
+        """
+        for provider in self.providers:
+            if provider.api_key and provider.breaker.allow_request():
+                yield provider
+
+    # ==================== CALLS ====================
+
+    async def chat(self, messages: List[Dict], temperature: float = 0.7, deadline: Optional[float] = None) -> str:
+        """
+        Hedged chat completion.
+
+        Args:
+            messages: List of message dicts dengan role & content
+            temperature: Kreativitas AI
+            deadline: Deadline total (detik); None = deadline adaptif per provider
+
+        Returns:
+            Jawaban provider yang sukses pertama
+
+        Raises:
+            CircuitOpenError: Jika tidak ada provider yang boleh dipanggil
+            AIDeadlineExceeded, httpx.HTTPError, ...: Error provider terakhir
+                jika semua provider gagal
+        """
+        self.requests += 1
+        started = time.monotonic()
+        candidates = self._candidates()
+        tasks: Dict[asyncio.Task, AIProvider] = {}
+        last_launched: Optional[AIProvider] = None
+        last_error: Optional[Exception] = None
+
+        def launch() -> bool:
+            nonlocal last_launched
+            remaining = None if deadline is None else deadline - (time.monotonic() - started)
+            if remaining is not None and remaining <= 0:
+                return False
+            provider = next(candidates, None)
+            if provider is None:
+                return False
+            task = asyncio.ensure_future(provider.call(messages, temperature, remaining))
+            tasks[task] = provider
+            last_launched = provider
+            return True
+
+        if not launch():
+            raise CircuitOpenError("Semua provider AI sedang tidak tersedia (circuit open)")
+
+        exhausted = False
+        try:
+            while tasks:
+                timeout = None
+                if self.hedge_enabled and not exhausted:
+                    timeout = self.hedge_delay(last_launched)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Ekor latency: panggil provider berikutnya, tunggu yang pertama
+                    if launch():
+                        self.hedged += 1
+                    else:
+                        exhausted = True
+                    continue
+
+                for task in done:
+                    provider = tasks.pop(task)
+                    try:
+                        content = task.result()
+                    except PROVIDER_ERRORS as e:
+                        last_error = e
+                        continue
+                    provider.wins += 1
+                    return content
+
+                if not tasks:
+                    # Semua yang berjalan gagal: failover ke provider berikutnya
+                    if launch():
+                        self.failovers += 1
+                    else:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if last_error is None:
+            raise AIDeadlineExceeded(f"AI tidak menjawab dalam {deadline} detik")
+        raise last_error
+
+    async def call_once(self, messages: List[Dict], temperature: float = 0.7, deadline: Optional[float] = None) -> str:
+        """
+        Tepat 1 request ke provider pertama yang boleh dipanggil, tanpa hedge
+        dan failover (untuk job background yang punya budget request).
+        Memakai background_breaker provider, bukan breaker request user.
+
+        Raises:
+            CircuitOpenError: Jika tidak ada provider yang boleh dipanggil
+            AIDeadlineExceeded, httpx.HTTPError, ...: Error provider tersebut
+        """
+        provider = next(
+            (p for p in self.providers if p.api_key and p.background_breaker.allow_request()), None
+        )
+        if provider is None:
+            raise CircuitOpenError("Semua provider AI sedang tidak tersedia (circuit open)")
+        self.requests += 1
+        content = await provider.call_background(messages, temperature, deadline)
+        provider.wins += 1
+        return content
+
+    async def stream(
+        self,
+        messages: List[Dict],
+        temperature: float = 0.7,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream dari provider pertama yang tersedia. Tidak di-hedge (token dari 2
+        provider tidak bisa digabung), tapi jika provider gagal sebelum token
+        pertama, provider berikutnya dicoba.
+
+        Raises:
+            CircuitOpenError: Jika tidak ada provider yang boleh dipanggil
+            AIDeadlineExceeded, httpx.HTTPError, ValueError: Jika stream gagal
+        """
+        self.requests += 1
+        last_error: Optional[Exception] = None
+        for provider in self._candidates():
+            if last_error is not None:
+                self.failovers += 1
+            received = False
+            try:
+                async for delta in provider.stream(messages, temperature, deadline):
+                    received = True
+                    yield delta
+            except (AIDeadlineExceeded, httpx.HTTPError, ValueError) as e:
+                if received:
+                    raise
+                last_error = e
+                continue
+            provider.wins += 1
+            return
+
+        if last_error is None:
+            raise CircuitOpenError("Semua provider AI sedang tidak tersedia (circuit open)")
+        raise last_error
+
+    # ==================== ADMIN ====================
+
+    def reset_breakers(self) -> None:
+        """Tutup circuit breaker semua provider (termasuk breaker job background)."""
+        for provider in self.providers:
+            provider.breaker.reset()
+            provider.background_breaker.reset()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik hedge dan per provider untuk monitoring."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "failovers": self.failovers,
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_percentile": self.hedge_percentile,
+            "providers": [
+                {**provider.stats(), "hedge_delay_seconds": round(self.hedge_delay(provider), 3)}
+                for provider in self.providers
+            ],
+        }
+
+
+def parse_providers(raw: str) -> List[AIProvider]:
+    """
+    Buat daftar provider dari JSON AI_PROVIDERS.
+
+    Setiap item: name, url, model, dan api_key atau api_key_env (nama env
+    variable yang berisi key). JSON kosong = 1 provider dari AI_API_URL,
+    AI_MODEL, AI_API_KEY.
+
+    Raises:
+        ValueError: Jika JSON atau item tidak valid
+    """
+    if not raw.strip():
+        return [AIProvider("default", AI_API_URL, AI_MODEL, AI_API_KEY)]
+
+    items = json.loads(raw)
+    if not isinstance(items, list) or not items:
+        raise ValueError("AI_PROVIDERS harus list JSON yang tidak kosong")
+
+    providers = []
+    for index, item in enumerate(items):
+        try:
+            api_key = item.get("api_key") or os.getenv(item.get("api_key_env", ""), "")
+            providers.append(AIProvider(
+                name=item.get("name") or f"provider-{index + 1}",
+                url=item["url"],
+                model=item["model"],
+                api_key=api_key
+            ))
+        except (AttributeError, KeyError) as e:
+            raise ValueError(f"AI_PROVIDERS item {index} tidak valid: {e}")
+    return providers
+
+
+# Singleton untuk seluruh aplikasi
+provider_pool = ProviderPool(parse_providers(AI_PROVIDERS))
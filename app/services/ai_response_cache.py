@@ -0,0 +1,269 @@
+"""
+AI Response Cache - Cache persisten (SQLite) untuk jawaban AI
+
+Pasangan device populer dibandingkan berulang kali, dan setiap kali prompt
+yang sama persis dikirim ke AI API (beberapa detik + kuota). Cache in-memory
+(comparison_cache) hilang saat restart dan tidak dibagi antar worker, jadi
+jawaban AI juga disimpan di file SQLite:
+
+    key = sha256(model, versi template prompt, jenis, field device di prompt)
+
+- Field device yang dipakai di prompt ikut di-hash, jadi perubahan data yang
+  mengubah prompt otomatis memakai key baru
+- Entry kedaluwarsa setelah AI_RESPONSE_CACHE_TTL_SECONDS
+- Jika jumlah entry / total ukuran melewati batas, entry yang paling lama
+  tidak dipakai dibuang (LRU berdasarkan accessed_at)
+- Entry device dibuang lewat catalog_events saat device di-edit / dihapus
+- File dibuka lazy saat pertama dipakai; mode WAL supaya aman dipakai
+  beberapa worker sekaligus
+
+Author: Kelompok COMPARELY
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..core.config import (
+    AI_RESPONSE_CACHE_MAX_ENTRIES,
+    AI_RESPONSE_CACHE_MAX_MB,
+    AI_RESPONSE_CACHE_PATH,
+    AI_RESPONSE_CACHE_TTL_SECONDS,
+)
+from . import catalog_events
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_responses (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ai_responses_accessed ON ai_responses (accessed_at);
+CREATE TABLE IF NOT EXISTS ai_response_devices (
+    key TEXT NOT NULL,
+    device_id INTEGER NOT NULL,
+    PRIMARY KEY (device_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_ai_response_devices_key ON ai_response_devices (key);
+"""
+
+
+def fingerprint(model: str, prompt_version: Any, kind: str, devices: List[Dict[str, Any]]) -> str:
+    """
+    Key cache: hash dari model, versi template prompt, jenis dan field device.
+
+    Args:
+        model: Nama model AI
+        prompt_version: Versi template prompt (naikkan jika template berubah)
+        kind: Jenis jawaban, misal "compare"
+        devices: Field setiap device yang dipakai di prompt (urutan penting)
+
+    Returns:
+        Hex digest sha256
+    """
+    raw = json.dumps([model, prompt_version, kind, devices], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """
+    Cache jawaban AI di SQLite dengan TTL dan batas ukuran.
+
+    Attributes:
+        path: Lokasi file SQLite
+        ttl_seconds: Umur maksimal entry
+        max_entries: Maksimal jumlah entry
+        max_bytes: Maksimal total ukuran jawaban
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # ==================== GET & PUT ====================
+
+    def get(self, key: str) -> Optional[str]:
+        """Ambil jawaban (None jika tidak ada / kedaluwarsa)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, created_at FROM ai_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._delete(conn, [key])
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE ai_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def contains(self, key: str) -> bool:
+        """True jika key ada dan belum kedaluwarsa (tanpa mengubah statistik / LRU)."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT created_at FROM ai_responses WHERE key = ?", (key,)
+            ).fetchone()
+            return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, key: str, kind: str, response: str, device_ids: Iterable[int]) -> None:
+        """Simpan jawaban untuk device tertentu, lalu terapkan batas ukuran."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_responses (key, kind, response, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, response, size, now, now),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO ai_response_devices (key, device_id) VALUES (?, ?)",
+                    [(key, device_id) for device_id in set(device_ids)],
+                )
+            self._enforce_limits(conn)
+
+    def _enforce_limits(self, conn: sqlite3.Connection) -> None:
+        """Buang entry kedaluwarsa, lalu entry paling lama tidak dipakai."""
+        expired = [row[0] for row in conn.execute(
+            "SELECT key FROM ai_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        )]
+        self._delete(conn, expired)
+
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ai_responses").fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM ai_responses ORDER BY accessed_at"):
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append(key)
+            entries -= 1
+            total -= size
+        self._delete(conn, victims)
+        self.evictions += len(victims)
+
+    def _delete(self, conn: sqlite3.Connection, keys: List[str]) -> None:
+        if not keys:
+            return
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany("DELETE FROM ai_responses WHERE key = ?", [(key,) for key in keys])
+            conn.executemany("DELETE FROM ai_response_devices WHERE key = ?", [(key,) for key in keys])
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate_devices(self, device_ids: Iterable[int]) -> int:
+        """
+        Buang semua jawaban yang melibatkan device ini.
+
+        Returns:
+            Jumlah entry yang dibuang
+        """
+        device_ids = list(device_ids)
+        if not device_ids or (self._conn is None and not os.path.exists(self.path)):
+            return 0  # Cache belum pernah dibuat, tidak ada yang dibuang
+        with self._lock:
+            conn = self._connect()
+            placeholders = ",".join("?" * len(device_ids))
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM ai_response_devices WHERE device_id IN ({placeholders})",
+                device_ids,
+            )]
+            self._delete(conn, keys)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Kosongkan cache (statistik tetap)."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM ai_responses")
+                conn.execute("DELETE FROM ai_response_devices")
+
+    def close(self) -> None:
+        """Tutup koneksi SQLite."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik cache untuk monitoring."""
+        with self._lock:
+            entries, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ai_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": total,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Singleton cache untuk seluruh aplikasi
+ai_response_cache = AIResponseCache(
+    path=AI_RESPONSE_CACHE_PATH,
+    ttl_seconds=AI_RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=AI_RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=int(AI_RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+)
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Buang jawaban AI untuk device yang di-edit atau dihapus."""
+    try:
+        ai_response_cache.invalidate_devices([data["id"] for data in changed] + list(deleted_ids))
+    except sqlite3.Error as e:
+        logger.warning(f"Gagal invalidasi AI response cache: {e}")
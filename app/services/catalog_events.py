@@ -0,0 +1,128 @@
+"""
+Catalog Events - Notifikasi perubahan data phones ke komponen in-memory
+
+Beberapa fitur menyimpan salinan katalog di memory (misal: index autocomplete).
+Modul ini memberi tahu mereka setiap kali phone dibuat, di-edit, atau dihapus,
+supaya index bisa di-update per device (incremental) tanpa rebuild penuh.
+
+Cara kerja:
+- Event SQLAlchemy `after_flush` mencatat phone yang berubah di session
+- Event `after_commit` mengirim perubahan ke semua listener
+- Jika transaksi di-rollback, perubahan dibuang (tidak dikirim)
+
+Bulk query (`query.update()` / `query.delete()`) tidak melewati unit-of-work,
+jadi router bulk memanggil publish_changed() / publish_deleted() secara manual.
+
+Author: Kelompok COMPARELY
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Phone
+
+logger = logging.getLogger(__name__)
+
+# Signature listener: listener(changed, deleted_ids)
+# - changed: list of dict snapshot kolom phone (hasil snapshot())
+# - deleted_ids: list of phone ID yang dihapus
+CatalogListener = Callable[[List[Dict[str, Any]], List[int]], None]
+
+_listeners: List[CatalogListener] = []
+
+# Key di session.info untuk menampung perubahan sampai commit
+_PENDING_KEY = "catalog_events_pending"
+
+
+# ==================== PUBLIC API ====================
+
+def subscribe(listener: CatalogListener) -> CatalogListener:
+    """
+    Daftarkan listener perubahan katalog. Bisa dipakai sebagai decorator.
+
+    Example:
+        @catalog_events.subscribe
+        def on_catalog_change(changed, deleted_ids):
+            ...
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def snapshot(phone: Phone) -> Dict[str, Any]:
+    """Salin semua kolom phone ke dict biasa (aman dipakai setelah session ditutup)."""
+    return {attr.key: getattr(phone, attr.key) for attr in inspect(Phone).column_attrs}
+
+
+def publish(changed: List[Dict[str, Any]], deleted_ids: Iterable[int]) -> None:
+    """Kirim perubahan ke semua listener. Error di listener hanya di-log."""
+    deleted_ids = list(deleted_ids)
+    if not changed and not deleted_ids:
+        return
+
+    for listener in list(_listeners):
+        try:
+            listener(changed, deleted_ids)
+        except Exception as e:
+            logger.exception(f"Catalog listener {listener.__name__} gagal: {e}")
+
+
+def publish_changed(db: Session, device_ids: Iterable[int]) -> None:
+    """
+    Kirim perubahan untuk device yang di-update lewat bulk query.
+    Data terbaru diambil ulang dari database dalam 1 query.
+    """
+    ids = list(device_ids)
+    if not ids:
+        return
+    phones = db.query(Phone).filter(Phone.id.in_(ids)).all()
+    publish([snapshot(phone) for phone in phones], [])
+
+
+def publish_deleted(device_ids: Iterable[int]) -> None:
+    """Kirim perubahan untuk device yang dihapus lewat bulk query."""
+    publish([], device_ids)
+
+
+# ==================== SQLALCHEMY HOOKS ====================
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    """
+    Catat phone yang berubah. Di after_flush, session.new/dirty/deleted masih
+    berisi state sebelum flush, dan ID phone baru sudah tersedia.
+    """
+    pending = session.info.setdefault(_PENDING_KEY, {"changed": {}, "deleted": set()})
+
+    for obj in session.new:
+        if isinstance(obj, Phone):
+            pending["changed"][obj.id] = snapshot(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, Phone) and session.is_modified(obj, include_collections=False):
+            pending["changed"][obj.id] = snapshot(obj)
+            pending["deleted"].discard(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, Phone):
+            pending["changed"].pop(obj.id, None)
+            pending["deleted"].add(obj.id)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _dispatch_changes(session):
+    """Kirim perubahan yang sudah ter-commit ke listener."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        publish(list(pending["changed"].values()), pending["deleted"])
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    """Buang perubahan dari transaksi yang gagal."""
+    session.info.pop(_PENDING_KEY, None)
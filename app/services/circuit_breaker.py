@@ -0,0 +1,232 @@
+"""
+Circuit Breaker - Pemutus panggilan AI saat provider lambat / error
+
+Tanpa breaker, saat AI provider lambat setiap request /compare/ai menunggu
+sampai deadline penuh dan worker menumpuk. Breaker mencatat hasil panggilan
+dalam jendela bergulir (AI_BREAKER_WINDOW_SECONDS):
+
+- error rate  : proporsi panggilan gagal (timeout, 5xx, 429, koneksi)
+- slow rate   : proporsi panggilan lebih lama dari AI_BREAKER_SLOW_CALL_SECONDS
+
+State:
+- closed    : panggilan normal
+- open      : salah satu rate melewati batas (minimal AI_BREAKER_MIN_CALLS
+              panggilan di jendela). Panggilan langsung ditolak selama
+              AI_BREAKER_OPEN_SECONDS; pemanggil memakai ringkasan rule-based
+- half_open : setelah itu 1 panggilan percobaan diizinkan. Berhasil ->
+              closed (jendela dikosongkan), gagal -> open lagi
+
+Setiap provider AI (ai_providers.py) punya breaker sendiri.
+
+Deadline adaptif: p95 latency panggilan sukses di jendela x
+AI_DEADLINE_LATENCY_MULTIPLIER, dibatasi antara AI_DEADLINE_MIN_SECONDS dan
+AI_REQUEST_DEADLINE_SECONDS. Jadi saat provider normal (misal 3 detik) request
+yang macet diputus jauh sebelum deadline maksimal.
+
+Author: Kelompok COMPARELY
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import (
+    AI_BREAKER_ERROR_RATE,
+    AI_BREAKER_MIN_CALLS,
+    AI_BREAKER_OPEN_SECONDS,
+    AI_BREAKER_SLOW_CALL_SECONDS,
+    AI_BREAKER_SLOW_RATE,
+    AI_BREAKER_WINDOW_SECONDS,
+    AI_DEADLINE_LATENCY_MULTIPLIER,
+    AI_DEADLINE_MIN_SECONDS,
+    AI_REQUEST_DEADLINE_SECONDS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Panggilan ditolak karena circuit sedang open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker dengan jendela bergulir error rate & latency.
+
+    Attributes:
+        state: closed / open / half_open
+        times_opened: Berapa kali circuit terbuka
+        rejected: Jumlah panggilan yang ditolak saat open
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = AI_BREAKER_WINDOW_SECONDS,
+        min_calls: int = AI_BREAKER_MIN_CALLS,
+        error_rate: float = AI_BREAKER_ERROR_RATE,
+        slow_call_seconds: float = AI_BREAKER_SLOW_CALL_SECONDS,
+        slow_rate: float = AI_BREAKER_SLOW_RATE,
+        open_seconds: float = AI_BREAKER_OPEN_SECONDS,
+        deadline_min: float = AI_DEADLINE_MIN_SECONDS,
+        deadline_max: float = AI_REQUEST_DEADLINE_SECONDS,
+        deadline_multiplier: float = AI_DEADLINE_LATENCY_MULTIPLIER
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.deadline_min = deadline_min
+        self.deadline_max = deadline_max
+        self.deadline_multiplier = deadline_multiplier
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._calls: Deque[Tuple[float, bool, float]] = deque()  # (waktu, sukses, latency)
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    # ==================== CALL FLOW ====================
+
+    def allow_request(self) -> bool:
+        """
+        True jika panggilan boleh dijalankan. Saat half_open hanya 1
+        panggilan percobaan yang diizinkan.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            if self.state == HALF_OPEN:
+                # Percobaan yang tidak pernah selesai (misal dibatalkan) tidak
+                # boleh mengunci breaker selamanya
+                if self._probe_started is None or now - self._probe_started > self.deadline_max:
+                    self._probe_started = now
+                    return True
+            if self.state != CLOSED:
+                self.rejected += 1
+                return False
+            return True
+
+    def check(self) -> None:
+        """
+        Seperti allow_request, tapi raise jika ditolak.
+
+        Raises:
+            CircuitOpenError: Jika circuit open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit AI {self.state}, coba lagi dalam {self.retry_in():.0f} detik")
+
+    def record_success(self, latency: float) -> None:
+        """Catat panggilan sukses (latency dalam detik)."""
+        self._record(True, latency)
+
+    def record_failure(self, latency: float) -> None:
+        """Catat panggilan gagal (latency dalam detik)."""
+        self._record(False, latency)
+
+    def _record(self, ok: bool, latency: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if ok:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    self._calls.append((now, ok, latency))
+                else:
+                    self._open(now)
+                return
+
+            self._calls.append((now, ok, latency))
+            self._prune(now)
+            if self.state == CLOSED and self._should_open():
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self._probe_started = None
+        self.times_opened += 1
+
+    def _prune(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _rates(self) -> Tuple[int, float, float]:
+        """(jumlah panggilan, error rate, slow rate) di jendela."""
+        total = len(self._calls)
+        if not total:
+            return 0, 0.0, 0.0
+        errors = sum(1 for _, ok, _ in self._calls if not ok)
+        slow = sum(1 for _, _, latency in self._calls if latency >= self.slow_call_seconds)
+        return total, errors / total, slow / total
+
+    def _should_open(self) -> bool:
+        total, error_rate, slow_rate = self._rates()
+        return total >= self.min_calls and (error_rate >= self.error_rate or slow_rate >= self.slow_rate)
+
+    # ==================== DEADLINE ====================
+
+    def _latency_percentile(self, q: float) -> Optional[float]:
+        latencies = [latency for _, ok, latency in self._calls if ok]
+        if len(latencies) < self.min_calls:
+            return None
+        return float(np.percentile(latencies, q))
+
+    def deadline(self) -> float:
+        """
+        Deadline adaptif untuk panggilan berikutnya (detik).
+        Belum cukup data -> deadline maksimal.
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            p95 = self._latency_percentile(95)
+        if p95 is None:
+            return self.deadline_max
+        return min(self.deadline_max, max(self.deadline_min, p95 * self.deadline_multiplier))
+
+    def retry_in(self) -> float:
+        """Sisa detik sampai circuit open boleh dicoba lagi."""
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+    def reset(self) -> None:
+        """Kembalikan ke closed dan kosongkan jendela (misal dari admin)."""
+        with self._lock:
+            self.state = CLOSED
+            self.opened_at = None
+            self._probe_started = None
+            self._calls.clear()
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik breaker untuk monitoring / halaman admin."""
+        deadline = self.deadline()
+        with self._lock:
+            total, error_rate, slow_rate = self._rates()
+            p50 = self._latency_percentile(50)
+            p95 = self._latency_percentile(95)
+        return {
+            "state": self.state,
+            "calls_in_window": total,
+            "window_seconds": self.window_seconds,
+            "error_rate": round(error_rate, 4),
+            "slow_rate": round(slow_rate, 4),
+            "latency_p50_seconds": round(p50, 3) if p50 is not None else None,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+            "deadline_seconds": round(deadline, 2),
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
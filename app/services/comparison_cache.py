@@ -0,0 +1,224 @@
+"""
+Comparison Cache - Cache hasil perbandingan per pasangan device (LRU)
+
+Traffic /compare/, /compare-page dan /compare/ai terkumpul di beberapa pasangan
+populer (misal "Galaxy S24 vs iPhone 15"), tapi setiap request menghitung ulang
+highlights dan memanggil AI dari awal. Modul ini menyimpan hasilnya di memory:
+
+    key = (jenis, id_kecil, version_kecil, id_besar, version_besar)
+
+- Pasangan tidak berurutan: (1, 2) dan (2, 1) memakai entry yang sama
+- Version device (kolom phones.version) naik setiap kali device di-update,
+  jadi entry lama otomatis tidak terpakai lagi, juga di worker lain
+- Entry untuk device yang di-edit/dihapus langsung dibuang lewat catalog_events
+  (admin edit, delete, bulk) supaya memory tidak terisi entry basi
+- LRU dengan 2 batas: jumlah entry dan total ukuran (byte, perkiraan pickle)
+
+Author: Kelompok COMPARELY
+"""
+
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import COMPARISON_CACHE_MAX_ENTRIES, COMPARISON_CACHE_MAX_MB
+from ..crud import device as device_crud
+from . import catalog_events
+
+CacheKey = Tuple[str, int, int, int, int]
+
+
+def make_key(kind: str, id1: int, version1: int, id2: int, version2: int) -> CacheKey:
+    """Key cache untuk pasangan device (urutan id1/id2 tidak berpengaruh)."""
+    if id1 > id2:
+        id1, version1, id2, version2 = id2, version2, id1, version1
+    return (kind, id1, version1, id2, version2)
+
+
+def _estimate_size(value: Any) -> int:
+    """Perkiraan ukuran value di memory (byte)."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class ComparisonCache:
+    """
+    LRU cache dengan batas jumlah entry dan total byte.
+
+    Attributes:
+        max_entries: Maksimal jumlah entry
+        max_bytes: Maksimal total ukuran entry
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, int]]" = OrderedDict()
+        self._by_device: Dict[int, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ==================== GET & PUT ====================
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Ambil value (None jika tidak ada). Entry jadi yang paling baru dipakai."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Simpan value, buang entry paling lama jika melewati batas."""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return  # Terlalu besar untuk di-cache
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, size)
+            self._bytes += size
+            for device_id in (key[1], key[3]):
+                self._by_device.setdefault(device_id, set()).add(key)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], Any], cacheable: Callable[[Any], bool] = None) -> Any:
+        """
+        Ambil dari cache, atau hitung lalu simpan.
+
+        Args:
+            key: Key dari make_key()
+            compute: Fungsi tanpa argumen yang menghasilkan value
+            cacheable: Opsional, return False untuk hasil yang tidak boleh
+                       disimpan (misal pesan error AI)
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self.put(key, value)
+        return value
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate_device(self, device_id: int) -> int:
+        """
+        Buang semua entry yang berisi device ini.
+
+        Returns:
+            Jumlah entry yang dibuang
+        """
+        with self._lock:
+            keys = list(self._by_device.get(device_id, ()))
+            for key in keys:
+                self._discard(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Kosongkan cache (statistik tetap)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_device.clear()
+            self._bytes = 0
+
+    def _discard(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        for device_id in (key[1], key[3]):
+            keys = self._by_device.get(device_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_device[device_id]
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik cache untuk monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Singleton cache untuk seluruh aplikasi
+comparison_cache = ComparisonCache(
+    max_entries=COMPARISON_CACHE_MAX_ENTRIES,
+    max_bytes=int(COMPARISON_CACHE_MAX_MB * 1024 * 1024),
+)
+
+
+def pair_key(db: Session, kind: str, id1: int, id2: int) -> CacheKey:
+    """
+    Key cache untuk pasangan device (hanya kolom id + version yang dibaca).
+
+    Raises:
+        ValueError: Jika salah satu atau kedua device tidak ditemukan
+    """
+    versions = device_crud.get_device_versions(db, [id1, id2])
+    if id1 not in versions or id2 not in versions:
+        raise ValueError("Salah satu atau kedua perangkat tidak ditemukan")
+    return make_key(kind, id1, versions[id1], id2, versions[id2])
+
+
+def get_pair(
+    db: Session,
+    kind: str,
+    id1: int,
+    id2: int,
+    compute: Callable[[], Any],
+    cacheable: Callable[[Any], bool] = None
+) -> Any:
+    """
+    Ambil hasil perbandingan pasangan device dari cache, atau hitung.
+
+    Args:
+        db: Database session
+        kind: Jenis hasil, misal "compare", "page", "ai"
+        id1, id2: ID kedua device
+        compute: Fungsi tanpa argumen yang menghitung hasil jika cache miss
+        cacheable: Opsional, filter hasil yang boleh disimpan
+
+    Raises:
+        ValueError: Jika salah satu atau kedua device tidak ditemukan
+    """
+    return comparison_cache.get_or_compute(pair_key(db, kind, id1, id2), compute, cacheable)
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Buang entry untuk device yang di-edit atau dihapus."""
+    for data in changed:
+        comparison_cache.invalidate_device(data["id"])
+    for device_id in deleted_ids:
+        comparison_cache.invalidate_device(device_id)
@@ -1,12 +1,18 @@
+import numpy as np
 from sqlalchemy.orm import Session
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from .. import models
 from ..crud import device as device_crud
+from ..utils.fields import PHONE_FIELDS, phone_to_dict
+from . import comparison_cache, highlight_rules
 
 def compare_two_devices(db: Session, device_id_1: int, device_id_2: int) -> Dict[str, Any]:
     """
     Membandingkan 2 device dan menghasilkan highlights keunggulan masing-masing.
     
+    Hasil disimpan di comparison_cache per pasangan device + version, jadi
+    pasangan populer tidak dihitung ulang sampai salah satu device berubah.
+    
     Args:
         db: Database session
         device_id_1: ID device pertama
@@ -14,40 +20,57 @@ def compare_two_devices(db: Session, device_id_1: int, device_id_2: int) -> Dict
     
     Returns:
         Dictionary berisi:
-        - device_1: Data device pertama
+        - device_1: Data device pertama (dict, lihat utils/fields.py)
         - device_2: Data device kedua
         - highlights: List keunggulan masing-masing device
     
     Raises:
         ValueError: Jika salah satu atau kedua device tidak ditemukan
     """
-    # Ambil data kedua device dari database
-    device1 = device_crud.get_device(db, device_id_1)
-    device2 = device_crud.get_device(db, device_id_2)
+    def compute():
+        # Ambil data kedua device dari database (1 query untuk keduanya)
+        device1, device2 = load_pair(db, device_id_1, device_id_2)
+        return {
+            "devices": {
+                device.id: phone_to_dict(device, PHONE_FIELDS)
+                for device in (device1, device2)
+            },
+            # Highlights simetris (menyebut nama pemenang), jadi aman dipakai
+            # untuk urutan id1/id2 yang terbalik
+            "highlights": generate_highlights(device1, device2)
+        }
+    
+    cached = comparison_cache.get_pair(db, "compare", device_id_1, device_id_2, compute)
+    return {
+        "device_1": dict(cached["devices"][device_id_1]),
+        "device_2": dict(cached["devices"][device_id_2]),
+        "highlights": list(cached["highlights"])
+    }
+
+
+def load_pair(db: Session, device_id_1: int, device_id_2: int) -> Tuple[models.Phone, models.Phone]:
+    """
+    Ambil 2 device (1 query) dalam urutan yang diminta.
+    
+    Raises:
+        ValueError: Jika salah satu atau kedua device tidak ditemukan
+    """
+    devices = {d.id: d for d in device_crud.get_devices_by_ids(db, [device_id_1, device_id_2])}
+    device1 = devices.get(device_id_1)
+    device2 = devices.get(device_id_2)
     
     # Validasi: pastikan kedua device ada
     if not device1 or not device2:
         raise ValueError("Salah satu atau kedua perangkat tidak ditemukan")
-    
-    # Generate highlights (keunggulan masing-masing)
-    highlights = generate_highlights(device1, device2)
-    
-    # FastAPI akan otomatis convert SQLAlchemy model ke JSON
-    # menggunakan Pydantic schema yang sudah di-set di router
-    return {
-        "device_1": device1,
-        "device_2": device2,
-        "highlights": highlights
-    }
+    return device1, device2
 
 
 def generate_highlights(device1: models.Phone, device2: models.Phone) -> List[str]:
     """
     Generate list highlights yang membandingkan keunggulan 2 device.
     
-    Logic sederhana untuk mahasiswa:
-    - Bandingkan harga (lebih murah = keunggulan)
-    - Bandingkan tahun rilis (lebih baru = keunggulan)
+    Memakai rule engine services/highlight_rules.py (harga, tahun rilis, RAM,
+    storage, kamera, baterai, layar) yang sama dengan halaman /compare-page.
     
     Args:
         device1: Device pertama
@@ -56,39 +79,141 @@ def generate_highlights(device1: models.Phone, device2: models.Phone) -> List[st
     Returns:
         List of string highlights
     """
-    highlights = []
-    
-    # 1. Bandingkan Harga
-    if device1.price and device2.price:
-        price_diff = abs(device1.price - device2.price)
-        
-        if device1.price < device2.price:
-            highlights.append(
-                f"{device1.name} lebih murah Rp {price_diff:,.0f}"
-            )
-        elif device2.price < device1.price:
-            highlights.append(
-                f"{device2.name} lebih murah Rp {price_diff:,.0f}"
-            )
-        # Jika sama, tidak ada highlight
-    
-    # 2. Bandingkan Tahun Rilis
-    if device1.release_year and device2.release_year:
-        if device1.release_year > device2.release_year:
-            highlights.append(
-                f"{device1.name} lebih baru (Rilis {device1.release_year})"
-            )
-        elif device2.release_year > device1.release_year:
-            highlights.append(
-                f"{device2.name} lebih baru (Rilis {device2.release_year})"
-            )
-    
-    # TODO: Bisa ditambahkan comparison lain seperti:
-    # - RAM (perlu parsing string "8GB" -> integer)
-    # - Storage (perlu parsing string "256GB" -> integer)
-    # - Benchmark scores (jika ada)
-    
-    return highlights
+    return [highlight.text for highlight in highlight_rules.evaluate(device1, device2)]
+
+
+# ==================== N-WAY COMPARISON ====================
+
+# Maksimal device per perbandingan (GET /compare/multi)
+MAX_COMPARE_DEVICES = 10
+
+# Spesifikasi numerik yang dibandingkan (sama dengan rule highlight):
+# (kolom, label, lebih besar lebih baik?, satuan)
+COMPARE_SPECS = [
+    (rule.key, rule.label, rule.higher_is_better, rule.unit)
+    for rule in highlight_rules.RULES
+]
+
+# Kolom yang nilainya bilangan bulat (sisanya float, misal screen_inch)
+_INTEGER_SPECS = {"price_idr", "release_year", "ram_gb", "storage_gb", "main_camera_mp", "battery_mah"}
+
+
+def parse_device_ids(raw: str) -> List[int]:
+    """
+    Parse "1,2,3" jadi list ID unik (urutan dipertahankan).
+    
+    Raises:
+        ValueError: Jika format salah, kurang dari 2, atau lebih dari MAX_COMPARE_DEVICES
+    """
+    try:
+        device_ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise ValueError("ids harus berupa angka dipisah koma")
+    
+    if len(device_ids) < 2:
+        raise ValueError("Minimal 2 device untuk dibandingkan")
+    if len(device_ids) > MAX_COMPARE_DEVICES:
+        raise ValueError(f"Maksimal {MAX_COMPARE_DEVICES} device untuk dibandingkan")
+    return device_ids
+
+
+def compare_many_devices(db: Session, device_ids: List[int]) -> Dict[str, Any]:
+    """
+    Membandingkan 2 sampai MAX_COMPARE_DEVICES device sekaligus.
+    
+    Semua device diambil dengan 1 query. Nilai spesifikasi diambil dari kolom
+    numerik yang sudah di-parse saat device disimpan (tanpa parsing string),
+    lalu pemenang, ranking dan selisih dihitung sebagai operasi array NumPy
+    untuk semua spesifikasi dan device sekaligus.
+    
+    Args:
+        db: Database session
+        device_ids: List ID device (lihat parse_device_ids)
+    
+    Returns:
+        Dictionary berisi:
+        - devices: List data device (dict) sesuai urutan device_ids
+        - specs: Per spesifikasi: key, label, unit, higher_is_better,
+          values, ranks (1 = terbaik), deltas (selisih dari nilai terbaik),
+          winners (list ID device terbaik)
+        - wins: Jumlah spesifikasi yang dimenangkan, per device
+    
+    Raises:
+        ValueError: Jika ada device yang tidak ditemukan
+    """
+    devices = device_crud.get_devices_by_ids(db, device_ids)
+    found = {device.id for device in devices}
+    missing = [device_id for device_id in device_ids if device_id not in found]
+    if missing:
+        raise ValueError(f"Perangkat tidak ditemukan: {', '.join(map(str, missing))}")
+    
+    stats = rank_specs(devices)
+    ids = np.array([device.id for device in devices])
+    
+    specs = []
+    for i, (key, label, higher_is_better, unit) in enumerate(COMPARE_SPECS):
+        specs.append({
+            "key": key,
+            "label": label,
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+            "values": _to_list(stats["values"][i], key in _INTEGER_SPECS),
+            "ranks": _to_list(stats["ranks"][i], True),
+            "deltas": _to_list(stats["deltas"][i], key in _INTEGER_SPECS),
+            "winners": ids[stats["winners"][i]].tolist(),
+        })
+    
+    return {
+        "devices": [phone_to_dict(device, PHONE_FIELDS) for device in devices],
+        "specs": specs,
+        "wins": stats["winners"].sum(axis=0).tolist(),
+    }
+
+
+def rank_specs(devices: List[models.Phone]) -> Dict[str, np.ndarray]:
+    """
+    Hitung nilai, ranking, selisih dan pemenang untuk setiap rule di
+    highlight_rules.RULES (nilai diambil dengan extractor rule yang sama).
+    
+    Semua hasil berbentuk array (jumlah spesifikasi x jumlah device).
+    Nilai kosong = NaN (ranking & selisih juga NaN, tidak pernah menang).
+    
+    Returns:
+        Dict berisi values, ranks, deltas (float) dan winners (bool)
+    """
+    values = np.array(
+        [[rule.extract(device) for device in devices] for rule in highlight_rules.RULES],
+        dtype=float  # None -> NaN
+    )
+    higher = np.array([rule.higher_is_better for rule in highlight_rules.RULES])[:, None]
+    valid = ~np.isnan(values)
+    
+    # Samakan arah: makin besar makin baik (harga dibalik tandanya)
+    score = np.where(valid, np.where(higher, values, -values), -np.inf)
+    best = score.max(axis=1, keepdims=True)
+    
+    # Ranking kompetisi: 1 + jumlah device yang lebih baik (seri = ranking sama)
+    ranks = 1 + (score[:, None, :] > score[:, :, None]).sum(axis=2)
+    ranks = np.where(valid, ranks, np.nan)
+    
+    # Selisih dari nilai terbaik dalam satuan asli (misal: +Rp 2.000.000, -4GB)
+    best_value = np.where(higher, best, -best)
+    deltas = np.where(valid, values - best_value, np.nan)
+    
+    # Pemenang hanya jika minimal 2 device punya nilai dan tidak semuanya seri
+    comparable = valid.sum(axis=1, keepdims=True) >= 2
+    all_equal = (np.where(valid, score, best) == best).all(axis=1, keepdims=True)
+    winners = valid & (score == best) & comparable & ~all_equal
+    
+    return {"values": values, "ranks": ranks, "deltas": deltas, "winners": winners}
+
+
+def _to_list(row: np.ndarray, as_int: bool) -> List[Optional[float]]:
+    """Array 1 baris -> list JSON (NaN -> None)."""
+    return [
+        None if np.isnan(value) else (int(value) if as_int else round(float(value), 2))
+        for value in row
+    ]
 
 
 def calculate_price_difference(device1: models.Phone, device2: models.Phone) -> float:
@@ -0,0 +1,301 @@
+"""
+Comparison Summary - Ringkasan perbandingan 2 device tanpa AI
+
+Analisis AI butuh beberapa detik dan kuota API. Modul ini membuat 5 bagian
+yang sama dengan analisis AI (performa, kamera, baterai, value_for_money,
+rekomendasi) dari kolom spesifikasi numerik hasil utils/spec_parser.py,
+memakai template kalimat. Nilai diambil dengan extractor
+services/highlight_rules.py, jadi tidak ada parsing teks dan 1 ringkasan
+selesai dalam hitungan mikrodetik.
+
+Dipakai untuk:
+- Halaman /compare-page: ringkasan langsung tampil, analisis AI hanya
+  diminta saat user menekan tombol "Analisis dengan AI"
+- services/ai.py: pengganti pesan error saat AI tidak tersedia (tanpa API
+  key, circuit open, atau provider error)
+
+Tabel phones tidak punya kolom skor benchmark, jadi performa diwakili RAM
+dan tahun rilis (generasi chipset), sama seperti skor rekomendasi
+(USE_CASE_WEIGHTS di core/config.py).
+
+Benchmark: python scripts/benchmarks/comparison_summary.py
+
+Author: Kelompok COMPARELY
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from . import highlight_rules
+
+# Bagian ringkasan: (key, judul yang ditampilkan). Sama dengan format JSON
+# analisis AI (services/ai.py), jadi keduanya tampil dengan cara yang sama
+SECTIONS = (
+    ("performa", "Performa"),
+    ("kamera", "Kamera"),
+    ("baterai", "Baterai"),
+    ("value_for_money", "Value for Money"),
+    ("rekomendasi", "Rekomendasi"),
+)
+
+# Keunggulan per spesifikasi untuk kalimat rekomendasi, urut prioritas
+STRENGTHS = (
+    ("price_idr", "harga lebih murah"),
+    ("release_year", "chipset lebih baru"),
+    ("ram_gb", "RAM lebih besar"),
+    ("main_camera_mp", "kamera lebih tajam"),
+    ("battery_mah", "baterai lebih awet"),
+    ("storage_gb", "storage lebih lega"),
+    ("screen_inch", "layar lebih lebar"),
+)
+
+# Maksimal keunggulan yang disebut per device
+MAX_STRENGTHS = 3
+
+_RULES = {rule.key: rule for rule in highlight_rules.RULES}
+
+# Hasil perbandingan 1 spesifikasi: (nilai device 1, nilai device 2, unggul)
+# unggul: 1 / 2 = device yang lebih baik, 0 = seri, None = salah satu kosong
+Spec = Tuple[Optional[float], Optional[float], Optional[int]]
+
+
+# ==================== TEMPLATES ====================
+
+PERFORMANCE_TEMPLATES = {
+    "lead": "{winner} unggul di performa: {reasons}.",
+    "split": (
+        "{ram_winner} punya RAM lebih besar ({ram_winner_value} vs {ram_loser_value}), "
+        "sedangkan {year_winner} memakai chipset lebih baru (rilis {year_winner_value} vs "
+        "{year_loser_value}); performa keduanya bersaing."
+    ),
+    "tie": "Performa keduanya setara: {reasons}.",
+    "missing": "Data RAM dan tahun rilis {device} belum lengkap, performa belum bisa dibandingkan.",
+}
+
+CAMERA_TEMPLATES = {
+    "lead": (
+        "Kamera utama {winner} beresolusi lebih tinggi ({winner_value} vs {loser_value}), "
+        "lebih leluasa untuk crop dan foto detail."
+    ),
+    "tie": "Kamera utama keduanya sama-sama {value}; hasil foto lebih ditentukan pemrosesan gambar.",
+    "missing": "Data kamera {device} belum tersedia, kamera belum bisa dibandingkan.",
+}
+
+BATTERY_TEMPLATES = {
+    "lead": (
+        "Baterai {winner} lebih besar ({winner_value} vs {loser_value}, +{percent}%), "
+        "lebih tahan untuk pemakaian seharian."
+    ),
+    "tie": "Kapasitas baterai keduanya sama ({value}).",
+    "missing": "Data baterai {device} belum tersedia, baterai belum bisa dibandingkan.",
+}
+
+VALUE_TEMPLATES = {
+    "cheaper": (
+        "{cheap} lebih murah Rp {diff:,.0f} ({percent}%) dengan spesifikasi yang tidak kalah "
+        "({cheap_wins} vs {pricey_wins} keunggulan), jadi value for money lebih baik."
+    ),
+    "pricier": (
+        "{pricey} lebih mahal Rp {diff:,.0f} ({percent}%), sebanding dengan {strengths}. "
+        "{cheap} lebih hemat jika hal itu bukan prioritas."
+    ),
+    "same_price": "Harga keduanya sama (Rp {price:,.0f}); {winner} unggul di {wins} spesifikasi, jadi lebih bernilai.",
+    "tie": "Harga dan spesifikasi keduanya seimbang, value for money setara.",
+    "missing": "Harga {device} belum tersedia, value for money belum bisa dinilai.",
+}
+
+RECOMMENDATION_TEMPLATES = {
+    "both": "Pilih {device1} jika mengutamakan {strengths1}. Pilih {device2} jika mengutamakan {strengths2}.",
+    "one": "Pilih {winner} karena unggul di {strengths} tanpa kalah di aspek lain yang dibandingkan.",
+    "tie": "Spesifikasi keduanya setara; pilih berdasarkan merek, desain, atau ketersediaan.",
+    "missing": "Data spesifikasi belum cukup untuk memberi rekomendasi; cek detail kedua device.",
+}
+
+
+# ==================== SUMMARY ====================
+
+def summarize(device1: Any, device2: Any) -> Dict[str, str]:
+    """
+    Ringkasan perbandingan 2 device.
+
+    Args:
+        device1: Device pertama (Phone atau object dengan atribut yang sama)
+        device2: Device kedua
+
+    Returns:
+        Dict key bagian (lihat SECTIONS) -> kalimat ringkasan
+    """
+    devices = (device1, device2)
+    specs = {}
+    for rule in highlight_rules.RULES:
+        value1 = rule.extract(device1)
+        value2 = rule.extract(device2)
+        specs[rule.key] = (value1, value2, _lead(rule.higher_is_better, value1, value2))
+
+    return {
+        "performa": _performance(devices, specs),
+        "kamera": _single_spec(devices, specs["main_camera_mp"], "main_camera_mp", CAMERA_TEMPLATES),
+        "baterai": _single_spec(devices, specs["battery_mah"], "battery_mah", BATTERY_TEMPLATES),
+        "value_for_money": _value_for_money(devices, specs),
+        "rekomendasi": _recommendation(devices, specs),
+    }
+
+
+def format_sections(sections: Mapping[str, str]) -> str:
+    """
+    Gabungkan bagian jadi text markdown ("**Performa:** ...", dst), format
+    yang sama dengan analisis AI. Bagian yang tidak ada ditulis "N/A".
+    """
+    return "\n\n".join(f"**{title}:** {sections.get(key, 'N/A')}" for key, title in SECTIONS)
+
+
+def summary_items(device1: Any, device2: Any) -> List[Dict[str, str]]:
+    """Ringkasan sebagai list {"key", "title", "text"} (urut SECTIONS) untuk template."""
+    sections = summarize(device1, device2)
+    return [{"key": key, "title": title, "text": sections[key]} for key, title in SECTIONS]
+
+
+# ==================== SECTIONS ====================
+
+def _performance(devices: Sequence[Any], specs: Dict[str, Spec]) -> str:
+    ram = specs["ram_gb"]
+    year = specs["release_year"]
+    if ram[2] is None and year[2] is None:
+        return PERFORMANCE_TEMPLATES["missing"].format(device=_missing_names(devices, ram, year))
+
+    leaders = {lead for lead in (ram[2], year[2]) if lead}
+    if len(leaders) == 2:
+        ram_winner, ram_loser = _ordered(ram)
+        year_winner, year_loser = _ordered(year)
+        return PERFORMANCE_TEMPLATES["split"].format(
+            ram_winner=devices[ram[2] - 1].name,
+            ram_winner_value=_show("ram_gb", ram_winner),
+            ram_loser_value=_show("ram_gb", ram_loser),
+            year_winner=devices[year[2] - 1].name,
+            year_winner_value=_show("release_year", year_winner),
+            year_loser_value=_show("release_year", year_loser),
+        )
+
+    # Nilai pemenang disebut dulu ("RAM 12GB vs 8GB")
+    reasons = []
+    if ram[2]:
+        reasons.append("RAM {} vs {}".format(*(_show("ram_gb", value) for value in _ordered(ram))))
+    elif ram[2] == 0:
+        reasons.append(f"RAM sama-sama {_show('ram_gb', ram[0])}")
+    if year[2]:
+        reasons.append("rilis {} vs {}".format(*(_show("release_year", value) for value in _ordered(year))))
+    elif year[2] == 0:
+        reasons.append(f"sama-sama rilis {_show('release_year', year[0])}")
+
+    if not leaders:
+        return PERFORMANCE_TEMPLATES["tie"].format(reasons=" dan ".join(reasons))
+
+    winner = devices[leaders.pop() - 1]
+    name = f"{winner.name} ({winner.cpu})" if getattr(winner, "cpu", None) else winner.name
+    return PERFORMANCE_TEMPLATES["lead"].format(winner=name, reasons=" dan ".join(reasons))
+
+
+def _single_spec(devices: Sequence[Any], spec: Spec, key: str, templates: Dict[str, str]) -> str:
+    value1, value2, lead = spec
+    if lead is None:
+        return templates["missing"].format(device=_missing_names(devices, spec))
+    if lead == 0:
+        return templates["tie"].format(value=_show(key, value1))
+
+    winner_value, loser_value = _ordered(spec)
+    return templates["lead"].format(
+        winner=devices[lead - 1].name,
+        winner_value=_show(key, winner_value),
+        loser_value=_show(key, loser_value),
+        percent=round(abs(winner_value - loser_value) / loser_value * 100),
+    )
+
+
+def _value_for_money(devices: Sequence[Any], specs: Dict[str, Spec]) -> str:
+    price1, price2, cheaper = specs["price_idr"]
+    if cheaper is None:
+        return VALUE_TEMPLATES["missing"].format(device=_missing_names(devices, specs["price_idr"]))
+
+    wins = [
+        [key for key, (_, _, lead) in specs.items() if key != "price_idr" and lead == index]
+        for index in (1, 2)
+    ]
+    if cheaper == 0:
+        if len(wins[0]) == len(wins[1]):
+            return VALUE_TEMPLATES["tie"]
+        better = 0 if len(wins[0]) > len(wins[1]) else 1
+        return VALUE_TEMPLATES["same_price"].format(
+            price=price1, winner=devices[better].name, wins=len(wins[better])
+        )
+
+    cheap, pricey = cheaper - 1, 2 - cheaper
+    cheap_price, pricey_price = (price1, price2) if cheaper == 1 else (price2, price1)
+    fields = {
+        "cheap": devices[cheap].name,
+        "pricey": devices[pricey].name,
+        "diff": pricey_price - cheap_price,
+        "percent": round((pricey_price - cheap_price) / pricey_price * 100),
+    }
+    if len(wins[cheap]) >= len(wins[pricey]):
+        return VALUE_TEMPLATES["cheaper"].format(
+            cheap_wins=len(wins[cheap]), pricey_wins=len(wins[pricey]), **fields
+        )
+    return VALUE_TEMPLATES["pricier"].format(strengths=_strengths(specs, pricey + 1), **fields)
+
+
+def _recommendation(devices: Sequence[Any], specs: Dict[str, Spec]) -> str:
+    strengths1 = _strengths(specs, 1)
+    strengths2 = _strengths(specs, 2)
+    if strengths1 and strengths2:
+        return RECOMMENDATION_TEMPLATES["both"].format(
+            device1=devices[0].name, strengths1=strengths1,
+            device2=devices[1].name, strengths2=strengths2,
+        )
+    if strengths1 or strengths2:
+        winner = 0 if strengths1 else 1
+        return RECOMMENDATION_TEMPLATES["one"].format(
+            winner=devices[winner].name, strengths=strengths1 or strengths2
+        )
+    if all(lead is None for _, _, lead in specs.values()):
+        return RECOMMENDATION_TEMPLATES["missing"]
+    return RECOMMENDATION_TEMPLATES["tie"]
+
+
+# ==================== HELPERS ====================
+
+def _lead(higher_is_better: bool, value1: Optional[float], value2: Optional[float]) -> Optional[int]:
+    """1 / 2 = device yang lebih baik, 0 = seri, None = salah satu kosong (0 = kosong, sama seperti highlight)."""
+    if not value1 or not value2:
+        return None
+    if value1 == value2:
+        return 0
+    return 1 if (value1 > value2) == higher_is_better else 2
+
+
+def _ordered(spec: Spec) -> Tuple[float, float]:
+    """(nilai pemenang, nilai yang kalah)."""
+    value1, value2, lead = spec
+    return (value1, value2) if lead == 1 else (value2, value1)
+
+
+def _show(key: str, value: float) -> str:
+    """Format nilai dengan display rule highlight (misal 8 -> "8GB")."""
+    return _RULES[key].display(value)
+
+
+def _strengths(specs: Dict[str, Spec], index: int) -> str:
+    """Keunggulan device ke-index (1/2) dalam 1 frase, misal "RAM lebih besar dan kamera lebih tajam"."""
+    words = [text for key, text in STRENGTHS if specs[key][2] == index][:MAX_STRENGTHS]
+    if len(words) <= 1:
+        return "".join(words)
+    return ", ".join(words[:-1]) + " dan " + words[-1]
+
+
+def _missing_names(devices: Sequence[Any], *specs: Spec) -> str:
+    """Nama device yang datanya kosong (untuk template "missing")."""
+    missing = [
+        device.name for index, device in enumerate(devices)
+        if all(not spec[index] for spec in specs)
+    ]
+    if len(missing) == len(devices) or not missing:
+        return "kedua device"
+    return missing[0]
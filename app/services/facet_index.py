@@ -0,0 +1,320 @@
+"""
+Facet Index - Hitung jumlah device per nilai filter (faceted search) di memory
+
+Halaman /devices punya filter brand, kategori, RAM, storage dan harga. Supaya
+setiap pilihan bisa menampilkan jumlahnya ("Samsung (12)", "8GB (30)") tanpa
+menjalankan COUNT ... GROUP BY untuk setiap facet, setiap nilai facet disimpan
+sebagai bitmap:
+
+    brand["samsung"] = 0b0010110...   (bit ke-i = 1 jika device di slot i Samsung)
+    ram_gb[8]        = 0b0110100...
+
+Bitmap memakai int Python (operasi AND/OR/bit_count berjalan di C), jadi:
+- Filter      = OR bitmap nilai yang dipilih dalam 1 facet, AND antar facet
+- Jumlah      = (bitmap_nilai & mask_filter).bit_count()
+
+Jumlah per facet dihitung dengan filter facet LAIN saja (disjunctive faceting),
+jadi saat brand=Samsung dipilih, brand lain tetap menampilkan jumlahnya.
+
+Index di-update per device lewat catalog_events dan di-rebuild penuh jika
+umurnya melewati SEARCH_INDEX_REFRESH_SECONDS (sama seperti prefix_index).
+
+Author: Kelompok COMPARELY
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import SEARCH_INDEX_REFRESH_SECONDS
+from ..models import Phone
+from . import catalog_events
+
+# Facet yang di-index (urutan = urutan tampil)
+FACETS = ("brand", "category_id", "ram_gb", "storage_gb", "release_year", "price_bucket")
+
+# Kolom phones yang dibaca untuk membangun index
+_COLUMNS = ("id", "brand", "category_id", "ram_gb", "storage_gb", "release_year", "price_idr")
+
+# Rentang harga: (key, batas bawah, batas atas eksklusif, label)
+PRICE_BUCKETS = [
+    ("0-2000000", 0, 2_000_000, "< Rp 2 Juta"),
+    ("2000000-4000000", 2_000_000, 4_000_000, "Rp 2 - 4 Juta"),
+    ("4000000-6000000", 4_000_000, 6_000_000, "Rp 4 - 6 Juta"),
+    ("6000000-10000000", 6_000_000, 10_000_000, "Rp 6 - 10 Juta"),
+    ("10000000-", 10_000_000, None, "> Rp 10 Juta"),
+]
+_PRICE_BUCKET_ORDER = {key: i for i, (key, _, _, _) in enumerate(PRICE_BUCKETS)}
+
+# Granularitas filter max_price (sama dengan step slider harga di /devices)
+PRICE_STEP = 500_000
+
+
+def price_bucket(price_idr: Optional[int]) -> Optional[str]:
+    """Key rentang harga untuk 1 harga, None jika harga kosong."""
+    if price_idr is None:
+        return None
+    for key, low, high, _ in PRICE_BUCKETS:
+        if price_idr >= low and (high is None or price_idr < high):
+            return key
+    return None
+
+
+def _facet_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Nilai setiap facet untuk 1 device (None = tidak punya nilai)."""
+    brand = data.get("brand")
+    return {
+        "brand": brand.strip().lower() if brand and brand.strip() else None,
+        "category_id": data.get("category_id"),
+        "ram_gb": data.get("ram_gb"),
+        "storage_gb": data.get("storage_gb"),
+        "release_year": data.get("release_year"),
+        "price_bucket": price_bucket(data.get("price_idr")),
+    }
+
+
+class FacetIndex:
+    """
+    Bitmap per nilai facet.
+
+    Attributes:
+        slots: device_id -> posisi bit
+        bitmaps: facet -> {nilai: bitmap}
+        labels: nilai brand (lowercase) -> nama brand untuk ditampilkan
+    """
+
+    def __init__(self):
+        self._reset()
+        self.built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def _reset(self) -> None:
+        self.slots: Dict[int, int] = {}
+        self.free_slots: List[int] = []
+        self.next_slot = 0
+        self.all_bits = 0
+        self.bitmaps: Dict[str, Dict[Any, int]] = {facet: {} for facet in FACETS}
+        self.values: Dict[int, Dict[str, Any]] = {}    # slot -> nilai facet
+        self.prices: Dict[int, int] = {}               # slot -> price_idr
+        # Untuk filter max_price: bitmap per step harga (price // PRICE_STEP),
+        # plus bitmap per harga persis untuk step yang terpotong batas
+        self.price_steps: Dict[int, int] = defaultdict(int)
+        self.price_values: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self.labels: Dict[str, str] = {}
+
+    # ==================== BUILD & UPDATE ====================
+
+    def build(self, db: Session) -> None:
+        """Bangun ulang index dari database (hanya kolom facet)."""
+        rows = db.query(*(getattr(Phone, column) for column in _COLUMNS)).all()
+        self.load(dict(zip(_COLUMNS, row)) for row in rows)
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Bangun ulang index dari iterable dict kolom phone."""
+        with self._lock:
+            self._reset()
+            for data in rows:
+                self._add(data)
+            self.built_at = time.monotonic()
+
+    def upsert(self, data: Dict[str, Any]) -> None:
+        """Tambah atau update 1 device (dict snapshot dari catalog_events)."""
+        with self._lock:
+            self._remove(data["id"])
+            self._add(data)
+
+    def remove(self, device_id: int) -> None:
+        """Hapus 1 device dari index."""
+        with self._lock:
+            self._remove(device_id)
+
+    def is_stale(self) -> bool:
+        """True jika index belum dibangun atau sudah melewati batas umur."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at > SEARCH_INDEX_REFRESH_SECONDS
+        )
+
+    def _add(self, data: Dict[str, Any]) -> None:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = self.next_slot
+            self.next_slot += 1
+        bit = 1 << slot
+
+        self.slots[data["id"]] = slot
+        self.all_bits |= bit
+
+        values = _facet_values(data)
+        self.values[slot] = values
+        for facet, value in values.items():
+            if value is None:
+                continue
+            bitmaps = self.bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+        if values["brand"] is not None:
+            self.labels.setdefault(values["brand"], data["brand"].strip())
+
+        price = data.get("price_idr")
+        if price is not None:
+            self.prices[slot] = price
+            step = price // PRICE_STEP
+            self.price_steps[step] |= bit
+            prices = self.price_values[step]
+            prices[price] = prices.get(price, 0) | bit
+
+    def _remove(self, device_id: int) -> None:
+        slot = self.slots.pop(device_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        self.all_bits &= ~bit
+
+        for facet, value in self.values.pop(slot).items():
+            if value is None:
+                continue
+            bitmaps = self.bitmaps[facet]
+            remaining = bitmaps[value] & ~bit
+            if remaining:
+                bitmaps[value] = remaining
+            else:
+                # Nilai tidak dipakai device lain -> hilang dari dropdown
+                del bitmaps[value]
+                if facet == "brand":
+                    self.labels.pop(value, None)
+
+        price = self.prices.pop(slot, None)
+        if price is not None:
+            step = price // PRICE_STEP
+            self.price_steps[step] &= ~bit
+            prices = self.price_values[step]
+            prices[price] &= ~bit
+            if not prices[price]:
+                del prices[price]
+            if not self.price_steps[step]:
+                del self.price_steps[step]
+                del self.price_values[step]
+
+        self.free_slots.append(slot)
+
+    # ==================== QUERY ====================
+
+    def _price_at_most(self, max_price: float) -> int:
+        """Bitmap device dengan price_idr <= max_price."""
+        limit_step = int(max_price // PRICE_STEP)
+        mask = 0
+        for step, bitmap in self.price_steps.items():
+            if step < limit_step:
+                mask |= bitmap
+        # Step yang terpotong batas: cek per harga
+        for price, bitmap in self.price_values.get(limit_step, {}).items():
+            if price <= max_price:
+                mask |= bitmap
+        return mask
+
+    def _filter_masks(self, filters: Dict[str, Iterable[Any]], max_price: Optional[float]) -> Dict[str, int]:
+        """Mask per facet yang difilter: OR nilai terpilih dalam 1 facet."""
+        masks = {}
+        for facet in FACETS:
+            selected = filters.get(facet)
+            if not selected:
+                continue
+            bitmaps = self.bitmaps[facet]
+            mask = 0
+            for value in selected:
+                if facet == "brand" and isinstance(value, str):
+                    value = value.strip().lower()
+                mask |= bitmaps.get(value, 0)
+            masks[facet] = mask
+
+        # max_price termasuk kelompok facet harga
+        if max_price:
+            price_mask = self._price_at_most(max_price)
+            masks["price_bucket"] = masks.get("price_bucket", self.all_bits) & price_mask
+        return masks
+
+    def counts(
+        self,
+        filters: Optional[Dict[str, Iterable[Any]]] = None,
+        max_price: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Jumlah device per nilai untuk SEMUA facet sekaligus (tanpa SQL).
+
+        Args:
+            filters: facet -> nilai yang dipilih, misal {"brand": ["Samsung"], "ram_gb": [8]}
+            max_price: Harga maksimal (ikut kelompok facet harga)
+
+        Returns:
+            {"total": jumlah device yang cocok semua filter,
+             "facets": {facet: [{"value", "label", "count"}, ...]}}
+        """
+        filters = filters or {}
+        with self._lock:
+            masks = self._filter_masks(filters, max_price)
+
+            matched = self.all_bits
+            for mask in masks.values():
+                matched &= mask
+
+            facets = {}
+            for facet in FACETS:
+                # Mask dari filter facet lain saja
+                base = self.all_bits
+                for other, mask in masks.items():
+                    if other != facet:
+                        base &= mask
+                facets[facet] = [
+                    {"value": value, "label": self._label(facet, value), "count": (bitmap & base).bit_count()}
+                    for value, bitmap in self.bitmaps[facet].items()
+                ]
+                facets[facet].sort(key=_sort_key(facet))
+
+            return {"total": matched.bit_count(), "facets": facets}
+
+    def _label(self, facet: str, value: Any) -> str:
+        if facet == "brand":
+            return self.labels.get(value, value)
+        if facet == "price_bucket":
+            return PRICE_BUCKETS[_PRICE_BUCKET_ORDER[value]][3]
+        if facet in ("ram_gb", "storage_gb"):
+            return f"{value // 1024}TB" if value >= 1024 and value % 1024 == 0 else f"{value}GB"
+        return str(value)
+
+
+def _sort_key(facet: str):
+    """Urutan nilai di dropdown."""
+    if facet == "brand":
+        return lambda item: item["label"].lower()
+    if facet == "price_bucket":
+        return lambda item: _PRICE_BUCKET_ORDER[item["value"]]
+    if facet == "release_year":
+        return lambda item: -item["value"]
+    return lambda item: item["value"]
+
+
+# Singleton index untuk seluruh aplikasi
+device_facet_index = FacetIndex()
+
+
+def ensure_built(db: Session) -> FacetIndex:
+    """Bangun index jika belum ada atau sudah terlalu lama (lazy)."""
+    if device_facet_index.is_stale():
+        device_facet_index.build(db)
+    return device_facet_index
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Update index per device setiap ada perubahan katalog."""
+    if device_facet_index.built_at is None:
+        return  # Belum dibangun, nanti dibangun lengkap saat pertama dipakai
+    for data in changed:
+        device_facet_index.upsert(data)
+    for device_id in deleted_ids:
+        device_facet_index.remove(device_id)
@@ -0,0 +1,285 @@
+"""
+Fuzzy Index - Pencarian device yang toleran typo
+
+User sering mengetik "samsng a55" atau "redmi note13" sehingga search biasa
+(full-text / prefix) tidak menemukan apa-apa. Modul ini dipakai sebagai
+FALLBACK saat search biasa kosong.
+
+Cara kerja (trigram similarity):
+1. Setiap token nama/brand dipecah jadi trigram: "samsung" -> "  s", " sa", "sam", ...
+2. Vocabulary token unik di-index per trigram (trigram -> token)
+3. Token query dicocokkan ke vocabulary: similarity = |A ∩ B| / |A ∪ B|
+4. Device diberi skor rata-rata similarity terbaik per kata query
+
+Token juga dinormalisasi supaya "note13" == "note 13":
+- "note13" ikut di-index sebagai "note" + "13"
+- "note" + "13" yang bersebelahan ikut di-index sebagai "note13"
+
+Latency dibatasi (bounded) karena:
+- Pencocokan dilakukan ke vocabulary token, bukan ke setiap device
+- Posting list trigram dibaca maksimal MAX_TRIGRAM_POSTINGS entry
+- Device yang diberi skor maksimal MAX_CANDIDATES
+Benchmark: scripts/benchmarks/fuzzy_search.py (100k device sintetis).
+
+Author: Kelompok COMPARELY
+"""
+
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import SEARCH_INDEX_REFRESH_SECONDS
+from ..models import Phone
+from . import catalog_events
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_ALNUM_SPLIT = re.compile(r"[^\W\d_]+|\d+", re.UNICODE)
+
+# Similarity minimal agar token query dianggap cocok dengan token vocabulary
+MIN_TOKEN_SIMILARITY = 0.3
+
+# Skor minimal device (rata-rata similarity semua kata query)
+MIN_DEVICE_SCORE = 0.45
+
+# Batas kerja per query (menjaga latency tetap bounded di katalog besar)
+MAX_VOCAB_MATCHES = 8        # token vocabulary terbaik per kata query
+MAX_TRIGRAM_POSTINGS = 5000  # entry yang dibaca per trigram
+MAX_CANDIDATES = 2000        # device yang diberi skor per query
+
+
+# ==================== NORMALISASI ====================
+
+def normalize_tokens(text: Optional[str]) -> List[str]:
+    """
+    Token lowercase + variasi pecah/gabung huruf-angka.
+
+    Contoh:
+        "Redmi Note13" -> ["redmi", "note13", "note", "13"]
+        "Redmi Note 13" -> ["redmi", "note", "13", "note13"]
+    """
+    if not text:
+        return []
+
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    expanded = list(tokens)
+
+    # Pecah token campuran huruf+angka ("note13" -> "note", "13")
+    for token in tokens:
+        parts = _ALNUM_SPLIT.findall(token)
+        if len(parts) > 1:
+            expanded.extend(part for part in parts if len(part) >= 2)
+
+    # Gabung kata + angka yang bersebelahan ("note", "13" -> "note13")
+    for left, right in zip(tokens, tokens[1:]):
+        if left.isalpha() and right[:1].isdigit():
+            expanded.append(left + right)
+
+    # Buang duplikat, pertahankan urutan
+    return list(dict.fromkeys(expanded))
+
+
+def trigrams(token: str) -> Set[str]:
+    """Trigram dengan padding (gaya pg_trgm): "a55" -> {"  a", " a5", "a55", "55 "}."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity trigram 2 token (0.0 - 1.0)."""
+    ta, tb = trigrams(a), trigrams(b)
+    shared = len(ta & tb)
+    return shared / (len(ta) + len(tb) - shared) if shared else 0.0
+
+
+# ==================== INDEX ====================
+
+class FuzzyIndex:
+    """
+    Trigram index atas vocabulary token nama/brand device.
+
+    Attributes:
+        vocab_trigrams: token -> set trigram
+        trigram_postings: trigram -> set token vocabulary
+        token_postings: token -> set device_id
+        docs: device_id -> {"id", "name", "brand", "tokens"}
+    """
+
+    def __init__(self):
+        self.vocab_trigrams: Dict[str, Set[str]] = {}
+        self.trigram_postings: Dict[str, Set[str]] = defaultdict(set)
+        self.token_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        self.built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ==================== BUILD & UPDATE ====================
+
+    def build(self, db: Session) -> None:
+        """Bangun ulang index dari database (hanya kolom id, name, brand)."""
+        self.load(db.query(Phone.id, Phone.name, Phone.brand).all())
+
+    def load(self, rows: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> None:
+        """Bangun ulang index dari iterable (id, name, brand)."""
+        with self._lock:
+            self.vocab_trigrams = {}
+            self.trigram_postings = defaultdict(set)
+            self.token_postings = defaultdict(set)
+            self.docs = {}
+            for device_id, name, brand in rows:
+                self._add(device_id, name, brand)
+            self.built_at = time.monotonic()
+
+    def upsert(self, device_id: int, name: Optional[str], brand: Optional[str]) -> None:
+        """Tambah atau update 1 device (incremental)."""
+        with self._lock:
+            self._remove(device_id)
+            self._add(device_id, name, brand)
+
+    def remove(self, device_id: int) -> None:
+        """Hapus 1 device dari index."""
+        with self._lock:
+            self._remove(device_id)
+
+    def is_stale(self) -> bool:
+        """True jika index belum dibangun atau sudah melewati batas umur."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at > SEARCH_INDEX_REFRESH_SECONDS
+        )
+
+    def _add(self, device_id: int, name: Optional[str], brand: Optional[str]) -> None:
+        tokens = set(normalize_tokens(name)) | set(normalize_tokens(brand))
+        self.docs[device_id] = {
+            "id": device_id, "name": name or "", "brand": brand or "", "tokens": tokens
+        }
+        for token in tokens:
+            if token not in self.vocab_trigrams:
+                grams = trigrams(token)
+                self.vocab_trigrams[token] = grams
+                for gram in grams:
+                    self.trigram_postings[gram].add(token)
+            self.token_postings[token].add(device_id)
+
+    def _remove(self, device_id: int) -> None:
+        doc = self.docs.pop(device_id, None)
+        if not doc:
+            return
+        for token in doc["tokens"]:
+            postings = self.token_postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(device_id)
+            if not postings:
+                # Token tidak dipakai device lain -> keluarkan dari vocabulary
+                del self.token_postings[token]
+                for gram in self.vocab_trigrams.pop(token, ()):
+                    self.trigram_postings[gram].discard(token)
+
+    # ==================== QUERY ====================
+
+    def _match_vocab(self, token: str) -> Dict[str, float]:
+        """Token vocabulary paling mirip dengan 1 kata query -> {token: similarity}."""
+        if token in self.token_postings:
+            return {token: 1.0}
+
+        grams = trigrams(token)
+        shared = Counter()
+        for gram in grams:
+            postings = self.trigram_postings.get(gram)
+            if not postings:
+                continue
+            for count, candidate in enumerate(postings):
+                if count >= MAX_TRIGRAM_POSTINGS:
+                    break
+                shared[candidate] += 1
+
+        scored = []
+        for candidate, common in shared.items():
+            sim = common / (len(grams) + len(self.vocab_trigrams[candidate]) - common)
+            if sim >= MIN_TOKEN_SIMILARITY:
+                scored.append((sim, candidate))
+        scored.sort(reverse=True)
+
+        return {candidate: sim for sim, candidate in scored[:MAX_VOCAB_MATCHES]}
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Cari device yang mirip dengan query (toleran typo).
+
+        Returns:
+            List of dict {"id", "name", "brand", "score"}, skor tertinggi dulu
+        """
+        query_tokens = _TOKEN_PATTERN.findall(query.lower()) if query else []
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            matches = [self._match_vocab(token) for token in query_tokens]
+            matched = [m for m in matches if m]
+            if not matched:
+                return []
+
+            # Kandidat diambil dari kata query paling selektif (posting paling kecil)
+            def posting_size(vocab_matches):
+                return sum(len(self.token_postings[t]) for t in vocab_matches)
+
+            seed = min(matched, key=posting_size)
+            candidates = set()
+            for token in sorted(seed, key=seed.get, reverse=True):
+                for device_id in self.token_postings[token]:
+                    candidates.add(device_id)
+                    if len(candidates) >= MAX_CANDIDATES:
+                        break
+                if len(candidates) >= MAX_CANDIDATES:
+                    break
+
+            # Skor device = rata-rata similarity terbaik untuk setiap kata query.
+            # Dihitung per token vocabulary dengan set intersection (C-level),
+            # bukan loop per device x per token
+            totals = dict.fromkeys(candidates, 0.0)
+            for vocab_matches in matches:
+                assigned = set()
+                for token, sim in sorted(vocab_matches.items(), key=lambda item: -item[1]):
+                    hits = candidates.intersection(self.token_postings[token])
+                    hits.difference_update(assigned)
+                    for device_id in hits:
+                        totals[device_id] += sim
+                    assigned |= hits
+
+            results = []
+            for device_id, total in totals.items():
+                score = total / len(matches)
+                if score >= MIN_DEVICE_SCORE:
+                    results.append((score, self.docs[device_id]))
+
+        results.sort(key=lambda item: (-item[0], len(item[1]["name"]), item[1]["name"]))
+        return [
+            {"id": doc["id"], "name": doc["name"], "brand": doc["brand"], "score": round(score, 3)}
+            for score, doc in results[:limit]
+        ]
+
+
+# Singleton index untuk seluruh aplikasi
+device_fuzzy_index = FuzzyIndex()
+
+
+def ensure_built(db: Session) -> FuzzyIndex:
+    """Bangun index jika belum ada atau sudah terlalu lama (lazy)."""
+    if device_fuzzy_index.is_stale():
+        device_fuzzy_index.build(db)
+    return device_fuzzy_index
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Update index per device setiap ada perubahan katalog."""
+    if device_fuzzy_index.built_at is None:
+        return  # Belum dibangun, nanti dibangun lengkap saat pertama dipakai
+    for data in changed:
+        device_fuzzy_index.upsert(data["id"], data.get("name"), data.get("brand"))
+    for device_id in deleted_ids:
+        device_fuzzy_index.remove(device_id)
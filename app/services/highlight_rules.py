@@ -0,0 +1,207 @@
+"""
+Highlight Rules - Rule engine untuk highlight perbandingan device
+
+Dulu logika highlight ada di 2 tempat dan isinya berbeda:
+- comparison_service.generate_highlights (API /compare/) : harga & tahun saja
+- frontend.compare_page (/compare-page)                  : + RAM, storage, dll
+
+Sekarang setiap spesifikasi adalah 1 rule deklaratif:
+
+    HighlightRule(
+        key="ram_gb", label="RAM", icon="fa-memory", unit="GB",
+        extract=attrgetter("ram_gb"),       # ambil nilai numerik dari device
+        higher_is_better=True,              # comparator
+        template="{winner} lebih besar ({winner_value} vs {loser_value})",
+    )
+
+RULES di-compile sekali saat import (extractor, comparator dan template.format
+disimpan sebagai tuple) lalu evaluate() menjalankan semua rule dalam 1 loop.
+Nilai diambil dari kolom numerik hasil utils/spec_parser.py, jadi tidak ada
+parsing teks saat membandingkan.
+
+Rule yang sama dipakai untuk:
+- Highlight API /compare/ dan halaman /compare-page
+- Spesifikasi yang di-ranking di /compare/multi (comparison_service)
+
+Benchmark: python scripts/benchmarks/highlights.py
+
+Author: Kelompok COMPARELY
+"""
+
+import operator
+from dataclasses import dataclass
+from operator import attrgetter
+from string import Formatter
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# ==================== EXTRACTOR & FORMAT ====================
+
+def _price(device: Any) -> Optional[float]:
+    """
+    Harga dalam Rupiah: price_idr, fallback ke kolom price (data lama).
+    Harga <= 0 dianggap belum diketahui (sama dengan spec_parser).
+    """
+    if device.price_idr is not None:
+        return device.price_idr
+    if device.price is None or device.price <= 0:
+        return None
+    return float(device.price)
+
+
+def _storage_text(gb: float) -> str:
+    gb = int(gb)
+    return f"{gb // 1024}TB" if gb >= 1024 and gb % 1024 == 0 else f"{gb}GB"
+
+
+def _number(value: float) -> str:
+    """8.0 -> "8", 6.67 -> "6.67"."""
+    return f"{value:g}"
+
+
+# ==================== RULE DEFINITIONS ====================
+
+@dataclass(frozen=True)
+class HighlightRule:
+    """
+    1 aturan perbandingan spesifikasi.
+
+    Attributes:
+        key: Nama spesifikasi (sama dengan kolom numerik phones)
+        label: Nama yang ditampilkan, misal "RAM"
+        icon: Class Font Awesome, misal "fa-memory"
+        unit: Satuan nilai, misal "GB"
+        extract: Fungsi device -> nilai numerik (None/0 = tidak dibandingkan)
+        higher_is_better: True jika nilai lebih besar lebih unggul
+        template: Kalimat highlight. Field: winner, loser, winner_value,
+                  loser_value (sudah diformat) dan diff (selisih numerik)
+        display: Format nilai untuk template
+    """
+    key: str
+    label: str
+    icon: str
+    unit: str
+    extract: Callable[[Any], Optional[float]]
+    higher_is_better: bool
+    template: str
+    display: Callable[[float], str] = _number
+
+
+RULES: List[HighlightRule] = [
+    HighlightRule(
+        key="price_idr", label="Harga", icon="fa-tag", unit="Rp",
+        extract=_price, higher_is_better=False,
+        template="{winner} lebih murah Rp {diff:,.0f}",
+    ),
+    HighlightRule(
+        key="release_year", label="Tahun Rilis", icon="fa-calendar", unit="",
+        extract=attrgetter("release_year"), higher_is_better=True,
+        template="{winner} lebih baru (Rilis {winner_value})",
+    ),
+    HighlightRule(
+        key="ram_gb", label="RAM", icon="fa-memory", unit="GB",
+        extract=attrgetter("ram_gb"), higher_is_better=True,
+        template="{winner} lebih besar ({winner_value} vs {loser_value})",
+        display=lambda gb: f"{gb:g}GB",
+    ),
+    HighlightRule(
+        key="storage_gb", label="Storage", icon="fa-hard-drive", unit="GB",
+        extract=attrgetter("storage_gb"), higher_is_better=True,
+        template="{winner} lebih besar ({winner_value} vs {loser_value})",
+        display=_storage_text,
+    ),
+    HighlightRule(
+        key="main_camera_mp", label="Kamera Utama", icon="fa-camera", unit="MP",
+        extract=attrgetter("main_camera_mp"), higher_is_better=True,
+        template="{winner} lebih tinggi ({winner_value} vs {loser_value})",
+        display=lambda mp: f"{mp:g}MP",
+    ),
+    HighlightRule(
+        key="battery_mah", label="Baterai", icon="fa-battery-three-quarters", unit="mAh",
+        extract=attrgetter("battery_mah"), higher_is_better=True,
+        template="{winner} lebih besar ({winner_value} vs {loser_value})",
+        display=lambda mah: f"{mah:g} mAh",
+    ),
+    HighlightRule(
+        key="screen_inch", label="Layar", icon="fa-display", unit="inch",
+        extract=attrgetter("screen_inch"), higher_is_better=True,
+        template="{winner} lebih besar ({winner_value} vs {loser_value})",
+        display=lambda inch: f"{inch:g}\"",
+    ),
+]
+
+
+# ==================== ENGINE ====================
+
+class Highlight(NamedTuple):
+    """Hasil 1 rule: key spesifikasi, kategori (HTML ikon + label) dan kalimat."""
+    key: str
+    category: str
+    text: str
+
+
+# (key, extract, better, render, display, category, needs_values, needs_diff)
+CompiledRule = Tuple[str, Callable, Callable, Callable, Callable, str, bool, bool]
+
+
+def compile_rules(rules: Sequence[HighlightRule]) -> List[CompiledRule]:
+    """
+    Ubah rule jadi tuple siap pakai (dipanggil sekali saat import).
+
+    Field template dibaca sekali di sini, jadi evaluate() hanya memformat
+    nilai (display) / selisih yang benar-benar dipakai template.
+    """
+    compiled = []
+    for rule in rules:
+        fields = {name for _, name, _, _ in Formatter().parse(rule.template) if name}
+        compiled.append((
+            rule.key,
+            rule.extract,
+            operator.gt if rule.higher_is_better else operator.lt,
+            rule.template.format,
+            rule.display,
+            f"<i class='fa-solid {rule.icon}'></i> {rule.label}",
+            bool(fields & {"winner_value", "loser_value"}),
+            "diff" in fields,
+        ))
+    return compiled
+
+
+_COMPILED = compile_rules(RULES)
+
+
+def evaluate(device1: Any, device2: Any, compiled: List[CompiledRule] = _COMPILED) -> List[Highlight]:
+    """
+    Jalankan semua rule untuk 2 device dalam 1 loop.
+
+    Spesifikasi yang kosong di salah satu device, atau nilainya sama,
+    tidak menghasilkan highlight.
+
+    Args:
+        device1: Device pertama (Phone atau object dengan atribut yang sama)
+        device2: Device kedua
+        compiled: Rule hasil compile_rules() (default: RULES)
+
+    Returns:
+        List of Highlight, urut sesuai RULES
+    """
+    highlights = []
+    for key, extract, better, render, display, category, needs_values, needs_diff in compiled:
+        value1 = extract(device1)
+        value2 = extract(device2)
+        if not value1 or not value2 or value1 == value2:
+            continue
+
+        if better(value1, value2):
+            winner, loser, winner_value, loser_value = device1, device2, value1, value2
+        else:
+            winner, loser, winner_value, loser_value = device2, device1, value2, value1
+
+        fields = {"winner": winner.name, "loser": loser.name}
+        if needs_values:
+            fields["winner_value"] = display(winner_value)
+            fields["loser_value"] = display(loser_value)
+        if needs_diff:
+            fields["diff"] = abs(winner_value - loser_value)
+        highlights.append(Highlight(key, category, render(**fields)))
+    return highlights
@@ -0,0 +1,257 @@
+"""
+Pareto Index - Rekomendasi "best value" (Pareto frontier / skyline) per kategori
+
+Mode /recommendation/?mode=pareto mencari device yang TIDAK kalah di dua sumbu
+sekaligus oleh device lain:
+
+    harga (lebih murah lebih baik)  vs  skor spesifikasi (lebih tinggi lebih baik)
+
+Device A didominasi jika ada device B yang harganya <= A dan skornya >= A
+(salah satunya lebih baik). Yang tersisa adalah frontier: setiap device di
+frontier adalah spesifikasi terbaik untuk harganya.
+
+Skor spesifikasi = score_candidates() dari recommendation_service dengan bobot
+use case tanpa harga (spec_weight_vector), dinormalisasi per kategori.
+
+Algoritma skyline 2 dimensi, O(n log n):
+1. Urutkan berdasarkan harga naik (harga sama: skor turun)
+2. Sapu dari yang termurah, simpan skor maksimum sejauh ini
+3. Device masuk frontier jika skornya > maksimum sebelumnya
+   (langkah 2-3 = np.maximum.accumulate, tanpa loop Python)
+
+Frontier default setiap kategori dihitung saat build; kombinasi lain (use case,
+tahun minimal) dihitung saat pertama diminta. Frontier disimpan per (kategori,
+use case, tahun) dan dibuang hanya untuk kategori yang berubah (lewat
+catalog_events), lalu dihitung ulang saat diminta lagi. Tahun minimal bebas
+diisi user, jadi kombinasi selain default dibatasi LRU
+(PARETO_FRONTIER_CACHE_MAX_ENTRIES). Filter max_price tidak
+perlu hitung ulang: frontier untuk harga <= budget = potongan frontier penuh.
+
+Author: Kelompok COMPARELY
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.config import PARETO_FRONTIER_CACHE_MAX_ENTRIES, SEARCH_INDEX_REFRESH_SECONDS
+from ..crud import device as device_crud
+from ..models import Phone
+from . import catalog_events
+from .recommendation_service import SCORE_FEATURES, score_candidates, spec_row, spec_weight_vector
+
+# Kolom phones yang dibaca untuk membangun index
+_COLUMNS = ("id", "category_id", "price_idr", "price", "release_year", "ram_gb",
+            "storage_gb", "main_camera_mp", "battery_mah", "screen_inch")
+
+# Key kategori untuk frontier seluruh katalog (tanpa filter kategori)
+ALL_CATEGORIES = None
+
+
+def pareto_frontier(prices: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Skyline 2 dimensi: harga minimum vs skor maksimum.
+
+    Args:
+        prices: Harga per device
+        scores: Skor spesifikasi per device
+
+    Returns:
+        Indeks device di frontier, urut harga naik (skor juga naik)
+    """
+    if not len(prices):
+        return np.empty(0, dtype=np.int64)
+
+    order = np.lexsort((-scores, prices))  # Harga naik, harga sama -> skor turun
+    sorted_scores = scores[order]
+    best_before = np.concatenate(([-np.inf], np.maximum.accumulate(sorted_scores)[:-1]))
+    return order[sorted_scores > best_before]
+
+
+class ParetoIndex:
+    """
+    Frontier Pareto per (kategori, use case), dihitung lazy lalu disimpan.
+
+    Attributes:
+        rows: category_id -> {device_id: baris spesifikasi (spec_row)}
+        frontiers: (category_id, use_case, min_release_year) ->
+                   (device_ids, prices) frontier urut harga naik (LRU)
+        max_frontiers: Maksimal frontier non-default yang disimpan
+    """
+
+    def __init__(self, max_frontiers: int = PARETO_FRONTIER_CACHE_MAX_ENTRIES):
+        self.built_at: Optional[float] = None
+        self.rows: Dict[Any, Dict[int, Tuple]] = {}
+        self.category_of: Dict[int, Any] = {}
+        self.frontiers: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.max_frontiers = max_frontiers
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    # ==================== BUILD & UPDATE ====================
+
+    def build(self, db: Session) -> None:
+        """Bangun ulang index dari database (hanya kolom numerik)."""
+        rows = db.query(*(getattr(Phone, column) for column in _COLUMNS)).all()
+        self.load(dict(zip(_COLUMNS, row)) for row in rows)
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Bangun ulang index dari dict kolom phone."""
+        with self._lock:
+            self.rows = {}
+            self.category_of = {}
+            self.frontiers = OrderedDict()
+            for data in rows:
+                self._add(data)
+            # Frontier default (tanpa use case) per kategori langsung dihitung
+            for category_id in [ALL_CATEGORIES] + [c for c in self.rows if c is not None]:
+                self.frontier(category_id)
+            self.built_at = time.monotonic()
+
+    def upsert(self, data: Dict[str, Any]) -> None:
+        """Tambah atau update 1 device, frontier kategori lama & baru dibuang."""
+        with self._lock:
+            self.remove(data["id"])
+            self._add(data)
+            self._invalidate(data.get("category_id"))
+
+    def remove(self, device_id: int) -> None:
+        """Hapus 1 device dari index."""
+        with self._lock:
+            if device_id not in self.category_of:
+                return
+            category_id = self.category_of.pop(device_id)
+            self.rows[category_id].pop(device_id, None)
+            self._invalidate(category_id)
+
+    def is_stale(self) -> bool:
+        """True jika index belum dibangun atau sudah melewati batas umur."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at > SEARCH_INDEX_REFRESH_SECONDS
+        )
+
+    def _add(self, data: Dict[str, Any]) -> None:
+        category_id = data.get("category_id")
+        self.rows.setdefault(category_id, {})[data["id"]] = spec_row(data)
+        self.category_of[data["id"]] = category_id
+
+    def _invalidate(self, category_id: Any) -> None:
+        """Buang frontier kategori ini dan frontier seluruh katalog."""
+        for key in list(self.frontiers):
+            if key[0] in (category_id, ALL_CATEGORIES):
+                del self.frontiers[key]
+
+    # ==================== QUERY ====================
+
+    def frontier(
+        self,
+        category_id: Optional[int] = ALL_CATEGORIES,
+        use_case: Optional[str] = None,
+        min_release_year: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Frontier Pareto (dari cache, atau dihitung lalu disimpan).
+
+        Args:
+            category_id: Kategori, None = seluruh katalog
+            use_case: Bobot skor spesifikasi (lihat spec_weight_vector)
+            min_release_year: Hanya device yang rilis >= tahun ini
+
+        Returns:
+            Tuple (device_ids, prices), urut harga naik
+
+        Raises:
+            ValueError: Jika use case tidak dikenal
+        """
+        weights = spec_weight_vector(use_case)
+        key = (category_id, use_case, min_release_year)
+        with self._lock:
+            cached = self.frontiers.get(key)
+            if cached is not None:
+                self.frontiers.move_to_end(key)
+                return cached
+
+            if category_id is ALL_CATEGORIES:
+                items = [item for rows in self.rows.values() for item in rows.items()]
+            else:
+                items = list(self.rows.get(category_id, {}).items())
+
+            ids = np.array([device_id for device_id, _ in items], dtype=np.int64)
+            specs = np.array([row for _, row in items], dtype=float).reshape(len(items), len(SCORE_FEATURES))
+
+            # Device tanpa harga tidak bisa dibandingkan di sumbu harga
+            keep = ~np.isnan(specs[:, 0])
+            if min_release_year is not None:
+                keep &= specs[:, 1] >= min_release_year
+            ids, specs = ids[keep], specs[keep]
+
+            scores = score_candidates(specs, weights) if len(ids) else np.empty(0)
+            selected = pareto_frontier(specs[:, 0], scores)
+            result = (ids[selected], specs[selected, 0])
+            self._store(key, result)
+            return result
+
+    def _store(self, key: Tuple, result: Tuple[np.ndarray, np.ndarray]) -> None:
+        """Simpan frontier; jika penuh, buang frontier non-default yang paling lama tidak dipakai."""
+        self.frontiers[key] = result
+        extra = sum(1 for cached_key in self.frontiers if cached_key[1:] != (None, None))
+        if extra <= self.max_frontiers:
+            return
+        for cached_key in self.frontiers:
+            if cached_key[1:] != (None, None):
+                del self.frontiers[cached_key]
+                self.evictions += 1
+                return
+
+
+# Singleton index untuk seluruh aplikasi
+pareto_index = ParetoIndex()
+
+
+def ensure_built(db: Session) -> ParetoIndex:
+    """Bangun index jika belum ada atau sudah terlalu lama (lazy)."""
+    if pareto_index.is_stale():
+        pareto_index.build(db)
+    return pareto_index
+
+
+def get_pareto_recommendations(
+    db: Session,
+    max_price: Optional[float] = None,
+    category_id: Optional[int] = None,
+    min_release_year: Optional[int] = None,
+    limit: int = 5,
+    use_case: Optional[str] = None
+) -> List[Phone]:
+    """
+    Rekomendasi mode Pareto: device di frontier harga vs spesifikasi.
+
+    Parameter sama dengan recommendation_service.get_recommendations.
+
+    Returns:
+        List of Phone objects, harga tertinggi yang masih <= max_price dulu
+        (= spesifikasi terbaik dalam budget), lalu alternatif yang lebih murah
+
+    Raises:
+        ValueError: Jika use case tidak dikenal
+    """
+    ids, prices = ensure_built(db).frontier(category_id, use_case, min_release_year)
+    if max_price is not None:
+        ids = ids[:np.searchsorted(prices, max_price, side="right")]
+    return device_crud.get_devices_by_ids(db, ids[::-1][:limit].tolist())
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Update baris device dan buang frontier kategori yang berubah."""
+    if pareto_index.built_at is None:
+        return  # Belum dibangun, nanti dibangun lengkap saat pertama dipakai
+    for data in changed:
+        pareto_index.upsert(data)
+    for device_id in deleted_ids:
+        pareto_index.remove(device_id)
@@ -0,0 +1,197 @@
+"""
+Prefix Index - Index in-memory untuk autocomplete device
+
+Autocomplete dipanggil setiap user berhenti mengetik 300ms. Daripada query
+database setiap kali, nama & brand device disimpan di memory sebagai
+sorted token array:
+
+    [("13t", 3), ("15", 2), ("a55", 7), ("apple", 2), ("galaxy", 1), ...]
+
+Prefix "gal" dicari dengan binary search (bisect) -> O(log n), lalu range
+token yang diawali "gal" dibaca berurutan. Query multi-kata ("galaxy s2")
+harus cocok di semua kata (AND).
+
+Index dibangun saat startup (atau saat pertama dipakai) dan di-update per
+device lewat catalog_events setiap ada create/edit/delete. Karena setiap
+worker gunicorn punya memory sendiri, index juga di-rebuild penuh jika
+umurnya melewati SEARCH_INDEX_REFRESH_SECONDS (jaring pengaman jika ada
+perubahan dari worker lain).
+
+Author: Kelompok COMPARELY
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import SEARCH_INDEX_REFRESH_SECONDS
+from ..models import Phone
+from . import catalog_events
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Batas jumlah kandidat yang diperiksa per query (menjaga latency tetap kecil
+# untuk prefix pendek seperti "s" yang cocok dengan ribuan token)
+MAX_CANDIDATES = 1000
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Pecah teks jadi token lowercase alfanumerik."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class PrefixIndex:
+    """
+    Sorted token array untuk pencarian prefix nama/brand device.
+
+    Attributes:
+        entries: List (token, device_id) yang selalu ter-sort
+        docs: Dict device_id -> {"id", "name", "brand", "tokens"}
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[str, int]] = []
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        self.built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ==================== BUILD & UPDATE ====================
+
+    def build(self, db: Session) -> None:
+        """Bangun ulang index dari database (hanya kolom id, name, brand)."""
+        rows = db.query(Phone.id, Phone.name, Phone.brand).all()
+
+        docs = {}
+        entries = []
+        for device_id, name, brand in rows:
+            doc = self._make_doc(device_id, name, brand)
+            docs[device_id] = doc
+            entries.extend((token, device_id) for token in doc["tokens"])
+        entries.sort()
+
+        with self._lock:
+            self.docs = docs
+            self.entries = entries
+            self.built_at = time.monotonic()
+
+    def upsert(self, device_id: int, name: Optional[str], brand: Optional[str]) -> None:
+        """Tambah atau update 1 device (incremental, tanpa rebuild)."""
+        with self._lock:
+            self._remove_entries(device_id)
+            doc = self._make_doc(device_id, name, brand)
+            self.docs[device_id] = doc
+            for token in doc["tokens"]:
+                insort(self.entries, (token, device_id))
+
+    def remove(self, device_id: int) -> None:
+        """Hapus 1 device dari index."""
+        with self._lock:
+            self._remove_entries(device_id)
+            self.docs.pop(device_id, None)
+
+    def is_stale(self) -> bool:
+        """True jika index belum dibangun atau sudah melewati batas umur."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at > SEARCH_INDEX_REFRESH_SECONDS
+        )
+
+    def _make_doc(self, device_id: int, name: Optional[str], brand: Optional[str]) -> Dict[str, Any]:
+        tokens = set(tokenize(name)) | set(tokenize(brand))
+        return {"id": device_id, "name": name or "", "brand": brand or "", "tokens": tokens}
+
+    def _remove_entries(self, device_id: int) -> None:
+        doc = self.docs.get(device_id)
+        if not doc:
+            return
+        for token in doc["tokens"]:
+            pos = bisect_left(self.entries, (token, device_id))
+            if pos < len(self.entries) and self.entries[pos] == (token, device_id):
+                del self.entries[pos]
+
+    # ==================== QUERY ====================
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Posisi [start, end) token yang diawali prefix (2x binary search)."""
+        start = bisect_left(self.entries, (prefix,))
+        end = bisect_left(self.entries, (prefix + "\uffff",))
+        return start, end
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Cari device yang semua kata query-nya cocok sebagai prefix.
+
+        Ranking:
+        1. Nama diawali query (misal "galaxy" -> "Galaxy S24")
+        2. Ada token yang sama persis dengan kata terakhir
+        3. Nama lebih pendek dulu, lalu alfabetis
+
+        Returns:
+            List of dict {"id", "name", "brand"}
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            # Mulai dari token paling selektif (range paling kecil)
+            ranges = [(self._prefix_range(t), t) for t in tokens]
+            ranges.sort(key=lambda item: item[0][1] - item[0][0])
+            (start, end), _ = ranges[0]
+            if start == end:
+                return []
+
+            candidate_ids = []
+            seen = set()
+            for _, device_id in self.entries[start:min(end, start + MAX_CANDIDATES)]:
+                if device_id not in seen:
+                    seen.add(device_id)
+                    candidate_ids.append(device_id)
+
+            # Cek token lain: setiap kata query harus jadi prefix salah satu token device
+            others = [t for _, t in ranges[1:]]
+            matches = []
+            for device_id in candidate_ids:
+                doc = self.docs[device_id]
+                if all(any(tok.startswith(t) for tok in doc["tokens"]) for t in others):
+                    matches.append(doc)
+
+        query_lower = query.strip().lower()
+        last_token = tokens[-1]
+        matches.sort(key=lambda doc: (
+            not doc["name"].lower().startswith(query_lower),
+            last_token not in doc["tokens"],
+            len(doc["name"]),
+            doc["name"].lower(),
+        ))
+
+        return [
+            {"id": doc["id"], "name": doc["name"], "brand": doc["brand"]}
+            for doc in matches[:limit]
+        ]
+
+
+# Singleton index untuk seluruh aplikasi
+device_prefix_index = PrefixIndex()
+
+
+def ensure_built(db: Session) -> PrefixIndex:
+    """Bangun index jika belum ada atau sudah terlalu lama (lazy)."""
+    if device_prefix_index.is_stale():
+        device_prefix_index.build(db)
+    return device_prefix_index
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Update index per device setiap ada perubahan katalog."""
+    if device_prefix_index.built_at is None:
+        return  # Belum dibangun, nanti dibangun lengkap saat pertama dipakai
+    for data in changed:
+        device_prefix_index.upsert(data["id"], data.get("name"), data.get("brand"))
+    for device_id in deleted_ids:
+        device_prefix_index.remove(device_id)
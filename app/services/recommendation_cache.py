@@ -0,0 +1,192 @@
+"""
+Recommendation Cache - Cache kandidat rekomendasi per rentang budget
+
+/recommendation/ sering dipanggil dengan budget yang hampir sama
+(4.999.000, 5.000.000, 5.100.000 ...). Tanpa cache setiap request menjalankan
+query filter ke database. Modul ini menyimpan KANDIDAT (id + spesifikasi
+numerik) per parameter yang sudah dinormalisasi:
+
+    key = (batas atas bucket harga, category_id, min_release_year)
+
+- max_price dibulatkan ke atas ke kelipatan RECOMMENDATION_PRICE_BUCKET,
+  jadi 4.999.000 dan 5.000.000 memakai kandidat yang sama (<= 5.000.000)
+- Filter harga yang tepat dilakukan di memory (NumPy), jadi hasilnya tetap
+  sama persis dengan query langsung
+- Hasil ranking (top-k id) per (max_price, use_case, limit) ikut disimpan
+  di entry, jadi request yang sama persis tidak menghitung skor lagi
+- Entry kedaluwarsa setelah RECOMMENDATION_CACHE_TTL_SECONDS (jaring pengaman
+  untuk multi-worker) dan dibuang lewat catalog_events jika device di
+  kategorinya berubah / dihapus
+- LRU dengan batas jumlah entry
+
+Author: Kelompok COMPARELY
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from ..core.config import (
+    RECOMMENDATION_CACHE_MAX_ENTRIES,
+    RECOMMENDATION_CACHE_TTL_SECONDS,
+    RECOMMENDATION_PRICE_BUCKET,
+)
+from . import catalog_events
+
+CacheKey = Tuple[Optional[int], Optional[int], Optional[int]]
+
+# Maksimal hasil ranking yang disimpan per entry
+MAX_RANKED_PER_ENTRY = 64
+
+
+class Candidates(NamedTuple):
+    """
+    Kandidat rekomendasi untuk 1 bucket.
+
+    Attributes:
+        ids: device_id per baris
+        price_idr: Kolom price_idr (NaN jika kosong), untuk filter budget
+        specs: Matrix spesifikasi (urutan SCORE_FEATURES)
+        ranked: (max_price, use_case, limit) -> list device_id hasil ranking
+    """
+    ids: np.ndarray
+    price_idr: np.ndarray
+    specs: np.ndarray
+    ranked: Dict[Tuple, list]
+
+
+def price_bucket(max_price: Optional[float]) -> Optional[int]:
+    """Batas atas bucket untuk max_price (dibulatkan ke atas), None = tanpa batas."""
+    if max_price is None:
+        return None
+    return int(math.ceil(max_price / RECOMMENDATION_PRICE_BUCKET)) * RECOMMENDATION_PRICE_BUCKET
+
+
+def make_key(max_price: Optional[float], category_id: Optional[int], min_release_year: Optional[int]) -> CacheKey:
+    """Key cache dari parameter request (max_price dibulatkan ke bucket)."""
+    return (price_bucket(max_price), category_id, min_release_year)
+
+
+class RecommendationCache:
+    """
+    LRU cache kandidat dengan TTL.
+
+    Attributes:
+        max_entries: Maksimal jumlah entry
+        ttl_seconds: Umur maksimal entry
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[Candidates, float, Set[int]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ==================== GET & PUT ====================
+
+    def get(self, key: CacheKey) -> Optional[Candidates]:
+        """Ambil kandidat (None jika tidak ada / kedaluwarsa)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, candidates: Candidates) -> None:
+        """Simpan kandidat, buang entry paling lama jika melewati batas."""
+        with self._lock:
+            self._entries[key] = (candidates, time.monotonic(), set(candidates.ids.tolist()))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def remember_ranked(self, candidates: Candidates, ranked_key: Tuple, device_ids: list) -> None:
+        """Simpan hasil ranking di entry (dibatasi MAX_RANKED_PER_ENTRY)."""
+        with self._lock:
+            if len(candidates.ranked) >= MAX_RANKED_PER_ENTRY:
+                candidates.ranked.clear()
+            candidates.ranked[ranked_key] = device_ids
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate_device(self, device_id: int) -> int:
+        """
+        Buang entry yang berisi device ini.
+
+        Returns:
+            Jumlah entry yang dibuang
+        """
+        return self._discard_where(lambda key, device_ids: device_id in device_ids)
+
+    def invalidate_category(self, category_id: Any) -> int:
+        """
+        Buang entry yang mungkin harus berisi device dari kategori ini
+        (filter kategori sama, atau tanpa filter kategori).
+
+        Returns:
+            Jumlah entry yang dibuang
+        """
+        return self._discard_where(lambda key, device_ids: key[1] is None or key[1] == category_id)
+
+    def _discard_where(self, predicate) -> int:
+        with self._lock:
+            keys = [key for key, (_, _, device_ids) in self._entries.items() if predicate(key, device_ids)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Kosongkan cache (statistik tetap)."""
+        with self._lock:
+            self._entries.clear()
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik cache untuk monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "price_bucket": RECOMMENDATION_PRICE_BUCKET,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Singleton cache untuk seluruh aplikasi
+recommendation_cache = RecommendationCache(
+    max_entries=RECOMMENDATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=RECOMMENDATION_CACHE_TTL_SECONDS,
+)
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Buang entry yang terpengaruh device yang di-edit atau dihapus."""
+    for data in changed:
+        recommendation_cache.invalidate_device(data["id"])
+        recommendation_cache.invalidate_category(data.get("category_id"))
+    for device_id in deleted_ids:
+        recommendation_cache.invalidate_device(device_id)
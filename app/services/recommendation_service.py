@@ -1,88 +1,214 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 from .. import models
+from ..core.config import DEFAULT_SCORE_WEIGHTS, USE_CASE_WEIGHTS
 from ..crud import device as device_crud
+from . import recommendation_cache
+
+# ==================== SCORING FEATURES ====================
+
+# Spesifikasi yang bisa diberi bobot: (nama, skala log?, lebih besar lebih baik?)
+# Urutan = urutan kolom matrix kandidat (setelah kolom id)
+SCORE_FEATURES: List[Tuple[str, bool, bool]] = [
+    ("price", False, False),          # price_idr, fallback kolom price
+    ("release_year", False, True),
+    ("ram_gb", True, True),
+    ("storage_gb", True, True),
+    ("main_camera_mp", True, True),
+    ("battery_mah", False, True),
+    ("screen_inch", False, True),
+]
+
+_FEATURE_INDEX = {name: i for i, (name, _, _) in enumerate(SCORE_FEATURES)}
+_LOG_SCALE = np.array([log for _, log, _ in SCORE_FEATURES])
+_HIGHER_IS_BETTER = np.array([higher for _, _, higher in SCORE_FEATURES])
+
+
+def weight_vector(use_case: Optional[str] = None) -> np.ndarray:
+    """
+    Bobot per spesifikasi (urutan SCORE_FEATURES) untuk 1 use case.
+
+    Args:
+        use_case: Salah satu USE_CASES, None = bobot umum (tahun + harga)
+
+    Returns:
+        Array bobot (total 1.0)
+
+    Raises:
+        ValueError: Jika use case tidak dikenal
+    """
+    if use_case is None:
+        weights = DEFAULT_SCORE_WEIGHTS
+    elif use_case in USE_CASE_WEIGHTS:
+        weights = USE_CASE_WEIGHTS[use_case]
+    else:
+        raise ValueError(f"Use case tidak dikenal: {use_case}. Pilihan: {', '.join(USE_CASE_WEIGHTS)}")
+
+    vector = np.zeros(len(SCORE_FEATURES))
+    for name, weight in weights.items():
+        vector[_FEATURE_INDEX[name]] = weight
+    return vector / vector.sum()
+
+
+def spec_weight_vector(use_case: Optional[str] = None) -> np.ndarray:
+    """
+    Bobot spesifikasi tanpa harga (untuk sumbu "spesifikasi" mode Pareto).
+
+    Args:
+        use_case: Salah satu USE_CASES, None = semua spesifikasi sama rata
+
+    Raises:
+        ValueError: Jika use case tidak dikenal
+    """
+    if use_case is None:
+        vector = np.ones(len(SCORE_FEATURES))
+    else:
+        vector = weight_vector(use_case)
+    vector[_FEATURE_INDEX["price"]] = 0.0
+    return vector / vector.sum()
+
+
+def spec_row(data: Dict[str, Any]) -> Tuple[Optional[float], ...]:
+    """1 baris matrix kandidat (urutan SCORE_FEATURES) dari dict kolom phone."""
+    price = data.get("price_idr") or data.get("price") or None
+    return (price,) + tuple(data.get(name) for name, _, _ in SCORE_FEATURES[1:])
+
+
+# ==================== RECOMMENDATION ====================
 
 def get_recommendations(
     db: Session,
     max_price: Optional[float] = None,
     category_id: Optional[int] = None,
     min_release_year: Optional[int] = None,
-    limit: int = 5
+    limit: int = 5,
+    use_case: Optional[str] = None
 ) -> List[models.Phone]:
     """
     Memberikan rekomendasi phone berdasarkan kriteria yang diberikan.
-    
-    Logika sederhana untuk mahasiswa:
-    1. Filter berdasarkan kriteria (harga, kategori, tahun)
-    2. Sort berdasarkan tahun rilis (terbaru) dan harga (termurah)
-    3. Return top N phones
-    
+
+    Logika:
+    1. Kandidat (kolom spesifikasi numerik saja) diambil dari cache per
+       bucket budget, atau di-query jika belum ada (_load_candidates)
+    2. Filter budget yang tepat di memory, lalu semua kandidat diberi skor
+       sekaligus dengan NumPy (score_candidates) memakai bobot use case
+    3. Top N diambil dengan argpartition, detail device di-load 1 query
+
     Args:
         db: Database session
         max_price: Harga maksimal yang diinginkan
         category_id: ID kategori (1=Smartphone, 2=Laptop, dll)
         min_release_year: Tahun rilis minimal
         limit: Berapa banyak rekomendasi yang dikembalikan
-    
+        use_case: Use case (lihat USE_CASES di core/config.py), None = umum
+
     Returns:
-        List of Phone objects
+        List of Phone objects, skor tertinggi dulu
+
+    Raises:
+        ValueError: Jika use case tidak dikenal
     """
-    # Mulai dengan query semua devices
-    query = db.query(models.Phone)
-    
-    # Filter berdasarkan harga maksimal
-    if max_price is not None:
-        query = query.filter(models.Phone.price <= max_price)
-    
+    weights = weight_vector(use_case)
+
+    # Kandidat per bucket budget dari cache (lihat recommendation_cache.py)
+    cache = recommendation_cache.recommendation_cache
+    key = recommendation_cache.make_key(max_price, category_id, min_release_year)
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = _load_candidates(db, key[0], category_id, min_release_year)
+        cache.put(key, candidates)
+
+    ranked_key = (max_price, use_case, limit)
+    top_ids = candidates.ranked.get(ranked_key)
+    if top_ids is None:
+        # Filter budget yang tepat di dalam bucket
+        in_budget = slice(None) if max_price is None else candidates.price_idr <= max_price
+        ids, specs = candidates.ids[in_budget], candidates.specs[in_budget]
+        top_ids = ids[top_k(score_candidates(specs, weights), limit)].tolist() if len(ids) else []
+        cache.remember_ranked(candidates, ranked_key, top_ids)
+
+    return device_crud.get_devices_by_ids(db, top_ids)
+
+
+def _load_candidates(
+    db: Session,
+    price_limit: Optional[int],
+    category_id: Optional[int],
+    min_release_year: Optional[int]
+) -> recommendation_cache.Candidates:
+    """Query kandidat (kolom id + spesifikasi numerik saja) untuk 1 bucket."""
+    query = db.query(
+        models.Phone.id,
+        models.Phone.price_idr,
+        models.Phone.price,
+        models.Phone.release_year,
+        models.Phone.ram_gb,
+        models.Phone.storage_gb,
+        models.Phone.main_camera_mp,
+        models.Phone.battery_mah,
+        models.Phone.screen_inch,
+    )
+
+    # Filter berdasarkan batas atas bucket harga (kolom price_idr integer ter-index)
+    if price_limit is not None:
+        query = query.filter(models.Phone.price_idr <= price_limit)
+
     # Filter berdasarkan kategori
     if category_id is not None:
         query = query.filter(models.Phone.category_id == category_id)
-    
+
     # Filter berdasarkan tahun rilis minimal
     if min_release_year is not None:
         query = query.filter(models.Phone.release_year >= min_release_year)
-    
-    # Sort: Prioritas tahun terbaru, lalu harga termurah
-    query = query.order_by(
-        models.Phone.release_year.desc(),  # Tahun terbaru dulu
-        models.Phone.price.asc()            # Harga termurah dulu
+
+    rows = query.all()
+    return recommendation_cache.Candidates(
+        ids=np.array([row.id for row in rows], dtype=np.int64),
+        price_idr=np.array([row.price_idr for row in rows], dtype=float),
+        specs=np.array([spec_row(row._mapping) for row in rows], dtype=float).reshape(len(rows), len(SCORE_FEATURES)),
+        ranked={},
     )
-    
-    # Ambil top N phones
-    return query.limit(limit).all()
 
 
-def calculate_device_score(device: models.Phone) -> float:
+def score_candidates(specs: np.ndarray, weights: np.ndarray) -> np.ndarray:
     """
-    Menghitung skor phone berdasarkan beberapa faktor.
-    Skor lebih tinggi = lebih direkomendasikan.
-    
-    Faktor yang dipertimbangkan:
-    - Tahun rilis (lebih baru = lebih baik)
-    - Harga (lebih murah = lebih baik, dengan normalisasi)
-    
+    Skor semua kandidat dalam 1 operasi matrix.
+
+    Setiap kolom dinormalisasi 0..1 di antara kandidat (min-max, skala log
+    untuk RAM/storage/kamera). Untuk harga dibalik: termurah = 1.
+    Spesifikasi kosong (NaN) dapat 0, jadi tidak pernah menaikkan skor.
+
     Args:
-        device: Phone object
-    
+        specs: Matrix (n kandidat x SCORE_FEATURES), kosong = NaN
+        weights: Bobot dari weight_vector()
+
     Returns:
-        Skor phone (float)
+        Array skor (n,), 0..1
+    """
+    missing = np.isnan(specs)
+    values = np.where(_LOG_SCALE, np.log1p(np.where(missing, 0.0, specs)), specs)
+    low = np.where(missing, np.inf, values).min(axis=0)
+    high = np.where(missing, -np.inf, values).max(axis=0)
+    varies = high > low  # Kolom kosong semua / nilainya sama -> tidak membedakan
+
+    span = np.where(varies, high - low, 1.0)
+    normalized = (values - np.where(varies, low, 0.0)) / span
+    normalized = np.where(_HIGHER_IS_BETTER, normalized, 1.0 - normalized)
+    normalized = np.where(varies & ~missing, normalized, 0.0)
+    return normalized @ weights
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
     """
-    score = 0.0
-    
-    # Faktor 1: Tahun Rilis (bobot 60%)
-    # Asumsi: tahun 2020-2025 adalah range yang relevan
-    if device.release_year:
-        # Normalisasi: 2020 = 0, 2025 = 5
-        year_score = max(0, device.release_year - 2020) * 12  # Max 60 poin
-        score += year_score
-    
-    # Faktor 2: Harga (bobot 40%)
-    # Semakin murah semakin baik (inverse)
-    if device.price:
-        # Normalisasi harga: 1jt = 40 poin, 20jt = 0 poin
-        price_float = float(device.price)
-        price_score = max(0, 40 - (price_float / 500000))  # Max 40 poin
-        score += price_score
-    
-    return score
+    Indeks k skor tertinggi, urut skor tertinggi dulu.
+
+    argpartition memilih k teratas tanpa sort penuh (O(n)), lalu hanya
+    k hasil itu yang di-sort. Skor sama -> urutan kandidat (stabil).
+    """
+    if k >= len(scores):
+        selected = np.arange(len(scores))
+    else:
+        selected = np.argpartition(-scores, k - 1)[:k]
+    return selected[np.lexsort((selected, -scores[selected]))]
+
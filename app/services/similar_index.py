@@ -0,0 +1,359 @@
+"""
+Similar Index - Cari device yang mirip (nearest neighbour) di memory
+
+Halaman /device/{id} menampilkan device lain dengan spesifikasi paling mirip.
+Setiap device diubah jadi vektor spesifikasi yang sudah dinormalisasi:
+
+    [harga, RAM, storage, baterai, kamera, layar, tahun rilis]
+
+- Harga/RAM/storage/kamera memakai skala log (5 vs 6 juta sama jauhnya
+  dengan 10 vs 12 juta)
+- Setiap dimensi di-standarisasi (median & standar deviasi katalog) lalu
+  dikali bobot FEATURES; nilai kosong diisi median (= 0 setelah standarisasi)
+
+Vektor disimpan di KD-tree (leaf berisi ~LEAF_SIZE device, jarak di leaf
+dihitung dengan NumPy), jadi lookup k tetangga hanya membuka sebagian kecil
+leaf, bukan seluruh katalog (median < 0.5 ms, p99 < 2 ms untuk 100k device).
+
+Update incremental lewat catalog_events:
+- Device yang di-edit/dihapus ditandai mati di tree (tombstone)
+- Versi baru masuk buffer kecil yang dicek brute force setiap query
+- Jika buffer sudah besar, tree dibangun ulang dari vektor di memory
+  (tanpa query database)
+
+Benchmark: python scripts/benchmarks/similar_devices.py
+
+Author: Kelompok COMPARELY
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.config import SEARCH_INDEX_REFRESH_SECONDS
+from ..models import Phone
+from . import catalog_events
+
+
+def _price(data: Dict[str, Any]) -> Optional[float]:
+    """Harga Rupiah: price_idr, fallback ke kolom price (data lama)."""
+    if data.get("price_idr") is not None:
+        return data["price_idr"]
+    return data.get("price")
+
+
+# Dimensi vektor: (nama, ambil nilai dari dict kolom phone, transform, bobot)
+FEATURES: List[Tuple[str, Callable[[Dict[str, Any]], Any], Callable, float]] = [
+    ("price", _price, np.log1p, 2.0),
+    ("ram_gb", lambda d: d.get("ram_gb"), np.log1p, 1.0),
+    ("storage_gb", lambda d: d.get("storage_gb"), np.log1p, 1.0),
+    ("battery_mah", lambda d: d.get("battery_mah"), None, 0.8),
+    ("main_camera_mp", lambda d: d.get("main_camera_mp"), np.log1p, 0.8),
+    ("screen_inch", lambda d: d.get("screen_inch"), None, 0.8),
+    ("release_year", lambda d: d.get("release_year"), None, 1.0),
+]
+
+# Kolom phones yang dibaca untuk membangun index
+_COLUMNS = ("id", "price_idr", "price", "ram_gb", "storage_gb", "battery_mah",
+            "main_camera_mp", "screen_inch", "release_year")
+
+# Maksimal k untuk /devices/{id}/similar
+MAX_SIMILAR = 50
+
+# Jumlah device per leaf KD-tree
+LEAF_SIZE = 128
+
+# Jumlah leaf di batch scan pertama (batch berikutnya 2x lipat)
+SCAN_BATCH_LEAVES = 16
+
+# Buffer update dibangun ulang ke tree jika melewati max(MIN, rasio x katalog)
+REBUILD_BUFFER_MIN = 256
+REBUILD_BUFFER_RATIO = 0.02
+
+
+# ==================== KD-TREE ====================
+
+class KDTree:
+    """
+    KD-tree dengan leaf berisi banyak titik (bucket).
+
+    Titik disusun ulang supaya setiap leaf = potongan array yang berurutan
+    (points[start:end]). Setiap leaf menyimpan bounding box-nya, jadi query
+    tidak menelusuri node satu per satu di Python:
+
+    1. Jarak minimum titik query ke semua bounding box (1 operasi NumPy)
+    2. Leaf terdekat di-scan sampai dapat k kandidat -> batas jarak ke-k
+    3. Hanya leaf yang bounding box-nya masih di dalam batas itu yang di-scan
+
+    Attributes:
+        points: Titik dalam urutan tree (n x d, float32)
+        order: Posisi di urutan tree -> indeks baris input
+        alive: False untuk titik yang sudah dihapus (tombstone)
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE):
+        n, dims = points.shape
+        self.leaf_size = leaf_size
+        self.order = np.arange(n)
+        leaf_starts: List[int] = []
+        if n:
+            self._split(points, 0, n, leaf_starts)
+
+        self.points = np.ascontiguousarray(points[self.order], dtype=np.float32)
+        self.alive = np.ones(n, dtype=bool)
+
+        # Leaf dibuat berurutan (kiri dulu), jadi start-nya naik dan menutupi 0..n
+        self.leaf_start = np.array(leaf_starts, dtype=np.int64)
+        self.leaf_end = np.append(self.leaf_start[1:], n).astype(np.int64)
+        self.leaf_of = np.repeat(np.arange(len(leaf_starts)), self.leaf_end - self.leaf_start)
+        self.leaf_alive = self.leaf_end - self.leaf_start
+        if n:
+            self.leaf_low = np.minimum.reduceat(self.points, self.leaf_start)
+            self.leaf_high = np.maximum.reduceat(self.points, self.leaf_start)
+        else:
+            self.leaf_low = self.leaf_high = np.empty((0, dims))
+
+    def _split(self, points: np.ndarray, lo: int, hi: int, leaf_starts: List[int]) -> None:
+        """Bagi order[lo:hi] di median dimensi dengan sebaran terbesar."""
+        if hi - lo > self.leaf_size:
+            subset = points[self.order[lo:hi]]
+            spread = subset.max(axis=0) - subset.min(axis=0)
+            dim = int(spread.argmax())
+            if spread[dim] > 0:
+                mid = (hi - lo) // 2
+                self.order[lo:hi] = self.order[lo:hi][np.argpartition(subset[:, dim], mid)]
+                self._split(points, lo, lo + mid, leaf_starts)
+                self._split(points, lo + mid, hi, leaf_starts)
+                return
+        leaf_starts.append(lo)  # Leaf (sudah kecil, atau semua titik sama)
+
+    def kill(self, pos: int) -> None:
+        """Tandai titik di posisi pos sebagai terhapus."""
+        if self.alive[pos]:
+            self.alive[pos] = False
+            self.leaf_alive[self.leaf_of[pos]] -= 1
+
+    def query(self, point: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k titik terdekat (hanya yang alive).
+
+        Returns:
+            Tuple (jarak kuadrat, posisi di urutan tree), urut terdekat dulu
+        """
+        if not len(self.points) or k <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        point = np.asarray(point, dtype=self.points.dtype)
+        gap = np.maximum(self.leaf_low - point, 0) + np.maximum(point - self.leaf_high, 0)
+        bound = (gap * gap).sum(axis=1)
+        leaf_order = np.argsort(bound)
+        sorted_bound = bound[leaf_order]
+
+        # Scan leaf dari yang terdekat, batch makin besar. Setelah setiap batch
+        # batas jarak ke-k makin ketat; berhenti jika leaf berikutnya di luar batas.
+        first = int(np.searchsorted(np.cumsum(self.leaf_alive[leaf_order]), k)) + 1
+        start, end = 0, max(first, SCAN_BATCH_LEAVES)
+        dist, pos = np.empty(0, dtype=point.dtype), np.empty(0, dtype=np.int64)
+        while start < len(leaf_order):
+            more_dist, more_pos = self._scan(leaf_order[start:end], point)
+            dist = np.concatenate((dist, more_dist))
+            pos = np.concatenate((pos, more_pos))
+            if len(dist) > k:
+                keep = np.argpartition(dist, k - 1)[:k]
+                dist, pos = dist[keep], pos[keep]
+
+            start, end = end, end * 2
+            if len(dist) >= k:
+                worst = dist.max()
+                end = min(end, int(np.searchsorted(sorted_bound, worst, side="right")))
+                if end <= start:
+                    break
+
+        ranked = np.argsort(dist, kind="stable")
+        return dist[ranked], pos[ranked]
+
+    def _scan(self, leaves: np.ndarray, point: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Jarak kuadrat ke semua titik alive di leaf-leaf ini."""
+        starts, ends = self.leaf_start[leaves], self.leaf_end[leaves]
+        sizes = ends - starts
+        # Gabungkan range [start, end) semua leaf jadi 1 array posisi
+        pos = np.arange(sizes.sum()) + np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+        pos = pos[self.alive[pos]]
+        diff = self.points[pos] - point
+        return np.einsum("ij,ij->i", diff, diff), pos
+
+
+# ==================== SIMILAR INDEX ====================
+
+class SimilarIndex:
+    """
+    Index nearest neighbour untuk device.
+
+    Attributes:
+        center, scale: Parameter normalisasi per dimensi (dihitung saat build)
+        tree: KD-tree berisi vektor saat build/rebuild terakhir
+        tree_ids: device_id per posisi di tree
+        tree_pos: device_id -> posisi di tree (hanya yang masih alive)
+        buffer: device_id -> vektor untuk device yang berubah setelah build
+    """
+
+    def __init__(self):
+        self.built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        dims = len(FEATURES)
+        self.center = np.zeros(dims)
+        self.scale = np.ones(dims)
+        self.weights = np.array([feature[3] for feature in FEATURES])
+        self._set_tree(np.empty((0, dims)), np.empty(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.tree_pos) + len(self.buffer)
+
+    # ==================== BUILD & UPDATE ====================
+
+    def build(self, db: Session) -> None:
+        """Bangun ulang index dari database (hanya kolom spesifikasi numerik)."""
+        rows = db.query(*(getattr(Phone, column) for column in _COLUMNS)).all()
+        self.load(dict(zip(_COLUMNS, row)) for row in rows)
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Bangun ulang index (termasuk parameter normalisasi) dari dict kolom phone."""
+        rows = list(rows)
+        raw = self._raw_matrix(rows)
+        with self._lock:
+            self.center = np.nan_to_num(np.nanmedian(raw, axis=0)) if len(rows) else np.zeros(raw.shape[1])
+            std = np.nanstd(raw, axis=0) if len(rows) else np.ones(raw.shape[1])
+            self.scale = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+            ids = np.array([row["id"] for row in rows], dtype=np.int64)
+            self._set_tree(self._normalize(raw), ids)
+            self.built_at = time.monotonic()
+
+    def upsert(self, data: Dict[str, Any]) -> None:
+        """Tambah atau update 1 device (dict snapshot dari catalog_events)."""
+        vector = self._normalize(self._raw_matrix([data]))[0].astype(np.float32)
+        with self._lock:
+            self._kill(data["id"])
+            self.buffer[data["id"]] = vector
+            self._buffer_matrix = None
+            if len(self.buffer) > max(REBUILD_BUFFER_MIN, REBUILD_BUFFER_RATIO * len(self.tree_pos)):
+                self._rebuild_from_memory()
+
+    def remove(self, device_id: int) -> None:
+        """Hapus 1 device dari index."""
+        with self._lock:
+            self._kill(device_id)
+            if self.buffer.pop(device_id, None) is not None:
+                self._buffer_matrix = None
+
+    def is_stale(self) -> bool:
+        """True jika index belum dibangun atau sudah melewati batas umur."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at > SEARCH_INDEX_REFRESH_SECONDS
+        )
+
+    def _set_tree(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        self.tree = KDTree(vectors)
+        self.tree_ids = ids[self.tree.order]
+        self.tree_pos: Dict[int, int] = {int(device_id): pos for pos, device_id in enumerate(self.tree_ids)}
+        self.buffer: Dict[int, np.ndarray] = {}
+        self._buffer_matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _kill(self, device_id: int) -> None:
+        pos = self.tree_pos.pop(device_id, None)
+        if pos is not None:
+            self.tree.kill(pos)
+
+    def _rebuild_from_memory(self) -> None:
+        """Gabungkan buffer ke tree baru (parameter normalisasi tetap)."""
+        alive = self.tree.alive
+        vectors = np.vstack([self.tree.points[alive]] + list(self.buffer.values()))
+        ids = np.concatenate([self.tree_ids[alive], np.array(list(self.buffer), dtype=np.int64)])
+        self._set_tree(vectors, ids)
+
+    def _raw_matrix(self, rows: List[Dict[str, Any]]) -> np.ndarray:
+        """Nilai mentah (sudah di-transform log) per dimensi, None -> NaN."""
+        raw = np.array(
+            [[extract(row) for _, extract, _, _ in FEATURES] for row in rows],
+            dtype=float
+        ).reshape(len(rows), len(FEATURES))
+        for i, (_, _, transform, _) in enumerate(FEATURES):
+            if transform is not None:
+                raw[:, i] = transform(raw[:, i])
+        return raw
+
+    def _normalize(self, raw: np.ndarray) -> np.ndarray:
+        """Standarisasi + bobot. Nilai kosong diisi median (= 0)."""
+        normalized = (raw - self.center) / self.scale
+        return np.nan_to_num(normalized, nan=0.0) * self.weights
+
+    # ==================== QUERY ====================
+
+    def vector_of(self, device_id: int) -> Optional[np.ndarray]:
+        """Vektor device (None jika tidak ada di index)."""
+        if device_id in self.buffer:
+            return self.buffer[device_id]
+        pos = self.tree_pos.get(device_id)
+        return None if pos is None else self.tree.points[pos]
+
+    def similar(self, device_id: int, k: int = 10) -> Optional[List[Tuple[int, float]]]:
+        """
+        k device paling mirip dengan device_id (tidak termasuk device itu sendiri).
+
+        Returns:
+            List (device_id, jarak) urut paling mirip dulu,
+            atau None jika device tidak ada di index
+        """
+        with self._lock:
+            vector = self.vector_of(device_id)
+            if vector is None:
+                return None
+            return [
+                (other_id, distance)
+                for other_id, distance in self.nearest(vector, k + 1)
+                if other_id != device_id
+            ][:k]
+
+    def nearest(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """k device terdekat dari sebuah vektor (tree + buffer)."""
+        with self._lock:
+            dist, pos = self.tree.query(vector, k)
+            candidates = list(zip(self.tree_ids[pos].tolist(), dist.tolist()))
+
+            if self.buffer:
+                if self._buffer_matrix is None:
+                    self._buffer_matrix = (
+                        np.array(list(self.buffer), dtype=np.int64),
+                        np.vstack(list(self.buffer.values())),
+                    )
+                buffer_ids, buffer_vectors = self._buffer_matrix
+                buffer_dist = ((buffer_vectors - vector) ** 2).sum(axis=1)
+                candidates += zip(buffer_ids.tolist(), buffer_dist.tolist())
+
+            candidates.sort(key=lambda item: item[1])
+            return [(device_id, float(np.sqrt(d))) for device_id, d in candidates[:k]]
+
+
+# Singleton index untuk seluruh aplikasi
+device_similar_index = SimilarIndex()
+
+
+def ensure_built(db: Session) -> SimilarIndex:
+    """Bangun index jika belum ada atau sudah terlalu lama (lazy)."""
+    if device_similar_index.is_stale():
+        device_similar_index.build(db)
+    return device_similar_index
+
+
+@catalog_events.subscribe
+def _on_catalog_change(changed, deleted_ids):
+    """Update index per device setiap ada perubahan katalog."""
+    if device_similar_index.built_at is None:
+        return  # Belum dibangun, nanti dibangun lengkap saat pertama dipakai
+    for data in changed:
+        device_similar_index.upsert(data)
+    for device_id in deleted_ids:
+        device_similar_index.remove(device_id)
@@ -0,0 +1,151 @@
+"""
+Single Flight - Gabungkan panggilan async identik yang berjalan bersamaan
+
+Saat 1 link perbandingan ramai dibuka, puluhan request /compare/ai untuk
+pasangan yang sama datang hampir bersamaan. Sebelum jawaban pertama masuk
+cache, setiap request memanggil AI API sendiri-sendiri (boros kuota, mudah
+kena 429). Dengan single flight:
+
+- Request pertama untuk sebuah key menjalankan panggilan (leader)
+- Request lain dengan key yang sama selama panggilan masih berjalan
+  menunggu hasil yang sama (collapsed), tanpa panggilan baru
+- Setelah selesai, key dilepas; request berikutnya memanggil lagi
+  (biasanya sudah kena cache)
+
+Panggilan berjalan sebagai task terpisah: jika salah satu request dibatalkan
+(misal client disconnect), request lain tetap mendapat hasilnya.
+
+Hal yang sama berlaku untuk stream (/compare/ai/stream): SingleFlight.stream
+menjalankan 1 stream leader per key dan menyiarkan setiap item ke semua
+subscriber. Subscriber yang datang belakangan menerima ulang item yang
+sudah lewat, lalu lanjut mengikuti stream yang sama.
+
+Author: Kelompok COMPARELY
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+class SingleFlight:
+    """
+    Penggabung panggilan async per key.
+
+    Attributes:
+        calls: Jumlah permintaan
+        executions: Jumlah panggilan yang benar-benar dijalankan
+        collapsed: Jumlah permintaan yang menumpang panggilan yang sedang berjalan
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, "_Broadcast"] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Jalankan fn(), atau tunggu hasil fn() yang sedang berjalan untuk key ini.
+
+        Args:
+            key: Identitas panggilan (misal hash prompt)
+            fn: Fungsi async tanpa argumen
+
+        Returns:
+            Hasil fn() (exception juga diteruskan ke semua yang menunggu)
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(key)
+        if task is None or task.get_loop() is not loop:
+            self.executions += 1
+            task = loop.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Ikuti stream fn(), atau stream fn() yang sedang berjalan untuk key ini.
+
+        Args:
+            key: Identitas stream
+            fn: Fungsi tanpa argumen yang mengembalikan async iterator
+
+        Yields:
+            Semua item stream dari awal (exception diteruskan ke semua subscriber)
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        broadcast = self._streams.get(key)
+        if broadcast is None or broadcast.task.get_loop() is not loop:
+            self.executions += 1
+            broadcast = _Broadcast()
+            broadcast.task = loop.create_task(broadcast.pump(fn()))
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(
+                lambda done, key=key, broadcast=broadcast: self._forget_stream(key, broadcast)
+            )
+        else:
+            self.collapsed += 1
+        async for item in broadcast.subscribe():
+            yield item
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def _forget_stream(self, key: str, broadcast: "_Broadcast") -> None:
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistik untuk monitoring."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "collapse_rate": round(self.collapsed / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._in_flight) + len(self._streams),
+        }
+
+
+class _Broadcast:
+    """Item 1 stream leader, disimpan supaya bisa dibaca ulang oleh setiap subscriber."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    async def pump(self, iterator: AsyncIterator[Any]) -> None:
+        try:
+            async for item in iterator:
+                async with self._changed:
+                    self.items.append(item)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self._changed:
+                self.finished = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.items) or self.finished)
+                pending, finished = self.items[index:], self.finished
+            index += len(pending)
+            for item in pending:
+                yield item
+            if finished:
+                if self.error is not None:
+                    raise self.error
+                return
@@ -2,6 +2,8 @@
 // COMPARE PAGE - Fetch AI Analysis
 // File: compare.js
 // Deskripsi: JavaScript untuk halaman compare dengan AI
+// Ringkasan perbandingan sudah dirender server (tanpa AI);
+// analisis AI hanya diminta saat user menekan tombol
 // ==========================================
 
 // Tunggu sampai halaman selesai load
@@ -14,7 +16,7 @@ document.addEventListener('DOMContentLoaded', function () {
     addFadeInAnimation('.highlight-card');
 
     // ==========================================
-    // FETCH AI ANALYSIS OTOMATIS
+    // FETCH AI ANALYSIS (atas permintaan user)
     // ==========================================
 
     // Ambil device IDs dari URL
@@ -23,9 +25,16 @@ document.addEventListener('DOMContentLoaded', function () {
     const deviceId1 = urlParams.get('id1');
     const deviceId2 = urlParams.get('id2');
 
-    // Kalau ada kedua ID, fetch AI analysis
-    if (deviceId1 && deviceId2) {
-        fetchAIAnalysis(deviceId1, deviceId2);
+    // Tombol "Analisis dengan AI": fetch AI analysis
+    const aiRequestBtn = document.getElementById('aiRequestBtn');
+    if (aiRequestBtn) {
+        if (!deviceId1 || !deviceId2) {
+            aiRequestBtn.style.display = 'none';
+        }
+        aiRequestBtn.addEventListener('click', function () {
+            aiRequestBtn.style.display = 'none';
+            fetchAIAnalysis(deviceId1, deviceId2);
+        });
     }
 
     // ==========================================
@@ -55,6 +64,12 @@ function fetchAIAnalysis(id1, id2) {
     resultDiv.style.display = 'none';
     errorDiv.style.display = 'none';
 
+    // Browser modern: pakai streaming (bagian analisis muncul satu per satu)
+    if (window.EventSource) {
+        streamAIAnalysis(id1, id2);
+        return;
+    }
+
     // Fetch ke endpoint /compare/ai
     // Pakai fetch API (built-in JavaScript, gak perlu library)
     fetch(`/compare/ai?id1=${id1}&id2=${id2}`)
@@ -77,6 +92,51 @@ function fetchAIAnalysis(id1, id2) {
         });
 }
 
+// ==========================================
+// FUNCTION: Stream AI Analysis (Server-Sent Events)
+// Endpoint /compare/ai/stream mengirim event:
+// - section: 1 bagian analisis yang sudah selesai
+// - done: analisis lengkap
+// ==========================================
+function streamAIAnalysis(id1, id2) {
+    const loadingDiv = document.getElementById('aiLoading');
+    const resultDiv = document.getElementById('aiResult');
+    const source = new EventSource(`/compare/ai/stream?id1=${id1}&id2=${id2}`);
+    let finished = false;
+
+    resultDiv.innerHTML = '';
+
+    source.addEventListener('section', function (event) {
+        const section = JSON.parse(event.data);
+
+        // Bagian pertama tiba: ganti loading (dan ringkasan) dengan hasil
+        loadingDiv.style.display = 'none';
+        hideSummary();
+        resultDiv.style.display = 'block';
+
+        const paragraph = document.createElement('p');
+        const title = document.createElement('strong');
+        title.textContent = section.title + ':';
+        paragraph.appendChild(title);
+        paragraph.appendChild(document.createTextNode(' ' + section.text));
+        resultDiv.appendChild(paragraph);
+    });
+
+    source.addEventListener('done', function (event) {
+        finished = true;
+        source.close();
+        displayAIResult(JSON.parse(event.data).ai_analysis);
+    });
+
+    source.onerror = function () {
+        // EventSource otomatis reconnect; kita tutup dan tampilkan error saja
+        source.close();
+        if (!finished) {
+            showError();
+        }
+    };
+}
+
 // ==========================================
 // FUNCTION: Tampilkan hasil AI
 // ==========================================
@@ -88,7 +148,8 @@ function displayAIResult(aiAnalysis) {
     // Sembunyikan loading
     loadingDiv.style.display = 'none';
 
-    // Tampilkan result
+    // Tampilkan result (menggantikan ringkasan tanpa AI)
+    hideSummary();
     resultDiv.style.display = 'block';
 
     // Format AI analysis dengan line breaks
@@ -120,3 +181,14 @@ function showError() {
     // Tampilkan error
     errorDiv.style.display = 'block';
 }
+
+// ==========================================
+// FUNCTION: Sembunyikan ringkasan tanpa AI
+// (hasil AI berisi bagian yang sama)
+// ==========================================
+function hideSummary() {
+    const summaryDiv = document.getElementById('summaryResult');
+    if (summaryDiv) {
+        summaryDiv.style.display = 'none';
+    }
+}
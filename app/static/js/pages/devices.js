@@ -27,7 +27,10 @@ document.addEventListener('DOMContentLoaded', function () {
     // VARIABEL GLOBAL
     // ==========================================
 
-    // Array untuk menyimpan device yang dipilih (maksimal 2)
+    // Maksimal device yang bisa dibandingkan (sama dengan MAX_COMPARE_DEVICES di server)
+    const MAX_COMPARE_DEVICES = 10;
+
+    // Array untuk menyimpan device yang dipilih (maksimal MAX_COMPARE_DEVICES)
     let selectedDevices = [];
 
     // ==========================================
@@ -196,6 +199,10 @@ document.addEventListener('DOMContentLoaded', function () {
             if (selectedDevices.length === 2) {
                 // Redirect ke halaman compare
                 window.location.href = `/compare-page?id1=${selectedDevices[0].id}&id2=${selectedDevices[1].id}`;
+            } else if (selectedDevices.length > 2) {
+                // Lebih dari 2 device: tabel perbandingan multi kolom
+                const ids = selectedDevices.map(device => device.id).join(',');
+                window.location.href = `/compare-multi?ids=${ids}`;
             }
         });
     }
@@ -246,14 +253,14 @@ document.addEventListener('DOMContentLoaded', function () {
      * Function untuk tambah device ke selection
      */
     function addDevice(id, name, card) {
-        // Cek apakah sudah ada 2 device
-        if (selectedDevices.length >= 2) {
+        // Cek apakah sudah mencapai batas device
+        if (selectedDevices.length >= MAX_COMPARE_DEVICES) {
             // Uncheck checkbox yang baru diklik
             const checkboxes = document.querySelectorAll(`.device-checkbox[data-id="${id}"]`);
             checkboxes.forEach(cb => cb.checked = false);
 
             // Tampilkan pesan ke user
-            alert('Maksimal 2 device untuk dibandingkan!');
+            alert(`Maksimal ${MAX_COMPARE_DEVICES} device untuk dibandingkan!`);
             return;
         }
 
@@ -303,7 +310,7 @@ document.addEventListener('DOMContentLoaded', function () {
             `).join('');
 
             // Enable/disable tombol compare
-            if (selectedDevices.length === 2) {
+            if (selectedDevices.length >= 2) {
                 compareButton.disabled = false;
             } else {
                 compareButton.disabled = true;
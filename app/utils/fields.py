@@ -0,0 +1,72 @@
+"""
+Fields Utility - Sparse fieldset (`?fields=`) untuk API device
+
+Response list device default berisi semua kolom phone (termasuk description
+yang panjang) + category. Kebanyakan client hanya butuh beberapa kolom:
+
+    GET /devices/?fields=id,name,brand,price,image_url
+
+Modul ini memvalidasi parameter `fields` dan mengubah object Phone menjadi
+dict biasa berisi kolom yang diminta saja. Kolom yang sama dipakai di SQL
+(load_only) supaya kolom lain tidak ikut di-SELECT, dan response dibuat
+tanpa membangun model Pydantic per baris.
+
+Author: Kelompok COMPARELY
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import inspect
+
+from ..models import Phone
+
+# Field yang boleh diminta: semua kolom phones + relasi category
+PHONE_COLUMNS = tuple(attr.key for attr in inspect(Phone).column_attrs)
+PHONE_FIELDS = PHONE_COLUMNS + ("category",)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse parameter `fields` ("id,name,price") jadi list nama field.
+
+    Args:
+        raw: Nilai query parameter `fields`
+
+    Returns:
+        List field (selalu diawali "id"), atau None jika tidak diisi
+        (artinya: response lengkap seperti biasa)
+
+    Raises:
+        ValueError: Jika ada field yang tidak dikenal
+    """
+    if raw is None or not raw.strip():
+        return None
+
+    requested = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [name for name in requested if name not in PHONE_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Field tidak dikenal: {', '.join(unknown)}. "
+            f"Field yang tersedia: {', '.join(PHONE_FIELDS)}"
+        )
+
+    # id selalu ada (dibutuhkan client untuk detail/compare), tanpa duplikat
+    return list(dict.fromkeys(["id"] + requested))
+
+
+def phone_to_dict(phone: Phone, fields: List[str]) -> Dict[str, Any]:
+    """
+    Ubah Phone jadi dict JSON-ready berisi field yang diminta saja.
+
+    Decimal (kolom price) diubah ke float, category jadi {"id", "name"}.
+    """
+    data = {}
+    for name in fields:
+        if name == "category":
+            category = phone.category
+            data["category"] = {"id": category.id, "name": category.name} if category else None
+            continue
+        value = getattr(phone, name)
+        data[name] = float(value) if isinstance(value, Decimal) else value
+    return data
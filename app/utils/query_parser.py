@@ -0,0 +1,214 @@
+"""
+Query Parser Utility - Ubah kalimat search jadi filter terstruktur
+
+User mengetik pencarian natural seperti:
+    "samsung 8gb 256gb di bawah 5 juta"
+    "hp xiaomi ram 12gb < 4jt 2024"
+    "oppo 8/256 3-5 juta"
+
+Dulu seluruh kalimat dikirim ke 1 ILIKE, jadi hampir tidak pernah ada hasil.
+Modul ini memisahkan brand, RAM, storage, harga dan tahun rilis dari teks
+bebas, lalu hasilnya dipakai langsung sebagai argumen get_devices_filtered()
+(crud/device.py) -> filter kolom yang ter-index (brand, ram_gb, storage_gb,
+price_idr, release_year). Sisa kata (misal "galaxy", "redmi note") tetap
+dicari lewat full-text search.
+
+Author: Kelompok COMPARELY
+"""
+
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# ==================== REGEX PATTERNS ====================
+
+# Nominal harga: "5", "5.5", "4,5", "5.000.000", opsional "Rp" di depan
+_NUMBER = r"(\d+(?:[.,]\d+)*)"
+_RUPIAH = r"(?:rp\.?\s*)?"
+_UNIT = r"(juta|jt|ribu|rb|k)"
+_AMOUNT = _RUPIAH + _NUMBER + r"\s*" + _UNIT + r"?(?!\w)"
+_AMOUNT_WITH_UNIT = _RUPIAH + _NUMBER + r"\s*" + _UNIT + r"(?!\w)"
+
+# Pasangan RAM/storage, misal: "8/256", "12/512gb"
+_SIZE_PAIR_PATTERN = re.compile(r"(?<![\w.])(\d{1,2})\s*/\s*(\d{2,4})\s*(?:gb)?(?!\w)")
+
+# Ukuran GB/TB dengan penanda opsional, misal: "ram 8gb", "8 gb ram", "rom 256gb", "1tb"
+_SIZE_PATTERN = re.compile(
+    r"(?<!\w)(?:(ram|rom|storage|internal|memori)\s*)?(\d+)\s*(gb|tb)(?:\s*(ram|rom|storage|internal))?(?!\w)"
+)
+
+# Rentang harga, misal: "3-5 juta", "antara 3jt sampai 5jt", "rp 3.000.000 - 5.000.000"
+_PRICE_RANGE_PATTERN = re.compile(
+    r"(?<!\w)(?:antara\s+)?" + _AMOUNT
+    + r"\s*(?:-|–|sampai|hingga|s/d|sd|to)\s*" + _AMOUNT
+)
+
+# Batas atas harga, misal: "di bawah 5 juta", "< 5jt", "max 4jt", "budget 3 juta"
+_MAX_PRICE_PATTERN = re.compile(
+    r"(?:(?<!\w)(?:di\s*bawah|kurang\s+dari|under|below|maks(?:imal)?|max(?:imal)?|budget)|<=?)\s*"
+    + _AMOUNT
+)
+
+# Batas bawah harga, misal: "di atas 3 juta", "> 3jt", "min 2jt"
+_MIN_PRICE_PATTERN = re.compile(
+    r"(?:(?<!\w)(?:di\s*atas|lebih\s+dari|over|above|min(?:imal)?)|>=?)\s*"
+    + _AMOUNT
+)
+
+# Harga tanpa operator tapi dengan satuan, misal: "5 juta", "rp 3jt" -> dianggap budget
+_BARE_PRICE_PATTERN = re.compile(r"(?<!\w)" + _AMOUNT_WITH_UNIT)
+
+# Tahun rilis, misal: "2024", "tahun 2023", "rilis 2022"
+_YEAR_PATTERN = re.compile(r"(?<!\w)(?:(?:tahun|rilis)\s+)?(20[1-3]\d)(?!\w)")
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Kata yang tidak berguna untuk full-text search
+STOPWORDS = {
+    "hp", "handphone", "smartphone", "ponsel", "harga", "murah",
+    "ram", "rom", "storage", "internal", "memori", "gb",
+    "yang", "dengan", "dan", "atau", "untuk",
+}
+
+# Batas RAM wajar: ukuran di atas ini tanpa penanda dianggap storage
+MAX_RAM_GB = 24
+
+_UNIT_MULTIPLIER = {
+    "juta": 1_000_000, "jt": 1_000_000,
+    "ribu": 1_000, "rb": 1_000, "k": 1_000,
+}
+
+
+# ==================== HELPER ====================
+
+def _amount_to_idr(number: str, unit: Optional[str]) -> Optional[int]:
+    """
+    Convert nominal ke Rupiah integer.
+
+    - Dengan satuan: "5" + "juta" -> 5000000, "4,5" + "jt" -> 4500000
+    - Tanpa satuan : "5.000.000" -> 5000000, angka kecil ("5") dianggap juta
+    - Angka lain tanpa satuan (misal "2024") -> None (bukan harga)
+    """
+    if unit:
+        try:
+            value = float(number.replace(",", "."))
+        except ValueError:
+            return None
+        return int(value * _UNIT_MULTIPLIER[unit])
+
+    value = int(re.sub(r"[.,]", "", number))
+    if value < 1000:
+        return value * 1_000_000
+    if value >= 100_000:
+        return value
+    return None
+
+
+def _ram_text(gb: int) -> str:
+    return f"{gb}GB"
+
+
+def _storage_text(gb: int) -> str:
+    return f"{gb // 1024}TB" if gb >= 1024 and gb % 1024 == 0 else f"{gb}GB"
+
+
+# ==================== MAIN PARSER ====================
+
+def parse_search_query(text: Optional[str], brands: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Pisahkan filter terstruktur dari teks search.
+
+    Args:
+        text: Kalimat search dari user
+        brands: Daftar brand yang ada di database (untuk mengenali brand)
+
+    Returns:
+        Dict yang key-nya sama dengan argumen get_devices_filtered():
+        brand, ram, storage, min_price, max_price, release_year, search.
+        Hanya key yang terdeteksi yang ada. "search" berisi sisa kata.
+
+    Example:
+        >>> parse_search_query("samsung 8gb 256gb di bawah 5 juta", ["Samsung"])
+        {'ram': '8GB', 'storage': '256GB', 'max_price': 5000000, 'brand': 'Samsung'}
+    """
+    if not text:
+        return {}
+
+    remaining = text.lower()
+    filters: Dict[str, Any] = {}
+
+    # 1. RAM & storage dulu, supaya "8gb" / "8/256" tidak terbaca sebagai harga
+    def take_pair(match):
+        ram_gb, storage_gb = int(match.group(1)), int(match.group(2))
+        if ram_gb > MAX_RAM_GB or storage_gb < 32:
+            return match.group(0)
+        filters["ram"] = _ram_text(ram_gb)
+        filters["storage"] = _storage_text(storage_gb)
+        return " "
+
+    def take_size(match):
+        prefix, number, unit, suffix = match.groups()
+        gb = int(number) * (1024 if unit == "tb" else 1)
+        marker = prefix or suffix
+        if marker == "ram" or (marker is None and unit == "gb" and gb <= MAX_RAM_GB):
+            filters.setdefault("ram", _ram_text(gb))
+        else:
+            filters.setdefault("storage", _storage_text(gb))
+        return " "
+
+    remaining = _SIZE_PAIR_PATTERN.sub(take_pair, remaining)
+    remaining = _SIZE_PATTERN.sub(take_size, remaining)
+
+    # 2. Harga: rentang -> batas atas -> batas bawah -> nominal tanpa operator
+    def take_range(match):
+        low_num, low_unit, high_num, high_unit = match.groups()
+        if not (low_unit or high_unit or "rp" in match.group(0)):
+            return match.group(0)  # "13-15" tanpa satuan bukan harga
+        low = _amount_to_idr(low_num, low_unit or high_unit)
+        high = _amount_to_idr(high_num, high_unit)
+        if low is None or high is None:
+            return match.group(0)
+        filters["min_price"], filters["max_price"] = min(low, high), max(low, high)
+        return " "
+
+    def take_bound(key):
+        def take(match):
+            amount = _amount_to_idr(*match.groups())
+            if amount is None:
+                return match.group(0)
+            filters[key] = amount
+            return " "
+        return take
+
+    remaining = _PRICE_RANGE_PATTERN.sub(take_range, remaining)
+    remaining = _MAX_PRICE_PATTERN.sub(take_bound("max_price"), remaining)
+    remaining = _MIN_PRICE_PATTERN.sub(take_bound("min_price"), remaining)
+    if "max_price" not in filters and "min_price" not in filters:
+        remaining = _BARE_PRICE_PATTERN.sub(take_bound("max_price"), remaining, count=1)
+
+    # 3. Tahun rilis
+    def take_year(match):
+        filters["release_year"] = int(match.group(1))
+        return " "
+
+    remaining = _YEAR_PATTERN.sub(take_year, remaining, count=1)
+
+    # 4. Brand (hanya jika tepat 1 brand yang disebut, karena filter-nya AND)
+    brand_lookup = {brand.lower(): brand for brand in brands if brand}
+    tokens = _TOKEN_PATTERN.findall(remaining)
+    mentioned = {token for token in tokens if token in brand_lookup}
+    if len(mentioned) == 1:
+        brand_token = mentioned.pop()
+        filters["brand"] = brand_lookup[brand_token]
+        tokens = [token for token in tokens if token != brand_token]
+
+    # 5. Sisa kata -> full-text search
+    keywords = [token for token in tokens if token not in STOPWORDS]
+    if keywords:
+        filters["search"] = " ".join(keywords)
+
+    return filters
+
+
+def has_structured_filters(filters: Dict[str, Any]) -> bool:
+    """True jika hasil parse berisi filter selain sisa kata (search)."""
+    return any(key != "search" for key in filters)
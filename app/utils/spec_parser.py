@@ -0,0 +1,273 @@
+"""
+Spec Parser Utility - Ubah spesifikasi teks bebas menjadi angka
+
+Kolom spesifikasi di tabel phones (ram, storage, camera, battery, screen)
+berupa teks bebas seperti "8GB", "256GB 12GB RAM", "50 MP + 12MP" atau
+"6.7 inches, 108.4 cm2". Modul ini adalah SATU-SATUNYA tempat parsing
+teks tersebut, supaya filter, sort dan perbandingan bisa memakai kolom
+angka yang ter-index (ram_gb, storage_gb, main_camera_mp, battery_mah,
+screen_inch, price_idr).
+
+Author: Kelompok COMPARELY
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+# ==================== REGEX PATTERNS ====================
+
+# Angka + satuan GB/TB, misal: "8GB", "256 GB", "1TB"
+_SIZE_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(GB|TB)\b", re.IGNORECASE)
+
+# Ukuran yang diikuti kata RAM, misal: "12GB RAM" (format GSMArena)
+_RAM_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(GB|TB)\s*RAM\b", re.IGNORECASE)
+
+# Resolusi kamera, misal: "50MP", "50 MP", "12.2 MP"
+_CAMERA_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*MP\b", re.IGNORECASE)
+
+# Kapasitas baterai, misal: "5000mAh", "5,000 mAh"
+_BATTERY_PATTERN = re.compile(r"(\d{1,2}[.,]?\d{3})\s*mAh\b", re.IGNORECASE)
+
+# Ukuran layar, misal: "6.7 inch", "6.1\"", "6.59 inches"
+_SCREEN_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:inch(?:es)?|in\b|\"|”)", re.IGNORECASE)
+
+# Angka pertama di dalam teks (fallback)
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+
+# Rentang wajar untuk validasi hasil fallback
+_BATTERY_RANGE = (500, 30000)
+_SCREEN_RANGE = (1.0, 20.0)
+
+
+# ==================== HELPER ====================
+
+def _to_float(raw: str) -> Optional[float]:
+    """Convert string angka ("6,7" atau "6.7") ke float."""
+    try:
+        return float(raw.replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+
+def _size_to_gb(number: str, unit: str) -> Optional[int]:
+    """Convert pasangan (angka, satuan) ke GB integer. 1TB = 1024GB."""
+    value = _to_float(number)
+    if value is None:
+        return None
+    if unit.upper() == "TB":
+        value *= 1024
+    return int(round(value))
+
+
+def _price_text_to_decimal(text: str) -> Optional[str]:
+    """
+    Normalisasi teks harga ke format desimal ("12999000.00").
+
+    Separator terakhir adalah desimal jika kedua separator muncul
+    ("12.999.000,00", "12,999,000.00"). Jika hanya 1 jenis separator, itu
+    pemisah ribuan bila muncul lebih dari sekali atau diikuti tepat 3 digit
+    ("5.999.000", "12,999,000", "1.500"), selain itu desimal ("12999000.00").
+    """
+    number = re.sub(r"[^\d.,]", "", text).strip(".,")  # "Rp. 5.999.000,-"
+    if not any(char.isdigit() for char in number):
+        return None
+
+    if "." in number and "," in number:
+        decimal_sep = "." if number.rfind(".") > number.rfind(",") else ","
+    elif "." in number or "," in number:
+        separator = "." if "." in number else ","
+        parts = number.split(separator)
+        decimal_sep = None if len(parts) > 2 or len(parts[-1]) == 3 else separator
+    else:
+        return number
+
+    if decimal_sep is None:
+        return number.replace(".", "").replace(",", "")
+    thousands_sep = "," if decimal_sep == "." else "."
+    whole, _, fraction = number.replace(thousands_sep, "").rpartition(decimal_sep)
+    return f"{whole or 0}.{fraction or 0}"
+
+
+def _is_empty(text: Optional[str]) -> bool:
+    """Cek apakah teks spesifikasi kosong atau placeholder N/A."""
+    return not text or text.strip().upper() in ("N/A", "NA", "-", "UNKNOWN")
+
+
+# ==================== PARSERS ====================
+
+def parse_ram_gb(text: Optional[str]) -> Optional[int]:
+    """
+    Ambil ukuran RAM dalam GB.
+
+    Contoh:
+        "8GB" -> 8
+        "256GB 12GB RAM" -> 12
+        "N/A" -> None
+    """
+    if _is_empty(text):
+        return None
+
+    match = _RAM_PATTERN.search(text) or _SIZE_PATTERN.search(text)
+    if match:
+        return _size_to_gb(match.group(1), match.group(2))
+
+    # Fallback: angka saja, misal "8"
+    match = _NUMBER_PATTERN.search(text)
+    return int(round(_to_float(match.group(0)))) if match else None
+
+
+def parse_storage_gb(text: Optional[str]) -> Optional[int]:
+    """
+    Ambil ukuran storage dalam GB (ukuran yang BUKAN RAM).
+
+    Contoh:
+        "256GB" -> 256
+        "1TB" -> 1024
+        "256GB 12GB RAM" -> 256
+    """
+    if _is_empty(text):
+        return None
+
+    for match in _SIZE_PATTERN.finditer(text):
+        # Lewati ukuran yang diikuti kata "RAM"
+        if text[match.end():].lstrip().upper().startswith("RAM"):
+            continue
+        return _size_to_gb(match.group(1), match.group(2))
+
+    match = _NUMBER_PATTERN.search(text)
+    return int(round(_to_float(match.group(0)))) if match else None
+
+
+def parse_camera_mp(text: Optional[str]) -> Optional[int]:
+    """
+    Ambil resolusi kamera utama (angka MP pertama).
+
+    Contoh:
+        "50MP + 12MP + 10MP" -> 50
+        "48 MP, f/1.8" -> 48
+    """
+    if _is_empty(text):
+        return None
+
+    match = _CAMERA_PATTERN.search(text)
+    if match:
+        return int(round(_to_float(match.group(1))))
+
+    # Fallback: angka pertama dari kamera pertama ("48 + 12")
+    match = _NUMBER_PATTERN.search(text.split("+")[0])
+    return int(round(_to_float(match.group(0)))) if match else None
+
+
+def parse_battery_mah(text: Optional[str]) -> Optional[int]:
+    """
+    Ambil kapasitas baterai dalam mAh.
+
+    Contoh:
+        "5000 mAh" -> 5000
+        "Li-Po 5,000 mAh, non-removable" -> 5000
+    """
+    if _is_empty(text):
+        return None
+
+    match = _BATTERY_PATTERN.search(text)
+    if match:
+        return int(re.sub(r"[.,]", "", match.group(1)))
+
+    # Fallback: angka pertama yang masuk rentang wajar
+    for raw in _NUMBER_PATTERN.findall(text):
+        value = int(re.sub(r"[.,]", "", raw))
+        if _BATTERY_RANGE[0] <= value <= _BATTERY_RANGE[1]:
+            return value
+    return None
+
+
+def parse_screen_inch(text: Optional[str]) -> Optional[float]:
+    """
+    Ambil ukuran layar dalam inch (dibulatkan 2 desimal).
+
+    Contoh:
+        "6.7 inch AMOLED" -> 6.7
+        "6.59 inches, 106.5 cm2" -> 6.59
+    """
+    if _is_empty(text):
+        return None
+
+    match = _SCREEN_PATTERN.search(text)
+    if match:
+        value = _to_float(match.group(1))
+        return round(value, 2) if value is not None else None
+
+    # Fallback: angka pertama yang masuk rentang wajar
+    for raw in _NUMBER_PATTERN.findall(text):
+        value = _to_float(raw)
+        if value is not None and _SCREEN_RANGE[0] <= value <= _SCREEN_RANGE[1]:
+            return round(value, 2)
+    return None
+
+
+def parse_price_idr(value: Any) -> Optional[int]:
+    """
+    Convert harga ke Rupiah integer. Harga 0 dianggap belum diketahui.
+
+    Contoh:
+        Decimal("12999000.00") -> 12999000
+        "Rp 5.999.000" -> 5999000
+        "12999000.00" / "12,999,000" / "12.999.000,00" -> 12999000
+        0 -> None
+    """
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, str):
+        value = _price_text_to_decimal(value)
+        if value is None:
+            return None
+
+    try:
+        price = int(Decimal(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+    return price if price > 0 else None
+
+
+# ==================== PUBLIC API ====================
+
+# Mapping kolom numerik -> (kolom sumber, parser)
+NORMALIZED_FIELDS = {
+    "ram_gb": ("ram", parse_ram_gb),
+    "storage_gb": ("storage", parse_storage_gb),
+    "main_camera_mp": ("camera", parse_camera_mp),
+    "battery_mah": ("battery", parse_battery_mah),
+    "screen_inch": ("screen", parse_screen_inch),
+    "price_idr": ("price", parse_price_idr),
+}
+
+
+def normalize_specs(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Hitung semua kolom numerik dari dict spesifikasi mentah.
+
+    Args:
+        data: Dict dengan key ram, storage, camera, battery, screen, price
+
+    Returns:
+        Dict berisi ram_gb, storage_gb, main_camera_mp, battery_mah,
+        screen_inch, price_idr (None jika tidak bisa di-parse)
+    """
+    return {
+        target: parser(data.get(source))
+        for target, (source, parser) in NORMALIZED_FIELDS.items()
+    }
+
+
+def apply_normalized_specs(device: Any) -> None:
+    """
+    Isi kolom numerik pada object Phone berdasarkan kolom teksnya.
+
+    Dipanggil otomatis oleh event listener di models/phone.py setiap kali
+    phone di-insert atau di-update, dan oleh script backfill.
+    """
+    for target, (source, parser) in NORMALIZED_FIELDS.items():
+        setattr(device, target, parser(getattr(device, source, None)))
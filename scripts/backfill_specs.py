@@ -0,0 +1,94 @@
+"""
+Script untuk mengisi kolom spesifikasi numerik (backfill) di tabel phones.
+
+Kolom yang diisi: ram_gb, storage_gb, main_camera_mp, battery_mah,
+screen_inch, price_idr. Nilainya di-parse dari kolom teks (ram, storage,
+camera, battery, screen, price) memakai app/utils/spec_parser.py.
+
+Device baru/yang di-edit sudah otomatis terisi lewat event listener di
+models/phone.py, dan migration m0001 mengisi data lama saat kolom numerik
+ditambahkan. Script ini untuk menghitung ulang setelah spec_parser berubah.
+
+Cara Pakai:
+    python scripts/backfill_specs.py            # jalankan migration (jika belum) + isi semua
+    python scripts/backfill_specs.py --dry-run  # tampilkan ringkasan tanpa menyimpan data
+"""
+
+import sys
+from app import migrations
+from app.database import SessionLocal, engine
+from app.models import Phone
+from app.utils.spec_parser import NORMALIZED_FIELDS, normalize_specs
+
+BATCH_SIZE = 500
+
+
+def backfill_specs(dry_run: bool = False):
+    """
+    Hitung ulang kolom numerik untuk semua phone secara batch.
+
+    Args:
+        dry_run: Jika True, hanya hitung tanpa commit
+    """
+    db = SessionLocal()
+    updated_count = 0
+    unparsed = {name: 0 for name in NORMALIZED_FIELDS}
+
+    try:
+        last_id = 0
+        while True:
+            # Keyset batch (id > last_id) supaya tidak ada OFFSET yang makin lambat
+            phones = (
+                db.query(Phone)
+                .filter(Phone.id > last_id)
+                .order_by(Phone.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not phones:
+                break
+
+            for phone in phones:
+                values = normalize_specs({
+                    source: getattr(phone, source)
+                    for source, _ in NORMALIZED_FIELDS.values()
+                })
+                for name, value in values.items():
+                    if value is None:
+                        unparsed[name] += 1
+                    setattr(phone, name, value)
+                updated_count += 1
+
+            last_id = phones[-1].id
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+            print(f"   ✅ {updated_count} phones diproses")
+
+        print("=" * 60)
+        print(f"📊 HASIL BACKFILL{' (dry run)' if dry_run else ''}:")
+        print(f"   Total phones: {updated_count}")
+        for name, count in unparsed.items():
+            print(f"   {name:<15} tidak ter-parse: {count}")
+
+    except Exception as e:
+        print(f"❌ ERROR: {str(e)}")
+        db.rollback()
+        sys.exit(1)
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    dry_run = "--dry-run" in sys.argv
+
+    print("🚀 COMPARELY - Backfill Spesifikasi Numerik")
+    print("=" * 60)
+
+    # Kolom numerik ditambahkan oleh migration m0001 (jika belum ada)
+    migrations.upgrade(engine)
+    backfill_specs(dry_run=dry_run)
+
+    print("\n✨ Backfill selesai!")
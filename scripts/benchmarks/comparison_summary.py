@@ -0,0 +1,69 @@
+"""
+Microbenchmark ringkasan perbandingan offline (app/services/comparison_summary.py).
+
+Mengukur summarize() untuk pasangan device acak (5 bagian: performa, kamera,
+baterai, value for money, rekomendasi), yang dipakai halaman /compare-page
+dan sebagai pengganti analisis AI saat AI tidak tersedia.
+
+Device sintetis dibuat tanpa database (sama dengan benchmark highlight).
+Script gagal (exit code 1) jika p99 per pasangan melewati budget, jadi bisa
+dipakai di CI.
+
+Cara Pakai:
+    python scripts/benchmarks/comparison_summary.py
+    python scripts/benchmarks/comparison_summary.py --pairs 200000 --budget-us 100
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.services import comparison_summary
+
+from highlights import BATCH_SIZE, generate_devices, percentiles
+
+
+def bench_pairs(devices, pairs: int, rng: random.Random):
+    """Waktu per pasangan (µs), diukur per batch supaya overhead timer kecil."""
+    samples = []
+    for _ in range(max(1, pairs // BATCH_SIZE)):
+        batch = [(rng.choice(devices), rng.choice(devices)) for _ in range(BATCH_SIZE)]
+        start = time.perf_counter()
+        for device1, device2 in batch:
+            comparison_summary.summarize(device1, device2)
+        samples.append((time.perf_counter() - start) * 1e6 / BATCH_SIZE)
+    return samples
+
+
+def run_benchmark(pairs: int, budget_us: float) -> bool:
+    rng = random.Random(7)
+    devices = generate_devices(1000)
+    for device in devices:
+        device.cpu = None
+
+    p50, p99, worst = percentiles(bench_pairs(devices, pairs, rng))
+    print(f"📝 summarize()  : {pairs:,} pasangan, {len(comparison_summary.SECTIONS)} bagian")
+    print(f"   p50          : {p50:.2f} µs/pasangan")
+    print(f"   p99          : {p99:.2f} µs/pasangan (budget {budget_us} µs)")
+    print(f"   max          : {worst:.2f} µs/pasangan")
+
+    sample = comparison_summary.summarize(devices[0], devices[1])
+    for key, title in comparison_summary.SECTIONS[:2]:
+        print(f"   contoh       : {title}: {sample[key]}")
+
+    return p99 <= budget_us
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark ringkasan perbandingan offline")
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--budget-us", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print("🚀 COMPARELY - Comparison Summary Benchmark")
+    print("=" * 60)
+    ok = run_benchmark(args.pairs, args.budget_us)
+    print("=" * 60)
+    print("✅ Dalam budget" if ok else "❌ Melewati budget")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,120 @@
+"""
+Microbenchmark rule engine highlight (app/services/highlight_rules.py).
+
+Mengukur:
+- evaluate()      : highlight 2 device (API /compare/ dan /compare-page)
+- rank_specs()    : pemenang/ranking/selisih untuk 10 device (/compare/multi)
+
+Device sintetis dibuat tanpa database. Script gagal (exit code 1) jika p99
+per pasangan melewati budget, jadi bisa dipakai di CI.
+
+Cara Pakai:
+    python scripts/benchmarks/highlights.py
+    python scripts/benchmarks/highlights.py --pairs 200000 --budget-us 50
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from app.services import highlight_rules
+from app.services.comparison_service import rank_specs
+
+BATCH_SIZE = 1000
+
+
+def generate_devices(size: int, seed: int = 42):
+    """Device sintetis dengan kolom numerik yang dipakai rule (sebagian kosong)."""
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f"Phone {i}",
+            price=None,
+            price_idr=maybe(rng.randrange(1_000_000, 25_000_000, 50_000)),
+            release_year=maybe(rng.randint(2019, 2025)),
+            ram_gb=maybe(rng.choice([4, 6, 8, 12, 16])),
+            storage_gb=maybe(rng.choice([64, 128, 256, 512, 1024])),
+            main_camera_mp=maybe(rng.choice([12, 48, 50, 64, 108, 200])),
+            battery_mah=maybe(rng.randrange(3000, 6500, 100)),
+            screen_inch=maybe(round(rng.uniform(5.8, 6.9), 1)),
+        )
+        for i in range(1, size + 1)
+    ]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples),
+        samples[int(len(samples) * 0.99) - 1],
+        samples[-1],
+    )
+
+
+def bench_pairs(devices, pairs: int, rng: random.Random):
+    """Waktu per pasangan (µs), diukur per batch supaya overhead timer kecil."""
+    samples = []
+    for _ in range(max(1, pairs // BATCH_SIZE)):
+        batch = [(rng.choice(devices), rng.choice(devices)) for _ in range(BATCH_SIZE)]
+        start = time.perf_counter()
+        for device1, device2 in batch:
+            highlight_rules.evaluate(device1, device2)
+        samples.append((time.perf_counter() - start) * 1e6 / BATCH_SIZE)
+    return samples
+
+
+def bench_multi(devices, rounds: int, group_size: int, rng: random.Random):
+    """Waktu rank_specs untuk 1 grup device (µs)."""
+    samples = []
+    for _ in range(rounds):
+        group = rng.sample(devices, group_size)
+        start = time.perf_counter()
+        rank_specs(group)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def run_benchmark(pairs: int, budget_us: float) -> bool:
+    rng = random.Random(7)
+    devices = generate_devices(1000)
+
+    print(f"📏 Rule         : {len(highlight_rules.RULES)} ({', '.join(r.key for r in highlight_rules.RULES)})")
+
+    p50, p99, worst = percentiles(bench_pairs(devices, pairs, rng))
+    print(f"⚖️  evaluate()   : {pairs:,} pasangan")
+    print(f"   p50          : {p50:.2f} µs/pasangan")
+    print(f"   p99          : {p99:.2f} µs/pasangan (budget {budget_us} µs)")
+    print(f"   max          : {worst:.2f} µs/pasangan")
+
+    m50, m99, _ = percentiles(bench_multi(devices, 2000, 10, rng))
+    print(f"📊 rank_specs() : 10 device x {len(highlight_rules.RULES)} spesifikasi")
+    print(f"   p50          : {m50:.1f} µs")
+    print(f"   p99          : {m99:.1f} µs")
+
+    sample = highlight_rules.evaluate(devices[0], devices[1])
+    for highlight in sample[:3]:
+        print(f"   contoh       : {highlight.text}")
+
+    return p99 <= budget_us
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark highlight rule engine")
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    print("🚀 COMPARELY - Highlight Rules Benchmark")
+    print("=" * 60)
+    ok = run_benchmark(args.pairs, args.budget_us)
+    print("=" * 60)
+    print("✅ Dalam budget" if ok else "❌ Melewati budget")
+    sys.exit(0 if ok else 1)
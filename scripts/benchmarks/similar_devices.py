@@ -0,0 +1,150 @@
+"""
+Benchmark index device mirip (app/services/similar_index.py).
+
+Mengukur:
+- build          : bangun KD-tree untuk seluruh katalog sintetis
+- similar()      : k tetangga terdekat 1 device (/devices/{id}/similar)
+- upsert()       : update 1 device lewat buffer (catalog_events)
+
+Hasil similar() juga dicek terhadap brute force (jarak ke semua device),
+jadi pruning KD-tree tidak boleh mengubah hasil. Script gagal (exit code 1)
+jika p99 melewati budget atau hasil berbeda dari brute force.
+
+p99 dari 1 putaran query naik-turun ±20% antar run (GC, scheduler), jadi
+dipakai nilai stabil: setelah warm-up, query diukur dalam ROUNDS putaran
+(GC dimatikan selama pengukuran) dan yang dibandingkan dengan budget adalah
+median p99 antar putaran.
+
+Cara Pakai:
+    python scripts/benchmarks/similar_devices.py
+    python scripts/benchmarks/similar_devices.py --devices 200000 --k 20 --budget-ms 2
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from app.services.similar_index import SimilarIndex
+
+QUERIES = 2000
+WARMUP_QUERIES = 200
+ROUNDS = 5
+CHECKED_QUERIES = 200
+
+
+def generate_rows(size: int, seed: int = 42):
+    """Dict kolom phone sintetis (sebagian spesifikasi kosong)."""
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return [
+        {
+            "id": i,
+            "price": None,
+            "price_idr": maybe(rng.randrange(1_000_000, 25_000_000, 50_000)),
+            "ram_gb": maybe(rng.choice([4, 6, 8, 12, 16])),
+            "storage_gb": maybe(rng.choice([64, 128, 256, 512, 1024])),
+            "battery_mah": maybe(rng.randrange(3000, 6500, 100)),
+            "main_camera_mp": maybe(rng.choice([12, 48, 50, 64, 108, 200])),
+            "screen_inch": maybe(round(rng.uniform(5.8, 6.9), 2)),
+            "release_year": maybe(rng.randint(2019, 2025)),
+        }
+        for i in range(1, size + 1)
+    ]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples),
+        samples[int(len(samples) * 0.99) - 1],
+        samples[-1],
+    )
+
+
+def brute_force(index: SimilarIndex, device_id: int, k: int):
+    """Jarak ke k device terdekat dengan menghitung semua device."""
+    vector = index.vector_of(device_id)
+    distances = np.sqrt(((index.tree.points - vector) ** 2).sum(axis=1))
+    distances = distances[index.tree_ids != device_id]
+    return np.sort(distances)[:k]
+
+
+def bench_similar(index: SimilarIndex, devices: int, k: int, rng: random.Random):
+    """1 putaran QUERIES query similar() acak -> (p50, p99, max) dalam ms."""
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(QUERIES):
+            device_id = rng.randint(1, devices)
+            start = time.perf_counter()
+            index.similar(device_id, k)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return percentiles(samples)
+
+
+def run_benchmark(devices: int, k: int, budget_ms: float) -> bool:
+    rng = random.Random(7)
+    rows = generate_rows(devices)
+    index = SimilarIndex()
+
+    start = time.perf_counter()
+    index.load(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"🌳 Build        : {devices:,} device, {len(index.tree.leaf_start):,} leaf dalam {build_ms:.0f} ms")
+
+    for _ in range(WARMUP_QUERIES):
+        index.similar(rng.randint(1, devices), k)
+
+    rounds = [bench_similar(index, devices, k, rng) for _ in range(ROUNDS)]
+    p50 = statistics.median(p50 for p50, _, _ in rounds)
+    p99 = statistics.median(p99 for _, p99, _ in rounds)
+    worst = max(worst for _, _, worst in rounds)
+    print(f"🔎 similar(k={k}) : {ROUNDS} x {QUERIES:,} query (median antar putaran)")
+    print(f"   p50          : {p50:.3f} ms")
+    print(f"   p99          : {p99:.3f} ms (budget {budget_ms} ms)")
+    print(f"   p99/putaran  : {', '.join(f'{p99:.3f}' for _, p99, _ in rounds)} ms")
+    print(f"   max          : {worst:.3f} ms")
+
+    mismatches = 0
+    for _ in range(CHECKED_QUERIES):
+        device_id = rng.randint(1, devices)
+        found = [distance for _, distance in index.similar(device_id, k)]
+        if not np.allclose(found, brute_force(index, device_id, k), atol=1e-4):
+            mismatches += 1
+    print(f"🎯 Brute force  : {CHECKED_QUERIES - mismatches}/{CHECKED_QUERIES} query sama persis")
+
+    upsert_samples = []
+    for row in rng.sample(rows, 1000):
+        updated = dict(row, price_idr=rng.randrange(1_000_000, 25_000_000, 50_000))
+        start = time.perf_counter()
+        index.upsert(updated)
+        upsert_samples.append((time.perf_counter() - start) * 1000)
+    u50, u99, _ = percentiles(upsert_samples)
+    print(f"✏️  upsert()     : p50 {u50:.3f} ms, p99 {u99:.3f} ms (buffer {len(index.buffer)} device)")
+
+    return p99 <= budget_ms and mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark index device mirip")
+    parser.add_argument("--devices", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print("🚀 COMPARELY - Similar Devices Benchmark")
+    print("=" * 60)
+    ok = run_benchmark(args.devices, args.k, args.budget_ms)
+    print("=" * 60)
+    print("✅ Dalam budget" if ok else "❌ Melewati budget")
+    sys.exit(0 if ok else 1)
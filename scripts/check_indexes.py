@@ -0,0 +1,211 @@
+"""
+Script untuk mengecek bahwa query yang sering dipakai memakai index (EXPLAIN).
+
+Setiap fungsi crud/service di HOT_QUERIES dijalankan terhadap database,
+SQL yang dihasilkan ditangkap, lalu di-EXPLAIN:
+
+- SQLite : EXPLAIN QUERY PLAN -> gagal jika ada "SCAN phones" tanpa index
+- MySQL  : EXPLAIN            -> gagal jika tabel phones type=ALL (full scan)
+
+Sort tanpa index ("USE TEMP B-TREE FOR ORDER BY" / "Using filesort") dan
+scan urut id yang berhenti di LIMIT tanpa filter apa pun di phones (halaman
+keyset pertama) hanya ditampilkan sebagai peringatan. Scan urut id dengan
+filter WHERE di kolom phones tetap gagal: SQLite membaca baris satu per satu
+sampai LIMIT terpenuhi, jadi filter yang jarang cocok = full scan. Script keluar dengan exit code 1 jika ada
+query yang full scan, jadi bisa dipakai di CI setelah migration.
+
+Cara Pakai:
+    python scripts/migrate.py && python scripts/check_indexes.py
+    python scripts/check_indexes.py --verbose   # tampilkan SQL + plan lengkap
+"""
+
+import argparse
+import re
+import sys
+
+from sqlalchemy import event
+
+from app.crud import device as device_crud
+from app.crud import pagination
+from app.crud import search as search_crud
+from app.database import SessionLocal, engine
+from app.models import Phone
+from app.services import recommendation_service
+
+# Halaman keyset urut id: SQLite boleh scan tabel urut rowid dan berhenti di LIMIT
+_PK_ORDERED_PAGE = re.compile(r"ORDER BY phones\.id(?: ASC| DESC)?\s+LIMIT", re.IGNORECASE)
+
+# Isi klausa WHERE (sampai GROUP BY / ORDER BY / LIMIT) dan kolom phones di dalamnya
+_WHERE_CLAUSE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_PHONES_COLUMN = re.compile(r"\bphones\.\w+", re.IGNORECASE)
+
+
+def _sample(db):
+    """Nilai filter yang benar-benar ada di database (supaya plan realistis)."""
+    phone = (
+        db.query(Phone)
+        .filter(Phone.brand.isnot(None), Phone.category_id.isnot(None))
+        .order_by(Phone.id)
+        .first()
+    )
+    if phone is None:
+        return None
+    return {
+        "id": phone.id,
+        "brand": phone.brand,
+        "category_id": phone.category_id,
+        "release_year": phone.release_year or 2024,
+        "ram": f"{phone.ram_gb or 8}GB",
+        "storage": f"{phone.storage_gb or 256}GB",
+        "max_price": 5_000_000,
+    }
+
+
+# (nama, fungsi(db, sample)) - query yang dipanggil di setiap request halaman utama
+HOT_QUERIES = [
+    ("device.get_device", lambda db, s: device_crud.get_device(db, s["id"])),
+    ("device.get_devices_by_ids", lambda db, s: device_crud.get_devices_by_ids(db, [s["id"], s["id"] + 1])),
+    ("device.get_unique_brands", lambda db, s: device_crud.get_unique_brands(db)),
+    ("filtered: category", lambda db, s: device_crud.get_devices_filtered(
+        db, category_id=s["category_id"])),
+    ("filtered: category + max_price", lambda db, s: device_crud.get_devices_filtered(
+        db, category_id=s["category_id"], max_price=s["max_price"])),
+    ("filtered: brand + max_price", lambda db, s: device_crud.get_devices_filtered(
+        db, brand=s["brand"], max_price=s["max_price"])),
+    ("filtered: ram + storage", lambda db, s: device_crud.get_devices_filtered(
+        db, ram=s["ram"], storage=s["storage"])),
+    ("filtered: release_year", lambda db, s: device_crud.get_devices_filtered(
+        db, release_year=s["release_year"])),
+    ("filtered page: max_price", lambda db, s: device_crud.get_devices_filtered_page(
+        db, max_price=s["max_price"])),
+    ("filtered page: category", lambda db, s: device_crud.get_devices_filtered_page(
+        db, category_id=s["category_id"])),
+    ("page: id", lambda db, s: device_crud.get_devices_filtered_page(db)),
+    ("paginate: sort price_idr", lambda db, s: pagination.paginate(
+        db.query(Phone), sort_column=Phone.price_idr)),
+    ("search: keyword", lambda db, s: search_crud.search_devices(db, s["brand"])),
+    # Query kandidat di balik cache rekomendasi (cache hit tidak menjalankan SQL)
+    ("recommendation: category + budget + year", lambda db, s: recommendation_service._load_candidates(
+        db, s["max_price"], s["category_id"], s["release_year"] - 1)),
+    ("recommendation: budget", lambda db, s: recommendation_service._load_candidates(
+        db, s["max_price"], None, None)),
+]
+
+
+# ==================== CAPTURE & EXPLAIN ====================
+
+def capture_statements(db, fn, sample):
+    """Jalankan fn lalu kembalikan list (sql, params) SELECT yang menyentuh phones."""
+    captured = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        sql = statement.lstrip().upper()
+        if sql.startswith("SELECT") and "PHONES" in sql:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        fn(db, sample)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return captured
+
+
+def _filters_phones(statement):
+    """True jika statement punya predicate WHERE di kolom phones."""
+    where = _WHERE_CLAUSE.search(statement)
+    return bool(where and _PHONES_COLUMN.search(where.group(1)))
+
+
+def explain(conn, statement, parameters):
+    """
+    EXPLAIN 1 statement.
+
+    Returns:
+        Tuple (plan_lines, errors, warnings)
+    """
+    errors, warnings, lines = [], [], []
+
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        for row in rows:
+            detail = row[-1]
+            lines.append(detail)
+            if detail == "SCAN phones":
+                if _PK_ORDERED_PAGE.search(statement) and not _filters_phones(statement):
+                    # Scan urut primary key tanpa filter, berhenti di LIMIT (keyset page by id)
+                    warnings.append(f"scan urut id + LIMIT: {detail}")
+                else:
+                    errors.append(f"full scan: {detail}")
+            if "TEMP B-TREE" in detail:
+                warnings.append(f"sort tanpa index: {detail}")
+
+    elif engine.dialect.name in ("mysql", "mariadb"):
+        result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        for row in result.mappings():
+            line = f"table={row['table']} type={row['type']} key={row['key']} extra={row['Extra']}"
+            lines.append(line)
+            if row["table"] == "phones" and row["type"] == "ALL":
+                errors.append(f"full scan: {line}")
+            if row["Extra"] and "filesort" in row["Extra"]:
+                warnings.append(f"sort tanpa index: {line}")
+
+    else:
+        warnings.append(f"EXPLAIN tidak didukung untuk dialect {engine.dialect.name}")
+
+    return lines, errors, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek pemakaian index query utama")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan SQL dan plan lengkap")
+    args = parser.parse_args()
+
+    print("🔍 COMPARELY - Cek Index (EXPLAIN)")
+    print("=" * 60)
+
+    search_crud.ensure_fulltext_index(engine)
+    db = SessionLocal()
+    failed = 0
+
+    try:
+        sample = _sample(db)
+        if sample is None:
+            print("⚠️  Tabel phones kosong, tidak ada yang bisa dicek")
+            return 0
+
+        with engine.connect() as conn:
+            for name, fn in HOT_QUERIES:
+                statements = capture_statements(db, fn, sample)
+                errors, warnings, plans = [], [], []
+                for statement, parameters in statements:
+                    lines, stmt_errors, stmt_warnings = explain(conn, statement, parameters)
+                    plans.append((statement, lines))
+                    errors += stmt_errors
+                    warnings += stmt_warnings
+
+                mark = "❌" if errors else ("⚠️ " if warnings else "✅")
+                print(f"{mark} {name} ({len(statements)} query)")
+                for message in errors:
+                    print(f"      {message}")
+                for message in warnings:
+                    print(f"      peringatan: {message}")
+                if args.verbose:
+                    for statement, lines in plans:
+                        print(f"      SQL : {' '.join(statement.split())}")
+                        for line in lines:
+                            print(f"      PLAN: {line}")
+                failed += bool(errors)
+    finally:
+        db.close()
+
+    print("\n" + "=" * 60)
+    if failed:
+        print(f"❌ {failed} query melakukan full table scan")
+        return 1
+    print("✅ Semua query memakai index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
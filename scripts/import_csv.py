@@ -14,7 +14,7 @@ import csv
 import sys
 from decimal import Decimal
 from app.database import SessionLocal
-from app.models import Device
+from app.models import Phone
 
 def import_devices_from_csv(csv_file_path: str):
     """
@@ -43,8 +43,10 @@ def import_devices_from_csv(csv_file_path: str):
                         if not row.get(field) or row[field].strip() == '':
                             raise ValueError(f"Field '{field}' tidak boleh kosong")
                     
-                    # Buat object Device baru
-                    device = Device(
+                    # Buat object Phone baru
+                    # Kolom numerik (ram_gb, storage_gb, dll) diisi otomatis oleh
+                    # event listener di models/phone.py saat commit
+                    device = Phone(
                         name=row['name'].strip(),
                         brand=row['brand'].strip(),
                         category_id=int(row['category_id']),
@@ -58,7 +60,7 @@ def import_devices_from_csv(csv_file_path: str):
                         release_year=int(row.get('release_year', 2023)),
                         price=Decimal(row['price'].replace(',', '').replace('.', '')),  # Hapus koma/titik pemisah ribuan
                         image_url=row.get('image_url', '').strip() or None,
-                        description=row.get('source_data', '').strip() or None  # Gunakan source_data sebagai description
+                        source_data=row.get('source_data', '').strip() or None
                     )
                     
                     # Tambahkan ke database
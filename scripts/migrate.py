@@ -0,0 +1,50 @@
+"""
+Script untuk menjalankan schema migration (app/migrations).
+
+Base.metadata.create_all() hanya membuat tabel baru. Kolom dan index baru
+untuk tabel yang sudah ada ditambahkan lewat migration berversi.
+
+Cara Pakai:
+    python scripts/migrate.py              # jalankan semua migration yang belum
+    python scripts/migrate.py --status     # tampilkan status setiap migration
+    python scripts/migrate.py --target 1   # jalankan sampai versi 1 saja
+"""
+
+import argparse
+
+from app import migrations
+from app.database import Base, engine
+from app import models  # noqa: F401 (register semua model ke Base)
+
+
+def print_status():
+    """Tampilkan versi yang sudah / belum dijalankan."""
+    for item in migrations.status(engine):
+        applied = item["applied_at"]
+        mark = f"✅ {applied:%Y-%m-%d %H:%M:%S}" if applied else "⏳ belum"
+        print(f"   {item['version']:04d}  {mark:<22}  {item['description']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema migration COMPARELY")
+    parser.add_argument("--status", action="store_true", help="Tampilkan status saja")
+    parser.add_argument("--target", type=int, default=None, help="Versi terakhir yang dijalankan")
+    args = parser.parse_args()
+
+    print("🚀 COMPARELY - Schema Migration")
+    print("=" * 60)
+
+    if not args.status:
+        Base.metadata.create_all(bind=engine)
+        done = migrations.upgrade(engine, target=args.target)
+        if done:
+            print(f"✅ Migration dijalankan: {', '.join(f'{v:04d}' for v in done)}")
+        else:
+            print("✅ Database sudah versi terbaru")
+
+    print("\n📋 Status:")
+    print_status()
+
+
+if __name__ == "__main__":
+    main()
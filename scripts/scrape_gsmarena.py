@@ -19,6 +19,7 @@ import time
 import random
 from fake_useragent import UserAgent
 import os
+from app.utils.spec_parser import normalize_specs, NORMALIZED_FIELDS
 
 # ==================== KONFIGURASI ====================
 
@@ -315,7 +316,9 @@ def main():
                 print(f"      ⏭️  INCOMPLETE: {phone_data['name']} (Missing: {', '.join(missing)})")
                 continue
             
-            # Data valid! Simpan
+            # Data valid! Tambahkan spesifikasi numerik (ram_gb, storage_gb, dll)
+            # memakai parser yang sama dengan database, lalu simpan
+            phone_data.update(normalize_specs(phone_data))
             all_phones.append(phone_data)
             brand_complete += 1
             stats['complete'] += 1
@@ -336,7 +339,7 @@ def main():
             'name', 'brand', 'category_id', 'cpu', 'gpu', 'ram', 
             'storage', 'camera', 'battery', 'screen', 'release_year', 
             'price', 'image_url', 'source_data'
-        ]
+        ] + list(NORMALIZED_FIELDS)
         
         with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
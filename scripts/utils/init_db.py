@@ -1,9 +1,10 @@
 from app.database import engine, Base
-from app import models
+from app import models, migrations
 
 def init_db():
     print("Creating tables...")
     Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
     print("Tables created successfully!")
 
 if __name__ == "__main__":
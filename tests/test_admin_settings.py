@@ -0,0 +1,67 @@
+"""
+Tests untuk aksi AI di halaman admin settings (app/routers/admin/settings.py)
+Reset circuit breaker dan test koneksi AI hanya boleh dipanggil user yang login.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import User
+from app.routers.admin import settings
+from app.routers.admin.auth import get_password_hash
+
+ACTIONS = ["/admin/settings/reset-ai-circuit", "/admin/settings/test-ai"]
+
+
+@pytest.fixture
+def ai_calls(monkeypatch):
+    """Catat panggilan reset breaker / test koneksi (tanpa request AI sungguhan)."""
+    calls = []
+
+    async def test_ai_connection():
+        calls.append("test-ai")
+        return True
+
+    monkeypatch.setattr(settings.provider_pool, "reset_breakers", lambda: calls.append("reset"))
+    monkeypatch.setattr(settings.ai_service, "test_ai_connection", test_ai_connection)
+    return calls
+
+
+@pytest.fixture
+def admin_user():
+    """User admin sementara di database test."""
+    db = SessionLocal()
+    user = User(
+        username="settings-admin", email="settings-admin@comparely.test",
+        password_hash=get_password_hash("rahasia"), full_name="Settings Admin", is_active=True
+    )
+    db.add(user)
+    db.commit()
+    yield user
+    db.delete(user)
+    db.commit()
+    db.close()
+
+
+@pytest.mark.parametrize("url", ACTIONS)
+def test_anonymous_redirected_to_login(ai_calls, url):
+    response = TestClient(app).post(url, follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"].startswith("/admin/login")
+    assert ai_calls == []
+
+
+def test_logged_in_user_can_run_ai_actions(ai_calls, admin_user):
+    client = TestClient(app)
+    login = client.post(
+        "/admin/login", data={"username": "settings-admin", "password": "rahasia"}, follow_redirects=False
+    )
+    assert login.headers["location"] == "/admin/dashboard"
+
+    for url in ACTIONS:
+        response = client.post(url, follow_redirects=False)
+        assert response.status_code == 303
+        assert response.headers["location"].startswith("/admin/settings?message=")
+    assert ai_calls == ["reset", "test-ai"]
@@ -0,0 +1,105 @@
+"""
+Tests untuk app/services/ai_client.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.ai_client import AIClient, AIDeadlineExceeded
+
+
+def test_post_json_returns_body():
+    def handler(request):
+        assert request.headers["Authorization"] == "Bearer x"
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        client = AIClient(transport=httpx.MockTransport(handler))
+        try:
+            return await client.post_json("http://ai.test/v1", {"a": 1}, headers={"Authorization": "Bearer x"})
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == {"ok": True}
+
+
+def test_http_error_raised():
+    async def run():
+        client = AIClient(transport=httpx.MockTransport(lambda request: httpx.Response(429)))
+        try:
+            await client.post_json("http://ai.test/v1", {})
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_concurrency_limited():
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = AIClient(max_concurrency=2, transport=httpx.MockTransport(handler))
+        try:
+            await asyncio.gather(*(client.post_json("http://ai.test/v1", {}) for _ in range(6)))
+            return client.stats()
+        finally:
+            await client.aclose()
+
+    stats = asyncio.run(run())
+    assert active["max"] == 2
+    assert stats["requests"] == 6 and stats["in_flight"] == 0 and stats["waiting"] == 0
+
+
+def test_deadline_includes_queue_wait():
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = AIClient(max_concurrency=1, transport=httpx.MockTransport(handler))
+        try:
+            results = await asyncio.gather(
+                client.post_json("http://ai.test/v1", {}, deadline=0.3),
+                client.post_json("http://ai.test/v1", {}, deadline=0.3),
+                return_exceptions=True,
+            )
+            return results, client.stats()
+        finally:
+            await client.aclose()
+
+    results, stats = asyncio.run(run())
+    assert results[0] == {}
+    assert isinstance(results[1], AIDeadlineExceeded)
+    assert stats["deadline_exceeded"] == 1
+
+
+def test_stream_json_yields_chunks_until_done():
+    body = (
+        'data: {"n": 1}\n\n'
+        ': keep-alive\n\n'
+        'data: {"n": 2}\n\n'
+        'data: [DONE]\n\n'
+        'data: {"n": 3}\n\n'
+    )
+
+    async def run():
+        client = AIClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body)))
+        try:
+            chunks = [chunk async for chunk in client.stream_json("http://ai.test/v1", {"stream": True})]
+            return chunks, client.stats()
+        finally:
+            await client.aclose()
+
+    chunks, stats = asyncio.run(run())
+    assert chunks == [{"n": 1}, {"n": 2}]
+    assert stats["in_flight"] == 0
@@ -0,0 +1,189 @@
+"""
+Tests untuk app/services/ai_precompute.py
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.services import ai_precompute
+from app.services.ai_precompute import (
+    PopularityTracker,
+    PrecomputeScheduler,
+    comparison_key,
+    in_window,
+    parse_window,
+    retry_delay,
+)
+
+
+def rate_limited(headers=None):
+    request = httpx.Request("POST", "http://ai.test/v1")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("429", request=request, response=response)
+
+
+def test_window():
+    assert parse_window("") is None
+    assert parse_window("1-6") == (1, 6)
+    assert in_window(3, (1, 6)) and not in_window(6, (1, 6))
+    assert in_window(23, (22, 6)) and in_window(2, (22, 6)) and not in_window(12, (22, 6))
+    assert in_window(12, None)
+    with pytest.raises(ValueError):
+        parse_window("25-3")
+
+
+def test_retry_delay_prefers_retry_after_header():
+    assert retry_delay(rate_limited({"Retry-After": "7"}), backoff=30) == 7
+    assert retry_delay(rate_limited(), backoff=30) == 30
+
+
+def test_tracker_top_and_decay():
+    tracker = PopularityTracker(max_keys=10)
+    for _ in range(5):
+        tracker.record(comparison_key(2, 1))
+    tracker.record(comparison_key(3, 4))
+
+    assert tracker.top(5) == [("compare", 1, 2), ("compare", 3, 4)]
+    assert tracker.top(5, min_count=2) == [("compare", 1, 2)]
+
+    tracker.decay(0.4)  # 1 x 0.4 < POPULARITY_MIN_COUNT -> dibuang
+    assert list(tracker.counts) == [("compare", 1, 2)]
+
+
+def test_tracker_counts_shared_between_workers(tmp_path):
+    path = str(tmp_path / "ai_cache.sqlite3")
+    workers = [PopularityTracker(max_keys=10, path=path) for _ in range(3)]
+    job = workers[0]
+    try:
+        # Tiap worker melihat sebagian traffic; pasangan (1, 2) hanya populer jika dijumlahkan
+        for worker in workers:
+            worker.record(comparison_key(1, 2))
+            worker.record(comparison_key(1, 2))
+        workers[1].record("rekomendasi")
+        for worker in workers[1:]:
+            assert worker.flush() >= 1
+            assert worker.flush() == 0  # Hitungan tidak dijumlahkan 2 kali
+
+        job.load()
+        assert job.counts == {("compare", 1, 2): 6.0, "rekomendasi": 1.0}
+        assert job.top(5, min_count=3) == [("compare", 1, 2)]
+
+        job.decay(0.4)  # Decay & forget juga berlaku di tabel bersama
+        job.forget(comparison_key(2, 1))
+        workers[2].load()
+        assert workers[2].counts == {}
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+def test_run_once_reads_shared_counts(tmp_path):
+    path = str(tmp_path / "ai_cache.sqlite3")
+    worker, job = PopularityTracker(max_keys=10, path=path), PopularityTracker(max_keys=10, path=path)
+    try:
+        for _ in range(3):
+            worker.record("a")
+        worker.flush()
+        scheduler, calls = make_scheduler(job, {})
+        assert asyncio.run(scheduler.run_once()) == 1
+        assert calls == ["a"]
+    finally:
+        worker.close()
+        job.close()
+
+
+def make_scheduler(tracker, outcomes):
+    scheduler = PrecomputeScheduler(tracker, rpm=6000, window="", min_requests=1,
+                                    backoff_base=10, backoff_max=40)
+    calls = []
+
+    async def fake_precompute(key):
+        calls.append(key)
+        outcome = outcomes.get(key, True)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    scheduler._precompute = fake_precompute
+    return scheduler, calls
+
+
+def test_run_once_most_popular_first():
+    tracker = PopularityTracker(max_keys=10)
+    for key, count in (("a", 3), ("b", 5), ("c", 1)):
+        for _ in range(count):
+            tracker.record(key)
+    scheduler, calls = make_scheduler(tracker, {"c": False})
+
+    assert asyncio.run(scheduler.run_once()) == 2
+    assert calls == ["b", "a", "c"]
+
+
+def test_backoff_on_429():
+    tracker = PopularityTracker(max_keys=10)
+    for key, count in (("a", 3), ("b", 2), ("c", 1)):
+        for _ in range(count):
+            tracker.record(key)
+    scheduler, calls = make_scheduler(tracker, {"b": rate_limited()})
+
+    asyncio.run(scheduler.run_once())
+    assert calls == ["a", "b"]  # Berhenti setelah 429
+    assert scheduler.rate_limited == 1
+    assert scheduler.backoff == 20
+    assert scheduler.stats()["paused_seconds"] > 0
+
+    # Masih dalam masa backoff: tidak ada panggilan
+    calls.clear()
+    asyncio.run(scheduler.run_once())
+    assert calls == []
+
+
+def test_request_budget_spacing():
+    scheduler = PrecomputeScheduler(PopularityTracker(max_keys=10), rpm=1200, window="")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(4):
+            await scheduler._wait_for_budget()
+        return loop.time() - started
+
+    # 1200 rpm = 1 request per 0.05 detik; request pertama langsung
+    assert asyncio.run(run()) >= 0.15
+
+
+def test_precompute_loads_in_threadpool_and_spends_budget_once():
+    scheduler = PrecomputeScheduler(PopularityTracker(max_keys=10), rpm=6000, window="")
+    threads = []
+
+    async def precompute(*args):
+        return True
+
+    def load(key):
+        threads.append(threading.get_ident())
+        return (precompute, ()) if key == "baru" else None  # None = sudah di-cache
+
+    scheduler._load = load
+
+    async def run():
+        return await scheduler._precompute("baru"), await scheduler._precompute("lama")
+
+    assert asyncio.run(run()) == (True, False)
+    assert threading.get_ident() not in threads  # Query database tidak di event loop
+    assert scheduler.requests == 1
+
+
+@pytest.mark.skipif(ai_precompute.fcntl is None, reason="butuh fcntl")
+def test_lock_taken_by_one_process_only(tmp_path):
+    path = str(tmp_path / "precompute.lock")
+    with open(path, "a") as other_worker:
+        ai_precompute.fcntl.flock(other_worker, ai_precompute.fcntl.LOCK_EX | ai_precompute.fcntl.LOCK_NB)
+        assert not ai_precompute.acquire_lock(path)
+    # Worker lain berhenti: lock bisa diambil
+    try:
+        assert ai_precompute.acquire_lock(path)
+    finally:
+        ai_precompute.release_lock()
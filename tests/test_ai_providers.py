@@ -0,0 +1,247 @@
+"""
+Tests untuk app/services/ai_providers.py
+
+Provider diuji terhadap stub server chat completion lokal (127.0.0.1).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.services.ai_client import AIClient
+from app.services.ai_providers import AIProvider, ProviderPool, parse_providers
+from app.services.circuit_breaker import OPEN, CircuitBreaker, CircuitOpenError
+
+
+class StubAI:
+    """Stub server chat completion: jawab `reply` setelah `delay` detik."""
+
+    def __init__(self, reply, delay=0.0, status=200):
+        self.reply = reply
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if stub.status != 200:
+                    body, content_type = b"{}", "application/json"
+                elif payload.get("stream"):
+                    events = [{"choices": [{"delta": {"content": part}}]} for part in stub.reply.split(" ")]
+                    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+                    body, content_type = body.encode(), "text/event-stream"
+                else:
+                    body = json.dumps({"choices": [{"message": {"content": stub.reply}}]}).encode()
+                    content_type = "application/json"
+                try:
+                    self.send_response(stub.status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # Client sudah membatalkan (kalah hedge)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1/chat/completions"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def make(reply, **kwargs):
+        servers.append(StubAI(reply, **kwargs))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def run_pool(stub_list, call, breaker_options=None, **pool_options):
+    """Buat pool dari stub server lalu jalankan call(pool) di event loop baru."""
+    async def run():
+        client = AIClient()
+        providers = [
+            AIProvider(
+                f"stub-{index}", stub.url, "stub-model", "key",
+                breaker=CircuitBreaker(**(breaker_options or {})), client=client
+            )
+            for index, stub in enumerate(stub_list)
+        ]
+        options = {"default_delay": 5.0, "min_delay": 0.01, "min_samples": 3}
+        options.update(pool_options)
+        pool = ProviderPool(providers, **options)
+        try:
+            return await call(pool), pool
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def ask(pool):
+    return pool.chat([{"role": "user", "content": "hi"}])
+
+
+def test_fast_primary_not_hedged(stubs):
+    primary, secondary = stubs("primary"), stubs("secondary")
+    result, pool = run_pool([primary, secondary], ask)
+    assert result == "primary"
+    assert secondary.requests == 0
+    assert pool.hedged == 0 and pool.providers[0].wins == 1
+
+
+def test_slow_primary_hedged_to_secondary(stubs):
+    primary, secondary = stubs("primary", delay=1.0), stubs("secondary")
+    started = time.monotonic()
+    result, pool = run_pool([primary, secondary], ask, default_delay=0.1)
+    assert result == "secondary"
+    assert time.monotonic() - started < 0.8  # Tidak menunggu primary
+    assert pool.hedged == 1 and pool.providers[1].wins == 1
+
+
+def test_degraded_primary_recorded_and_breaker_opens(stubs):
+    primary, secondary = stubs("primary", delay=0.6), stubs("secondary")
+
+    async def call(pool):
+        results = []
+        for _ in range(4):
+            results.append(await ask(pool))
+            await asyncio.sleep(0.05)  # Panggilan primary yang kalah selesai dibatalkan
+        return results
+
+    results, pool = run_pool(
+        [primary, secondary], call, default_delay=0.25, min_samples=100,
+        breaker_options={"min_calls": 3, "slow_call_seconds": 0.2, "open_seconds": 60},
+    )
+    assert results == ["secondary"] * 4
+    # Panggilan yang kalah hedge tetap menyumbang latency (batas bawah)...
+    assert pool.providers[0].latency_percentile(50) >= 0.25
+    # ...dan dihitung lambat, jadi breaker primary open: request ke-4 tidak memanggilnya
+    assert pool.providers[0].breaker.state == OPEN
+    assert primary.requests == 3 and pool.hedged == 3
+
+
+def test_call_once_not_hedged(stubs):
+    primary, secondary = stubs("primary", delay=0.3), stubs("secondary")
+
+    async def call(pool):
+        return await pool.call_once([{"role": "user", "content": "hi"}])
+
+    result, pool = run_pool([primary, secondary], call, default_delay=0.01)
+    assert result == "primary"
+    assert secondary.requests == 0 and pool.hedged == 0
+
+
+def test_call_once_failures_do_not_open_user_breaker(stubs):
+    primary = stubs("primary", status=429)
+
+    async def call(pool):
+        provider = pool.providers[0]
+        provider.background_breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await pool.call_once([{"role": "user", "content": "hi"}])
+        with pytest.raises(CircuitOpenError):
+            await pool.call_once([{"role": "user", "content": "hi"}])
+        return provider
+
+    provider, pool = run_pool([primary], call, breaker_options={"min_calls": 2})
+    assert provider.background_breaker.state == OPEN
+    assert provider.breaker.state != OPEN and provider.breaker.stats()["error_rate"] == 0
+    assert primary.requests == 2
+    pool.reset_breakers()
+    assert provider.background_breaker.state != OPEN
+
+
+def test_failover_on_error(stubs):
+    primary, secondary = stubs("primary", status=503), stubs("secondary")
+    result, pool = run_pool([primary, secondary], ask, hedge_enabled=False)
+    assert result == "secondary"
+    assert pool.failovers == 1
+    assert pool.providers[0].breaker.stats()["error_rate"] == 1.0
+
+
+def test_all_providers_failing_raise_last_error(stubs):
+    primary, secondary = stubs("primary", status=503), stubs("secondary", status=429)
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        run_pool([primary, secondary], ask)
+    assert error.value.response.status_code == 429
+
+
+def test_open_provider_skipped(stubs):
+    primary, secondary = stubs("primary"), stubs("secondary")
+
+    async def call(pool):
+        pool.providers[0].breaker._open(time.monotonic())
+        result = await ask(pool)
+        pool.providers[1].breaker._open(time.monotonic())
+        with pytest.raises(CircuitOpenError):
+            await ask(pool)
+        return result
+
+    result, pool = run_pool([primary, secondary], call)
+    assert result == "secondary"
+    assert primary.requests == 0
+    assert pool.providers[0].breaker.state == OPEN
+
+
+def test_hedge_delay_follows_latency_percentile():
+    provider = AIProvider("p", "http://ai.test", "m", "key", breaker=CircuitBreaker())
+    pool = ProviderPool([provider], hedge_percentile=90, default_delay=5, min_delay=0.2, min_samples=3)
+    assert pool.hedge_delay(provider) == 5  # Belum cukup sampel
+    for latency in (1.0, 1.0, 1.0, 1.0, 3.0):
+        provider.record_latency(latency)
+    assert pool.hedge_delay(provider) == pytest.approx(2.2)
+    provider._latencies.clear()
+    for _ in range(3):
+        provider.record_latency(0.01)
+    assert pool.hedge_delay(provider) == 0.2
+
+
+def test_stream_fails_over_before_first_token(stubs):
+    primary, secondary = stubs("a b", status=500), stubs("halo dunia")
+
+    async def call(pool):
+        return [delta async for delta in pool.stream([{"role": "user", "content": "hi"}])]
+
+    deltas, pool = run_pool([primary, secondary], call)
+    assert deltas == ["halo", "dunia"]
+    assert pool.failovers == 1
+
+
+def test_parse_providers(monkeypatch):
+    monkeypatch.setenv("BACKUP_KEY", "rahasia")
+    raw = json.dumps([
+        {"name": "utama", "url": "http://a.test", "model": "m1", "api_key": "k1"},
+        {"url": "http://b.test", "model": "m2", "api_key_env": "BACKUP_KEY"},
+    ])
+    providers = parse_providers(raw)
+    assert [(p.name, p.model, p.api_key) for p in providers] == [("utama", "m1", "k1"), ("provider-2", "m2", "rahasia")]
+    assert len(parse_providers("")) == 1
+
+    with pytest.raises(ValueError):
+        parse_providers('[{"name": "tanpa url"}]')
@@ -0,0 +1,72 @@
+"""
+Tests untuk app/services/ai_response_cache.py
+"""
+
+import time
+
+from app.services.ai_response_cache import AIResponseCache, fingerprint
+
+
+def make_cache(tmp_path, **kwargs):
+    options = {"ttl_seconds": 3600, "max_entries": 100, "max_bytes": 100_000}
+    options.update(kwargs)
+    return AIResponseCache(path=str(tmp_path / "ai_cache.sqlite3"), **options)
+
+
+def test_fingerprint_depends_on_model_version_and_fields():
+    devices = [{"name": "A", "price": 1000}, {"name": "B", "price": 2000}]
+    key = fingerprint("model-x", 1, "compare", devices)
+    assert key == fingerprint("model-x", 1, "compare", [dict(d) for d in devices])
+    assert key != fingerprint("model-y", 1, "compare", devices)
+    assert key != fingerprint("model-x", 2, "compare", devices)
+    assert key != fingerprint("model-x", 1, "compare", [{"name": "A", "price": 1500}, devices[1]])
+
+
+def test_persistent_across_instances(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get("k") is None
+    cache.put("k", "compare", "**Performa:** ok", [1, 2])
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get("k") == "**Performa:** ok"
+    assert reopened.stats()["hits"] == 1
+
+
+def test_ttl_expiry(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=0.05)
+    cache.put("k", "compare", "x", [1])
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", "compare", "a", [1])
+    cache.put("b", "compare", "b", [2])
+    assert cache.get("a") == "a"  # "b" jadi yang paling lama tidak dipakai
+    cache.put("c", "compare", "c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" and cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_limit(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=10)
+    cache.put("a", "compare", "123456", [1])
+    cache.put("b", "compare", "123456", [2])
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] <= 10
+
+
+def test_invalidate_devices(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("1-2", "compare", "x", [1, 2])
+    cache.put("2-3", "compare", "y", [2, 3])
+    cache.put("3-4", "compare", "z", [3, 4])
+
+    assert cache.invalidate_devices([2]) == 2
+    assert cache.get("1-2") is None and cache.get("2-3") is None
+    assert cache.get("3-4") == "z"
@@ -0,0 +1,156 @@
+"""
+Tests untuk streaming analisis perbandingan (app/services/ai.py)
+
+Provider AI diganti httpx.MockTransport yang mengirim body SSE per chunk.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import ai as ai_service
+from app.services.ai_client import AIClient
+from app.services.ai_providers import AIProvider, ProviderPool
+from app.services.circuit_breaker import CircuitBreaker
+
+ANALYSIS = {
+    "performa": "A lebih kencang.",
+    "kamera": "B lebih tajam.",
+    "baterai": "A lebih awet.",
+    "value_for_money": "A lebih hemat.",
+    "rekomendasi": "Pilih A untuk harga.",
+}
+
+
+def make_device(device_id, name):
+    return SimpleNamespace(
+        id=device_id, name=name, brand="Merek", price=5_000_000, price_idr=5_000_000, release_year=2024,
+        cpu="Chip", ram="8GB", ram_gb=8, storage_gb=256, camera="50MP", main_camera_mp=50,
+        battery="5000mAh", battery_mah=5000, screen_inch=6.5,
+    )
+
+
+A, B = make_device(1, "A"), make_device(2, "B")
+
+
+def sse_chunks(text, size):
+    """Body SSE untuk `text` yang dipecah per `size` karakter (1 event per potongan)."""
+    parts = [text[i:i + size] for i in range(0, len(text), size)]
+    events = [{"choices": [{"delta": {"content": part}}]} for part in parts]
+    return [f"data: {json.dumps(event)}\n\n".encode() for event in events] + [b"data: [DONE]\n\n"]
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    """Kirim chunk satu per satu (dengan jeda), opsional putus di tengah stream."""
+
+    def __init__(self, chunks, delay=0.0, fail_after=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.fail_after = fail_after
+
+    async def __aiter__(self):
+        for index, chunk in enumerate(self.chunks):
+            if index == self.fail_after:
+                raise httpx.ReadError("koneksi putus")
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+@pytest.fixture
+def mock_ai(monkeypatch):
+    """Pasang provider_pool dengan transport tiruan; kembalikan daftar request."""
+    requests = []
+    cache = {}
+    monkeypatch.setattr(ai_service, "_cache_get", cache.get)
+    monkeypatch.setattr(ai_service, "_cache_put", lambda key, kind, response, ids: cache.__setitem__(key, response))
+
+    def install(stream_factory):
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, stream=stream_factory())
+
+        client = AIClient(transport=httpx.MockTransport(handler))
+        provider = AIProvider("mock", "http://ai.test/v1", "mock-model", "key", breaker=CircuitBreaker(), client=client)
+        monkeypatch.setattr(ai_service, "provider_pool", ProviderPool([provider]))
+        return requests
+
+    return install
+
+
+async def collect(device1=A, device2=B):
+    return [event async for event in ai_service.stream_comparison_analysis(device1, device2)]
+
+
+def test_concurrent_streams_share_one_ai_call(mock_ai):
+    requests = mock_ai(lambda: ChunkStream(sse_chunks(json.dumps(ANALYSIS), 7), delay=0.005))
+    flight = ai_service.ai_single_flight
+    executions = flight.executions
+
+    async def run():
+        return await asyncio.gather(*(collect() for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(requests) == 1
+    assert flight.executions - executions == 1
+    assert all(events == results[0] for events in results)
+    assert [event for event, _ in results[0]] == ["section"] * 5 + ["done"]
+
+
+def test_sections_extracted_across_split_tokens_and_escaped_quotes(mock_ai):
+    analysis = dict(ANALYSIS, kamera='B pakai sensor "ISOCELL" \\ lebih tajam.')
+    text = json.dumps(analysis)
+    # Potongan 3 karakter: ada token yang berakhir di tengah escape (\" atau \\)
+    assert any(text[i:i + 3].endswith("\\") for i in range(0, len(text), 3))
+    mock_ai(lambda: ChunkStream(sse_chunks(text, 3)))
+
+    events = asyncio.run(collect())
+
+    sections = [data for event, data in events if event == "section"]
+    assert [section["key"] for section in sections] == list(analysis)
+    assert {section["key"]: section["text"] for section in sections} == analysis
+    assert sections[1]["title"] == dict(ai_service.COMPARISON_SECTIONS)["kamera"]
+    assert events[-1] == ("done", ai_service.comparison_summary.format_sections(analysis))
+
+
+def test_provider_error_mid_stream_falls_back_to_summary(mock_ai):
+    chunks = sse_chunks(json.dumps(ANALYSIS), 40)
+    mock_ai(lambda: ChunkStream(chunks, fail_after=3))
+
+    events = asyncio.run(collect())
+
+    event, text = events[-1]
+    assert event == "done"
+    assert text == ai_service.rule_based_comparison(A, B)
+    assert not ai_service.is_structured_analysis(text)
+
+
+def test_stream_endpoint_event_order(mock_ai, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.routers import compare
+
+    mock_ai(lambda: ChunkStream(sse_chunks(json.dumps(ANALYSIS), 11)))
+    highlights = {"device_1": {"id": 1}, "device_2": {"id": 2}, "highlights": {}}
+    monkeypatch.setattr(
+        compare, "_load_for_ai", lambda id1, id2: (dict(highlights), "stream-test", None, (A, B))
+    )
+    stored = {}
+    monkeypatch.setattr(compare.comparison_cache.comparison_cache, "put", stored.__setitem__)
+
+    response = TestClient(app).get("/compare/ai/stream?id1=1&id2=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (lines[0][len("event: "):], json.loads(lines[1][len("data: "):]))
+        for lines in (block.split("\n") for block in response.text.strip().split("\n\n"))
+    ]
+    assert [event for event, _ in events] == ["highlights"] + ["section"] * 5 + ["done"]
+    assert events[0][1] == highlights
+    assert [data["key"] for _, data in events[1:-1]] == list(ANALYSIS)
+    assert ai_service.is_structured_analysis(events[-1][1]["ai_analysis"])
+    assert stored == {"stream-test": events[-1][1]["ai_analysis"]}
@@ -5,12 +5,42 @@ Smoke tests untuk memastikan aplikasi berjalan dengan baik.
 
 import pytest
 from app.main import app
+from app.crud.device import MAX_BATCH_SIZE
+from app.crud.pagination import encode_cursor, sort_signature
+from app.database import SessionLocal
+from app.models import Category, Phone
 from fastapi.testclient import TestClient
 
 # Test client
 client = TestClient(app)
 
 
+@pytest.fixture
+def seeded_devices():
+    """3 device sementara di database test (dihapus lagi setelah test)"""
+    db = SessionLocal()
+    category = Category(name="Seed Category")
+    db.add(category)
+    db.flush()
+    phones = [
+        Phone(
+            name=f"Seed Phone {i}", brand="SeedBrand", category_id=category.id,
+            cpu="Seed Chip", gpu="Seed GPU", ram="8GB", storage="256GB", camera="50MP",
+            battery="5000mAh", screen="6.5 inch", release_year=2024, price=1_000_000 * i,
+        )
+        for i in (1, 2, 3)
+    ]
+    db.add_all(phones)
+    db.commit()
+    ids = [phone.id for phone in phones]
+    yield ids
+    for phone in phones:
+        db.delete(phone)
+    db.delete(category)
+    db.commit()
+    db.close()
+
+
 class TestBasicEndpoints:
     """Test basic endpoints untuk memastikan aplikasi berjalan"""
     
@@ -61,6 +91,49 @@ class TestAPIEndpoints:
         response = client.get("/search?query=samsung")
         assert response.status_code == 200
 
+    def test_get_devices_malformed_cursor(self):
+        """Test GET /devices/?cursor= dengan nilai sort yang salah -> 400, bukan 500"""
+        cursor = encode_cursor({"k": [1, 2], "id": 1}, sort_signature())
+        response = client.get(f"/devices/?cursor={cursor}")
+        assert response.status_code == 400
+
+    def test_get_devices_batch_api(self, seeded_devices):
+        """Test GET /devices/batch: urutan ikut ids, duplikat & ID tidak dikenal dilewati"""
+        first, second, third = seeded_devices
+        ids = [third, first, third, 999999999, second]
+        response = client.get(f"/devices/batch?ids={','.join(map(str, ids))}")
+        assert response.status_code == 200
+        assert [device["id"] for device in response.json()] == [third, first, second]
+        assert response.json()[1]["name"] == "Seed Phone 1"
+
+    def test_get_devices_batch_too_many_ids(self):
+        """Test GET /devices/batch dengan lebih dari MAX_BATCH_SIZE ID"""
+        ids = ",".join(str(i) for i in range(1, MAX_BATCH_SIZE + 2))
+        response = client.get(f"/devices/batch?ids={ids}")
+        assert response.status_code == 400
+
+    def test_get_devices_sparse_fields(self, seeded_devices):
+        """Test GET /devices/?fields= hanya mengirim field yang diminta"""
+        response = client.get("/devices/?fields=name,price&limit=5")
+        assert response.status_code == 200
+        devices = response.json()
+        assert devices
+        for device in devices:
+            assert set(device) == {"id", "name", "price"}
+
+        response = client.get(f"/devices/batch?ids={seeded_devices[0]}&fields=name,price")
+        assert response.json() == [{"id": seeded_devices[0], "name": "Seed Phone 1", "price": 1000000.0}]
+
+    def test_compare_multi_invalid_ids(self):
+        """Test GET /compare/multi dengan kurang dari 2 device"""
+        response = client.get("/compare/multi?ids=1")
+        assert response.status_code == 400
+
+    def test_get_devices_batch_invalid_ids(self):
+        """Test GET /devices/batch dengan ids tidak valid"""
+        response = client.get("/devices/batch?ids=abc")
+        assert response.status_code == 400
+
 
 class TestModels:
     """Test database models dapat di-import"""
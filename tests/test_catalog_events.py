@@ -0,0 +1,114 @@
+"""
+Tests untuk app/services/catalog_events.py
+Commit / rollback di session sungguhan (SessionLocal) ke database sementara.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.database import Base, SessionLocal
+from app.models import Phone
+from app.services import catalog_events, prefix_index
+from app.services.prefix_index import PrefixIndex
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Listener perekam + prefix index baru sebagai satu-satunya listener."""
+    received = []
+    index = PrefixIndex()
+    monkeypatch.setattr(catalog_events, "_listeners", [])
+    monkeypatch.setattr(prefix_index, "device_prefix_index", index)
+    catalog_events.subscribe(prefix_index._on_catalog_change)
+    catalog_events.subscribe(lambda changed, deleted_ids: received.append(
+        ([data["id"] for data in changed], sorted(deleted_ids))
+    ))
+    return received, index
+
+
+@pytest.fixture
+def db(tmp_path, events):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    session.add_all([Phone(id=1, name="Galaxy S24", brand="Samsung"), Phone(id=2, name="Poco X6", brand="Xiaomi")])
+    session.commit()
+    events[1].build(session)
+    events[0].clear()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_committed_changes_published(db, events):
+    received, index = events
+
+    db.add(Phone(id=3, name="Redmi Note 13", brand="Xiaomi"))
+    db.get(Phone, 1).name = "Galaxy S25"
+    db.delete(db.get(Phone, 2))
+    db.commit()
+
+    assert received == [([3, 1], [2])]
+    assert ids(index.search("xiaomi")) == [3]
+    assert ids(index.search("s25")) == [1] and index.search("s24") == []
+    assert index.search("poco") == []
+
+
+def test_rolled_back_changes_discarded(db, events):
+    received, index = events
+
+    db.add(Phone(id=3, name="Redmi Note 13", brand="Xiaomi"))
+    db.get(Phone, 1).name = "Galaxy S25"
+    db.flush()  # Sudah tercatat di after_flush...
+    db.rollback()  # ...tapi dibuang saat rollback
+
+    assert received == []
+    assert index.search("redmi") == [] and ids(index.search("s24")) == [1]
+
+    # Commit berikutnya hanya mengirim perubahan transaksi itu sendiri
+    db.get(Phone, 2).brand = "POCO"
+    db.commit()
+    assert received == [([2], [])]
+    assert index.search("redmi") == []
+    assert ids(index.search("poco")) == [2]
+
+
+def test_update_then_delete_only_deleted(db, events):
+    received, _ = events
+    phone = db.get(Phone, 1)
+    phone.name = "Galaxy S25"
+    db.flush()
+    db.delete(phone)
+    db.commit()
+    assert received == [([], [1])]
+
+
+def test_listener_error_does_not_stop_others(db, events):
+    received, _ = events
+    catalog_events._listeners.insert(0, lambda changed, deleted_ids: 1 / 0)
+    catalog_events.publish_deleted([2])
+    assert received == [([], [2])]
+
+
+def test_brand_list_cached_until_catalog_changes(db, monkeypatch):
+    from sqlalchemy import event
+
+    from app.crud import device as device_crud
+
+    monkeypatch.setattr(catalog_events, "_listeners", [device_crud._on_catalog_change])
+    monkeypatch.setattr(device_crud, "_brand_cache", {"brands": None, "loaded_at": 0.0, "generation": 0})
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    assert device_crud.get_unique_brands(db) == ["Samsung", "Xiaomi"]
+    assert device_crud.get_unique_brands(db) == ["Samsung", "Xiaomi"]
+    assert len(queries) == 1
+
+    db.add(Phone(id=3, name="iPhone 15", brand="Apple"))
+    db.commit()
+    assert device_crud.get_unique_brands(db) == ["Apple", "Samsung", "Xiaomi"]
+    assert len(queries) == 3  # INSERT + 1 query brand baru
@@ -0,0 +1,82 @@
+"""
+Tests untuk app/services/circuit_breaker.py
+"""
+
+import time
+
+import pytest
+
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def make_breaker(**kwargs):
+    options = {
+        "window_seconds": 60, "min_calls": 4, "error_rate": 0.5,
+        "slow_call_seconds": 5, "slow_rate": 0.5, "open_seconds": 0.05,
+        "deadline_min": 1, "deadline_max": 20, "deadline_multiplier": 2,
+    }
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def test_opens_on_error_rate():
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED  # Belum cukup panggilan
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    assert not breaker.allow_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_opens_on_slow_calls():
+    breaker = make_breaker()
+    for latency in (6, 7, 0.1, 8):
+        breaker.record_success(latency)
+    assert breaker.state == OPEN
+
+
+def test_half_open_single_probe():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure(0.1)
+    time.sleep(0.06)
+
+    assert breaker.allow_request()        # Percobaan
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()    # Yang lain tetap ditolak
+
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls_in_window"] == 1
+
+
+def test_adaptive_deadline():
+    breaker = make_breaker()
+    assert breaker.deadline() == 20  # Belum cukup data
+    for latency in (1.0, 1.5, 2.0, 2.0):
+        breaker.record_success(latency)
+    assert breaker.deadline() == pytest.approx(4.0, rel=0.05)
+
+    fast = make_breaker()
+    for _ in range(4):
+        fast.record_success(0.1)
+    assert fast.deadline() == 1  # Tidak di bawah deadline_min
+
+
+def test_reset():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure(0.1)
+    breaker.reset()
+    assert breaker.state == CLOSED and breaker.allow_request()
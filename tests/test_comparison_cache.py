@@ -0,0 +1,88 @@
+"""
+Tests untuk app/services/comparison_cache.py
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Phone
+from app.services.comparison_cache import ComparisonCache, make_key
+
+
+def test_key_unordered_pair():
+    assert make_key("compare", 1, 3, 2, 5) == make_key("compare", 2, 5, 1, 3)
+    assert make_key("compare", 1, 3, 2, 5) != make_key("compare", 1, 4, 2, 5)
+    assert make_key("compare", 1, 3, 2, 5) != make_key("ai", 1, 3, 2, 5)
+
+
+def test_hit_miss_stats():
+    cache = ComparisonCache(max_entries=10, max_bytes=10_000)
+    key = make_key("compare", 1, 1, 2, 1)
+    calls = []
+    compute = lambda: calls.append(1) or {"highlights": ["x"]}
+
+    assert cache.get_or_compute(key, compute) == {"highlights": ["x"]}
+    assert cache.get_or_compute(key, compute) == {"highlights": ["x"]}
+    assert len(calls) == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = ComparisonCache(max_entries=2, max_bytes=10_000)
+    keys = [make_key("compare", i, 1, i + 100, 1) for i in range(3)]
+    cache.put(keys[0], "a")
+    cache.put(keys[1], "b")
+    cache.get(keys[0])            # keys[0] jadi paling baru dipakai
+    cache.put(keys[2], "c")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_bound():
+    cache = ComparisonCache(max_entries=100, max_bytes=3_000)
+    for i in range(10):
+        cache.put(make_key("compare", i, 1, i + 100, 1), "x" * 1_000)
+    assert cache.stats()["bytes"] <= 3_000
+    assert cache.stats()["entries"] < 10
+
+
+def test_invalidate_device():
+    cache = ComparisonCache(max_entries=10, max_bytes=10_000)
+    cache.put(make_key("compare", 1, 1, 2, 1), "a")
+    cache.put(make_key("ai", 1, 1, 3, 1), "b")
+    cache.put(make_key("compare", 2, 1, 3, 1), "c")
+
+    assert cache.invalidate_device(1) == 2
+    assert cache.stats()["entries"] == 1
+    assert cache.get(make_key("compare", 2, 1, 3, 1)) == "c"
+
+
+def test_cacheable_filter():
+    cache = ComparisonCache(max_entries=10, max_bytes=10_000)
+    key = make_key("ai", 1, 1, 2, 1)
+    cache.get_or_compute(key, lambda: "error", cacheable=lambda text: text != "error")
+    assert cache.stats()["entries"] == 0
+
+
+def test_phone_version_bumped_on_update():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    phone = Phone(name="Phone A", brand="Test", price=1000000)
+    db.add(phone)
+    db.commit()
+    assert phone.version == 1
+
+    phone.price = 2000000
+    db.commit()
+    assert phone.version == 2
+
+    # Flush tanpa perubahan tidak menaikkan version
+    db.commit()
+    assert phone.version == 2
+    db.close()
@@ -0,0 +1,80 @@
+"""
+Tests untuk app/services/comparison_summary.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.services import ai as ai_service
+from app.services import comparison_summary
+
+
+def make_device(name, **specs):
+    values = {
+        "id": None, "cpu": None, "price": None, "price_idr": None, "release_year": None, "ram_gb": None,
+        "storage_gb": None, "main_camera_mp": None, "battery_mah": None, "screen_inch": None,
+    }
+    values.update(specs)
+    return SimpleNamespace(name=name, **values)
+
+
+A = make_device("A", price_idr=5_000_000, release_year=2023, ram_gb=8, storage_gb=256,
+                main_camera_mp=50, battery_mah=5000, screen_inch=6.7, cpu="Dimensity 7200")
+B = make_device("B", price_idr=7_000_000, release_year=2024, ram_gb=12, storage_gb=256,
+                main_camera_mp=108, battery_mah=4500, screen_inch=6.1, cpu="Snapdragon 8 Gen 2")
+
+
+def test_all_sections_from_specs():
+    summary = comparison_summary.summarize(A, B)
+
+    assert list(summary) == [key for key, _ in comparison_summary.SECTIONS]
+    assert summary["performa"] == "B (Snapdragon 8 Gen 2) unggul di performa: RAM 12GB vs 8GB dan rilis 2024 vs 2023."
+    assert "B beresolusi lebih tinggi (108MP vs 50MP)" in summary["kamera"]
+    assert "A lebih besar (5000 mAh vs 4500 mAh, +11%)" in summary["baterai"]
+    assert summary["value_for_money"].startswith("B lebih mahal Rp 2,000,000 (29%)")
+    assert summary["rekomendasi"] == (
+        "Pilih A jika mengutamakan harga lebih murah, baterai lebih awet dan layar lebih lebar. "
+        "Pilih B jika mengutamakan chipset lebih baru, RAM lebih besar dan kamera lebih tajam."
+    )
+
+
+def test_cheaper_device_with_equal_specs_is_better_value():
+    cheap = make_device("Hemat", price_idr=4_000_000, ram_gb=8, battery_mah=5000)
+    pricey = make_device("Mahal", price_idr=5_000_000, ram_gb=8, battery_mah=5000)
+    summary = comparison_summary.summarize(pricey, cheap)
+
+    assert summary["value_for_money"].startswith("Hemat lebih murah Rp 1,000,000 (20%)")
+    assert summary["rekomendasi"].startswith("Pilih Hemat karena unggul di harga lebih murah")
+    assert summary["performa"] == "Performa keduanya setara: RAM sama-sama 8GB."
+
+
+def test_split_performance_and_missing_data():
+    a = make_device("A", ram_gb=12, release_year=2022)
+    b = make_device("B", ram_gb=8, release_year=2024)
+    assert "performa keduanya bersaing" in comparison_summary.summarize(a, b)["performa"]
+
+    empty = make_device("Kosong")
+    summary = comparison_summary.summarize(A, empty)
+    assert summary["kamera"] == "Data kamera Kosong belum tersedia, kamera belum bisa dibandingkan."
+    assert summary["value_for_money"] == "Harga Kosong belum tersedia, value for money belum bisa dinilai."
+    assert summary["rekomendasi"] == comparison_summary.RECOMMENDATION_TEMPLATES["missing"]
+
+
+def test_same_format_as_ai_analysis():
+    text = comparison_summary.format_sections(comparison_summary.summarize(A, B))
+    assert ai_service.is_structured_analysis(text)
+    assert [line.split(":**")[0] for line in text.split("\n\n")] == [
+        f"**{title}" for _, title in comparison_summary.SECTIONS
+    ]
+
+
+def test_ai_fallback_uses_summary_and_is_not_cached(monkeypatch):
+    monkeypatch.setattr(ai_service.provider_pool, "configured", lambda: False)
+    monkeypatch.setattr(ai_service, "comparison_cache_key", lambda device1, device2: "key")
+    monkeypatch.setattr(ai_service, "_cache_get", lambda key: None)
+
+    text = asyncio.run(ai_service.get_comparison_analysis(A, B))
+
+    assert text.startswith("**Ringkasan Otomatis:**")
+    assert comparison_summary.summarize(A, B)["rekomendasi"] in text
+    assert not ai_service.is_structured_analysis(text)  # Tidak di-cache sebagai jawaban AI
@@ -0,0 +1,61 @@
+"""
+Tests untuk app/services/facet_index.py
+Memastikan jumlah per facet sama dengan hitungan manual.
+"""
+
+from app.services.facet_index import FacetIndex, price_bucket
+
+ROWS = [
+    {"id": 1, "brand": "Samsung", "category_id": 1, "ram_gb": 8, "storage_gb": 256, "release_year": 2024, "price_idr": 5_500_000},
+    {"id": 2, "brand": "Samsung", "category_id": 1, "ram_gb": 12, "storage_gb": 512, "release_year": 2024, "price_idr": 18_000_000},
+    {"id": 3, "brand": "Xiaomi", "category_id": 1, "ram_gb": 8, "storage_gb": 256, "release_year": 2023, "price_idr": 3_200_000},
+    {"id": 4, "brand": "XIAOMI", "category_id": 2, "ram_gb": 16, "storage_gb": 1024, "release_year": 2023, "price_idr": None},
+]
+
+
+def make_index():
+    index = FacetIndex()
+    index.load(ROWS)
+    return index
+
+
+def counts_of(result, facet):
+    return {option["value"]: option["count"] for option in result["facets"][facet]}
+
+
+def test_counts_without_filter():
+    result = make_index().counts()
+    assert result["total"] == 4
+    assert counts_of(result, "brand") == {"samsung": 2, "xiaomi": 2}
+    assert counts_of(result, "price_bucket") == {"4000000-6000000": 1, "10000000-": 1, "2000000-4000000": 1}
+
+
+def test_other_facets_follow_filter():
+    result = make_index().counts({"brand": ["samsung"]})
+    assert result["total"] == 2
+    assert counts_of(result, "ram_gb") == {8: 1, 12: 1, 16: 0}
+    # Facet yang difilter tetap menampilkan jumlah pilihan lain
+    assert counts_of(result, "brand") == {"samsung": 2, "xiaomi": 2}
+
+
+def test_values_in_one_facet_are_or():
+    result = make_index().counts({"ram_gb": [8, 12], "release_year": [2024]})
+    assert result["total"] == 2
+
+
+def test_max_price():
+    result = make_index().counts(max_price=5_500_000)
+    assert result["total"] == 2
+
+
+def test_upsert_and_remove():
+    index = make_index()
+    index.upsert({**ROWS[0], "brand": "Xiaomi"})
+    assert counts_of(index.counts(), "brand") == {"samsung": 1, "xiaomi": 3}
+    index.remove(2)
+    assert counts_of(index.counts(), "brand") == {"xiaomi": 3}
+
+
+def test_price_bucket():
+    assert price_bucket(1_999_999) == "0-2000000"
+    assert price_bucket(None) is None
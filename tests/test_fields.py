@@ -0,0 +1,32 @@
+"""
+Tests untuk app/utils/fields.py
+Memastikan parameter ?fields= divalidasi dan diserialisasi dengan benar.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.models import Phone
+from app.utils.fields import parse_fields, phone_to_dict
+
+
+def test_parse_fields_always_includes_id():
+    assert parse_fields("name, price") == ["id", "name", "price"]
+
+
+def test_parse_fields_empty_means_all():
+    assert parse_fields(None) is None
+    assert parse_fields(" ") is None
+
+
+def test_parse_fields_rejects_unknown():
+    with pytest.raises(ValueError):
+        parse_fields("name,password")
+
+
+def test_phone_to_dict_converts_decimal():
+    phone = Phone(id=7, name="Galaxy A55", price=Decimal("5999000.00"))
+    assert phone_to_dict(phone, ["id", "name", "price"]) == {
+        "id": 7, "name": "Galaxy A55", "price": 5999000.0
+    }
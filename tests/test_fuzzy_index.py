@@ -0,0 +1,46 @@
+"""
+Tests untuk app/services/fuzzy_index.py
+Memastikan pencarian toleran typo dan variasi spasi huruf-angka.
+"""
+
+from app.services.fuzzy_index import FuzzyIndex, normalize_tokens
+
+ROWS = [
+    (1, "Samsung Galaxy A55", "Samsung"),
+    (2, "Samsung Galaxy S24 Ultra", "Samsung"),
+    (3, "Redmi Note 13", "Xiaomi"),
+    (4, "iPhone 15 Pro", "Apple"),
+]
+
+
+def make_index():
+    index = FuzzyIndex()
+    index.load(ROWS)
+    return index
+
+
+def test_normalize_splits_and_joins_digits():
+    assert {"note", "13"} <= set(normalize_tokens("Note13"))
+    assert "note13" in normalize_tokens("Note 13")
+
+
+def test_typo_in_brand():
+    results = make_index().search("samsng a55")
+    assert results[0]["id"] == 1
+
+
+def test_missing_space_before_number():
+    results = make_index().search("redmi note13")
+    assert results[0]["id"] == 3
+
+
+def test_unrelated_query_returns_nothing():
+    assert make_index().search("zzzz qqqq") == []
+
+
+def test_incremental_update():
+    index = make_index()
+    index.upsert(5, "Poco F6 Pro", "Xiaomi")
+    assert index.search("poko f6")[0]["id"] == 5
+    index.remove(5)
+    assert all(r["id"] != 5 for r in index.search("poko f6"))
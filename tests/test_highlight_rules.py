@@ -0,0 +1,67 @@
+"""
+Tests untuk app/services/highlight_rules.py
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services import highlight_rules
+from app.services.comparison_service import generate_highlights
+
+
+def make_device(name, **specs):
+    values = {
+        "price": None, "price_idr": None, "release_year": None, "ram_gb": None,
+        "storage_gb": None, "main_camera_mp": None, "battery_mah": None, "screen_inch": None,
+    }
+    values.update(specs)
+    return SimpleNamespace(name=name, **values)
+
+
+def texts(device1, device2):
+    return {h.key: h.text for h in highlight_rules.evaluate(device1, device2)}
+
+
+def test_all_rules_single_pass():
+    a = make_device("A", price_idr=5_000_000, release_year=2023, ram_gb=8, storage_gb=1024,
+                    main_camera_mp=50, battery_mah=5000, screen_inch=6.7)
+    b = make_device("B", price_idr=7_000_000, release_year=2024, ram_gb=12, storage_gb=256,
+                    main_camera_mp=108, battery_mah=4500, screen_inch=6.1)
+    result = texts(a, b)
+
+    assert result["price_idr"] == "A lebih murah Rp 2,000,000"
+    assert result["release_year"] == "B lebih baru (Rilis 2024)"
+    assert result["ram_gb"] == "B lebih besar (12GB vs 8GB)"
+    assert result["storage_gb"] == "A lebih besar (1TB vs 256GB)"
+    assert result["main_camera_mp"] == "B lebih tinggi (108MP vs 50MP)"
+    assert result["battery_mah"] == "A lebih besar (5000 mAh vs 4500 mAh)"
+    assert result["screen_inch"] == 'A lebih besar (6.7" vs 6.1")'
+    assert list(result) == [rule.key for rule in highlight_rules.RULES]
+
+
+def test_missing_and_equal_values_skipped():
+    a = make_device("A", ram_gb=8, battery_mah=5000)
+    b = make_device("B", ram_gb=8, battery_mah=None)
+    assert texts(a, b) == {}
+
+
+def test_price_falls_back_to_price_column():
+    a = make_device("A", price=Decimal("3000000.00"))
+    b = make_device("B", price=Decimal("4500000.00"))
+    assert texts(a, b)["price_idr"] == "A lebih murah Rp 1,500,000"
+
+
+def test_symmetric():
+    a = make_device("A", ram_gb=8, price_idr=1_000_000)
+    b = make_device("B", ram_gb=6, price_idr=2_000_000)
+    assert texts(a, b) == texts(b, a)
+
+
+def test_api_and_page_share_rules():
+    from app.routers.frontend import _compare_page_highlights
+
+    a = make_device("A", ram_gb=8, main_camera_mp=64)
+    b = make_device("B", ram_gb=6, main_camera_mp=50)
+    page = _compare_page_highlights(a, b)
+    assert [item["winner"] for item in page] == generate_highlights(a, b)
+    assert "fa-memory" in page[0]["category"]
@@ -0,0 +1,81 @@
+"""
+Tests untuk schema migration (app/migrations).
+"""
+
+from sqlalchemy import DECIMAL, Column, Integer, MetaData, String, Table, create_engine, inspect, text
+
+from app import migrations
+from app.database import Base
+from app import models  # noqa: F401
+from app.migrations import m0001_numeric_spec_columns
+
+
+def _legacy_engine(*extra_columns):
+    """Database lama: tabel phones tanpa kolom numerik dan tanpa composite index."""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    Table(
+        "phones", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(255)),
+        Column("brand", String(100)),
+        Column("category_id", Integer),
+        Column("release_year", Integer),
+        *extra_columns,
+    )
+    metadata.create_all(engine)
+    return engine
+
+
+class TestMigrations:
+    def test_versions_unique_and_ordered(self):
+        versions = [module.VERSION for module in migrations.discover()]
+        assert versions == sorted(versions)
+        assert len(versions) == len(set(versions))
+
+    def test_upgrade_legacy_database(self):
+        engine = _legacy_engine()
+        done = migrations.upgrade(engine)
+        assert done == [module.VERSION for module in migrations.discover()]
+
+        columns = {col["name"] for col in inspect(engine).get_columns("phones")}
+        assert {"ram_gb", "storage_gb", "price_idr"} <= columns
+        indexes = {index["name"] for index in inspect(engine).get_indexes("phones")}
+        assert {"ix_phones_price_idr", "ix_phones_category_year_price", "ix_phones_brand_price"} <= indexes
+
+    def test_upgrade_backfills_existing_rows(self, monkeypatch):
+        monkeypatch.setattr(m0001_numeric_spec_columns, "BATCH_SIZE", 2)  # Lebih dari 1 batch
+        engine = _legacy_engine(Column("ram", String(100)), Column("price", DECIMAL(15, 2)))
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO phones (id, name, ram, price) VALUES "
+                "(1, 'A', '8GB', 12999000.00), (2, 'B', 'N/A', 0), (3, 'C', '12GB RAM', 4500000)"
+            ))
+
+        migrations.upgrade(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, ram_gb, price_idr, battery_mah FROM phones ORDER BY id")).all()
+        assert [tuple(row) for row in rows] == [
+            (1, 8, 12999000, None), (2, None, None, None), (3, 12, 4500000, None)
+        ]
+
+    def test_upgrade_is_idempotent(self):
+        engine = _legacy_engine()
+        migrations.upgrade(engine)
+        assert migrations.upgrade(engine) == []
+        assert all(item["applied_at"] for item in migrations.status(engine))
+
+    def test_upgrade_after_create_all(self):
+        """Database baru: kolom/index sudah dibuat create_all, migration tidak error."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        migrations.upgrade(engine)
+        indexes = {index["name"] for index in inspect(engine).get_indexes("phones")}
+        assert "ix_phones_ram_storage" in indexes
+
+    def test_target_version(self):
+        engine = _legacy_engine()
+        assert migrations.upgrade(engine, target=1) == [1]
+        pending = [item["version"] for item in migrations.status(engine) if not item["applied_at"]]
+        assert 1 not in pending and pending
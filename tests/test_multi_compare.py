@@ -0,0 +1,78 @@
+"""
+Tests untuk perbandingan banyak device (comparison_service.compare_many_devices)
+"""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import comparison_service
+from app.services.comparison_service import COMPARE_SPECS, rank_specs
+
+
+def make_device(device_id, **specs):
+    values = {key: None for key, _, _, _ in COMPARE_SPECS}
+    values.update(price=None, name=f"Phone {device_id}")
+    values.update(specs)
+    return SimpleNamespace(id=device_id, **values)
+
+
+def spec_row(stats, key):
+    index = [spec[0] for spec in COMPARE_SPECS].index(key)
+    return {name: array[index] for name, array in stats.items()}
+
+
+def test_winner_rank_delta_higher_is_better():
+    devices = [
+        make_device(1, ram_gb=8),
+        make_device(2, ram_gb=12),
+        make_device(3, ram_gb=8),
+    ]
+    row = spec_row(rank_specs(devices), "ram_gb")
+    assert row["winners"].tolist() == [False, True, False]
+    assert row["ranks"].tolist() == [2, 1, 2]
+    assert row["deltas"].tolist() == [-4, 0, -4]
+
+
+def test_price_lower_is_better():
+    devices = [make_device(1, price_idr=5_000_000), make_device(2, price_idr=3_000_000)]
+    row = spec_row(rank_specs(devices), "price_idr")
+    assert row["winners"].tolist() == [False, True]
+    assert row["deltas"].tolist() == [2_000_000, 0]
+
+
+def test_legacy_zero_price_is_not_a_winner():
+    # Data lama tanpa price_idr: price 0 = belum diketahui, bukan "paling murah"
+    devices = [make_device(1, price=0), make_device(2, price_idr=3_000_000), make_device(3, price=4_000_000)]
+    row = spec_row(rank_specs(devices), "price_idr")
+    assert row["winners"].tolist() == [False, True, False]
+    assert math.isnan(row["values"][0]) and math.isnan(row["ranks"][0])
+    assert row["deltas"][2] == 1_000_000
+
+
+def test_missing_values_and_ties():
+    devices = [
+        make_device(1, battery_mah=5000, release_year=2024),
+        make_device(2, battery_mah=None, release_year=2024),
+        make_device(3, battery_mah=5000, release_year=2024),
+    ]
+    stats = rank_specs(devices)
+
+    battery = spec_row(stats, "battery_mah")
+    assert battery["winners"].tolist() == [False, False, False]   # semua seri
+    assert battery["ranks"][0] == 1 and battery["ranks"][2] == 1
+
+    # Hanya 1 device yang punya nilai -> tidak ada pemenang
+    camera = spec_row(rank_specs([make_device(1, main_camera_mp=50), make_device(2)]), "main_camera_mp")
+    assert not camera["winners"].any()
+
+
+def test_parse_device_ids():
+    assert comparison_service.parse_device_ids("3, 1,3,2") == [3, 1, 2]
+    with pytest.raises(ValueError):
+        comparison_service.parse_device_ids("1")
+    with pytest.raises(ValueError):
+        comparison_service.parse_device_ids("1,x")
+    with pytest.raises(ValueError):
+        comparison_service.parse_device_ids(",".join(str(i) for i in range(1, 12)))
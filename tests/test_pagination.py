@@ -0,0 +1,91 @@
+"""
+Tests untuk app/crud/pagination.py
+Memastikan keyset pagination tidak melewatkan / mengulang device.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Phone
+from app.crud import pagination
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    prices = [3000000, None, 5000000, 3000000, None, 1500000, 8000000, 5000000]
+    for i, price in enumerate(prices, start=1):
+        session.add(Phone(id=i, name=f"Phone {i}", brand="Test", price=price))
+    session.commit()
+    yield session
+    session.close()
+
+
+def collect(db, **kwargs):
+    ids, cursor = [], None
+    while True:
+        items, cursor = pagination.paginate(db.query(Phone), cursor=cursor, limit=3, **kwargs)
+        ids += [item.id for item in items]
+        if not cursor:
+            return ids
+
+
+def test_cursor_roundtrip():
+    position = {"k": 5000000, "id": 42}
+    assert pagination.decode_cursor(pagination.encode_cursor(position)) == position
+
+
+def test_invalid_cursor():
+    with pytest.raises(pagination.InvalidCursor):
+        pagination.decode_cursor("bukan-cursor")
+
+
+def test_cursor_bound_to_sort(db):
+    _, cursor = pagination.paginate(db.query(Phone), limit=3, sort_column=Phone.price_idr)
+    position = pagination.decode_cursor(cursor, "price_idr:asc")
+    assert position == {"k": 3000000, "id": 4}
+
+    for sort_column, descending in ((Phone.price_idr, True), (Phone.name, False), (None, False)):
+        with pytest.raises(pagination.InvalidCursor):
+            pagination.paginate(db.query(Phone), cursor=cursor, limit=3,
+                                sort_column=sort_column, descending=descending)
+
+
+def test_cursor_key_values_checked(db):
+    price_sort = pagination.sort_signature(Phone.price_idr)
+    malformed = [
+        {"id": 4},                      # Tanpa "k"
+        {"k": [3000000, 1], "id": 4},   # 2 nilai untuk 1 kolom sort
+        {"k": None, "id": 4},
+        {"k": 3000000, "id": 4, "null": "ya"},
+    ]
+    for position in malformed:
+        cursor = pagination.encode_cursor(position, price_sort)
+        with pytest.raises(pagination.InvalidCursor):
+            pagination.paginate(db.query(Phone), cursor=cursor, limit=3, sort_column=Phone.price_idr)
+
+    # Urut id saja: tidak boleh ada nilai sort
+    cursor = pagination.encode_cursor({"k": 5, "id": 4}, pagination.sort_signature())
+    with pytest.raises(pagination.InvalidCursor):
+        pagination.paginate(db.query(Phone), cursor=cursor, limit=3)
+
+    # Tahap NULL tidak butuh "k"
+    cursor = pagination.encode_cursor({"id": 2, "null": True}, price_sort)
+    items, _ = pagination.paginate(db.query(Phone), cursor=cursor, limit=3, sort_column=Phone.price_idr)
+    assert [item.id for item in items] == [5]
+
+
+def test_paginate_by_id(db):
+    assert collect(db) == list(range(1, 9))
+
+
+def test_paginate_nullable_column_nulls_last(db):
+    assert collect(db, sort_column=Phone.price_idr) == [6, 1, 4, 3, 8, 7, 2, 5]
+
+
+def test_paginate_descending(db):
+    assert collect(db, sort_column=Phone.price_idr, descending=True) == [7, 8, 3, 4, 1, 6, 2, 5]
@@ -0,0 +1,78 @@
+"""
+Tests untuk app/services/pareto_index.py
+"""
+
+import numpy as np
+
+from app.services.pareto_index import ParetoIndex, pareto_frontier
+
+
+def _brute_force(prices, scores):
+    """Device yang tidak didominasi device lain (O(n^2))."""
+    frontier = set()
+    for i in range(len(prices)):
+        dominated = any(
+            prices[j] <= prices[i] and scores[j] >= scores[i]
+            and (prices[j] < prices[i] or scores[j] > scores[i])
+            for j in range(len(prices))
+        )
+        if not dominated:
+            frontier.add(i)
+    return frontier
+
+
+def test_frontier_matches_brute_force():
+    rng = np.random.default_rng(5)
+    prices = rng.integers(1, 40, 300).astype(float) * 500_000
+    scores = rng.random(300).round(2)
+    frontier = pareto_frontier(prices, scores)
+
+    assert set(frontier.tolist()) <= _brute_force(prices, scores)
+    # Titik kembar (harga & skor sama) cukup diwakili 1 device
+    assert {(prices[i], scores[i]) for i in frontier} == {
+        (prices[i], scores[i]) for i in _brute_force(prices, scores)
+    }
+    assert np.all(np.diff(prices[frontier]) > 0)
+    assert np.all(np.diff(scores[frontier]) > 0)
+
+
+def _phone(device_id, price, ram, category_id=1, year=2024):
+    return {"id": device_id, "category_id": category_id, "price_idr": price,
+            "ram_gb": ram, "release_year": year}
+
+
+def test_index_frontier_budget_and_updates():
+    index = ParetoIndex()
+    index.load([
+        _phone(1, 3_000_000, 4),
+        _phone(2, 5_000_000, 8),
+        _phone(3, 6_000_000, 6),     # Lebih mahal dari 2 tapi RAM lebih kecil
+        _phone(4, 9_000_000, 12),
+        _phone(5, None, 16),         # Tanpa harga -> tidak ikut
+        _phone(6, 2_000_000, 16, category_id=2),
+    ])
+    assert index.frontier(1, "gaming")[0].tolist() == [1, 2, 4]
+    assert index.frontier()[0].tolist() == [6]
+
+    # Device 3 di-update jadi lebih murah dari 2 dengan RAM lebih besar
+    index.upsert(_phone(3, 4_000_000, 12))
+    assert index.frontier(1, "gaming")[0].tolist() == [1, 3]
+
+    index.remove(3)
+    assert index.frontier(1, "gaming")[0].tolist() == [1, 2, 4]
+
+
+def test_frontier_cache_bounded_lru():
+    index = ParetoIndex(max_frontiers=2)
+    index.load([_phone(1, 3_000_000, 4, year=2022), _phone(2, 5_000_000, 8, category_id=2)])
+    defaults = set(index.frontiers)
+    assert defaults == {(None, None, None), (1, None, None), (2, None, None)}
+
+    index.frontier(1, None, 2020)
+    index.frontier(1, None, 2021)
+    index.frontier(1, None, 2020)  # Dipakai lagi -> paling baru
+    index.frontier(1, None, 2022)
+
+    assert set(index.frontiers) == defaults | {(1, None, 2020), (1, None, 2022)}
+    assert index.evictions == 1
+    assert index.frontier(1, None, 2021)[0].tolist() == [1]  # Dihitung ulang
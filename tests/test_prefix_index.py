@@ -0,0 +1,58 @@
+"""
+Tests untuk app/services/prefix_index.py
+"""
+
+from app.services import prefix_index
+from app.services.prefix_index import PrefixIndex
+
+
+def make_index(devices):
+    index = PrefixIndex()
+    for device_id, name, brand in devices:
+        index.upsert(device_id, name, brand)
+    return index
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_prefix_search_and_ranking():
+    index = make_index([
+        (1, "Galaxy S24 Ultra", "Samsung"),
+        (2, "Galaxy S24", "Samsung"),
+        (3, "Redmi Galaxy Edition", "Xiaomi"),
+        (4, "iPhone 15", "Apple"),
+    ])
+    assert ids(index.search("gal")) == [2, 1, 3]  # Nama diawali query, lalu nama pendek
+    assert ids(index.search("sam s2")) == [2, 1]  # Semua kata harus cocok (AND)
+    assert index.search("galaxy apple") == []
+    assert index.search("") == []
+
+
+def test_upsert_replaces_old_tokens_and_remove():
+    index = make_index([(1, "Redmi Note 13", "Xiaomi"), (2, "Poco X6", "Xiaomi")])
+    entries = len(index.entries)
+
+    index.upsert(1, "Redmi Turbo 3", "Xiaomi")
+    assert index.search("note") == []
+    assert ids(index.search("turbo")) == [1]
+    assert len(index.entries) == entries  # Token lama dihapus, bukan ditumpuk
+    assert index.entries == sorted(index.entries)
+
+    index.remove(2)
+    assert ids(index.search("xiaomi")) == [1]
+    assert 2 not in index.docs
+    assert all(device_id != 2 for _, device_id in index.entries)
+    index.remove(99)  # Device yang tidak ada diabaikan
+
+
+def test_candidates_truncated(monkeypatch):
+    monkeypatch.setattr(prefix_index, "MAX_CANDIDATES", 3)
+    index = make_index([(i, f"Phone {i}", "Brand") for i in range(1, 11)])
+
+    # Hanya MAX_CANDIDATES entry pertama dari range prefix yang diperiksa
+    assert len(index.search("phone", limit=10)) == 3
+    # Token paling selektif dipakai dulu, jadi device di luar 3 entry pertama
+    # "phone" tetap ditemukan lewat token angkanya
+    assert ids(index.search("phone 9")) == [9]
@@ -0,0 +1,65 @@
+"""
+Tests untuk app/utils/query_parser.py
+Memastikan kalimat search natural dipecah jadi filter get_devices_filtered().
+"""
+
+from app.utils.query_parser import parse_search_query, has_structured_filters
+
+BRANDS = ["Samsung", "Xiaomi", "Oppo", "Apple"]
+
+
+class TestSpecs:
+    """Test RAM dan storage"""
+
+    def test_ram_and_storage_by_size(self):
+        filters = parse_search_query("samsung 8gb 256gb", BRANDS)
+        assert filters["ram"] == "8GB"
+        assert filters["storage"] == "256GB"
+        assert filters["brand"] == "Samsung"
+
+    def test_ram_storage_pair(self):
+        filters = parse_search_query("poco x6 pro 12/256", BRANDS)
+        assert filters["ram"] == "12GB"
+        assert filters["storage"] == "256GB"
+        assert filters["search"] == "poco x6 pro"
+
+    def test_explicit_ram_marker(self):
+        assert parse_search_query("ram 12gb", BRANDS) == {"ram": "12GB"}
+
+    def test_terabyte_is_storage(self):
+        assert parse_search_query("galaxy 1tb", BRANDS)["storage"] == "1TB"
+
+
+class TestPrice:
+    """Test ekspresi harga"""
+
+    def test_di_bawah_juta(self):
+        assert parse_search_query("di bawah 5 juta")["max_price"] == 5_000_000
+
+    def test_less_than_jt(self):
+        assert parse_search_query("xiaomi < 4,5jt", BRANDS)["max_price"] == 4_500_000
+
+    def test_range(self):
+        filters = parse_search_query("oppo 3-5 juta", BRANDS)
+        assert (filters["min_price"], filters["max_price"]) == (3_000_000, 5_000_000)
+
+    def test_di_atas_rupiah(self):
+        assert parse_search_query("di atas rp 10.000.000")["min_price"] == 10_000_000
+
+    def test_model_number_is_not_price(self):
+        assert parse_search_query("iphone 15 pro max", BRANDS) == {"search": "iphone 15 pro max"}
+
+
+class TestOthers:
+    """Test tahun, brand, dan sisa kata"""
+
+    def test_year(self):
+        assert parse_search_query("samsung 2024", BRANDS)["release_year"] == 2024
+
+    def test_two_brands_stay_keywords(self):
+        filters = parse_search_query("samsung xiaomi", BRANDS)
+        assert "brand" not in filters
+        assert not has_structured_filters(filters)
+
+    def test_stopwords_removed(self):
+        assert parse_search_query("hp murah dibawah 2jt") == {"max_price": 2_000_000}
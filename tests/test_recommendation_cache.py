@@ -0,0 +1,58 @@
+"""
+Tests untuk app/services/recommendation_cache.py
+"""
+
+import time
+
+import numpy as np
+
+from app.services.recommendation_cache import Candidates, RecommendationCache, make_key, price_bucket
+
+
+def _candidates(*ids):
+    count = len(ids)
+    return Candidates(
+        ids=np.array(ids, dtype=np.int64),
+        price_idr=np.zeros(count),
+        specs=np.zeros((count, 7)),
+        ranked={},
+    )
+
+
+def test_nearby_budgets_share_bucket():
+    assert price_bucket(4_999_000) == price_bucket(5_000_000) == 5_000_000
+    assert price_bucket(5_000_001) == 5_500_000
+    assert make_key(4_999_000, 1, 2023) == make_key(4_800_000, 1, 2023)
+    assert make_key(4_999_000, 1, 2023) != make_key(4_999_000, 2, 2023)
+    assert make_key(None, None, None) == (None, None, None)
+
+
+def test_ttl_expiry():
+    cache = RecommendationCache(max_entries=10, ttl_seconds=0.01)
+    cache.put(("k",), _candidates(1))
+    assert cache.get(("k",)) is not None
+    time.sleep(0.02)
+    assert cache.get(("k",)) is None
+
+
+def test_lru_eviction():
+    cache = RecommendationCache(max_entries=2, ttl_seconds=60)
+    for bucket in (1, 2, 3):
+        cache.put((bucket, None, None), _candidates(bucket))
+    assert cache.get((1, None, None)) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation_by_device_and_category():
+    cache = RecommendationCache(max_entries=10, ttl_seconds=60)
+    cache.put((5_000_000, 1, None), _candidates(10, 11))
+    cache.put((5_000_000, 2, None), _candidates(20))
+    cache.put((5_000_000, None, None), _candidates(10, 11, 20))
+
+    # Device 20 berubah: entry yang berisi device 20 dibuang
+    assert cache.invalidate_device(20) == 2
+    assert cache.get((5_000_000, 1, None)) is not None
+
+    # Device baru di kategori 1 bisa masuk entry kategori 1
+    assert cache.invalidate_category(1) == 1
+    assert cache.stats()["entries"] == 0
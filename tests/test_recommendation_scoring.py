@@ -0,0 +1,58 @@
+"""
+Tests untuk scoring engine di app/services/recommendation_service.py
+"""
+
+import numpy as np
+import pytest
+
+from app.core.config import USE_CASES
+from app.services.recommendation_service import (
+    SCORE_FEATURES, score_candidates, top_k, weight_vector
+)
+
+NAN = np.nan
+
+
+def _specs(*rows):
+    """Baris dict -> matrix urutan SCORE_FEATURES (kosong = NaN)."""
+    return np.array([[row.get(name, NAN) for name, _, _ in SCORE_FEATURES] for row in rows], dtype=float)
+
+
+def test_weight_vector_per_use_case():
+    for use_case in [None] + USE_CASES:
+        weights = weight_vector(use_case)
+        assert weights.shape == (len(SCORE_FEATURES),)
+        assert weights.sum() == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        weight_vector("memasak")
+
+
+def test_use_case_changes_ranking():
+    specs = _specs(
+        {"price": 5_000_000, "release_year": 2023, "ram_gb": 12, "main_camera_mp": 12},
+        {"price": 5_000_000, "release_year": 2023, "ram_gb": 6, "main_camera_mp": 200},
+    )
+    assert top_k(score_candidates(specs, weight_vector("gaming")), 1).tolist() == [0]
+    assert top_k(score_candidates(specs, weight_vector("fotografi")), 1).tolist() == [1]
+
+
+def test_default_prefers_newer_then_cheaper():
+    specs = _specs(
+        {"price": 3_000_000, "release_year": 2021},
+        {"price": 9_000_000, "release_year": 2024},
+        {"price": 4_000_000, "release_year": 2024},
+    )
+    assert top_k(score_candidates(specs, weight_vector()), 3).tolist() == [2, 1, 0]
+
+
+def test_missing_specs_never_add_score():
+    specs = _specs({"main_camera_mp": 50}, {}, {"main_camera_mp": 12})
+    scores = score_candidates(specs, weight_vector("fotografi"))
+    assert scores[1] == 0.0
+    assert np.isfinite(scores).all()
+
+
+def test_top_k_matches_full_sort():
+    scores = np.random.default_rng(3).random(1000)
+    assert top_k(scores, 10).tolist() == np.argsort(-scores)[:10].tolist()
+    assert len(top_k(scores[:3], 10)) == 3
@@ -0,0 +1,127 @@
+"""
+Tests untuk app/crud/search.py
+Full-text search SQLite (FTS5 + bm25) di database sementara.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import search
+from app.database import Base
+from app.models import Phone
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Phone(id=1, name="Samsung Galaxy S24", brand="Samsung"),
+        Phone(id=2, name="Galaxy Tab S9", brand="Samsung"),
+        Phone(id=3, name="Redmi Note 13", brand="Xiaomi"),
+    ])
+    session.commit()
+    assert search.ensure_fulltext_index(engine)
+    yield session
+    session.close()
+
+
+def fts_ids(db, match):
+    rows = db.execute(
+        text(f"SELECT rowid FROM {search.SQLITE_FTS_TABLE} WHERE {search.SQLITE_FTS_TABLE} MATCH :q ORDER BY rowid"),
+        {"q": match},
+    )
+    return [row[0] for row in rows]
+
+
+def ids(phones):
+    return [phone.id for phone in phones]
+
+
+def test_fts_table_synced_by_triggers(db):
+    # Data yang sudah ada diisi saat index dibuat ('rebuild')
+    assert fts_ids(db, "galaxy") == [1, 2]
+
+    db.add(Phone(id=4, name="Poco X6", brand="Xiaomi"))
+    db.commit()
+    assert fts_ids(db, "xiaomi") == [3, 4]
+
+    db.get(Phone, 3).name = "Redmi Turbo 3"
+    db.commit()
+    assert fts_ids(db, "note") == []
+    assert fts_ids(db, "turbo") == [3]
+
+    db.delete(db.get(Phone, 4))
+    db.commit()
+    assert fts_ids(db, "poco") == []
+    assert fts_ids(db, "xiaomi") == [3]
+
+
+def test_ensure_fulltext_index_idempotent(engine, db):
+    assert search.ensure_fulltext_index(engine)
+    assert fts_ids(db, "samsung") == [1, 2]  # Tidak ter-index dua kali
+
+
+def test_prefix_tokens_and_all_tokens_required(db):
+    assert ids(search.search_devices(db, "sams gal")) == [1, 2]
+    assert ids(search.search_devices(db, "galaxy s24")) == [1]
+    assert search.search_devices(db, "galaxy redmi") == []
+    assert search.search_devices(db, "  +-* ") == []
+
+
+def test_bm25_ordering(db):
+    db.add(Phone(id=4, name="Nokia Galaxy Galaxy Edition", brand="Galaxy"))
+    db.commit()
+    # Token muncul di name dan brand (bobot lebih besar) -> paling relevan
+    results = ids(search.search_devices(db, "galaxy"))
+    assert results[0] == 4
+    assert sorted(results) == [1, 2, 4]
+
+    query, rank, descending = search.build_ranked_search_query(db, "galaxy")
+    ordered = query.add_columns(rank).order_by(rank).all()
+    scores = [score for _, score in ordered]
+    assert descending is False  # bm25: makin kecil makin relevan
+    assert scores == sorted(scores)
+    assert ids(phone for phone, _ in ordered) == results
+
+
+def test_ranked_query_contract(db):
+    assert search.build_ranked_search_query(db, "") is None
+    assert search.build_ranked_search_query(db, "!!") is None
+
+    query, rank, descending = search.build_ranked_search_query(db, "samsung")
+    assert rank is not None and descending is False
+    # Query belum terurut: pemanggil (keyset pagination) yang menentukan urutan
+    assert "ORDER BY" not in str(query.statement)
+    assert sorted(ids(query.all())) == [1, 2]
+
+
+def test_ilike_fallback_without_fulltext_index(db, monkeypatch):
+    monkeypatch.setattr(search, "_fulltext_dialects", set())
+    query, rank, descending = search.build_ranked_search_query(db, "laxy")
+    assert rank is None and descending is False
+    assert sorted(ids(query.all())) == [1, 2]  # Substring, bukan prefix token
+    assert ids(search.search_devices(db, "xiao")) == [3]
+
+
+def test_mysql_short_tokens_use_ilike(db):
+    # Token < MYSQL_MIN_TOKEN_SIZE tidak ada di FULLTEXT index
+    query, rank, descending = search._mysql_search_query(db, ["galaxy", "s2"])
+    sql = str(query.statement.compile(dialect=mysql.dialect()))
+    assert "MATCH (phones.name, phones.brand) AGAINST" in sql
+    assert sql.count("LIKE") == 2  # name atau brand untuk "s2"
+    assert rank is not None and descending is True
+
+    query, rank, descending = search._mysql_search_query(db, ["s2", "a5"])
+    sql = str(query.statement.compile(dialect=mysql.dialect()))
+    assert "MATCH" not in sql and sql.count("LIKE") == 4
+    assert rank is None and descending is False
@@ -0,0 +1,96 @@
+"""
+Tests untuk app/services/similar_index.py
+"""
+
+import random
+
+import numpy as np
+
+from app.services import similar_index
+from app.services.similar_index import KDTree, SimilarIndex
+
+
+def _rows(size, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "price_idr": rng.randrange(1_000_000, 20_000_000, 100_000),
+            "ram_gb": rng.choice([4, 8, 12]),
+            "storage_gb": rng.choice([128, 256]),
+            "battery_mah": rng.randrange(4000, 6000, 100),
+            "main_camera_mp": rng.choice([12, 50, 200]) if i % 5 else None,
+            "screen_inch": round(rng.uniform(6.0, 6.8), 1),
+            "release_year": rng.randint(2020, 2025),
+        }
+        for i in range(1, size + 1)
+    ]
+
+
+def _brute_force(index, device_id, k):
+    vectors = {i: index.vector_of(i) for i in range(1, 10_000) if index.vector_of(i) is not None}
+    target = vectors[device_id]
+    distances = sorted(
+        (float(np.sqrt(((vector - target) ** 2).sum())), other_id)
+        for other_id, vector in vectors.items() if other_id != device_id
+    )
+    return [distance for distance, _ in distances[:k]]
+
+
+def test_kdtree_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(3000, 4))
+    tree = KDTree(points, leaf_size=16)
+    for query in rng.normal(size=(20, 4)):
+        dist, pos = tree.query(query, 7)
+        expected = np.sort(((points - query) ** 2).sum(axis=1))[:7]
+        assert np.allclose(dist, expected, atol=1e-4)
+        assert np.allclose(((tree.points[pos] - query) ** 2).sum(axis=1), dist, atol=1e-4)
+
+
+def test_kdtree_skips_killed_points():
+    points = np.arange(10, dtype=float).reshape(-1, 1)
+    tree = KDTree(points, leaf_size=2)
+    nearest = tree.query(np.array([0.0]), 1)[1][0]
+    tree.kill(nearest)
+    dist, pos = tree.query(np.array([0.0]), 2)
+    assert tree.points[pos].ravel().tolist() == [1.0, 2.0]
+
+
+def test_similar_matches_brute_force():
+    index = SimilarIndex()
+    index.load(_rows(500))
+    for device_id in (1, 77, 250, 500):
+        found = index.similar(device_id, 5)
+        assert len(found) == 5
+        assert device_id not in [other_id for other_id, _ in found]
+        assert np.allclose([d for _, d in found], _brute_force(index, device_id, 5), atol=1e-4)
+
+
+def test_similar_unknown_device():
+    index = SimilarIndex()
+    index.load(_rows(10))
+    assert index.similar(999) is None
+
+
+def test_upsert_and_remove(monkeypatch):
+    monkeypatch.setattr(similar_index, "REBUILD_BUFFER_MIN", 9)
+    monkeypatch.setattr(similar_index, "REBUILD_BUFFER_RATIO", 0)
+    rows = _rows(300)
+    index = SimilarIndex()
+    index.load(rows)
+
+    # Device 2 dibuat identik dengan device 1 -> jadi yang paling mirip
+    index.upsert(dict(rows[0], id=2))
+    assert index.similar(1, 1)[0] == (2, 0.0)
+
+    index.remove(2)
+    assert index.similar(2) is None
+    assert 2 not in [other_id for other_id, _ in index.similar(1, 20)]
+
+    # Update ke-10 melewati batas buffer -> buffer digabung ke tree baru
+    for row in rows[10:20]:
+        index.upsert(dict(row, price_idr=row["price_idr"] + 100_000))
+    assert not index.buffer
+    assert len(index) == 299
+    assert np.allclose([d for _, d in index.similar(15, 5)], _brute_force(index, 15, 5), atol=1e-4)
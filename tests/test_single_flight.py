@@ -0,0 +1,125 @@
+"""
+Tests untuk app/services/single_flight.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_collapsed():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "jawaban"
+
+    async def run():
+        same = [flight.do("a", fetch) for _ in range(10)]
+        other = flight.do("b", fetch)
+        return await asyncio.gather(*same, other)
+
+    results = asyncio.run(run())
+    assert results == ["jawaban"] * 11
+    assert len(calls) == 2
+
+    stats = flight.stats()
+    assert stats["calls"] == 11 and stats["executions"] == 2 and stats["collapsed"] == 9
+    assert stats["in_flight"] == 0
+
+
+def test_sequential_calls_not_collapsed():
+    flight = SingleFlight()
+
+    async def fetch():
+        return 1
+
+    async def run():
+        await flight.do("a", fetch)
+        await flight.do("a", fetch)
+
+    asyncio.run(run())
+    assert flight.stats()["executions"] == 2
+
+
+def test_error_shared_with_waiters():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("gagal")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("a", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["executions"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_call():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("a", fetch))
+        second = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_concurrent_streams_collapsed_and_replayed():
+    flight = SingleFlight()
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        for item in range(3):
+            await asyncio.sleep(0.01)
+            yield item
+
+    async def consume(delay=0.0):
+        await asyncio.sleep(delay)
+        return [item async for item in flight.stream("a", produce)]
+
+    async def run():
+        # Subscriber terakhir datang setelah item pertama lewat
+        return await asyncio.gather(consume(), consume(), consume(delay=0.015))
+
+    assert asyncio.run(run()) == [[0, 1, 2]] * 3
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert stats["executions"] == 1 and stats["collapsed"] == 2 and stats["in_flight"] == 0
+
+
+def test_stream_error_raised_to_all_subscribers():
+    flight = SingleFlight()
+
+    async def produce():
+        yield 1
+        raise ValueError("putus")
+
+    async def consume(items):
+        async for item in flight.stream("a", produce):
+            items.append(item)
+
+    async def run():
+        first, second = [], []
+        results = await asyncio.gather(consume(first), consume(second), return_exceptions=True)
+        return results, first, second
+
+    results, first, second = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert first == second == [1]
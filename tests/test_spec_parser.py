@@ -0,0 +1,92 @@
+"""
+Tests untuk app/utils/spec_parser.py
+Memastikan teks spesifikasi bebas di-parse jadi angka dengan benar.
+"""
+
+from decimal import Decimal
+
+from app.utils import spec_parser
+
+
+class TestSizeParsers:
+    """Test parsing RAM dan storage"""
+
+    def test_ram_simple(self):
+        assert spec_parser.parse_ram_gb("8GB") == 8
+        assert spec_parser.parse_ram_gb("12 GB") == 12
+
+    def test_ram_from_gsmarena_internal(self):
+        """Format GSMArena: storage dulu, lalu RAM"""
+        assert spec_parser.parse_ram_gb("256GB 12GB RAM") == 12
+
+    def test_storage_skips_ram(self):
+        assert spec_parser.parse_storage_gb("256GB 12GB RAM") == 256
+
+    def test_storage_terabyte(self):
+        assert spec_parser.parse_storage_gb("1TB") == 1024
+
+    def test_ram_does_not_confuse_18_with_8(self):
+        assert spec_parser.parse_ram_gb("18GB") == 18
+
+    def test_empty_values(self):
+        assert spec_parser.parse_ram_gb(None) is None
+        assert spec_parser.parse_storage_gb("N/A") is None
+
+
+class TestOtherParsers:
+    """Test parsing kamera, baterai, layar, dan harga"""
+
+    def test_camera_main_sensor(self):
+        assert spec_parser.parse_camera_mp("50MP + 12MP + 10MP") == 50
+        assert spec_parser.parse_camera_mp("48 MP, f/1.8, 24mm (wide)") == 48
+
+    def test_battery(self):
+        assert spec_parser.parse_battery_mah("5000mAh") == 5000
+        assert spec_parser.parse_battery_mah("Li-Po 5,000 mAh, non-removable") == 5000
+
+    def test_screen(self):
+        assert spec_parser.parse_screen_inch("6.1 inch AMOLED") == 6.1
+        assert spec_parser.parse_screen_inch("6.59 inches, 106.5 cm2") == 6.59
+        assert spec_parser.parse_screen_inch('6.7"') == 6.7
+
+    def test_price(self):
+        assert spec_parser.parse_price_idr(Decimal("12999000.00")) == 12999000
+        assert spec_parser.parse_price_idr("5.999.000") == 5999000
+        assert spec_parser.parse_price_idr(0) is None
+
+    def test_price_text_formats(self):
+        # Format Indonesia: titik ribuan, koma desimal
+        assert spec_parser.parse_price_idr("Rp 12.999.000") == 12999000
+        assert spec_parser.parse_price_idr("12.999.000,00") == 12999000
+        assert spec_parser.parse_price_idr("1.500") == 1500
+        assert spec_parser.parse_price_idr("Rp. 12999000,-") == 12999000
+        # Desimal biasa dan koma ribuan (CSV/import)
+        assert spec_parser.parse_price_idr("12999000.00") == 12999000
+        assert spec_parser.parse_price_idr("12999000,50") == 12999000
+        assert spec_parser.parse_price_idr("12,999,000") == 12999000
+        assert spec_parser.parse_price_idr("12,999,000.00") == 12999000
+        assert spec_parser.parse_price_idr("12999000") == 12999000
+        assert spec_parser.parse_price_idr("Rp 0,00") is None
+        assert spec_parser.parse_price_idr("N/A") is None
+
+
+class TestNormalizeSpecs:
+    """Test helper yang mengisi semua kolom numerik sekaligus"""
+
+    def test_normalize_specs(self):
+        values = spec_parser.normalize_specs({
+            "ram": "8GB",
+            "storage": "256GB",
+            "camera": "50MP + 12MP",
+            "battery": "3900mAh",
+            "screen": "6.1 inch AMOLED",
+            "price": Decimal("12999000"),
+        })
+        assert values == {
+            "ram_gb": 8,
+            "storage_gb": 256,
+            "main_camera_mp": 50,
+            "battery_mah": 3900,
+            "screen_inch": 6.1,
+            "price_idr": 12999000,
+        }